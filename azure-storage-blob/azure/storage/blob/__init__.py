@@ -26,6 +26,7 @@ from .models import (
     BlockListType,
     PublicAccess,
     BlobPrefix,
+    BlobColumns,
     DeleteSnapshot,
     BatchDeleteSubRequest,
     BatchSetBlobTierSubRequest,
@@ -34,4 +35,5 @@ from .models import (
     RehydratePriority,
 )
 from .pageblobservice import PageBlobService
+from .propertiescache import PropertiesCache
 from ._constants import __version__
@@ -12,3 +12,11 @@ X_MS_VERSION = '2019-02-02'
 
 # internal configurations, should not be changed
 _LARGE_BLOB_UPLOAD_MAX_READ_BUFFER_SIZE = 4 * 1024 * 1024
+_PAGE_SIZE = 512
+# the most empty pages sent between two runs of pages with data, rather than splitting them into two requests
+_MAX_SENT_EMPTY_PAGES_SIZE = 64 * 1024
+
+# service limits on the blocks of a block blob and the pages written by one request
+_MAX_BLOCK_SIZE = 100 * 1024 * 1024
+_MAX_BLOCK_COUNT = 50000
+_MAX_PAGE_RANGE_SIZE = 4 * 1024 * 1024
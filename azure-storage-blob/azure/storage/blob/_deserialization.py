@@ -4,7 +4,6 @@
 # license information.
 # --------------------------------------------------------------------------
 from azure.common import AzureException
-from dateutil import parser
 
 from azure.storage.common._http import HTTPResponse
 
@@ -18,11 +17,17 @@ from azure.storage.common._common_conversion import (
     _get_content_md5
 )
 from azure.storage.common._deserialization import (
+    _iterparse_list,
+    _ResponseBodyReader,
+    _parse_datetime,
     _parse_properties,
+    _to_epoch_seconds,
     _to_int,
+    _to_shared_str,
     _parse_metadata,
     _convert_xml_to_signed_identifiers,
     _bool,
+    _write_response_body,
 )
 from .models import (
     Container,
@@ -37,10 +42,14 @@ from .models import (
     PageBlobProperties,
     ResourceProperties,
     BlobPrefix,
+    BlobColumns,
     AccountInformation,
     UserDelegationKey, BatchSubResponse)
 from ._encryption import _decrypt_blob
-from azure.storage.common.models import _list
+from azure.storage.common.models import (
+    _list,
+    _StreamedList,
+)
 from azure.storage.common._error import (
     _validate_content_match,
     _ERROR_DECRYPTION_FAILURE,
@@ -62,7 +71,7 @@ def _parse_base_properties(response):
     Extracts basic response headers.
     '''
     resource_properties = ResourceProperties()
-    resource_properties.last_modified = parser.parse(response.headers.get('last-modified'))
+    resource_properties.last_modified = _parse_datetime(response.headers.get('last-modified'))
     resource_properties.etag = response.headers.get('etag')
     _parse_cpk_headers(response, resource_properties)
 
@@ -74,7 +83,7 @@ def _parse_page_properties(response):
     Extracts page response headers.
     '''
     put_page = PageBlobProperties()
-    put_page.last_modified = parser.parse(response.headers.get('last-modified'))
+    put_page.last_modified = _parse_datetime(response.headers.get('last-modified'))
     put_page.etag = response.headers.get('etag')
     put_page.sequence_number = _to_int(response.headers.get('x-ms-blob-sequence-number'))
     _parse_cpk_headers(response, put_page)
@@ -87,7 +96,7 @@ def _parse_append_block(response):
     Extracts append block response headers.
     '''
     append_block = AppendBlockProperties()
-    append_block.last_modified = parser.parse(response.headers.get('last-modified'))
+    append_block.last_modified = _parse_datetime(response.headers.get('last-modified'))
     append_block.etag = response.headers.get('etag')
     append_block.append_offset = _to_int(response.headers.get('x-ms-blob-append-offset'))
     append_block.committed_block_count = _to_int(response.headers.get('x-ms-blob-committed-block-count'))
@@ -118,8 +127,17 @@ def _parse_lease(response):
     return lease
 
 
+def _parse_lease_id(response):
+    return _parse_lease(response)['id']
+
+
+def _parse_lease_time(response):
+    return _parse_lease(response)['time']
+
+
 def _parse_blob(response, name, snapshot, validate_content=False, require_encryption=False,
-                key_encryption_key=None, key_resolver_function=None, start_offset=None, end_offset=None):
+                key_encryption_key=None, key_resolver_function=None, start_offset=None, end_offset=None,
+                stream_writer=None):
     if response is None:
         return None
 
@@ -134,6 +152,11 @@ def _parse_blob(response, name, snapshot, validate_content=False, require_encryp
         else:
             delattr(content_settings, 'content_md5')
 
+    if stream_writer is not None:
+        # The body is copied to the writer as it is read and is not kept on the blob
+        _write_response_body(response, stream_writer, validate_content)
+        return Blob(name, snapshot, None, props, metadata)
+
     if validate_content:
         computed_md5 = _get_content_md5(response.body)
         _validate_content_match(response.headers['content-md5'], computed_md5)
@@ -148,6 +171,10 @@ def _parse_blob(response, name, snapshot, validate_content=False, require_encryp
     return Blob(name, snapshot, response.body, props, metadata)
 
 
+def _parse_copy_properties(response):
+    return _parse_properties(response, BlobProperties).copy
+
+
 def _parse_container(response, name):
     if response is None:
         return None
@@ -218,7 +245,7 @@ def _convert_xml_to_containers(response):
         # Properties
         properties_element = container_element.find('Properties')
         container.properties.etag = properties_element.findtext('Etag')
-        container.properties.last_modified = parser.parse(properties_element.findtext('Last-Modified'))
+        container.properties.last_modified = _parse_datetime(properties_element.findtext('Last-Modified'))
         container.properties.lease_status = properties_element.findtext('LeaseStatus')
         container.properties.lease_state = properties_element.findtext('LeaseState')
         container.properties.lease_duration = properties_element.findtext('LeaseDuration')
@@ -232,35 +259,36 @@ def _convert_xml_to_containers(response):
     return containers
 
 
+# the values which repeat across the blobs of a listing are shared between them
 LIST_BLOBS_ATTRIBUTE_MAP = {
-    'Last-Modified': (None, 'last_modified', parser.parse),
+    'Last-Modified': (None, 'last_modified', _parse_datetime),
     'Etag': (None, 'etag', _to_str),
     'x-ms-blob-sequence-number': (None, 'sequence_number', _to_int),
-    'BlobType': (None, 'blob_type', _to_str),
+    'BlobType': (None, 'blob_type', _to_shared_str),
     'Content-Length': (None, 'content_length', _to_int),
     'ServerEncrypted': (None, 'server_encrypted', _bool),
-    'Content-Type': ('content_settings', 'content_type', _to_str),
-    'Content-Encoding': ('content_settings', 'content_encoding', _to_str),
+    'Content-Type': ('content_settings', 'content_type', _to_shared_str),
+    'Content-Encoding': ('content_settings', 'content_encoding', _to_shared_str),
     'Content-Disposition': ('content_settings', 'content_disposition', _to_str),
-    'Content-Language': ('content_settings', 'content_language', _to_str),
+    'Content-Language': ('content_settings', 'content_language', _to_shared_str),
     'Content-MD5': ('content_settings', 'content_md5', _to_str),
-    'Cache-Control': ('content_settings', 'cache_control', _to_str),
-    'LeaseStatus': ('lease', 'status', _to_str),
-    'LeaseState': ('lease', 'state', _to_str),
-    'LeaseDuration': ('lease', 'duration', _to_str),
+    'Cache-Control': ('content_settings', 'cache_control', _to_shared_str),
+    'LeaseStatus': ('lease', 'status', _to_shared_str),
+    'LeaseState': ('lease', 'state', _to_shared_str),
+    'LeaseDuration': ('lease', 'duration', _to_shared_str),
     'CopyId': ('copy', 'id', _to_str),
     'CopySource': ('copy', 'source', _to_str),
-    'CopyStatus': ('copy', 'status', _to_str),
+    'CopyStatus': ('copy', 'status', _to_shared_str),
     'CopyProgress': ('copy', 'progress', _to_str),
     'CopyCompletionTime': ('copy', 'completion_time', _to_str),
     'CopyStatusDescription': ('copy', 'status_description', _to_str),
-    'AccessTier': (None, 'blob_tier', _to_str),
-    'AccessTierChangeTime': (None, 'blob_tier_change_time', parser.parse),
+    'AccessTier': (None, 'blob_tier', _to_shared_str),
+    'AccessTierChangeTime': (None, 'blob_tier_change_time', _parse_datetime),
     'AccessTierInferred': (None, 'blob_tier_inferred', _bool),
-    'ArchiveStatus': (None, 'rehydration_status', _to_str),
-    'DeletedTime': (None, 'deleted_time', parser.parse),
+    'ArchiveStatus': (None, 'rehydration_status', _to_shared_str),
+    'DeletedTime': (None, 'deleted_time', _parse_datetime),
     'RemainingRetentionDays': (None, 'remaining_retention_days', _to_int),
-    'Creation-Time': (None, 'creation_time', parser.parse),
+    'Creation-Time': (None, 'creation_time', _parse_datetime),
 }
 
 
@@ -315,55 +343,96 @@ def _convert_xml_to_blob_list(response):
       <NextMarker />
     </EnumerationResults>
     '''
-    if response is None or response.body is None:
+    if response is None:
         return None
 
-    blob_list = _list()
-    list_element = ETree.fromstring(response.body)
+    body = _ResponseBodyReader(response)
+    if body.is_empty():
+        return None
 
-    setattr(blob_list, 'next_marker', list_element.findtext('NextMarker'))
+    blob_list = _list()
+    blob_prefixes = []
 
-    blobs_element = list_element.find('Blobs')
-    blob_prefix_elements = blobs_element.findall('BlobPrefix')
-    if blob_prefix_elements is not None:
-        for blob_prefix_element in blob_prefix_elements:
+    # the blobs are converted as the body is read, so the body is never held in memory as a whole
+    for element in _iterparse_list(body, 'Blobs', blob_list):
+        if element.tag == 'Blob':
+            blob_list.append(_convert_xml_to_blob(element))
+        elif element.tag == 'BlobPrefix':
             prefix = BlobPrefix()
-            prefix.name = blob_prefix_element.findtext('Name')
-            blob_list.append(prefix)
+            prefix.name = element.findtext('Name')
+            blob_prefixes.append(prefix)
 
-    for blob_element in blobs_element.findall('Blob'):
-        blob = Blob()
-        blob.name = blob_element.findtext('Name')
-        blob.snapshot = blob_element.findtext('Snapshot')
+    # the prefixes come first, as they always have
+    blob_list[0:0] = blob_prefixes
+    return blob_list
 
-        deleted = blob_element.findtext('Deleted')
-        if deleted:
-            blob.deleted = _bool(deleted)
 
-        # Properties
-        properties_element = blob_element.find('Properties')
-        if properties_element is not None:
-            for property_element in properties_element:
-                info = LIST_BLOBS_ATTRIBUTE_MAP.get(property_element.tag)
-                if info is None:
-                    setattr(blob.properties, property_element.tag, _to_str(property_element.text))
-                elif info[0] is None:
-                    setattr(blob.properties, info[1], info[2](property_element.text))
-                else:
-                    attr = getattr(blob.properties, info[0])
-                    setattr(attr, info[1], info[2](property_element.text))
+def _convert_xml_to_streamed_blob_list(response):
+    '''
+    Converts a page of a blob listing into a _StreamedList, which converts each 
+    blob as it is read off the connection. Only listings without a delimiter 
+    are streamed, as the prefixes of a page are returned before its blobs.
+    '''
+    return _convert_xml_to_streamed_list(response, _convert_xml_to_blob)
+
+
+def _convert_xml_to_blob(blob_element):
+    blob = Blob()
+    blob.name = blob_element.findtext('Name')
+    blob.snapshot = blob_element.findtext('Snapshot')
+
+    deleted = blob_element.findtext('Deleted')
+    if deleted:
+        blob.deleted = _bool(deleted)
+
+    # Properties
+    properties_element = blob_element.find('Properties')
+    if properties_element is not None:
+        for property_element in properties_element:
+            info = LIST_BLOBS_ATTRIBUTE_MAP.get(property_element.tag)
+            if info is None:
+                setattr(blob.properties, property_element.tag, _to_str(property_element.text))
+            elif info[0] is None:
+                setattr(blob.properties, info[1], info[2](property_element.text))
+            else:
+                attr = getattr(blob.properties, info[0])
+                setattr(attr, info[1], info[2](property_element.text))
 
-        # Metadata
-        metadata_root_element = blob_element.find('Metadata')
-        if metadata_root_element is not None:
-            blob.metadata = dict()
-            for metadata_element in metadata_root_element:
-                blob.metadata[metadata_element.tag] = metadata_element.text
+    # Metadata
+    metadata_root_element = blob_element.find('Metadata')
+    if metadata_root_element is not None:
+        blob.metadata = dict()
+        for metadata_element in metadata_root_element:
+            blob.metadata[metadata_element.tag] = metadata_element.text
 
-        # Add blob to list
-        blob_list.append(blob)
+    return blob
 
-    return blob_list
+
+def _convert_xml_to_blob_columns(response):
+    '''
+    Converts a page of a blob listing into BlobColumns, appending the properties 
+    of each blob to the columns as it is read rather than creating a Blob for it.
+    '''
+    if response is None:
+        return None
+
+    body = _ResponseBodyReader(response)
+    if body.is_empty():
+        return None
+
+    columns = BlobColumns()
+    for element in _iterparse_list(body, 'Blobs', columns):
+        if element.tag != 'Blob':
+            continue
+
+        properties_element = element.find('Properties')
+        columns.names.append(element.findtext('Name'))
+        columns.content_lengths.append(int(properties_element.findtext('Content-Length')))
+        columns.last_modified.append(_to_epoch_seconds(properties_element.findtext('Last-Modified')))
+        columns.etags.append(properties_element.findtext('Etag'))
+        columns.blob_tiers.append(_to_shared_str(properties_element.findtext('AccessTier')))
+
+    return columns
 
 
 def _convert_xml_to_blob_name_list(response):
@@ -417,24 +486,44 @@ def _convert_xml_to_blob_name_list(response):
       <NextMarker />
     </EnumerationResults>
     '''
-    if response is None or response.body is None:
+    if response is None:
+        return None
+
+    body = _ResponseBodyReader(response)
+    if body.is_empty():
         return None
 
     blob_list = _list()
-    list_element = ETree.fromstring(response.body)
+    blob_prefixes = []
+    for element in _iterparse_list(body, 'Blobs', blob_list):
+        if element.tag == 'Blob':
+            blob_list.append(element.findtext('Name'))
+        elif element.tag == 'BlobPrefix':
+            blob_prefixes.append(element.findtext('Name'))
+
+    blob_list[0:0] = blob_prefixes
+    return blob_list
 
-    setattr(blob_list, 'next_marker', list_element.findtext('NextMarker'))
 
-    blobs_element = list_element.find('Blobs')
-    blob_prefix_elements = blobs_element.findall('BlobPrefix')
-    if blob_prefix_elements is not None:
-        for blob_prefix_element in blob_prefix_elements:
-            blob_list.append(blob_prefix_element.findtext('Name'))
+def _convert_xml_to_streamed_blob_name_list(response):
+    '''
+    Converts a page of a blob listing into a _StreamedList of the blob names, 
+    read off the connection as it is iterated.
+    '''
+    return _convert_xml_to_streamed_list(response, lambda element: element.findtext('Name'))
 
-    for blob_element in blobs_element.findall('Blob'):
-        blob_list.append(blob_element.findtext('Name'))
 
-    return blob_list
+def _convert_xml_to_streamed_list(response, convert):
+    body = _ResponseBodyReader(response)
+    if body.is_empty():
+        return None
+
+    def iter_blobs(blob_list):
+        for element in _iterparse_list(body, 'Blobs', blob_list):
+            if element.tag == 'Blob':
+                yield convert(element)
+
+    return _StreamedList(response, iter_blobs)
 
 
 def _convert_xml_to_block_list(response):
@@ -5,6 +5,8 @@
 # --------------------------------------------------------------------------
 import threading
 
+from azure.storage.common._deserialization import _get_seekable_stream_writer
+
 
 def _download_blob_chunks(blob_service, container_name, blob_name, snapshot,
                           download_size, block_size, progress, start_range, end_range,
@@ -38,9 +40,7 @@ def _download_blob_chunks(blob_service, container_name, blob_name, snapshot,
     )
 
     if max_connections > 1:
-        import concurrent.futures
-        executor = concurrent.futures.ThreadPoolExecutor(max_connections)
-        list(executor.map(downloader.process_chunk, downloader.get_chunk_offsets()))
+        blob_service._transfer_chunks(downloader.process_chunk, downloader.get_chunk_offsets(), max_connections)
     else:
         for chunk in downloader.get_chunk_offsets():
             downloader.process_chunk(chunk)
@@ -87,16 +87,26 @@ class _BlobChunkDownloader(object):
             yield index
             index += self.chunk_size
 
-    def process_chunk(self, chunk_start):
+    def get_chunk_end(self, chunk_start):
         if chunk_start + self.chunk_size > self.blob_end:
-            chunk_end = self.blob_end
-        else:
-            chunk_end = chunk_start + self.chunk_size
+            return self.blob_end
+        return chunk_start + self.chunk_size
 
-        chunk_data = self._download_chunk(chunk_start, chunk_end).content
+    def process_chunk(self, chunk_start):
+        chunk_end = self.get_chunk_end(chunk_start)
+        self.process_chunk_response(self._download_chunk(chunk_start, chunk_end), chunk_start, chunk_end)
+
+    def process_chunk_response(self, response, chunk_start, chunk_end):
+        # This makes sure that if_match is set so that we can validate 
+        # that subsequent downloads are to an unmodified blob
+        self.if_match = response.properties.etag
+
+        # the chunk is written to the stream as it arrives when possible, in which case no content is returned
+        chunk_data = response.content
         length = chunk_end - chunk_start
         if length > 0:
-            self._write_to_stream(chunk_data, chunk_start)
+            if chunk_data is not None:
+                self._write_to_stream(chunk_data, chunk_start)
             self._update_progress(length)
 
     # should be provided by the subclass
@@ -107,8 +117,12 @@ class _BlobChunkDownloader(object):
     def _write_to_stream(self, chunk_data, chunk_start):
         pass
 
+    # should be provided by the subclass
+    def _get_stream_writer(self, chunk_start):
+        return None
+
     def _download_chunk(self, chunk_start, chunk_end):
-        response = self.blob_service._get_blob(
+        return self.blob_service._get_blob(
             self.container_name,
             self.blob_name,
             snapshot=self.snapshot,
@@ -123,13 +137,10 @@ class _BlobChunkDownloader(object):
             timeout=self.timeout,
             _context=self.operation_context,
             cpk=self.cpk,
+            _stream_writer=self._get_stream_writer(chunk_start),
+            _operation_name='get_blob_to_stream',
         )
 
-        # This makes sure that if_match is set so that we can validate 
-        # that subsequent downloads are to an unmodified blob
-        self.if_match = response.properties.etag
-        return response
-
 
 class _ParallelBlobChunkDownloader(_BlobChunkDownloader):
     def __init__(self, blob_service, container_name, blob_name, snapshot, download_size,
@@ -166,6 +177,16 @@ class _ParallelBlobChunkDownloader(_BlobChunkDownloader):
             self.stream.seek(self.stream_start + (chunk_start - self.start_index))
             self.stream.write(chunk_data)
 
+    def _get_stream_writer(self, chunk_start):
+        chunk_position = self.stream_start + (chunk_start - self.start_index)
+
+        def write(offset, data):
+            with self.stream_lock:
+                self.stream.seek(chunk_position + offset)
+                self.stream.write(data)
+
+        return write
+
 
 class _SequentialBlobChunkDownloader(_BlobChunkDownloader):
     def __init__(self, *args):
@@ -179,3 +200,7 @@ class _SequentialBlobChunkDownloader(_BlobChunkDownloader):
     def _write_to_stream(self, chunk_data, chunk_start):
         # chunk_start is ignored in the case of sequential download since we cannot seek the destination stream
         self.stream.write(chunk_data)
+
+    def _get_stream_writer(self, chunk_start):
+        # the body can only be streamed if a failed attempt can be rewritten from the start of the chunk
+        return _get_seekable_stream_writer(self.stream)
@@ -10,8 +10,6 @@ from json import (
 )
 from os import urandom
 
-from cryptography.hazmat.primitives.padding import PKCS7
-
 from azure.storage.common._encryption import (
     _generate_encryption_data_dict,
     _generate_AES_CBC_cipher,
@@ -45,6 +43,7 @@ def _encrypt_blob(blob, key_encryption_key):
     :return: A tuple of json-formatted string containing the encryption metadata and the encrypted blob data.
     :rtype: (str, bytes)
     '''
+    from cryptography.hazmat.primitives.padding import PKCS7
 
     _validate_not_none('blob', blob)
     _validate_not_none('key_encryption_key', key_encryption_key)
@@ -114,6 +113,7 @@ def _decrypt_blob(require_encryption, key_encryption_key, key_resolver,
     :return: The decrypted blob content.
     :rtype: bytes
     '''
+    from cryptography.hazmat.primitives.padding import PKCS7
     _validate_not_none('response', response)
     content = response.body
     _validate_not_none('content', content)
@@ -176,6 +176,7 @@ def _decrypt_blob(require_encryption, key_encryption_key, key_resolver,
 
 
 def _get_blob_encryptor_and_padder(cek, iv, should_pad):
+    from cryptography.hazmat.primitives.padding import PKCS7
     encryptor = None
     padder = None
 
@@ -0,0 +1,141 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import threading
+from collections import deque
+
+from azure.storage.common.models import _OperationContext
+from ._deserialization import _convert_xml_to_blob_list
+from .models import BlobPrefix
+
+
+class _PartitionedBlobLister(object):
+    '''
+    Lists the blobs of a container with up to max_connections list requests in
+    flight. The namespace is split on the virtual directories the service
+    returns for the delimiter: each BlobPrefix in a page is listed as a
+    partition of its own, while each partition follows its own continuation
+    markers. The service returns every blob under exactly one prefix, so each
+    blob is returned exactly once, though not in name order.
+
+    Partitions are listed depth first, and the workers wait while max_connections
+    pages are buffered, so neither the pending prefixes nor the listed blobs
+    pile up ahead of a slow consumer. Once the generator is closed, or garbage
+    collected after being abandoned, the workers are stopped, and it returns
+    when their requests in flight have been answered.
+    '''
+
+    def __init__(self, blob_service, container_name, prefix, include, delimiter,
+                 results_per_page, timeout, max_connections):
+        self._blob_service = blob_service
+        self._container_name = container_name
+        self._include = include
+        self._delimiter = delimiter
+        self._results_per_page = results_per_page
+        self._timeout = timeout
+        self._max_connections = max_connections
+
+        self._condition = threading.Condition()
+        self._partitions = [(prefix, None, _OperationContext(location_lock=True))]
+        self._pages = deque()
+        self._in_flight = 0
+        self._exception = None
+        self._stopped = False
+
+    def __iter__(self):
+        workers = []
+        for _ in range(self._max_connections):
+            worker = threading.Thread(target=self._work)
+            worker.daemon = True
+            worker.start()
+            workers.append(worker)
+
+        try:
+            while True:
+                with self._condition:
+                    while not self._pages and not self._is_done() and self._exception is None:
+                        self._condition.wait()
+                    if self._exception is not None:
+                        raise self._exception
+                    if not self._pages:
+                        return
+                    blobs = self._pages.popleft()
+                    self._condition.notify_all()
+
+                for blob in blobs:
+                    yield blob
+        finally:
+            with self._condition:
+                self._stopped = True
+                self._condition.notify_all()
+            for worker in workers:
+                worker.join()
+
+    def _is_done(self):
+        # must be called while holding the condition
+        return not self._partitions and self._in_flight == 0
+
+    def _is_idle(self):
+        # must be called while holding the condition
+        return not self._stopped and self._exception is None and not self._is_done() and \
+            (not self._partitions or len(self._pages) >= self._max_connections)
+
+    def _take_partition(self):
+        # must be called while holding the condition
+        if self._stopped or self._exception is not None or self._is_done():
+            self._condition.notify_all()
+            return None
+
+        self._in_flight += 1
+        return self._partitions.pop()
+
+    def _list_partition(self, prefix, marker, operation_context):
+        return self._blob_service._list_blobs(
+            self._container_name, prefix=prefix, marker=marker, max_results=self._results_per_page,
+            include=self._include, delimiter=self._delimiter, timeout=self._timeout,
+            _context=operation_context, _converter=_convert_xml_to_blob_list,
+            _operation_name='list_blobs_in_parallel')
+
+    def _add_page(self, prefix, operation_context, page):
+        # must be called while holding the condition
+        self._in_flight -= 1
+        for item in reversed(page):
+            if isinstance(item, BlobPrefix):
+                self._partitions.append((item.name, None, _OperationContext(location_lock=True)))
+
+        # the rest of this partition is listed before the prefixes it returned
+        if page.next_marker:
+            self._partitions.append((prefix, page.next_marker, operation_context))
+        blobs = [item for item in page if not isinstance(item, BlobPrefix)]
+        if blobs:
+            self._pages.append(blobs)
+        self._condition.notify_all()
+
+    def _add_exception(self, ex):
+        # must be called while holding the condition
+        self._in_flight -= 1
+        if self._exception is None:
+            self._exception = ex
+        self._condition.notify_all()
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while self._is_idle():
+                    self._condition.wait()
+                partition = self._take_partition()
+            if partition is None:
+                return
+
+            prefix, marker, operation_context = partition
+            try:
+                page = self._list_partition(prefix, marker, operation_context)
+            except Exception as ex:
+                with self._condition:
+                    self._add_exception(ex)
+                return
+
+            with self._condition:
+                self._add_page(prefix, operation_context, page)
@@ -3,7 +3,6 @@
 # Licensed under the MIT License. See License.txt in the project root for
 # license information.
 # --------------------------------------------------------------------------
-from xml.sax.saxutils import escape as xml_escape
 from datetime import date
 
 try:
@@ -115,6 +114,8 @@ def _convert_block_list_to_xml(block_id_list):
     if block_id_list is None:
         return ''
 
+    # saxutils imports urllib.request, so it is imported on first use rather than with the package
+    from xml.sax.saxutils import escape as xml_escape
     block_list_element = ETree.Element('BlockList')
 
     # Enabled
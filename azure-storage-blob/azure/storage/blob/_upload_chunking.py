@@ -3,13 +3,21 @@
 # Licensed under the MIT License. See License.txt in the project root for
 # license information.
 # --------------------------------------------------------------------------
-from io import (BytesIO, IOBase, SEEK_CUR, SEEK_END, SEEK_SET, UnsupportedOperation)
+import errno
+import os
+from io import (BufferedRandom, BufferedReader, BytesIO, FileIO, IOBase, SEEK_CUR, SEEK_END, SEEK_SET,
+                UnsupportedOperation)
+from stat import S_ISREG
 from threading import Lock
+from timeit import default_timer
 
 from math import ceil
 
+from azure.storage.common._chunk_sizing import _AdaptiveChunkSize
 from azure.storage.common._common_conversion import _encode_base64
+from azure.storage.common._constants import _ADAPTIVE_CHUNK_MIN_SIZE
 from azure.storage.common._error import _ERROR_VALUE_SHOULD_BE_SEEKABLE_STREAM
+from azure.storage.common._memory_mapping import _MemoryMappedFile
 from azure.storage.common._serialization import (
     url_quote,
     _get_data_bytes_only,
@@ -17,20 +25,44 @@ from azure.storage.common._serialization import (
 )
 from ._deserialization import _parse_base_properties
 from ._constants import (
-    _LARGE_BLOB_UPLOAD_MAX_READ_BUFFER_SIZE
+    _LARGE_BLOB_UPLOAD_MAX_READ_BUFFER_SIZE,
+    _MAX_BLOCK_COUNT,
+    _MAX_BLOCK_SIZE,
+    _MAX_PAGE_RANGE_SIZE,
+    _MAX_SENT_EMPTY_PAGES_SIZE,
+    _PAGE_SIZE,
 )
 from ._encryption import (
     _get_blob_encryptor_and_padder,
 )
 from .models import BlobBlock
 
+# positional reads, which are not available on Windows or Python 2.7
+_pread = getattr(os, 'pread', None)
+_preadv = getattr(os, 'preadv', None)
+# finding the data of sparse files, which is not available on Windows or Python 2.7
+_SEEK_DATA = getattr(os, 'SEEK_DATA', None)
+
+try:
+    # Python 2.7: open returns a file rather than a BufferedReader
+    _RAW_FILE_TYPES = (FileIO, file)
+except NameError:
+    _RAW_FILE_TYPES = (FileIO,)
+
+try:
+    # Python 2.7: the methods of str take buffers, but not memoryviews
+    _buffer = buffer
+except NameError:
+    _buffer = None
+
 
 def _upload_blob_chunks(blob_service, container_name, blob_name,
                         blob_size, block_size, stream, max_connections,
                         progress_callback, validate_content, lease_id, uploader_class,
                         maxsize_condition=None, if_modified_since=None, if_unmodified_since=None, if_match=None,
                         if_none_match=None, timeout=None, cpk=None,
-                        content_encryption_key=None, initialization_vector=None, resource_properties=None):
+                        content_encryption_key=None, initialization_vector=None, resource_properties=None,
+                        chunk_sizer=None):
     encryptor, padder = _get_blob_encryptor_and_padder(content_encryption_key, initialization_vector,
                                                        uploader_class is not _PageBlobChunkUploader)
 
@@ -52,6 +84,7 @@ def _upload_blob_chunks(blob_service, container_name, blob_name,
     )
 
     uploader.maxsize_condition = maxsize_condition
+    uploader.chunk_sizer = chunk_sizer
 
     # Access conditions do not work with parallelism
     if max_connections > 1:
@@ -66,39 +99,10 @@ def _upload_blob_chunks(blob_service, container_name, blob_name,
         progress_callback(0, blob_size)
 
     if max_connections > 1:
-        import concurrent.futures
-        from threading import BoundedSemaphore
-
-        '''
-        Ensures we bound the chunking so we only buffer and submit 'max_connections' amount of work items to the executor.
-        This is necessary as the executor queue will keep accepting submitted work items, which results in buffering all the blocks if
-        the max_connections + 1 ensures the next chunk is already buffered and ready for when the worker thread is available.
-        '''
-        chunk_throttler = BoundedSemaphore(max_connections + 1)
-
-        executor = concurrent.futures.ThreadPoolExecutor(max_connections)
-        futures = []
-        running_futures = []
-
-        # Check for exceptions and fail fast.
-        for chunk in uploader.get_chunk_streams():
-            for f in running_futures:
-                if f.done():
-                    if f.exception():
-                        raise f.exception()
-                    else:
-                        running_futures.remove(f)
-
-            chunk_throttler.acquire()
-            future = executor.submit(uploader.process_chunk, chunk)
-
-            # Calls callback upon completion (even if the callback was added after the Future task is done).
-            future.add_done_callback(lambda x: chunk_throttler.release())
-            futures.append(future)
-            running_futures.append(future)
-
-        # result() will wait until completion and also raise any exceptions that may have been set.
-        range_ids = [f.result() for f in futures]
+        # The executor takes the next chunk from the stream only once one in flight completes, so at most
+        # max_connections + 1 chunks are buffered at once.
+        range_ids = blob_service._transfer_chunks(uploader.process_chunk, uploader.get_chunk_streams(),
+                                                  max_connections)
     else:
         range_ids = [uploader.process_chunk(result) for result in uploader.get_chunk_streams()]
 
@@ -111,7 +115,7 @@ def _upload_blob_chunks(blob_service, container_name, blob_name,
 def _upload_blob_substream_blocks(blob_service, container_name, blob_name,
                                   blob_size, block_size, stream, max_connections,
                                   progress_callback, validate_content, lease_id, uploader_class,
-                                  maxsize_condition=None, if_match=None, timeout=None, cpk=None):
+                                  maxsize_condition=None, if_match=None, timeout=None, cpk=None, chunk_sizer=None):
     uploader = uploader_class(
         blob_service,
         container_name,
@@ -130,6 +134,7 @@ def _upload_blob_substream_blocks(blob_service, container_name, blob_name,
     )
 
     uploader.maxsize_condition = maxsize_condition
+    uploader.chunk_sizer = chunk_sizer
 
     # ETag matching does not work with parallelism as a ranged upload may start
     # before the previous finishes and provides an etag
@@ -139,15 +144,46 @@ def _upload_blob_substream_blocks(blob_service, container_name, blob_name,
         progress_callback(0, blob_size)
 
     if max_connections > 1:
-        import concurrent.futures
-        executor = concurrent.futures.ThreadPoolExecutor(max_connections)
-        range_ids = list(executor.map(uploader.process_substream_block, uploader.get_substream_blocks()))
+        range_ids = blob_service._transfer_chunks(uploader.process_substream_block, uploader.get_substream_blocks(),
+                                                  max_connections)
     else:
         range_ids = [uploader.process_substream_block(result) for result in uploader.get_substream_blocks()]
 
     return range_ids
 
 
+def _get_block_size(blob_size, block_size):
+    '''
+    Returns the size of the blocks to upload a blob of blob_size bytes in:
+    block_size, or the smallest multiple of it which fits the blob in the most
+    blocks a blob may have, up to the largest block the service supports.
+    '''
+    if blob_size is None or blob_size <= block_size * _MAX_BLOCK_COUNT:
+        return block_size
+    multiple = int(ceil(blob_size / (block_size * _MAX_BLOCK_COUNT * 1.0)))
+    return max(block_size, min(block_size * multiple, _MAX_BLOCK_SIZE))
+
+
+def _get_adaptive_block_size(blob_size, block_size):
+    '''
+    Returns the chunk size of an adaptive block blob upload, which starts at
+    block_size and grows up to the largest block the service supports. It does
+    not shrink so far that the blob would need more blocks than it may have.
+    '''
+    min_size = _ADAPTIVE_CHUNK_MIN_SIZE
+    if blob_size is not None:
+        min_size = max(min_size, int(ceil(blob_size / (_MAX_BLOCK_COUNT * 1.0))))
+    return _AdaptiveChunkSize(block_size, _MAX_BLOCK_SIZE, min_size)
+
+
+def _get_adaptive_page_size(page_size):
+    '''
+    Returns the chunk size of an adaptive page blob upload, which starts at
+    page_size and grows up to the most a request may write, in whole pages.
+    '''
+    return _AdaptiveChunkSize(page_size, _MAX_PAGE_RANGE_SIZE, alignment=_PAGE_SIZE)
+
+
 class _BlobChunkUploader(object):
     def __init__(self, blob_service, container_name, blob_name, blob_size,
                  chunk_size, stream, parallel, progress_callback,
@@ -172,45 +208,131 @@ class _BlobChunkUploader(object):
         self.response_properties = None
         self.cpk = cpk
 
+        # an adaptive upload tunes the size of its chunks as they are sent
+        self.chunk_sizer = None
+
+        # chunks are read into reusable buffers, which are sent without being copied
+        self.stream_readinto = getattr(stream, 'readinto', None)
+        self.buffer_lock = Lock()
+        self.free_buffers = []
+        self.chunk_buffers = {}
+
+        # the chunks of a memory-mapped file are views of the mapping, which need neither buffers nor the lock
+        self.stream_view = None
+        if isinstance(stream, _MemoryMappedFile):
+            self.stream_view = stream.get_view()
+            if blob_size is not None:
+                self.stream_view = self.stream_view[:blob_size]
+
     def get_chunk_streams(self):
         index = 0
         while True:
-            data = b''
-            read_size = self.chunk_size
-
-            # Buffer until we either reach the end of the stream or get a whole chunk.
-            while True:
-                if self.blob_size:
-                    read_size = min(self.chunk_size - len(data), self.blob_size - (index + len(data)))
-                temp = self.stream.read(read_size)
-                temp = _get_data_bytes_only('temp', temp)
-                data += temp
-
-                # We have read an empty string and so are at the end
-                # of the buffer or we have read a full chunk.
-                if temp == b'' or len(data) == self.chunk_size:
-                    break
-
-            if len(data) == self.chunk_size:
+            chunk_size = self._get_chunk_size()
+            buffer, data = self._read_chunk(index, chunk_size)
+            length = len(data)
+
+            if length == chunk_size:
                 if self.padder:
                     data = self.padder.update(data)
                 if self.encryptor:
                     data = self.encryptor.update(data)
-                yield index, data
             else:
                 if self.padder:
-                    data = self.padder.update(data) + self.padder.finalize()
+                    data = b''.join([self.padder.update(data), self.padder.finalize()])
                 if self.encryptor:
-                    data = self.encryptor.update(data) + self.encryptor.finalize()
+                    data = b''.join([self.encryptor.update(data), self.encryptor.finalize()])
+
+            # a chunk which is sent from its buffer keeps it until it has been sent
+            if buffer is not None:
+                is_sent_from_buffer = isinstance(data, memoryview) and len(data) > 0
+                if is_sent_from_buffer:
+                    with self.buffer_lock:
+                        self.chunk_buffers[index] = buffer
+                else:
+                    self._release_chunk_buffer(buffer)
+
+            if length == chunk_size:
+                yield index, data
+            else:
                 if len(data) > 0:
                     yield index, data
                 break
             index += len(data)
 
+    def _get_chunk_size(self):
+        return self.chunk_size if self.chunk_sizer is None else self.chunk_sizer.size
+
+    def _record_request(self, length, start_time):
+        # an adaptive upload tunes its chunk size from how long its requests take
+        if self.chunk_sizer is not None:
+            self.chunk_sizer.record(length, default_timer() - start_time)
+
+    def _read_chunk(self, index, chunk_size):
+        if self.stream_view is not None:
+            return None, self.stream_view[index:index + chunk_size]
+
+        buffer = self._get_chunk_buffer(chunk_size)
+        length = self._fill_chunk_buffer(buffer, index, chunk_size)
+        return buffer, memoryview(buffer)[:length]
+
+    def _fill_chunk_buffer(self, buffer, index, chunk_size):
+        '''
+        Reads the next chunk into the buffer, until either the buffer is full or 
+        the end of the stream is reached, and returns its length. The stream reads 
+        straight into the buffer if it can, so short reads are not copied again.
+        '''
+        view = memoryview(buffer)
+        length = 0
+        read_size = chunk_size
+        while length < chunk_size:
+            if self.blob_size:
+                read_size = min(chunk_size - length, self.blob_size - (index + length))
+            else:
+                read_size = chunk_size - length
+
+            count = None
+            if self.stream_readinto is not None:
+                try:
+                    count = self.stream_readinto(view[length:length + read_size])
+                except (NotImplementedError, UnsupportedOperation):
+                    self.stream_readinto = None
+            if self.stream_readinto is None:
+                temp = _get_data_bytes_only('temp', self.stream.read(read_size))
+                count = len(temp)
+                view[length:length + count] = temp
+
+            # We have read an empty string and so are at the end of the stream.
+            if not count:
+                break
+            length += count
+        return length
+
+    def _get_chunk_buffer(self, chunk_size):
+        with self.buffer_lock:
+            while self.free_buffers:
+                buffer = self.free_buffers.pop()
+                # the buffers of smaller chunks are dropped once an adaptive upload grows its chunks
+                if len(buffer) >= chunk_size:
+                    return buffer
+        return bytearray(chunk_size)
+
+    def _release_chunk_buffer(self, buffer):
+        with self.buffer_lock:
+            self.free_buffers.append(buffer)
+
     def process_chunk(self, chunk_data):
         chunk_bytes = chunk_data[1]
         chunk_offset = chunk_data[0]
-        return self._upload_chunk_with_progress(chunk_offset, chunk_bytes)
+        range_id = self._upload_chunk_with_progress(chunk_offset, chunk_bytes)
+        self._release_sent_chunk(chunk_offset)
+        return range_id
+
+    def _release_sent_chunk(self, chunk_offset):
+        # the buffer of a chunk is only filled again once the chunk has been sent
+        with self.buffer_lock:
+            buffer = self.chunk_buffers.pop(chunk_offset, None)
+            if buffer is not None:
+                self.free_buffers.append(buffer)
 
     def _update_progress(self, length):
         if self.progress_callback is not None:
@@ -238,13 +360,14 @@ class _BlobChunkUploader(object):
             if blob_length is None:
                 raise ValueError(_ERROR_VALUE_SHOULD_BE_SEEKABLE_STREAM.format('stream'))
 
-        blocks = int(ceil(blob_length / (self.chunk_size * 1.0)))
-        last_block_size = self.chunk_size if blob_length % self.chunk_size == 0 else blob_length % self.chunk_size
-
-        for i in range(blocks):
-            yield ('BlockId{}'.format("%05d" % i),
-                   _SubStream(self.stream, i * self.chunk_size, last_block_size if i == blocks - 1 else self.chunk_size,
-                              lock))
+        # the size of each block is taken as it is created, as an adaptive upload may have changed it
+        index = 0
+        offset = 0
+        while offset < blob_length:
+            block_size = min(self._get_chunk_size(), blob_length - offset)
+            yield ('BlockId{}'.format("%05d" % index), _SubStream(self.stream, offset, block_size, lock))
+            index += 1
+            offset += block_size
 
     def process_substream_block(self, block_data):
         return self._upload_substream_block_with_progress(block_data[0], block_data[1])
@@ -261,6 +384,7 @@ class _BlobChunkUploader(object):
 class _BlockBlobChunkUploader(_BlobChunkUploader):
     def _upload_chunk(self, chunk_offset, chunk_data):
         block_id = url_quote(_encode_base64('{0:032d}'.format(chunk_offset)))
+        start_time = default_timer()
         self.blob_service._put_block(
             self.container_name,
             self.blob_name,
@@ -270,11 +394,14 @@ class _BlockBlobChunkUploader(_BlobChunkUploader):
             lease_id=self.lease_id,
             timeout=self.timeout,
             cpk=self.cpk,
+            _operation_name='create_blob_from_stream',
         )
+        self._record_request(len(chunk_data), start_time)
         return BlobBlock(block_id)
 
     def _upload_substream_block(self, block_id, block_stream):
         try:
+            start_time = default_timer()
             self.blob_service._put_block(
                 self.container_name,
                 self.blob_name,
@@ -284,37 +411,127 @@ class _BlockBlobChunkUploader(_BlobChunkUploader):
                 lease_id=self.lease_id,
                 timeout=self.timeout,
                 cpk=self.cpk,
+                _operation_name='create_blob_from_stream',
             )
+            self._record_request(len(block_stream), start_time)
         finally:
             block_stream.close()
         return BlobBlock(block_id)
 
 
 class _PageBlobChunkUploader(_BlobChunkUploader):
-    def _is_chunk_empty(self, chunk_data):
-        # read until non-zero byte is encountered
-        # if reached the end without returning, then chunk_data is all 0's
-        for each_byte in chunk_data:
-            if each_byte != 0 and each_byte != b'\x00':
-                return False
-        return True
+    def __init__(self, *args):
+        super(_PageBlobChunkUploader, self).__init__(*args)
+        self.empty_chunk = None
+        self.hole_offsets = set()
+
+        # the holes of a sparse file are skipped without being read, as the pages of a new page blob are empty.
+        # An encrypted hole is not empty, so it is read and uploaded.
+        self.stream_fileno = None
+        if _SEEK_DATA is not None and self.encryptor is None:
+            self.stream_fileno = _get_regular_file_descriptor(self.stream)
+            self.stream_offset = self.stream.tell() if self.stream_fileno is not None else None
+
+    def _get_empty_chunk(self):
+        # allocated once, as every chunk is compared with it, at the largest size an adaptive upload's chunks grow to
+        if self.empty_chunk is None:
+            size = self.chunk_size if self.chunk_sizer is None else self.chunk_sizer.max_size
+            self.empty_chunk = b'\x00' * size
+        return self.empty_chunk
+
+    def _read_chunk(self, index, chunk_size):
+        length = min(chunk_size, self.blob_size - index)
+        if self.stream_fileno is not None and length > 0:
+            data_offset = _get_next_data_offset(self.stream_fileno, self.stream_offset + index)
+            if data_offset is None or data_offset >= self.stream_offset + index + length:
+                if self.stream_view is None:
+                    # the stream is read in order, so it moves past the hole as if it had been read
+                    self.stream.seek(length, SEEK_CUR)
+                self.hole_offsets.add(index)
+                return None, memoryview(self._get_empty_chunk())[:length]
+        return super(_PageBlobChunkUploader, self)._read_chunk(index, chunk_size)
+
+    def _get_empty_pages(self, length):
+        # the zeros are compared without being copied
+        if _buffer is not None:
+            return _buffer(self._get_empty_chunk(), 0, length)
+        return memoryview(self._get_empty_chunk())[:length]
+
+    def _get_page_ranges(self, chunk_data):
+        '''
+        Returns the (start, end) offsets of the runs of pages in the chunk which
+        are not all zeros, so that the empty pages between them are skipped. Runs
+        separated by less than _MAX_SENT_EMPTY_PAGES_SIZE of empty pages are
+        sent as one, as another request would cost more than the zeros.
+        '''
+        empty_chunk = self._get_empty_chunk()
+        if _buffer is not None and isinstance(chunk_data, memoryview):
+            chunk_data = chunk_data.tobytes()
+        if empty_chunk.startswith(chunk_data):
+            return []
+
+        # the chunk is copied once it has data, so that it can be searched for empty pages
+        data = chunk_data.tobytes() if isinstance(chunk_data, memoryview) else bytes(chunk_data)
+        ranges = []
+        start = self._skip_empty_pages(data, 0)
+        while start < len(data):
+            end = self._find_empty_page(data, start)
+            if ranges and start - ranges[-1][1] < _MAX_SENT_EMPTY_PAGES_SIZE:
+                ranges[-1] = (ranges[-1][0], end)
+            else:
+                ranges.append((start, end))
+            start = self._skip_empty_pages(data, end)
+        return ranges
+
+    def _skip_empty_pages(self, data, position):
+        # the empty pages are skipped in steps which double while they are empty, and halve when they are not
+        max_step = len(self._get_empty_chunk())
+        step = _PAGE_SIZE
+        while position < len(data):
+            if data.startswith(self._get_empty_pages(step), position):
+                position += step
+                step = min(step * 2, max_step)
+            elif step > _PAGE_SIZE:
+                step //= 2
+            else:
+                break
+        return min(position, len(data))
+
+    def _find_empty_page(self, data, position):
+        empty_page = self._get_empty_pages(_PAGE_SIZE)
+        while True:
+            index = data.find(empty_page, position)
+            if index == -1:
+                return len(data)
+            # the zeros found may straddle two pages
+            page = index + (-index % _PAGE_SIZE)
+            if data.startswith(empty_page, page):
+                return page
+            position = page + 1
 
     def _upload_chunk(self, chunk_start, chunk_data):
+        if chunk_start in self.hole_offsets:
+            # a hole of a sparse file, which is known to be empty without comparing it
+            self.hole_offsets.discard(chunk_start)
+            return
+
         # avoid uploading the empty pages
-        if not self._is_chunk_empty(chunk_data):
-            chunk_end = chunk_start + len(chunk_data) - 1
+        for start, end in self._get_page_ranges(chunk_data):
+            start_time = default_timer()
             resp = self.blob_service._update_page(
                 self.container_name,
                 self.blob_name,
-                chunk_data,
-                chunk_start,
-                chunk_end,
+                chunk_data[start:end],
+                chunk_start + start,
+                chunk_start + end - 1,
                 validate_content=self.validate_content,
                 lease_id=self.lease_id,
                 if_match=self.if_match,
                 timeout=self.timeout,
                 cpk=self.cpk,
+                _operation_name='create_blob_from_stream',
             )
+            self._record_request(end - start, start_time)
 
             if not self.parallel:
                 self.if_match = resp.etag
@@ -357,6 +574,39 @@ class _AppendBlobChunkUploader(_BlobChunkUploader):
         self.set_response_properties(resp)
 
 
+def _get_regular_file_descriptor(stream):
+    '''
+    Returns the descriptor of the regular file the stream reads, or None if it
+    does not read one. Only streams which read the bytes of the file as they are
+    qualify: a stream which decodes its file, such as a GzipFile, reports the
+    descriptor of the file it decodes, which does not hold what it reads.
+    '''
+    raw = stream.raw if isinstance(stream, (BufferedReader, BufferedRandom)) else stream
+    if not isinstance(raw, _RAW_FILE_TYPES + (_MemoryMappedFile,)):
+        return None
+
+    try:
+        fileno = stream.fileno()
+        return fileno if S_ISREG(os.fstat(fileno).st_mode) else None
+    except (AttributeError, EnvironmentError, ValueError):
+        return None
+
+
+def _get_next_data_offset(fileno, offset):
+    '''
+    Returns the offset of the first byte at or after offset which is not in a
+    hole of the sparse file, None if the rest of the file is a hole, or offset
+    itself if the file system cannot tell. The position of the file is kept.
+    '''
+    position = os.lseek(fileno, 0, SEEK_CUR)
+    try:
+        return os.lseek(fileno, offset, _SEEK_DATA)
+    except EnvironmentError as ex:
+        return None if ex.errno == errno.ENXIO else offset
+    finally:
+        os.lseek(fileno, position, SEEK_SET)
+
+
 class _SubStream(IOBase):
     def __init__(self, wrapped_stream, stream_begin_index, length, lockObj):
         # Python 2.7: file-like objects created with open() typically support seek(), but are not
@@ -370,6 +620,8 @@ class _SubStream(IOBase):
 
         self._lock = lockObj
         self._wrapped_stream = wrapped_stream
+        # a regular file is read at the position of the substream, so neither the lock nor seeking is needed
+        self._fileno = _get_regular_file_descriptor(wrapped_stream) if _pread is not None else None
         self._position = 0
         self._stream_begin_index = stream_begin_index
         self._length = length
@@ -423,8 +675,11 @@ class _SubStream(IOBase):
                 # or read in just enough data for the current block/sub stream
                 current_max_buffer_size = min(self._max_buffer_size, self._length - self._position)
 
+                if self._fileno is not None:
+                    buffer_from_stream = self._read_at(self._stream_begin_index + self._position,
+                                                       current_max_buffer_size)
                 # lock is only defined if max_connections > 1 (parallel uploads)
-                if self._lock:
+                elif self._lock:
                     with self._lock:
                         # reposition the underlying stream to match the start of the data to read
                         absolute_position = self._stream_begin_index + self._position
@@ -450,11 +705,60 @@ class _SubStream(IOBase):
 
         return read_buffer
 
+    def _read_at(self, position, count):
+        chunks = []
+        while count > 0:
+            chunk = _pread(self._fileno, count, position)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            position += len(chunk)
+            count -= len(chunk)
+        return b''.join(chunks)
+
+    def _read_into_at(self, view, position):
+        length = 0
+        while length < len(view):
+            if _preadv is not None:
+                count = _preadv(self._fileno, [view[length:]], position + length)
+            else:
+                chunk = _pread(self._fileno, len(view) - length, position + length)
+                count = len(chunk)
+                view[length:length + count] = chunk
+            if not count:
+                break
+            length += count
+        return length
+
     def readable(self):
         return True
 
     def readinto(self, b):
-        raise UnsupportedOperation
+        if self.closed:
+            raise ValueError("Stream is closed.")
+
+        view = memoryview(b)
+        n = min(len(view), self._length - self._position)
+        if n <= 0 or self._buffer.closed:
+            return 0
+
+        # take what is left in the read buffer first
+        bytes_read = self._buffer.readinto(view[:n])
+        self._position += bytes_read
+
+        if bytes_read < n:
+            if self._fileno is not None:
+                # the rest is read straight into the caller's buffer, bypassing the read buffer
+                count = self._read_into_at(view[bytes_read:n], self._stream_begin_index + self._position)
+                self._position += count
+            else:
+                # read moves the position itself
+                data = self.read(n - bytes_read)
+                count = len(data)
+                view[bytes_read:bytes_read + count] = data
+            bytes_read += count
+
+        return bytes_read
 
     def seek(self, offset, whence=0):
         if whence is SEEK_SET:
@@ -0,0 +1,54 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+from azure.storage.common.aio._concurrency import _run_concurrently
+
+from .._download_chunking import (
+    _ParallelBlobChunkDownloader,
+    _SequentialBlobChunkDownloader,
+)
+
+
+async def _download_blob_chunks(blob_service, container_name, blob_name, snapshot,
+                                download_size, block_size, progress, start_range, end_range,
+                                stream, max_connections, progress_callback, validate_content,
+                                lease_id, if_modified_since, if_unmodified_since, if_match,
+                                if_none_match, timeout, operation_context, cpk):
+
+    downloader_class = _ParallelBlobChunkDownloader if max_connections > 1 else _SequentialBlobChunkDownloader
+
+    downloader = downloader_class(
+        blob_service,
+        container_name,
+        blob_name,
+        snapshot,
+        download_size,
+        block_size,
+        progress,
+        start_range,
+        end_range,
+        stream,
+        progress_callback,
+        validate_content,
+        lease_id,
+        if_modified_since,
+        if_unmodified_since,
+        if_match,
+        if_none_match,
+        timeout,
+        operation_context,
+        cpk,
+    )
+
+    async def process_chunk(chunk_start):
+        chunk_end = downloader.get_chunk_end(chunk_start)
+        response = await downloader._download_chunk(chunk_start, chunk_end)
+        downloader.process_chunk_response(response, chunk_start, chunk_end)
+
+    if max_connections > 1:
+        await _run_concurrently(process_chunk, downloader.get_chunk_offsets(), max_connections)
+    else:
+        for chunk in downloader.get_chunk_offsets():
+            await process_chunk(chunk)
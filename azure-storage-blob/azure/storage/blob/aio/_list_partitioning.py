@@ -0,0 +1,66 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import asyncio
+
+from .._list_partitioning import _PartitionedBlobLister
+
+
+class _AsyncPartitionedBlobLister(_PartitionedBlobLister):
+    '''
+    The asyncio variant of _PartitionedBlobLister, whose workers are tasks on the
+    event loop. Once the asynchronous generator is closed, or finalized by the
+    event loop after being abandoned, the workers are cancelled.
+    '''
+
+    def __init__(self, *args):
+        super(_AsyncPartitionedBlobLister, self).__init__(*args)
+        self._condition = asyncio.Condition()
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        workers = [asyncio.ensure_future(self._work()) for _ in range(self._max_connections)]
+
+        try:
+            while True:
+                async with self._condition:
+                    while not self._pages and not self._is_done() and self._exception is None:
+                        await self._condition.wait()
+                    if self._exception is not None:
+                        raise self._exception
+                    if not self._pages:
+                        return
+                    blobs = self._pages.popleft()
+                    self._condition.notify_all()
+
+                for blob in blobs:
+                    yield blob
+        finally:
+            self._stopped = True
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _work(self):
+        while True:
+            async with self._condition:
+                while self._is_idle():
+                    await self._condition.wait()
+                partition = self._take_partition()
+            if partition is None:
+                return
+
+            prefix, marker, operation_context = partition
+            try:
+                page = await self._list_partition(prefix, marker, operation_context)
+            except Exception as ex:
+                async with self._condition:
+                    self._add_exception(ex)
+                return
+
+            async with self._condition:
+                self._add_page(prefix, operation_context, page)
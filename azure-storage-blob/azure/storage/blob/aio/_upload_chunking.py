@@ -0,0 +1,74 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+from timeit import default_timer
+
+from azure.storage.common._common_conversion import _encode_base64
+from azure.storage.common._serialization import url_quote
+from azure.storage.common.aio._concurrency import _run_concurrently
+
+from .._encryption import _get_blob_encryptor_and_padder
+from .._upload_chunking import _BlockBlobChunkUploader
+from ..models import BlobBlock
+
+
+async def _upload_blob_chunks(blob_service, container_name, blob_name,
+                              blob_size, block_size, stream, max_connections,
+                              progress_callback, validate_content, lease_id,
+                              timeout=None, cpk=None, content_encryption_key=None, initialization_vector=None,
+                              chunk_sizer=None):
+    encryptor, padder = _get_blob_encryptor_and_padder(content_encryption_key, initialization_vector, True)
+
+    uploader = _AsyncBlockBlobChunkUploader(
+        blob_service,
+        container_name,
+        blob_name,
+        blob_size,
+        block_size,
+        stream,
+        max_connections > 1,
+        progress_callback,
+        validate_content,
+        lease_id,
+        timeout,
+        encryptor,
+        padder,
+        cpk,
+    )
+    uploader.chunk_sizer = chunk_sizer
+
+    if progress_callback is not None:
+        progress_callback(0, blob_size)
+
+    if max_connections > 1:
+        return await _run_concurrently(uploader.process_chunk, uploader.get_chunk_streams(), max_connections)
+
+    return [await uploader.process_chunk(chunk) for chunk in uploader.get_chunk_streams()]
+
+
+class _AsyncBlockBlobChunkUploader(_BlockBlobChunkUploader):
+    async def process_chunk(self, chunk_data):
+        chunk_offset, chunk_bytes = chunk_data
+        block = await self._upload_chunk(chunk_offset, chunk_bytes)
+        self._update_progress(len(chunk_bytes))
+        self._release_sent_chunk(chunk_offset)
+        return block
+
+    async def _upload_chunk(self, chunk_offset, chunk_data):
+        block_id = url_quote(_encode_base64('{0:032d}'.format(chunk_offset)))
+        start_time = default_timer()
+        await self.blob_service._put_block(
+            self.container_name,
+            self.blob_name,
+            chunk_data,
+            block_id,
+            validate_content=self.validate_content,
+            lease_id=self.lease_id,
+            timeout=self.timeout,
+            cpk=self.cpk,
+            _operation_name='create_blob_from_stream',
+        )
+        self._record_request(len(chunk_data), start_time)
+        return BlobBlock(block_id)
@@ -0,0 +1,576 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import sys
+from copy import deepcopy
+from io import BytesIO
+
+from azure.common import AzureHttpError
+
+from azure.storage.common._deserialization import (
+    _get_seekable_stream_writer,
+    _parse_length_from_content_range,
+)
+from azure.storage.common._error import (
+    _dont_fail_not_exist,
+    _dont_fail_on_exist,
+    _validate_not_none,
+    _ERROR_PARALLEL_NOT_SEEKABLE,
+)
+from azure.storage.common.aio import (
+    AsyncListGenerator,
+    AsyncStorageClient,
+)
+from azure.storage.common.models import _OperationContext
+from .._deserialization import (
+    _convert_xml_to_blob_columns,
+    _convert_xml_to_blob_list,
+    _convert_xml_to_blob_name_list,
+    _parse_blob,
+    _parse_container,
+)
+from ..baseblobservice import (
+    BaseBlobService,
+    _CONDITION_NOT_MET_ERROR_CODE,
+    _CONTAINER_ALREADY_EXISTS_ERROR_CODE,
+    _CONTAINER_NOT_FOUND_ERROR_CODE,
+)
+from ..models import BlobColumns
+from ._download_chunking import _download_blob_chunks
+from ._list_partitioning import _AsyncPartitionedBlobLister
+
+
+class AsyncBaseBlobService(AsyncStorageClient, BaseBlobService):
+    '''
+    The asyncio variant of :class:`~azure.storage.blob.baseblobservice.BaseBlobService`.
+    It is created with the same arguments and exposes the same operations, but
+    every operation is a coroutine and the list operations return an
+    :class:`~azure.storage.common.aio.AsyncListGenerator` to be iterated with
+    ``async for``. Chunked downloads run their ranged gets concurrently on the
+    event loop instead of in a thread pool.
+
+    Requests are sent over an aiohttp session, so the aiohttp package must be
+    installed. Await close() or use the service as an async context manager to
+    release it.
+    '''
+
+    def _perform_request(self, request, *args, **kwargs):
+        if self.properties_cache is None or request.method in ('GET', 'HEAD'):
+            return AsyncStorageClient._perform_request(self, request, *args, **kwargs)
+
+        # The path is taken before the request is sent, which encodes it
+        return self._perform_write_request_async(
+            request.path, AsyncStorageClient._perform_request(self, request, *args, **kwargs))
+
+    async def _perform_write_request_async(self, path, coroutine):
+        try:
+            return await coroutine
+        finally:
+            self._invalidate_cached_properties(path)
+
+    async def _get_cached_properties(self, key, request, parser, parser_args, expected_errors=None,
+                                     _operation_name=None):
+        '''
+        The coroutine variant of :meth:`BaseBlobService._get_cached_properties`, 
+        which the inherited get_container_properties and get_blob_properties 
+        return to be awaited.
+        '''
+        cache = self.properties_cache
+        entry, generation = cache._lookup(key)
+        if entry is not None and entry.is_fresh():
+            return deepcopy(entry.value)
+
+        revalidating = entry is not None and key[1] is not None
+        if revalidating:
+            request.headers['If-None-Match'] = entry.etag
+            expected_errors = (expected_errors or []) + [_CONDITION_NOT_MET_ERROR_CODE]
+
+        try:
+            value = await self._perform_request(request, parser, parser_args, expected_errors=expected_errors,
+                                                operation_name=_operation_name)
+        except AzureHttpError as ex:
+            if not revalidating or ex.status_code != 304:
+                raise
+            cache._renew(key, entry, generation)
+            return deepcopy(entry.value)
+
+        cache._store(key, value, value.properties.etag, generation)
+        return deepcopy(value)
+
+    async def list_containers(self, prefix=None, num_results=None, include_metadata=False,
+                              marker=None, timeout=None, prefetch_pages=0):
+        '''
+        Returns an asynchronous generator to list the containers under the
+        specified account. See :meth:`BaseBlobService.list_containers`.
+
+        :rtype: :class:`~azure.storage.common.aio.AsyncListGenerator`
+        '''
+        include = 'metadata' if include_metadata else None
+        operation_context = _OperationContext(location_lock=True)
+        kwargs = {'prefix': prefix, 'marker': marker, 'max_results': num_results,
+                  'include': include, 'timeout': timeout, '_context': operation_context,
+                  '_operation_name': 'list_containers'}
+        resp = await self._list_containers(**kwargs)
+
+        return AsyncListGenerator(resp, self._list_containers, (), kwargs, prefetch_pages)
+
+    async def create_container(self, container_name, metadata=None,
+                               public_access=None, fail_on_exist=False, timeout=None):
+        '''
+        Creates a new container under the specified account. See
+        :meth:`BaseBlobService.create_container`.
+
+        :return: True if container is created, False if container already exists.
+        :rtype: bool
+        '''
+        request = self._get_create_container_http_request(container_name, metadata, public_access, timeout)
+
+        if not fail_on_exist:
+            try:
+                await self._perform_request(request, expected_errors=[_CONTAINER_ALREADY_EXISTS_ERROR_CODE],
+                                            operation_name='create_container')
+                return True
+            except AzureHttpError as ex:
+                _dont_fail_on_exist(ex)
+                return False
+        else:
+            await self._perform_request(request, operation_name='create_container')
+            return True
+
+    async def delete_container(self, container_name, fail_not_exist=False,
+                               lease_id=None, if_modified_since=None,
+                               if_unmodified_since=None, timeout=None):
+        '''
+        Marks the specified container for deletion. See
+        :meth:`BaseBlobService.delete_container`.
+
+        :return: True if container is deleted, False container doesn't exist.
+        :rtype: bool
+        '''
+        request = self._get_delete_container_http_request(container_name, lease_id, if_modified_since,
+                                                          if_unmodified_since, timeout)
+
+        if not fail_not_exist:
+            try:
+                await self._perform_request(request, expected_errors=[_CONTAINER_NOT_FOUND_ERROR_CODE],
+                                            operation_name='delete_container')
+                return True
+            except AzureHttpError as ex:
+                _dont_fail_not_exist(ex)
+                return False
+        else:
+            await self._perform_request(request, operation_name='delete_container')
+            return True
+
+    async def get_container_metadata(self, container_name, lease_id=None, timeout=None):
+        '''
+        Returns all user-defined metadata for the specified container. See
+        :meth:`BaseBlobService.get_container_metadata`.
+
+        :rtype: dict(str, str)
+        '''
+        if self.properties_cache is not None and lease_id is None:
+            # the metadata is returned along with the cached properties
+            return (await self.get_container_properties(container_name, timeout=timeout)).metadata
+        return await BaseBlobService.get_container_metadata(self, container_name, lease_id, timeout)
+
+    async def list_blobs(self, container_name, prefix=None, num_results=None, include=None,
+                         delimiter=None, marker=None, timeout=None, prefetch_pages=0):
+        '''
+        Returns an asynchronous generator to list the blobs under the specified
+        container. See :meth:`BaseBlobService.list_blobs`.
+
+        :rtype: :class:`~azure.storage.common.aio.AsyncListGenerator`
+        '''
+        operation_context = _OperationContext(location_lock=True)
+        args = (container_name,)
+        kwargs = {'prefix': prefix, 'marker': marker, 'max_results': num_results,
+                  'include': include, 'delimiter': delimiter, 'timeout': timeout,
+                  '_context': operation_context,
+                  '_converter': _convert_xml_to_blob_list,
+                  '_operation_name': 'list_blobs'}
+        resp = await self._list_blobs(*args, **kwargs)
+
+        return AsyncListGenerator(resp, self._list_blobs, args, kwargs, prefetch_pages)
+
+    async def list_blob_names(self, container_name, prefix=None, num_results=None,
+                              include=None, delimiter=None, marker=None,
+                              timeout=None, prefetch_pages=0):
+        '''
+        Returns an asynchronous generator to list the blob names under the
+        specified container. See :meth:`BaseBlobService.list_blob_names`.
+
+        :rtype: :class:`~azure.storage.common.aio.AsyncListGenerator`
+        '''
+        operation_context = _OperationContext(location_lock=True)
+        args = (container_name,)
+        kwargs = {'prefix': prefix, 'marker': marker, 'max_results': num_results,
+                  'include': include, 'delimiter': delimiter, 'timeout': timeout,
+                  '_context': operation_context,
+                  '_converter': _convert_xml_to_blob_name_list,
+                  '_operation_name': 'list_blob_names'}
+        resp = await self._list_blobs(*args, **kwargs)
+
+        return AsyncListGenerator(resp, self._list_blobs, args, kwargs, prefetch_pages)
+
+    async def list_blobs_in_parallel(self, container_name, prefix=None, include=None, delimiter='/',
+                                     max_connections=8, results_per_page=None, timeout=None):
+        '''
+        Returns an asynchronous generator to list the blobs under the specified
+        container, with up to max_connections list requests in flight at a time.
+        See :meth:`BaseBlobService.list_blobs_in_parallel`.
+
+        :rtype: AsyncIterator[~azure.storage.blob.models.Blob]
+        '''
+        _validate_not_none('container_name', container_name)
+        _validate_not_none('delimiter', delimiter)
+        if max_connections < 1:
+            raise ValueError('max_connections must be at least 1.')
+
+        return _AsyncPartitionedBlobLister(self, container_name, prefix, include, delimiter,
+                                           results_per_page, timeout, max_connections)
+
+    async def list_blob_columns(self, container_name, prefix=None, num_results=None, marker=None, timeout=None):
+        '''
+        Lists the blobs under the specified container as columns of their names,
+        sizes, last modified times, ETags and access tiers. See
+        :meth:`BaseBlobService.list_blob_columns`.
+
+        :rtype: :class:`~azure.storage.blob.models.BlobColumns`
+        '''
+        _validate_not_none('container_name', container_name)
+        operation_context = _OperationContext(location_lock=True)
+        columns = BlobColumns()
+        while True:
+            page = await self._list_blobs(container_name, prefix=prefix, marker=marker,
+                                          max_results=num_results - len(columns) if num_results else None,
+                                          timeout=timeout, _context=operation_context,
+                                          _converter=_convert_xml_to_blob_columns,
+                                          _operation_name='list_blob_columns')
+            columns._extend(page)
+            marker = page.next_marker
+            if not marker or (num_results and len(columns) >= num_results):
+                break
+
+        columns._finish()
+        return columns
+
+    async def exists(self, container_name, blob_name=None, snapshot=None, timeout=None):
+        '''
+        Returns a boolean indicating whether the container exists (if blob_name
+        is None), or otherwise a boolean indicating whether the blob exists.
+        See :meth:`BaseBlobService.exists`.
+
+        :rtype: bool
+        '''
+        request, expected_errors = self._get_exists_http_request(container_name, blob_name, snapshot, timeout)
+        try:
+            if self.properties_cache is None:
+                await self._perform_request(request, expected_errors=expected_errors, operation_name='exists')
+            elif blob_name is None:
+                await self._get_cached_properties((container_name, None, None), request, _parse_container,
+                                                  [container_name], expected_errors,
+                                                  _operation_name='exists')
+            else:
+                await self._get_cached_properties((container_name, blob_name, snapshot), request, _parse_blob,
+                                                  [blob_name, snapshot], expected_errors,
+                                                  _operation_name='exists')
+
+            return True
+        except AzureHttpError as ex:
+            _dont_fail_not_exist(ex)
+            return False
+
+    async def get_blob_metadata(
+            self, container_name, blob_name, snapshot=None, lease_id=None,
+            if_modified_since=None, if_unmodified_since=None, if_match=None,
+            if_none_match=None, timeout=None, cpk=None):
+        '''
+        Returns all user-defined metadata for the specified blob or snapshot.
+        See :meth:`BaseBlobService.get_blob_metadata`.
+
+        :rtype: dict(str, str)
+        '''
+        if self.properties_cache is not None and \
+                not any((lease_id, if_modified_since, if_unmodified_since, if_match, if_none_match, cpk)):
+            # the metadata is returned along with the cached properties
+            return (await self.get_blob_properties(container_name, blob_name, snapshot, timeout=timeout)).metadata
+        return await BaseBlobService.get_blob_metadata(self, container_name, blob_name, snapshot, lease_id,
+                                                       if_modified_since, if_unmodified_since, if_match,
+                                                       if_none_match, timeout, cpk)
+
+    async def get_blob_to_path(
+            self, container_name, blob_name, file_path, open_mode='wb',
+            snapshot=None, start_range=None, end_range=None,
+            validate_content=False, progress_callback=None,
+            max_connections=2, lease_id=None, if_modified_since=None,
+            if_unmodified_since=None, if_match=None, if_none_match=None, timeout=None, cpk=None):
+        '''
+        Downloads a blob to a file path, with automatic chunking and progress
+        notifications. See :meth:`BaseBlobService.get_blob_to_path`.
+
+        :rtype: :class:`~azure.storage.blob.models.Blob`
+        '''
+        _validate_not_none('container_name', container_name)
+        _validate_not_none('blob_name', blob_name)
+        _validate_not_none('file_path', file_path)
+        _validate_not_none('open_mode', open_mode)
+
+        if max_connections > 1 and 'a' in open_mode:
+            raise ValueError(_ERROR_PARALLEL_NOT_SEEKABLE)
+
+        with open(file_path, open_mode) as stream:
+            blob = await self.get_blob_to_stream(
+                container_name,
+                blob_name,
+                stream,
+                snapshot,
+                start_range,
+                end_range,
+                validate_content,
+                progress_callback,
+                max_connections,
+                lease_id,
+                if_modified_since,
+                if_unmodified_since,
+                if_match,
+                if_none_match,
+                timeout=timeout,
+                cpk=cpk)
+
+        return blob
+
+    async def get_blob_to_stream(
+            self, container_name, blob_name, stream, snapshot=None,
+            start_range=None, end_range=None, validate_content=False,
+            progress_callback=None, max_connections=2, lease_id=None,
+            if_modified_since=None, if_unmodified_since=None, if_match=None,
+            if_none_match=None, timeout=None, cpk=None):
+        '''
+        Downloads a blob to a stream, with automatic chunking and progress
+        notifications. See :meth:`BaseBlobService.get_blob_to_stream`.
+
+        Up to max_connections ranges are downloaded at the same time. Writes to
+        the stream are made from the event loop and must not block for long.
+
+        :rtype: :class:`~azure.storage.blob.models.Blob`
+        '''
+        _validate_not_none('container_name', container_name)
+        _validate_not_none('blob_name', blob_name)
+        _validate_not_none('stream', stream)
+
+        if end_range is not None:
+            _validate_not_none("start_range", start_range)
+
+        # the stream must be seekable if parallel download is required
+        if max_connections > 1:
+            if sys.version_info >= (3,) and not stream.seekable():
+                raise ValueError(_ERROR_PARALLEL_NOT_SEEKABLE)
+
+            try:
+                stream.seek(stream.tell())
+            except (NotImplementedError, AttributeError):
+                raise ValueError(_ERROR_PARALLEL_NOT_SEEKABLE)
+
+        # The service only provides transactional MD5s for chunks under 4MB.
+        # If validate_content is on, get only self.MAX_CHUNK_GET_SIZE for the first
+        # chunk so a transactional MD5 can be retrieved.
+        first_get_size = self.MAX_SINGLE_GET_SIZE if not validate_content else self.MAX_CHUNK_GET_SIZE
+
+        initial_request_start = start_range if start_range is not None else 0
+
+        if end_range is not None and end_range - start_range < first_get_size:
+            initial_request_end = end_range
+        else:
+            initial_request_end = initial_request_start + first_get_size - 1
+
+        # Send a context object to make sure we always retry to the initial location
+        operation_context = _OperationContext(location_lock=True)
+
+        # If the stream is seekable, the first download is written to it as it arrives
+        stream_writer = _get_seekable_stream_writer(stream)
+        try:
+            blob = await self._get_blob(container_name,
+                                        blob_name,
+                                        snapshot,
+                                        start_range=initial_request_start,
+                                        end_range=initial_request_end,
+                                        validate_content=validate_content,
+                                        lease_id=lease_id,
+                                        if_modified_since=if_modified_since,
+                                        if_unmodified_since=if_unmodified_since,
+                                        if_match=if_match,
+                                        if_none_match=if_none_match,
+                                        timeout=timeout,
+                                        _context=operation_context,
+                                        cpk=cpk,
+                                        _stream_writer=stream_writer,
+                                        _operation_name='get_blob_to_stream')
+
+            # Parse the total blob size and adjust the download size if ranges
+            # were specified
+            blob_size = _parse_length_from_content_range(blob.properties.content_range)
+            if end_range is not None:
+                # Use the end_range unless it is over the end of the blob
+                download_size = min(blob_size, end_range - start_range + 1)
+            elif start_range is not None:
+                download_size = blob_size - start_range
+            else:
+                download_size = blob_size
+        except AzureHttpError as ex:
+            if start_range is None and ex.status_code == 416:
+                # Get range will fail on an empty blob. If the user did not
+                # request a range, do a regular get request in order to get
+                # any properties.
+                blob = await self._get_blob(container_name,
+                                            blob_name,
+                                            snapshot,
+                                            validate_content=validate_content,
+                                            lease_id=lease_id,
+                                            if_modified_since=if_modified_since,
+                                            if_unmodified_since=if_unmodified_since,
+                                            if_match=if_match,
+                                            if_none_match=if_none_match,
+                                            timeout=timeout,
+                                            _context=operation_context,
+                                            cpk=cpk,
+                                            _stream_writer=stream_writer,
+                                            _operation_name='get_blob_to_stream')
+
+                # Set the download size to empty
+                download_size = 0
+            else:
+                raise ex
+
+        # Mark the first progress chunk. If the blob is small or this is a single
+        # shot download, this is the only call
+        if progress_callback:
+            progress_callback(blob.properties.content_length, download_size)
+
+        # Write the content to the user stream
+        # Clear blob content since output has been written to user stream
+        if blob.content is not None:
+            stream.write(blob.content)
+            blob.content = None
+
+        # If the blob is small, the download is complete at this point.
+        # If blob size is large, download the rest of the blob in chunks.
+        if blob.properties.content_length != download_size:
+            # Lock on the etag. This can be overriden by the user by specifying '*'
+            if_match = if_match if if_match is not None else blob.properties.etag
+
+            end_blob = blob_size
+            if end_range is not None:
+                # Use the end_range unless it is over the end of the blob
+                end_blob = min(blob_size, end_range + 1)
+
+            await _download_blob_chunks(
+                self,
+                container_name,
+                blob_name,
+                snapshot,
+                download_size,
+                self.MAX_CHUNK_GET_SIZE,
+                first_get_size,
+                initial_request_end + 1,  # start where the first download ended
+                end_blob,
+                stream,
+                max_connections,
+                progress_callback,
+                validate_content,
+                lease_id,
+                if_modified_since,
+                if_unmodified_since,
+                if_match,
+                if_none_match,
+                timeout,
+                operation_context,
+                cpk,
+            )
+
+            # Set the content length to the download size instead of the size of
+            # the last range
+            blob.properties.content_length = download_size
+
+            # Overwrite the content range to the user requested range
+            blob.properties.content_range = 'bytes {0}-{1}/{2}'.format(start_range, end_range, blob_size)
+
+            # Overwrite the content MD5 as it is the MD5 for the last range instead
+            # of the stored MD5
+            # TODO: Set to the stored MD5 when the service returns this
+            blob.properties.content_md5 = None
+
+        return blob
+
+    async def get_blob_to_bytes(
+            self, container_name, blob_name, snapshot=None,
+            start_range=None, end_range=None, validate_content=False,
+            progress_callback=None, max_connections=2, lease_id=None,
+            if_modified_since=None, if_unmodified_since=None, if_match=None,
+            if_none_match=None, timeout=None, cpk=None):
+        '''
+        Downloads a blob as an array of bytes, with automatic chunking and
+        progress notifications. See :meth:`BaseBlobService.get_blob_to_bytes`.
+
+        :rtype: :class:`~azure.storage.blob.models.Blob`
+        '''
+        _validate_not_none('container_name', container_name)
+        _validate_not_none('blob_name', blob_name)
+
+        stream = BytesIO()
+        blob = await self.get_blob_to_stream(
+            container_name,
+            blob_name,
+            stream,
+            snapshot,
+            start_range,
+            end_range,
+            validate_content,
+            progress_callback,
+            max_connections,
+            lease_id,
+            if_modified_since,
+            if_unmodified_since,
+            if_match,
+            if_none_match,
+            timeout=timeout,
+            cpk=cpk)
+
+        blob.content = stream.getvalue()
+        return blob
+
+    async def get_blob_to_text(
+            self, container_name, blob_name, encoding='utf-8', snapshot=None,
+            start_range=None, end_range=None, validate_content=False,
+            progress_callback=None, max_connections=2, lease_id=None,
+            if_modified_since=None, if_unmodified_since=None, if_match=None,
+            if_none_match=None, timeout=None, cpk=None):
+        '''
+        Downloads a blob as unicode text, with automatic chunking and progress
+        notifications. See :meth:`BaseBlobService.get_blob_to_text`.
+
+        :rtype: :class:`~azure.storage.blob.models.Blob`
+        '''
+        _validate_not_none('container_name', container_name)
+        _validate_not_none('blob_name', blob_name)
+        _validate_not_none('encoding', encoding)
+
+        blob = await self.get_blob_to_bytes(container_name,
+                                            blob_name,
+                                            snapshot,
+                                            start_range,
+                                            end_range,
+                                            validate_content,
+                                            progress_callback,
+                                            max_connections,
+                                            lease_id,
+                                            if_modified_since,
+                                            if_unmodified_since,
+                                            if_match,
+                                            if_none_match,
+                                            timeout=timeout,
+                                            cpk=cpk)
+        blob.content = blob.content.decode(encoding)
+        return blob
@@ -0,0 +1,171 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+from os import path
+
+from azure.storage.common._error import (
+    _validate_not_none,
+    _validate_encryption_required,
+)
+from azure.storage.common._memory_mapping import _open_file_for_upload
+from .._encryption import _generate_blob_encryption_data
+from .._upload_chunking import (
+    _get_adaptive_block_size,
+    _get_block_size,
+)
+from ..blockblobservice import BlockBlobService
+from ._upload_chunking import _upload_blob_chunks
+from .baseblobservice import AsyncBaseBlobService
+
+
+class AsyncBlockBlobService(AsyncBaseBlobService, BlockBlobService):
+    '''
+    The asyncio variant of :class:`~azure.storage.blob.blockblobservice.BlockBlobService`.
+    Every operation is a coroutine. Blobs larger than MAX_SINGLE_PUT_SIZE are
+    uploaded as blocks, up to max_connections of them at the same time, and
+    committed with a single put block list.
+
+    create_blob_from_bytes and create_blob_from_text are inherited and return
+    the coroutine of create_blob_from_stream.
+    '''
+
+    async def create_blob_from_path(self, container_name, blob_name, file_path, content_settings=None,
+                                    metadata=None, validate_content=False, progress_callback=None,
+                                    max_connections=2, lease_id=None, if_modified_since=None,
+                                    if_unmodified_since=None, if_match=None, if_none_match=None,
+                                    timeout=None, standard_blob_tier=None, cpk=None):
+        '''
+        Creates a new blob from a file path, or updates the content of an
+        existing blob, with automatic chunking and progress notifications.
+        See :meth:`BlockBlobService.create_blob_from_path`.
+
+        :rtype: :class:`~azure.storage.blob.models.ResourceProperties`
+        '''
+        _validate_not_none('container_name', container_name)
+        _validate_not_none('blob_name', blob_name)
+        _validate_not_none('file_path', file_path)
+
+        count = path.getsize(file_path)
+        with _open_file_for_upload(file_path) as stream:
+            return await self.create_blob_from_stream(container_name=container_name, blob_name=blob_name,
+                                                      stream=stream, count=count, content_settings=content_settings,
+                                                      metadata=metadata, validate_content=validate_content,
+                                                      progress_callback=progress_callback,
+                                                      max_connections=max_connections, lease_id=lease_id,
+                                                      if_modified_since=if_modified_since,
+                                                      if_unmodified_since=if_unmodified_since, if_match=if_match,
+                                                      if_none_match=if_none_match, timeout=timeout,
+                                                      standard_blob_tier=standard_blob_tier, cpk=cpk)
+
+    async def create_blob_from_stream(self, container_name, blob_name, stream, count=None, content_settings=None,
+                                      metadata=None, validate_content=False, progress_callback=None,
+                                      max_connections=2, lease_id=None, if_modified_since=None,
+                                      if_unmodified_since=None, if_match=None, if_none_match=None, timeout=None,
+                                      use_byte_buffer=False, standard_blob_tier=None, cpk=None):
+        '''
+        Creates a new blob from a file/stream, or updates the content of
+        an existing blob, with automatic chunking and progress
+        notifications. See :meth:`BlockBlobService.create_blob_from_stream`.
+
+        Blocks are read from the stream on the event loop, so the stream should
+        not block for long. use_byte_buffer is accepted for compatibility only:
+        blocks are always read into memory before they are uploaded.
+
+        :rtype: :class:`~azure.storage.blob.models.ResourceProperties`
+        '''
+        _validate_not_none('container_name', container_name)
+        _validate_not_none('blob_name', blob_name)
+        _validate_not_none('stream', stream)
+        _validate_encryption_required(self.require_encryption, self.key_encryption_key)
+
+        # Adjust count to include padding if we are expected to encrypt.
+        adjusted_count = count
+        if (self.key_encryption_key is not None) and (adjusted_count is not None):
+            adjusted_count += (16 - (count % 16))
+
+        # Do single put if the size is smaller than MAX_SINGLE_PUT_SIZE
+        if adjusted_count is not None and (adjusted_count < self.MAX_SINGLE_PUT_SIZE):
+            if progress_callback:
+                progress_callback(0, count)
+
+            data = stream.read(count)
+            data_chunk = data  # to store the chunk of data read from stream each time
+
+            # keep reading from stream util length of data >= count or reaching the end of stream
+            while len(data) < count and len(data_chunk) != 0:
+                data_chunk = stream.read(count - len(data))
+                data += data_chunk
+
+            if len(data) < count:
+                raise ValueError('Parameter:count is greater than the amount of data in the stream,'
+                                 'please specify a valid count')
+
+            if len(data) > count:
+                data = data[0:count]
+
+            resp = await self._put_blob(
+                container_name=container_name,
+                blob_name=blob_name,
+                blob=data,
+                content_settings=content_settings,
+                metadata=metadata,
+                validate_content=validate_content,
+                lease_id=lease_id,
+                if_modified_since=if_modified_since,
+                if_unmodified_since=if_unmodified_since,
+                if_match=if_match,
+                if_none_match=if_none_match,
+                standard_blob_tier=standard_blob_tier,
+                cpk=cpk,
+                timeout=timeout,
+                _operation_name='create_blob_from_stream')
+
+            if progress_callback:
+                progress_callback(count, count)
+
+            return resp
+        else:  # Size is larger than MAX_SINGLE_PUT_SIZE, must upload with multiple put_block calls
+            cek, iv, encryption_data = None, None, None
+            block_size = _get_block_size(count, self.MAX_BLOCK_SIZE)
+            chunk_sizer = _get_adaptive_block_size(count, block_size) if self.ADAPTIVE_BLOCK_SIZE else None
+            if self.key_encryption_key:
+                cek, iv, encryption_data = _generate_blob_encryption_data(self.key_encryption_key)
+
+            block_ids = await _upload_blob_chunks(
+                blob_service=self,
+                container_name=container_name,
+                blob_name=blob_name,
+                blob_size=count,
+                block_size=block_size,
+                stream=stream,
+                max_connections=max_connections,
+                progress_callback=progress_callback,
+                validate_content=validate_content,
+                lease_id=lease_id,
+                timeout=timeout,
+                content_encryption_key=cek,
+                initialization_vector=iv,
+                cpk=cpk,
+                chunk_sizer=chunk_sizer,
+            )
+
+            return await self._put_block_list(
+                container_name=container_name,
+                blob_name=blob_name,
+                block_list=block_ids,
+                content_settings=content_settings,
+                metadata=metadata,
+                validate_content=validate_content,
+                lease_id=lease_id,
+                if_modified_since=if_modified_since,
+                if_unmodified_since=if_unmodified_since,
+                if_match=if_match,
+                if_none_match=if_none_match,
+                timeout=timeout,
+                encryption_data=encryption_data,
+                standard_blob_tier=standard_blob_tier,
+                cpk=cpk,
+                _operation_name='create_blob_from_stream',
+            )
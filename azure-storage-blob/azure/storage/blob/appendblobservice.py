@@ -22,6 +22,7 @@ from azure.storage.common._error import (
     _validate_encryption_unsupported,
     _ERROR_VALUE_NEGATIVE,
 )
+from azure.storage.common._memory_mapping import _open_file_for_upload
 from azure.storage.common._http import HTTPRequest
 from azure.storage.common._serialization import (
     _get_data_bytes_only,
@@ -197,7 +198,7 @@ class AppendBlobService(BaseBlobService):
         if content_settings is not None:
             request.headers.update(content_settings._to_headers())
 
-        return self._perform_request(request, _parse_base_properties)
+        return self._perform_request(request, _parse_base_properties, operation_name='create_blob')
 
     def append_block(self, container_name, blob_name, block,
                      validate_content=False, maxsize_condition=None,
@@ -298,7 +299,7 @@ class AppendBlobService(BaseBlobService):
             computed_md5 = _get_content_md5(request.body)
             request.headers['Content-MD5'] = _to_str(computed_md5)
 
-        return self._perform_request(request, _parse_append_block)
+        return self._perform_request(request, _parse_append_block, operation_name='append_block')
 
     def append_block_from_url(self, container_name, blob_name, copy_source_url, source_range_start=None,
                               source_range_end=None, source_content_md5=None, source_if_modified_since=None,
@@ -422,7 +423,7 @@ class AppendBlobService(BaseBlobService):
                                            end_range_required=False,
                                            range_header_name="x-ms-source-range")
 
-        return self._perform_request(request, _parse_append_block)
+        return self._perform_request(request, _parse_append_block, operation_name='append_block_from_url')
 
     # ----Convenience APIs----------------------------------------------
 
@@ -500,7 +501,7 @@ class AppendBlobService(BaseBlobService):
         _validate_encryption_unsupported(self.require_encryption, self.key_encryption_key)
 
         count = path.getsize(file_path)
-        with open(file_path, 'rb') as stream:
+        with _open_file_for_upload(file_path) as stream:
             return self.append_blob_from_stream(
                 container_name,
                 blob_name,
@@ -6,6 +6,7 @@
 import sys
 import uuid
 from abc import ABCMeta
+from copy import deepcopy
 
 from azure.common import AzureHttpError
 
@@ -30,6 +31,7 @@ from azure.storage.common._deserialization import (
     _parse_properties,
     _convert_xml_to_service_stats,
     _parse_length_from_content_range,
+    _get_seekable_stream_writer,
 )
 from azure.storage.common._error import (
     _dont_fail_not_exist,
@@ -51,6 +53,7 @@ from azure.storage.common.models import (
     Services,
     ListGenerator,
     _OperationContext,
+    _StreamedList,
 )
 from .sharedaccesssignature import (
     BlobSharedAccessSignature,
@@ -61,15 +64,22 @@ from ._deserialization import (
     _parse_blob,
     _convert_xml_to_blob_list,
     _convert_xml_to_blob_name_list,
+    _convert_xml_to_streamed_blob_list,
+    _convert_xml_to_streamed_blob_name_list,
+    _convert_xml_to_blob_columns,
     _parse_container,
     _parse_snapshot_blob,
     _parse_lease,
+    _parse_lease_id,
+    _parse_lease_time,
     _convert_xml_to_signed_identifiers_and_access,
     _parse_base_properties,
+    _parse_copy_properties,
     _parse_account_information,
     _convert_xml_to_user_delegation_key,
     _ingest_batch_response)
 from ._download_chunking import _download_blob_chunks
+from ._list_partitioning import _PartitionedBlobLister
 from ._error import (
     _ERROR_INVALID_LEASE_DURATION,
     _ERROR_INVALID_LEASE_BREAK_PERIOD,
@@ -83,6 +93,7 @@ from ._serialization import (
     _validate_and_add_cpk_headers,
 )
 from .models import (
+    BlobColumns,
     BlobProperties,
     _LeaseActions,
     ContainerPermissions,
@@ -97,6 +108,7 @@ from ._constants import (
 _CONTAINER_ALREADY_EXISTS_ERROR_CODE = 'ContainerAlreadyExists'
 _BLOB_NOT_FOUND_ERROR_CODE = 'BlobNotFound'
 _CONTAINER_NOT_FOUND_ERROR_CODE = 'ContainerNotFound'
+_CONDITION_NOT_MET_ERROR_CODE = 'ConditionNotMet'
 
 if sys.version_info >= (3,):
     from io import BytesIO
@@ -146,6 +158,10 @@ class BaseBlobService(StorageClient):
         A flag that may be set to ensure that all messages successfully uploaded to the queue and all those downloaded and
         successfully read from the queue are/were encrypted while on the server. If this flag is set, all required
         parameters for encryption/decryption must be provided. See the above comments on the key_encryption_key and resolver.
+    :ivar ~azure.storage.blob.propertiescache.PropertiesCache properties_cache:
+        If set, the properties and metadata of blobs and containers are answered 
+        from this cache, and revalidated with the service once they expire. Writes 
+        made through this service object invalidate what they change. Defaults to None.
     '''
 
     __metaclass__ = ABCMeta
@@ -230,9 +246,60 @@ class BaseBlobService(StorageClient):
         self.require_encryption = False
         self.key_encryption_key = None
         self.key_resolver_function = None
+        self.properties_cache = None
         self._X_MS_VERSION = X_MS_VERSION
         self._update_user_agent_string(package_version)
 
+    def _perform_request(self, request, *args, **kwargs):
+        if self.properties_cache is None or request.method in ('GET', 'HEAD'):
+            return super(BaseBlobService, self)._perform_request(request, *args, **kwargs)
+
+        # The path is taken before it is encoded. The cache is invalidated once the 
+        # service has answered, so properties fetched while the write was in flight 
+        # are not kept either.
+        path = request.path
+        try:
+            return super(BaseBlobService, self)._perform_request(request, *args, **kwargs)
+        finally:
+            self._invalidate_cached_properties(path)
+
+    def _invalidate_cached_properties(self, path):
+        container_name, _, blob_name = path[1:].partition('/')
+        if not container_name:
+            # batch requests change any number of blobs
+            self.properties_cache.clear()
+        else:
+            self.properties_cache._invalidate(container_name, blob_name or None)
+
+    def _get_cached_properties(self, key, request, parser, parser_args, expected_errors=None, _operation_name=None):
+        '''
+        Returns a copy of the cached properties of the container or blob, fetching 
+        them with the request if they are not cached. Once they have expired, the 
+        properties of a blob are revalidated with the request made conditional on 
+        their ETag, and those of a container are fetched again.
+        '''
+        cache = self.properties_cache
+        entry, generation = cache._lookup(key)
+        if entry is not None and entry.is_fresh():
+            return deepcopy(entry.value)
+
+        revalidating = entry is not None and key[1] is not None
+        if revalidating:
+            request.headers['If-None-Match'] = entry.etag
+            expected_errors = (expected_errors or []) + [_CONDITION_NOT_MET_ERROR_CODE]
+
+        try:
+            value = self._perform_request(request, parser, parser_args, expected_errors=expected_errors,
+                                          operation_name=_operation_name)
+        except AzureHttpError as ex:
+            if not revalidating or ex.status_code != 304:
+                raise
+            cache._renew(key, entry, generation)
+            return deepcopy(entry.value)
+
+        cache._store(key, value, value.properties.etag, generation)
+        return deepcopy(value)
+
     def make_blob_url(self, container_name, blob_name, protocol=None, sas_token=None, snapshot=None):
         '''
         Creates the url to access a blob.
@@ -568,10 +635,11 @@ class BaseBlobService(StorageClient):
             'timeout': _int_to_str(timeout),
         }
         request.body = _get_request_body(_convert_delegation_key_info_to_xml(key_start_time, key_expiry_time))
-        return self._perform_request(request, _convert_xml_to_user_delegation_key)
+        return self._perform_request(request, _convert_xml_to_user_delegation_key,
+                                     operation_name='get_user_delegation_key')
 
     def list_containers(self, prefix=None, num_results=None, include_metadata=False,
-                        marker=None, timeout=None):
+                        marker=None, timeout=None, prefetch_pages=0):
         '''
         Returns a generator to list the containers under the specified account.
         The generator will lazily follow the continuation tokens returned by
@@ -599,17 +667,22 @@ class BaseBlobService(StorageClient):
             where the previous generator stopped.
         :param int timeout:
             The timeout parameter is expressed in seconds.
+        :param int prefetch_pages:
+            The number of pages of results to request ahead, in the background, 
+            while the current page is being iterated. Defaults to 0, which 
+            requests each page only once the previous one has been iterated.
         '''
         include = 'metadata' if include_metadata else None
         operation_context = _OperationContext(location_lock=True)
         kwargs = {'prefix': prefix, 'marker': marker, 'max_results': num_results,
-                  'include': include, 'timeout': timeout, '_context': operation_context}
+                  'include': include, 'timeout': timeout, '_context': operation_context,
+                  '_operation_name': 'list_containers'}
         resp = self._list_containers(**kwargs)
 
-        return ListGenerator(resp, self._list_containers, (), kwargs)
+        return ListGenerator(resp, self._list_containers, (), kwargs, prefetch_pages)
 
     def _list_containers(self, prefix=None, marker=None, max_results=None,
-                         include=None, timeout=None, _context=None):
+                         include=None, timeout=None, _context=None, _operation_name=None):
         '''
         Returns a list of the containers under the specified account.
 
@@ -647,7 +720,8 @@ class BaseBlobService(StorageClient):
             'timeout': _int_to_str(timeout)
         }
 
-        return self._perform_request(request, _convert_xml_to_containers, operation_context=_context)
+        return self._perform_request(request, _convert_xml_to_containers, operation_context=_context,
+                                     operation_name=_operation_name)
 
     def create_container(self, container_name, metadata=None,
                          public_access=None, fail_on_exist=False, timeout=None):
@@ -674,6 +748,21 @@ class BaseBlobService(StorageClient):
         :return: True if container is created, False if container already exists.
         :rtype: bool
         '''
+        request = self._get_create_container_http_request(container_name, metadata, public_access, timeout)
+
+        if not fail_on_exist:
+            try:
+                self._perform_request(request, expected_errors=[_CONTAINER_ALREADY_EXISTS_ERROR_CODE],
+                                      operation_name='create_container')
+                return True
+            except AzureHttpError as ex:
+                _dont_fail_on_exist(ex)
+                return False
+        else:
+            self._perform_request(request, operation_name='create_container')
+            return True
+
+    def _get_create_container_http_request(self, container_name, metadata=None, public_access=None, timeout=None):
         _validate_not_none('container_name', container_name)
         request = HTTPRequest()
         request.method = 'PUT'
@@ -687,17 +776,7 @@ class BaseBlobService(StorageClient):
             'x-ms-blob-public-access': _to_str(public_access)
         }
         _add_metadata_headers(metadata, request)
-
-        if not fail_on_exist:
-            try:
-                self._perform_request(request, expected_errors=[_CONTAINER_ALREADY_EXISTS_ERROR_CODE])
-                return True
-            except AzureHttpError as ex:
-                _dont_fail_on_exist(ex)
-                return False
-        else:
-            self._perform_request(request)
-            return True
+        return request
 
     def get_container_properties(self, container_name, lease_id=None, timeout=None):
         '''
@@ -725,7 +804,12 @@ class BaseBlobService(StorageClient):
         }
         request.headers = {'x-ms-lease-id': _to_str(lease_id)}
 
-        return self._perform_request(request, _parse_container, [container_name])
+        if self.properties_cache is not None and lease_id is None:
+            return self._get_cached_properties((container_name, None, None), request, _parse_container,
+                                               [container_name],
+                                               _operation_name='get_container_properties')
+        return self._perform_request(request, _parse_container, [container_name],
+                                     operation_name='get_container_properties')
 
     def get_container_metadata(self, container_name, lease_id=None, timeout=None):
         '''
@@ -743,6 +827,10 @@ class BaseBlobService(StorageClient):
         :rtype: dict(str, str)
         '''
         _validate_not_none('container_name', container_name)
+        if self.properties_cache is not None and lease_id is None:
+            # the metadata is returned along with the cached properties
+            return self.get_container_properties(container_name, timeout=timeout).metadata
+
         request = HTTPRequest()
         request.method = 'GET'
         request.host_locations = self._get_host_locations(secondary=True)
@@ -754,7 +842,7 @@ class BaseBlobService(StorageClient):
         }
         request.headers = {'x-ms-lease-id': _to_str(lease_id)}
 
-        return self._perform_request(request, _parse_metadata)
+        return self._perform_request(request, _parse_metadata, operation_name='get_container_metadata')
 
     def set_container_metadata(self, container_name, metadata=None,
                                lease_id=None, if_modified_since=None, timeout=None):
@@ -800,7 +888,7 @@ class BaseBlobService(StorageClient):
         }
         _add_metadata_headers(metadata, request)
 
-        return self._perform_request(request, _parse_base_properties)
+        return self._perform_request(request, _parse_base_properties, operation_name='set_container_metadata')
 
     def get_container_acl(self, container_name, lease_id=None, timeout=None):
         '''
@@ -830,7 +918,8 @@ class BaseBlobService(StorageClient):
         }
         request.headers = {'x-ms-lease-id': _to_str(lease_id)}
 
-        return self._perform_request(request, _convert_xml_to_signed_identifiers_and_access)
+        return self._perform_request(request, _convert_xml_to_signed_identifiers_and_access,
+                                     operation_name='get_container_acl')
 
     def set_container_acl(self, container_name, signed_identifiers=None,
                           public_access=None, lease_id=None,
@@ -889,7 +978,7 @@ class BaseBlobService(StorageClient):
         request.body = _get_request_body(
             _convert_signed_identifiers_to_xml(signed_identifiers))
 
-        return self._perform_request(request, _parse_base_properties)
+        return self._perform_request(request, _parse_base_properties, operation_name='set_container_acl')
 
     def delete_container(self, container_name, fail_not_exist=False,
                          lease_id=None, if_modified_since=None,
@@ -924,6 +1013,23 @@ class BaseBlobService(StorageClient):
         :return: True if container is deleted, False container doesn't exist.
         :rtype: bool
         '''
+        request = self._get_delete_container_http_request(container_name, lease_id, if_modified_since,
+                                                          if_unmodified_since, timeout)
+
+        if not fail_not_exist:
+            try:
+                self._perform_request(request, expected_errors=[_CONTAINER_NOT_FOUND_ERROR_CODE],
+                                      operation_name='delete_container')
+                return True
+            except AzureHttpError as ex:
+                _dont_fail_not_exist(ex)
+                return False
+        else:
+            self._perform_request(request, operation_name='delete_container')
+            return True
+
+    def _get_delete_container_http_request(self, container_name, lease_id=None, if_modified_since=None,
+                                           if_unmodified_since=None, timeout=None):
         _validate_not_none('container_name', container_name)
         request = HTTPRequest()
         request.method = 'DELETE'
@@ -938,22 +1044,12 @@ class BaseBlobService(StorageClient):
             'If-Modified-Since': _datetime_to_utc_string(if_modified_since),
             'If-Unmodified-Since': _datetime_to_utc_string(if_unmodified_since),
         }
-
-        if not fail_not_exist:
-            try:
-                self._perform_request(request, expected_errors=[_CONTAINER_NOT_FOUND_ERROR_CODE])
-                return True
-            except AzureHttpError as ex:
-                _dont_fail_not_exist(ex)
-                return False
-        else:
-            self._perform_request(request)
-            return True
+        return request
 
     def _lease_container_impl(
             self, container_name, lease_action, lease_id, lease_duration,
             lease_break_period, proposed_lease_id, if_modified_since,
-            if_unmodified_since, timeout):
+            if_unmodified_since, timeout, parser=_parse_lease, _operation_name=None):
         '''
         Establishes and manages a lease on a container.
         The Lease Container operation can be called in one of five modes
@@ -1005,6 +1101,8 @@ class BaseBlobService(StorageClient):
             the resource has not been modified since the specified date/time.
         :param int timeout:
             The timeout parameter is expressed in seconds.
+        :param parser:
+            Parses the response headers. Defaults to returning both the lease time and ID.
         :return:
             Response headers returned from the service call.
         :rtype: dict(str, str)
@@ -1030,7 +1128,7 @@ class BaseBlobService(StorageClient):
             'If-Unmodified-Since': _datetime_to_utc_string(if_unmodified_since),
         }
 
-        return self._perform_request(request, _parse_lease)
+        return self._perform_request(request, parser, operation_name=_operation_name)
 
     def acquire_container_lease(
             self, container_name, lease_duration=-1, proposed_lease_id=None,
@@ -1072,16 +1170,17 @@ class BaseBlobService(StorageClient):
                 (lease_duration < 15 or lease_duration > 60):
             raise ValueError(_ERROR_INVALID_LEASE_DURATION)
 
-        lease = self._lease_container_impl(container_name,
-                                           _LeaseActions.Acquire,
-                                           None,  # lease_id
-                                           lease_duration,
-                                           None,  # lease_break_period
-                                           proposed_lease_id,
-                                           if_modified_since,
-                                           if_unmodified_since,
-                                           timeout)
-        return lease['id']
+        return self._lease_container_impl(container_name,
+                                          _LeaseActions.Acquire,
+                                          None,  # lease_id
+                                          lease_duration,
+                                          None,  # lease_break_period
+                                          proposed_lease_id,
+                                          if_modified_since,
+                                          if_unmodified_since,
+                                          timeout,
+                                          _parse_lease_id,
+                                          _operation_name='acquire_container_lease')
 
     def renew_container_lease(
             self, container_name, lease_id, if_modified_since=None,
@@ -1116,16 +1215,17 @@ class BaseBlobService(StorageClient):
         '''
         _validate_not_none('lease_id', lease_id)
 
-        lease = self._lease_container_impl(container_name,
-                                           _LeaseActions.Renew,
-                                           lease_id,
-                                           None,  # lease_duration
-                                           None,  # lease_break_period
-                                           None,  # proposed_lease_id
-                                           if_modified_since,
-                                           if_unmodified_since,
-                                           timeout)
-        return lease['id']
+        return self._lease_container_impl(container_name,
+                                          _LeaseActions.Renew,
+                                          lease_id,
+                                          None,  # lease_duration
+                                          None,  # lease_break_period
+                                          None,  # proposed_lease_id
+                                          if_modified_since,
+                                          if_unmodified_since,
+                                          timeout,
+                                          _parse_lease_id,
+                                          _operation_name='renew_container_lease')
 
     def release_container_lease(
             self, container_name, lease_id, if_modified_since=None,
@@ -1156,15 +1256,17 @@ class BaseBlobService(StorageClient):
         '''
         _validate_not_none('lease_id', lease_id)
 
-        self._lease_container_impl(container_name,
-                                   _LeaseActions.Release,
-                                   lease_id,
-                                   None,  # lease_duration
-                                   None,  # lease_break_period
-                                   None,  # proposed_lease_id
-                                   if_modified_since,
-                                   if_unmodified_since,
-                                   timeout)
+        return self._lease_container_impl(container_name,
+                                          _LeaseActions.Release,
+                                          lease_id,
+                                          None,  # lease_duration
+                                          None,  # lease_break_period
+                                          None,  # proposed_lease_id
+                                          if_modified_since,
+                                          if_unmodified_since,
+                                          timeout,
+                                          None,
+                                          _operation_name='release_container_lease')
 
     def break_container_lease(
             self, container_name, lease_break_period=None,
@@ -1210,16 +1312,17 @@ class BaseBlobService(StorageClient):
         if (lease_break_period is not None) and (lease_break_period < 0 or lease_break_period > 60):
             raise ValueError(_ERROR_INVALID_LEASE_BREAK_PERIOD)
 
-        lease = self._lease_container_impl(container_name,
-                                           _LeaseActions.Break,
-                                           None,  # lease_id
-                                           None,  # lease_duration
-                                           lease_break_period,
-                                           None,  # proposed_lease_id
-                                           if_modified_since,
-                                           if_unmodified_since,
-                                           timeout)
-        return lease['time']
+        return self._lease_container_impl(container_name,
+                                          _LeaseActions.Break,
+                                          None,  # lease_id
+                                          None,  # lease_duration
+                                          lease_break_period,
+                                          None,  # proposed_lease_id
+                                          if_modified_since,
+                                          if_unmodified_since,
+                                          timeout,
+                                          _parse_lease_time,
+                                          _operation_name='break_container_lease')
 
     def change_container_lease(
             self, container_name, lease_id, proposed_lease_id,
@@ -1252,18 +1355,20 @@ class BaseBlobService(StorageClient):
         '''
         _validate_not_none('lease_id', lease_id)
 
-        self._lease_container_impl(container_name,
-                                   _LeaseActions.Change,
-                                   lease_id,
-                                   None,  # lease_duration
-                                   None,  # lease_break_period
-                                   proposed_lease_id,
-                                   if_modified_since,
-                                   if_unmodified_since,
-                                   timeout)
+        return self._lease_container_impl(container_name,
+                                          _LeaseActions.Change,
+                                          lease_id,
+                                          None,  # lease_duration
+                                          None,  # lease_break_period
+                                          proposed_lease_id,
+                                          if_modified_since,
+                                          if_unmodified_since,
+                                          timeout,
+                                          None,
+                                          _operation_name='change_container_lease')
 
     def list_blobs(self, container_name, prefix=None, num_results=None, include=None,
-                   delimiter=None, marker=None, timeout=None):
+                   delimiter=None, marker=None, timeout=None, prefetch_pages=0):
         '''
         Returns a generator to list the blobs under the specified container.
         The generator will lazily follow the continuation tokens returned by
@@ -1274,6 +1379,9 @@ class BaseBlobService(StorageClient):
         finishes. This marker can be used to create a new generator if more 
         results are desired.
 
+        Each listed blob is a :class:`~azure.storage.blob.models.Blob` of about 
+        1.3KB. To hold a large listing in memory, use :meth:`list_blob_columns`.
+
         :param str container_name:
             Name of existing container.
         :param str prefix:
@@ -1301,20 +1409,27 @@ class BaseBlobService(StorageClient):
             where the previous generator stopped.
         :param int timeout:
             The timeout parameter is expressed in seconds.
+        :param int prefetch_pages:
+            The number of pages of results to request ahead, in the background, 
+            while the current page is being iterated. Defaults to 0, which 
+            requests each page only once the previous one has been iterated.
         '''
         operation_context = _OperationContext(location_lock=True)
         args = (container_name,)
+        # without a delimiter, the blobs are returned as they are read off the connection unless pages are prefetched
+        streamed = delimiter is None and not prefetch_pages
         kwargs = {'prefix': prefix, 'marker': marker, 'max_results': num_results,
                   'include': include, 'delimiter': delimiter, 'timeout': timeout,
                   '_context': operation_context,
-                  '_converter': _convert_xml_to_blob_list}
+                  '_converter': _convert_xml_to_streamed_blob_list if streamed else _convert_xml_to_blob_list,
+                  '_operation_name': 'list_blobs'}
         resp = self._list_blobs(*args, **kwargs)
 
-        return ListGenerator(resp, self._list_blobs, args, kwargs)
+        return ListGenerator(resp, self._list_blobs, args, kwargs, prefetch_pages)
 
     def list_blob_names(self, container_name, prefix=None, num_results=None,
                         include=None, delimiter=None, marker=None,
-                        timeout=None):
+                        timeout=None, prefetch_pages=0):
         '''
         Returns a generator to list the blob names under the specified container.
         The generator will lazily follow the continuation tokens returned by
@@ -1352,20 +1467,130 @@ class BaseBlobService(StorageClient):
             where the previous generator stopped.
         :param int timeout:
             The timeout parameter is expressed in seconds.
+        :param int prefetch_pages:
+            The number of pages of results to request ahead, in the background, 
+            while the current page is being iterated. Defaults to 0, which 
+            requests each page only once the previous one has been iterated.
         '''
         operation_context = _OperationContext(location_lock=True)
         args = (container_name,)
+        # without a delimiter, the blobs are returned as they are read off the connection unless pages are prefetched
+        streamed = delimiter is None and not prefetch_pages
         kwargs = {'prefix': prefix, 'marker': marker, 'max_results': num_results,
                   'include': include, 'delimiter': delimiter, 'timeout': timeout,
                   '_context': operation_context,
-                  '_converter': _convert_xml_to_blob_name_list}
+                  '_converter': _convert_xml_to_streamed_blob_name_list if streamed else _convert_xml_to_blob_name_list,
+                  '_operation_name': 'list_blob_names'}
         resp = self._list_blobs(*args, **kwargs)
 
-        return ListGenerator(resp, self._list_blobs, args, kwargs)
+        return ListGenerator(resp, self._list_blobs, args, kwargs, prefetch_pages)
+
+    def list_blob_columns(self, container_name, prefix=None, num_results=None, marker=None, timeout=None):
+        '''
+        Lists the blobs under the specified container as columns of their names, 
+        sizes, last modified times, ETags and access tiers, following the 
+        continuation tokens returned by the service until all blobs have been 
+        listed or num_results is reached.
+
+        The columns are filled in as each page is read off the connection, 
+        without creating an object for each blob. The sizes and last modified 
+        times are returned as NumPy int64 arrays when NumPy is installed, and 
+        as array.array buffers otherwise.
+
+        If num_results is specified and the container has more than that number 
+        of blobs, the next_marker of the columns is populated. This marker can be 
+        used to list the remaining blobs.
+
+        :param str container_name:
+            Name of existing container.
+        :param str prefix:
+            Filters the results to return only blobs whose names
+            begin with the specified prefix.
+        :param int num_results:
+            Specifies the maximum number of blobs to return.
+        :param str marker:
+            An opaque continuation token. This value can be retrieved from the 
+            next_marker field of a previous listing if num_results was specified 
+            and it did not return all the blobs. If specified, the listing 
+            begins from the point where the previous one stopped.
+        :param int timeout:
+            The timeout parameter is expressed in seconds. This function may make 
+            multiple calls to the service in which case the timeout value specified 
+            will be applied to each individual call.
+        :return: The blobs under the container, as columns.
+        :rtype: :class:`~azure.storage.blob.models.BlobColumns`
+        '''
+        _validate_not_none('container_name', container_name)
+        operation_context = _OperationContext(location_lock=True)
+        columns = BlobColumns()
+        while True:
+            page = self._list_blobs(container_name, prefix=prefix, marker=marker,
+                                    max_results=num_results - len(columns) if num_results else None,
+                                    timeout=timeout, _context=operation_context,
+                                    _converter=_convert_xml_to_blob_columns,
+                                    _operation_name='list_blob_columns')
+            columns._extend(page)
+            marker = page.next_marker
+            if not marker or (num_results and len(columns) >= num_results):
+                break
+
+        columns._finish()
+        return columns
+
+    def list_blobs_in_parallel(self, container_name, prefix=None, include=None, delimiter='/',
+                               max_connections=8, results_per_page=None, timeout=None):
+        '''
+        Returns a generator to list the blobs under the specified container, 
+        with up to max_connections list requests in flight at a time.
+
+        A single listing can only be followed one page at a time, as each page 
+        is requested with the continuation token of the previous one. This 
+        method splits the listing on the virtual directories formed by the 
+        delimiter instead: each :class:`~azure.storage.blob.models.BlobPrefix` 
+        is listed separately, and in parallel with the other prefixes. Every 
+        blob is returned exactly once, but the blobs are not returned in name 
+        order, and no :class:`~azure.storage.blob.models.BlobPrefix` elements 
+        are returned. A container whose blob names do not contain the delimiter 
+        is still listed one page at a time.
+
+        If a list request fails, the remaining requests are abandoned and the 
+        exception is raised by the generator. Closing the generator, or 
+        dropping it before it finishes, stops the listing once the requests in 
+        flight have been answered.
+
+        :param str container_name:
+            Name of existing container.
+        :param str prefix:
+            Filters the results to return only blobs whose names
+            begin with the specified prefix.
+        :param ~azure.storage.blob.models.Include include:
+            Specifies one or more additional datasets to include in the response.
+        :param str delimiter:
+            The delimiter of the virtual directories the listing is split on. 
+            The delimiter may be a single character or a string.
+        :param int max_connections:
+            The most list requests in flight at a time.
+        :param int results_per_page:
+            The most blobs and prefixes requested in each list request. If it 
+            is not specified or is greater than 5,000, the server will return 
+            up to 5,000 items.
+        :param int timeout:
+            The timeout parameter is expressed in seconds.
+        :return: A generator of the blobs under the container.
+        :rtype: Iterator[~azure.storage.blob.models.Blob]
+        '''
+        _validate_not_none('container_name', container_name)
+        _validate_not_none('delimiter', delimiter)
+        if max_connections < 1:
+            raise ValueError('max_connections must be at least 1.')
+
+        lister = _PartitionedBlobLister(self, container_name, prefix, include, delimiter,
+                                        results_per_page, timeout, max_connections)
+        return iter(lister)
 
     def _list_blobs(self, container_name, prefix=None, marker=None,
                     max_results=None, include=None, delimiter=None, timeout=None,
-                    _context=None, _converter=None):
+                    _context=None, _converter=None, _operation_name=None):
         '''
         Returns the list of blobs under the specified container.
 
@@ -1434,7 +1659,15 @@ class BaseBlobService(StorageClient):
             'timeout': _int_to_str(timeout),
         }
 
-        return self._perform_request(request, _converter, operation_context=_context)
+        # the listing is parsed as it is read off the connection
+        blobs = self._perform_request(request, _converter, operation_context=_context, stream=True,
+                                      operation_name=_operation_name)
+
+        if isinstance(blobs, _StreamedList):
+            # a page which fails part way through being read is requested again
+            blobs._reload = lambda: self._list_blobs(container_name, prefix, marker, max_results, include,
+                                                     delimiter, timeout, _context, _converter, _operation_name)
+        return blobs
 
     def get_blob_account_information(self, container_name=None, blob_name=None, timeout=None):
         """
@@ -1461,7 +1694,7 @@ class BaseBlobService(StorageClient):
             'timeout': _int_to_str(timeout),
         }
 
-        return self._perform_request(request, _parse_account_information)
+        return self._perform_request(request, _parse_account_information, operation_name='get_blob_account_information')
 
     def get_blob_service_stats(self, timeout=None):
         '''
@@ -1497,7 +1730,7 @@ class BaseBlobService(StorageClient):
             'timeout': _int_to_str(timeout),
         }
 
-        return self._perform_request(request, _convert_xml_to_service_stats)
+        return self._perform_request(request, _convert_xml_to_service_stats, operation_name='get_blob_service_stats')
 
     def set_blob_service_properties(
             self, logging=None, hour_metrics=None, minute_metrics=None,
@@ -1560,7 +1793,7 @@ class BaseBlobService(StorageClient):
             _convert_service_properties_to_xml(logging, hour_metrics, minute_metrics,
                                                cors, target_version, delete_retention_policy, static_website))
 
-        self._perform_request(request)
+        return self._perform_request(request, operation_name='set_blob_service_properties')
 
     def get_blob_service_properties(self, timeout=None):
         '''
@@ -1582,7 +1815,8 @@ class BaseBlobService(StorageClient):
             'timeout': _int_to_str(timeout),
         }
 
-        return self._perform_request(request, _convert_xml_to_service_properties)
+        return self._perform_request(request, _convert_xml_to_service_properties,
+                                     operation_name='get_blob_service_properties')
 
     def get_blob_properties(
             self, container_name, blob_name, snapshot=None, lease_id=None,
@@ -1652,7 +1886,13 @@ class BaseBlobService(StorageClient):
             'If-None-Match': _to_str(if_none_match),
         }
         _validate_and_add_cpk_headers(request, encryption_key=cpk, protocol=self.protocol)
-        return self._perform_request(request, _parse_blob, [blob_name, snapshot])
+
+        if self.properties_cache is not None and \
+                not any((lease_id, if_modified_since, if_unmodified_since, if_match, if_none_match, cpk)):
+            return self._get_cached_properties((container_name, blob_name, snapshot), request, _parse_blob,
+                                               [blob_name, snapshot],
+                                               _operation_name='get_blob_properties')
+        return self._perform_request(request, _parse_blob, [blob_name, snapshot], operation_name='get_blob_properties')
 
     def set_blob_properties(
             self, container_name, blob_name, content_settings=None, lease_id=None,
@@ -1722,7 +1962,7 @@ class BaseBlobService(StorageClient):
         if content_settings is not None:
             request.headers.update(content_settings._to_headers())
 
-        return self._perform_request(request, _parse_base_properties)
+        return self._perform_request(request, _parse_base_properties, operation_name='set_blob_properties')
 
     def exists(self, container_name, blob_name=None, snapshot=None, timeout=None):
         '''
@@ -1741,33 +1981,47 @@ class BaseBlobService(StorageClient):
         :return: A boolean indicating whether the resource exists.
         :rtype: bool
         '''
-        _validate_not_none('container_name', container_name)
+        request, expected_errors = self._get_exists_http_request(container_name, blob_name, snapshot, timeout)
         try:
-            # make head request to see if container/blob/snapshot exists
-            request = HTTPRequest()
-            request.method = 'GET' if blob_name is None else 'HEAD'
-            request.host_locations = self._get_host_locations(secondary=True)
-            request.path = _get_path(container_name, blob_name)
-            request.query = {
-                'snapshot': _to_str(snapshot),
-                'timeout': _int_to_str(timeout),
-                'restype': 'container' if blob_name is None else None,
-            }
-
-            expected_errors = [_CONTAINER_NOT_FOUND_ERROR_CODE] if blob_name is None \
-                else [_CONTAINER_NOT_FOUND_ERROR_CODE, _BLOB_NOT_FOUND_ERROR_CODE]
-            self._perform_request(request, expected_errors=expected_errors)
+            if self.properties_cache is None:
+                self._perform_request(request, expected_errors=expected_errors, operation_name='exists')
+            elif blob_name is None:
+                self._get_cached_properties((container_name, None, None), request, _parse_container,
+                                            [container_name], expected_errors,
+                                            _operation_name='exists')
+            else:
+                self._get_cached_properties((container_name, blob_name, snapshot), request, _parse_blob,
+                                            [blob_name, snapshot], expected_errors,
+                                            _operation_name='exists')
 
             return True
         except AzureHttpError as ex:
             _dont_fail_not_exist(ex)
             return False
 
+    def _get_exists_http_request(self, container_name, blob_name=None, snapshot=None, timeout=None):
+        _validate_not_none('container_name', container_name)
+
+        # make head request to see if container/blob/snapshot exists
+        request = HTTPRequest()
+        request.method = 'GET' if blob_name is None else 'HEAD'
+        request.host_locations = self._get_host_locations(secondary=True)
+        request.path = _get_path(container_name, blob_name)
+        request.query = {
+            'snapshot': _to_str(snapshot),
+            'timeout': _int_to_str(timeout),
+            'restype': 'container' if blob_name is None else None,
+        }
+
+        expected_errors = [_CONTAINER_NOT_FOUND_ERROR_CODE] if blob_name is None \
+            else [_CONTAINER_NOT_FOUND_ERROR_CODE, _BLOB_NOT_FOUND_ERROR_CODE]
+        return request, expected_errors
+
     def _get_blob(
             self, container_name, blob_name, snapshot=None, start_range=None,
             end_range=None, validate_content=False, lease_id=None, if_modified_since=None,
             if_unmodified_since=None, if_match=None, if_none_match=None, timeout=None, cpk=None,
-            _context=None):
+            _context=None, _stream_writer=None, _operation_name=None):
         '''
         Downloads a blob's content, metadata, and properties. You can also
         call this API to read a snapshot. You can specify a range if you don't
@@ -1880,11 +2134,15 @@ class BaseBlobService(StorageClient):
             end_range_required=False,
             check_content_md5=validate_content)
 
+        # Encrypted content has to be decrypted as a whole, so it is never streamed to the writer
+        stream = _stream_writer is not None and \
+                 self.key_encryption_key is None and self.key_resolver_function is None
+
         return self._perform_request(request, _parse_blob,
                                      [blob_name, snapshot, validate_content, self.require_encryption,
                                       self.key_encryption_key, self.key_resolver_function,
-                                      start_offset, end_offset],
-                                     operation_context=_context)
+                                      start_offset, end_offset, _stream_writer if stream else None],
+                                     operation_context=_context, stream=stream, operation_name=_operation_name)
 
     def get_blob_to_path(
             self, container_name, blob_name, file_path, open_mode='wb',
@@ -2143,6 +2401,9 @@ class BaseBlobService(StorageClient):
 
         # Send a context object to make sure we always retry to the initial location
         operation_context = _OperationContext(location_lock=True)
+
+        # If the stream is seekable, the first download is written to it as it arrives
+        stream_writer = _get_seekable_stream_writer(stream)
         try:
             blob = self._get_blob(container_name,
                                   blob_name,
@@ -2157,7 +2418,9 @@ class BaseBlobService(StorageClient):
                                   if_none_match=if_none_match,
                                   timeout=timeout,
                                   _context=operation_context,
-                                  cpk=cpk)
+                                  cpk=cpk,
+                                  _stream_writer=stream_writer,
+                                  _operation_name='get_blob_to_stream')
 
             # Parse the total blob size and adjust the download size if ranges
             # were specified
@@ -2185,7 +2448,9 @@ class BaseBlobService(StorageClient):
                                       if_none_match=if_none_match,
                                       timeout=timeout,
                                       _context=operation_context,
-                                      cpk=cpk)
+                                      cpk=cpk,
+                                      _stream_writer=stream_writer,
+                                      _operation_name='get_blob_to_stream')
 
                 # Set the download size to empty
                 download_size = 0
@@ -2539,6 +2804,11 @@ class BaseBlobService(StorageClient):
         '''
         _validate_not_none('container_name', container_name)
         _validate_not_none('blob_name', blob_name)
+        if self.properties_cache is not None and \
+                not any((lease_id, if_modified_since, if_unmodified_since, if_match, if_none_match, cpk)):
+            # the metadata is returned along with the cached properties
+            return self.get_blob_properties(container_name, blob_name, snapshot, timeout=timeout).metadata
+
         request = HTTPRequest()
         request.method = 'GET'
         request.host_locations = self._get_host_locations(secondary=True)
@@ -2556,7 +2826,7 @@ class BaseBlobService(StorageClient):
             'If-None-Match': _to_str(if_none_match),
         }
         _validate_and_add_cpk_headers(request, encryption_key=cpk, protocol=self.protocol)
-        return self._perform_request(request, _parse_metadata)
+        return self._perform_request(request, _parse_metadata, operation_name='get_blob_metadata')
 
     def set_blob_metadata(self, container_name, blob_name,
                           metadata=None, lease_id=None,
@@ -2627,13 +2897,14 @@ class BaseBlobService(StorageClient):
         }
         _add_metadata_headers(metadata, request)
         _validate_and_add_cpk_headers(request, encryption_key=cpk, protocol=self.protocol)
-        return self._perform_request(request, _parse_base_properties)
+        return self._perform_request(request, _parse_base_properties, operation_name='set_blob_metadata')
 
     def _lease_blob_impl(self, container_name, blob_name,
                          lease_action, lease_id,
                          lease_duration, lease_break_period,
                          proposed_lease_id, if_modified_since,
-                         if_unmodified_since, if_match, if_none_match, timeout=None):
+                         if_unmodified_since, if_match, if_none_match, timeout=None, parser=_parse_lease,
+                         _operation_name=None):
         '''
         Establishes and manages a lease on a blob for write and delete operations.
         The Lease Blob operation can be called in one of five modes:
@@ -2695,6 +2966,8 @@ class BaseBlobService(StorageClient):
             operation if it does exist.
         :param int timeout:
             The timeout parameter is expressed in seconds.
+        :param parser:
+            Parses the response headers. Defaults to returning both the lease time and ID.
         :return:
             Response headers returned from the service call.
         :rtype: dict(str, str)
@@ -2722,7 +2995,7 @@ class BaseBlobService(StorageClient):
             'If-None-Match': _to_str(if_none_match),
         }
 
-        return self._perform_request(request, _parse_lease)
+        return self._perform_request(request, parser, operation_name=_operation_name)
 
     def acquire_blob_lease(self, container_name, blob_name,
                            lease_duration=-1,
@@ -2779,19 +3052,20 @@ class BaseBlobService(StorageClient):
         if lease_duration != -1 and \
                 (lease_duration < 15 or lease_duration > 60):
             raise ValueError(_ERROR_INVALID_LEASE_DURATION)
-        lease = self._lease_blob_impl(container_name,
-                                      blob_name,
-                                      _LeaseActions.Acquire,
-                                      None,  # lease_id
-                                      lease_duration,
-                                      None,  # lease_break_period
-                                      proposed_lease_id,
-                                      if_modified_since,
-                                      if_unmodified_since,
-                                      if_match,
-                                      if_none_match,
-                                      timeout)
-        return lease['id']
+        return self._lease_blob_impl(container_name,
+                                     blob_name,
+                                     _LeaseActions.Acquire,
+                                     None,  # lease_id
+                                     lease_duration,
+                                     None,  # lease_break_period
+                                     proposed_lease_id,
+                                     if_modified_since,
+                                     if_unmodified_since,
+                                     if_match,
+                                     if_none_match,
+                                     timeout,
+                                     _parse_lease_id,
+                                     _operation_name='acquire_blob_lease')
 
     def renew_blob_lease(self, container_name, blob_name,
                          lease_id, if_modified_since=None,
@@ -2838,19 +3112,20 @@ class BaseBlobService(StorageClient):
         '''
         _validate_not_none('lease_id', lease_id)
 
-        lease = self._lease_blob_impl(container_name,
-                                      blob_name,
-                                      _LeaseActions.Renew,
-                                      lease_id,
-                                      None,  # lease_duration
-                                      None,  # lease_break_period
-                                      None,  # proposed_lease_id
-                                      if_modified_since,
-                                      if_unmodified_since,
-                                      if_match,
-                                      if_none_match,
-                                      timeout)
-        return lease['id']
+        return self._lease_blob_impl(container_name,
+                                     blob_name,
+                                     _LeaseActions.Renew,
+                                     lease_id,
+                                     None,  # lease_duration
+                                     None,  # lease_break_period
+                                     None,  # proposed_lease_id
+                                     if_modified_since,
+                                     if_unmodified_since,
+                                     if_match,
+                                     if_none_match,
+                                     timeout,
+                                     _parse_lease_id,
+                                     _operation_name='renew_blob_lease')
 
     def release_blob_lease(self, container_name, blob_name,
                            lease_id, if_modified_since=None,
@@ -2893,18 +3168,20 @@ class BaseBlobService(StorageClient):
         '''
         _validate_not_none('lease_id', lease_id)
 
-        self._lease_blob_impl(container_name,
-                              blob_name,
-                              _LeaseActions.Release,
-                              lease_id,
-                              None,  # lease_duration
-                              None,  # lease_break_period
-                              None,  # proposed_lease_id
-                              if_modified_since,
-                              if_unmodified_since,
-                              if_match,
-                              if_none_match,
-                              timeout)
+        return self._lease_blob_impl(container_name,
+                                     blob_name,
+                                     _LeaseActions.Release,
+                                     lease_id,
+                                     None,  # lease_duration
+                                     None,  # lease_break_period
+                                     None,  # proposed_lease_id
+                                     if_modified_since,
+                                     if_unmodified_since,
+                                     if_match,
+                                     if_none_match,
+                                     timeout,
+                                     None,
+                                     _operation_name='release_blob_lease')
 
     def break_blob_lease(self, container_name, blob_name,
                          lease_break_period=None,
@@ -2966,19 +3243,20 @@ class BaseBlobService(StorageClient):
         if (lease_break_period is not None) and (lease_break_period < 0 or lease_break_period > 60):
             raise ValueError(_ERROR_INVALID_LEASE_BREAK_PERIOD)
 
-        lease = self._lease_blob_impl(container_name,
-                                      blob_name,
-                                      _LeaseActions.Break,
-                                      None,  # lease_id
-                                      None,  # lease_duration
-                                      lease_break_period,
-                                      None,  # proposed_lease_id
-                                      if_modified_since,
-                                      if_unmodified_since,
-                                      if_match,
-                                      if_none_match,
-                                      timeout)
-        return lease['time']
+        return self._lease_blob_impl(container_name,
+                                     blob_name,
+                                     _LeaseActions.Break,
+                                     None,  # lease_id
+                                     None,  # lease_duration
+                                     lease_break_period,
+                                     None,  # proposed_lease_id
+                                     if_modified_since,
+                                     if_unmodified_since,
+                                     if_match,
+                                     if_none_match,
+                                     timeout,
+                                     _parse_lease_time,
+                                     _operation_name='break_blob_lease')
 
     def change_blob_lease(self, container_name, blob_name,
                           lease_id,
@@ -3024,18 +3302,20 @@ class BaseBlobService(StorageClient):
         :param int timeout:
             The timeout parameter is expressed in seconds.
         '''
-        self._lease_blob_impl(container_name,
-                              blob_name,
-                              _LeaseActions.Change,
-                              lease_id,
-                              None,  # lease_duration
-                              None,  # lease_break_period
-                              proposed_lease_id,
-                              if_modified_since,
-                              if_unmodified_since,
-                              if_match,
-                              if_none_match,
-                              timeout)
+        return self._lease_blob_impl(container_name,
+                                     blob_name,
+                                     _LeaseActions.Change,
+                                     lease_id,
+                                     None,  # lease_duration
+                                     None,  # lease_break_period
+                                     proposed_lease_id,
+                                     if_modified_since,
+                                     if_unmodified_since,
+                                     if_match,
+                                     if_none_match,
+                                     timeout,
+                                     None,
+                                     _operation_name='change_blob_lease')
 
     def snapshot_blob(self, container_name, blob_name,
                       metadata=None, if_modified_since=None,
@@ -3108,7 +3388,7 @@ class BaseBlobService(StorageClient):
         _validate_and_add_cpk_headers(request, encryption_key=cpk, protocol=self.protocol)
         _add_metadata_headers(metadata, request)
 
-        return self._perform_request(request, _parse_snapshot_blob, [blob_name])
+        return self._perform_request(request, _parse_snapshot_blob, [blob_name], operation_name='snapshot_blob')
 
     def copy_blob(self, container_name, blob_name, copy_source,
                   metadata=None,
@@ -3248,7 +3528,8 @@ class BaseBlobService(StorageClient):
                                destination_if_none_match,
                                destination_lease_id,
                                source_lease_id, timeout,
-                               False, False)
+                               False, False,
+                               _operation_name='copy_blob')
 
     def _copy_blob(self, container_name, blob_name, copy_source,
                    metadata=None,
@@ -3265,7 +3546,7 @@ class BaseBlobService(StorageClient):
                    incremental_copy=False,
                    requires_sync=None,
                    standard_blob_tier=None,
-                   rehydrate_priority=None):
+                   rehydrate_priority=None, _operation_name=None):
         '''
         See copy_blob for more details. This helper method
         allows for standard copies as well as incremental copies which are only supported for page blobs and sync
@@ -3327,7 +3608,7 @@ class BaseBlobService(StorageClient):
 
         _add_metadata_headers(metadata, request)
 
-        return self._perform_request(request, _parse_properties, [BlobProperties]).copy
+        return self._perform_request(request, _parse_copy_properties, operation_name=_operation_name)
 
     def abort_copy_blob(self, container_name, blob_name, copy_id,
                         lease_id=None, timeout=None):
@@ -3364,7 +3645,7 @@ class BaseBlobService(StorageClient):
             'x-ms-copy-action': 'abort',
         }
 
-        self._perform_request(request)
+        return self._perform_request(request, operation_name='abort_copy_blob')
 
     def delete_blob(self, container_name, blob_name, snapshot=None,
                     lease_id=None, delete_snapshots=None,
@@ -3430,7 +3711,7 @@ class BaseBlobService(StorageClient):
                                                            if_none_match=if_none_match,
                                                            timeout=timeout)
 
-        self._perform_request(request)
+        return self._perform_request(request, operation_name='delete_blob')
 
     def batch_delete_blobs(self, batch_delete_sub_requests, timeout=None):
         '''
@@ -3469,7 +3750,8 @@ class BaseBlobService(StorageClient):
 
         request.body = _serialize_batch_body(batch_http_requests, batch_id)
 
-        return self._perform_request(request, parser=_ingest_batch_response, parser_args=[batch_delete_sub_requests])
+        return self._perform_request(request, parser=_ingest_batch_response, parser_args=[batch_delete_sub_requests],
+                                     operation_name='batch_delete_blobs')
 
     def _construct_batch_delete_sub_http_request(self, content_id, batch_delete_sub_request):
         """
@@ -3566,4 +3848,4 @@ class BaseBlobService(StorageClient):
             'timeout': _int_to_str(timeout)
         }
 
-        self._perform_request(request)
+        return self._perform_request(request, operation_name='undelete_blob')
@@ -30,6 +30,10 @@ from azure.storage.common._error import (
     _ERROR_VALUE_NEGATIVE,
     _ERROR_VALUE_SHOULD_BE_STREAM
 )
+from azure.storage.common._memory_mapping import (
+    _MemoryMappedFile,
+    _open_file_for_upload,
+)
 from azure.storage.common._http import HTTPRequest
 from azure.storage.common._serialization import (
     _get_request_body,
@@ -58,6 +62,8 @@ from ._serialization import (
 )
 from ._upload_chunking import (
     _BlockBlobChunkUploader,
+    _get_adaptive_block_size,
+    _get_block_size,
     _upload_blob_chunks,
     _upload_blob_substream_blocks,
 )
@@ -85,7 +91,16 @@ class BlockBlobService(BaseBlobService):
     :ivar int MAX_BLOCK_SIZE:
         The size of the blocks put by create_blob_from_* methods if the content
         length is unknown or is larger than MAX_SINGLE_PUT_SIZE. Smaller blocks
-        may be put. The maximum block size the service supports is 100MB.
+        may be put. Larger blocks are put if the blob would otherwise need more
+        than the 50,000 blocks a blob may have. The maximum block size the service
+        supports is 100MB.
+    :ivar bool ADAPTIVE_BLOCK_SIZE:
+        If True, the create_blob_from_* methods tune the size of the blocks they
+        put as they upload, starting at MAX_BLOCK_SIZE. The blocks grow while
+        larger blocks raise the throughput of a put, up to 100MB, and shrink
+        when a put takes more than ten seconds, so that fewer requests are made
+        on fast connections. In the upload path which buffers the blocks, up to
+        max_connections + 1 blocks of the grown size are held in memory.
     :ivar int MIN_LARGE_BLOCK_UPLOAD_THRESHOLD:
         The minimum block size at which the the memory-optimized, block upload
         algorithm is considered. This algorithm is only applicable to the create_blob_from_file and
@@ -96,6 +111,7 @@ class BlockBlobService(BaseBlobService):
 
     MAX_SINGLE_PUT_SIZE = 64 * 1024 * 1024
     MAX_BLOCK_SIZE = 4 * 1024 * 1024
+    ADAPTIVE_BLOCK_SIZE = False
     MIN_LARGE_BLOCK_UPLOAD_THRESHOLD = 4 * 1024 * 1024 + 1
 
     def __init__(self, account_name=None, account_key=None, sas_token=None, is_emulated=False,
@@ -184,7 +200,7 @@ class BlockBlobService(BaseBlobService):
         '''
         _validate_encryption_unsupported(self.require_encryption, self.key_encryption_key)
 
-        self._put_block(
+        return self._put_block(
             container_name,
             blob_name,
             block,
@@ -193,6 +209,7 @@ class BlockBlobService(BaseBlobService):
             lease_id=lease_id,
             timeout=timeout,
             cpk=cpk,
+            _operation_name='put_block',
         )
 
     def put_block_list(
@@ -285,6 +302,7 @@ class BlockBlobService(BaseBlobService):
             timeout=timeout,
             standard_blob_tier=standard_blob_tier,
             cpk=cpk,
+            _operation_name='put_block_list',
         )
 
     def get_block_list(self, container_name, blob_name, snapshot=None,
@@ -332,7 +350,7 @@ class BlockBlobService(BaseBlobService):
         }
         request.headers = {'x-ms-lease-id': _to_str(lease_id)}
 
-        return self._perform_request(request, _convert_xml_to_block_list)
+        return self._perform_request(request, _convert_xml_to_block_list, operation_name='get_block_list')
 
     def put_block_from_url(self, container_name, blob_name, copy_source_url, block_id,
                            source_range_start=None, source_range_end=None,
@@ -397,7 +415,7 @@ class BlockBlobService(BaseBlobService):
             range_header_name="x-ms-source-range"
         )
 
-        self._perform_request(request)
+        return self._perform_request(request, operation_name='put_block_from_url')
 
     # ----Convenience APIs-----------------------------------------------------
 
@@ -408,6 +426,8 @@ class BlockBlobService(BaseBlobService):
         '''
         Creates a new blob from a file path, or updates the content of an
         existing blob, with automatic chunking and progress notifications.
+        The file is memory-mapped when it can be, and each block is sent
+        straight from the mapping, so no block is buffered in memory.
 
         :param str container_name:
             Name of existing container.
@@ -480,7 +500,7 @@ class BlockBlobService(BaseBlobService):
         _validate_not_none('file_path', file_path)
 
         count = path.getsize(file_path)
-        with open(file_path, 'rb') as stream:
+        with _open_file_for_upload(file_path) as stream:
             return self.create_blob_from_stream(container_name=container_name, blob_name=blob_name, stream=stream,
                                                 count=count, content_settings=content_settings, metadata=metadata,
                                                 validate_content=validate_content, progress_callback=progress_callback,
@@ -578,6 +598,8 @@ class BlockBlobService(BaseBlobService):
             is an inexpensive operation and this is not much of a concern. However, for other variants of streams
             this may not be the case. The trade-off for memory-efficiency must be weighed against the cost of seeking
             with your input stream.
+            Streams which read a regular file are the exception where os.pread is available:
+            each SubStream reads its own position of the file, without the lock or seeking.
             The SubStream class will attempt to buffer up to 4 MB internally to reduce the amount of
             seek and read calls to the underlying stream. This is particularly beneficial when uploading larger blocks.
         :param StandardBlobTier standard_blob_tier:
@@ -630,7 +652,8 @@ class BlockBlobService(BaseBlobService):
                 if_none_match=if_none_match,
                 standard_blob_tier=standard_blob_tier,
                 cpk=cpk,
-                timeout=timeout)
+                timeout=timeout,
+                _operation_name='create_blob_from_stream')
 
             if progress_callback:
                 progress_callback(count, count)
@@ -638,9 +661,13 @@ class BlockBlobService(BaseBlobService):
             return resp
         else:  # Size is larger than MAX_SINGLE_PUT_SIZE, must upload with multiple put_block calls
             cek, iv, encryption_data = None, None, None
+            block_size = _get_block_size(count, self.MAX_BLOCK_SIZE)
+            chunk_sizer = _get_adaptive_block_size(count, block_size) if self.ADAPTIVE_BLOCK_SIZE else None
 
+            # the blocks of a memory-mapped file are sent straight from the mapping, without buffering
             use_original_upload_path = use_byte_buffer or validate_content or self.require_encryption or \
-                                       self.MAX_BLOCK_SIZE < self.MIN_LARGE_BLOCK_UPLOAD_THRESHOLD or \
+                                       block_size < self.MIN_LARGE_BLOCK_UPLOAD_THRESHOLD or \
+                                       isinstance(stream, _MemoryMappedFile) or \
                                        hasattr(stream, 'seekable') and not stream.seekable() or \
                                        not hasattr(stream, 'seek') or not hasattr(stream, 'tell')
 
@@ -653,7 +680,7 @@ class BlockBlobService(BaseBlobService):
                     container_name=container_name,
                     blob_name=blob_name,
                     blob_size=count,
-                    block_size=self.MAX_BLOCK_SIZE,
+                    block_size=block_size,
                     stream=stream,
                     max_connections=max_connections,
                     progress_callback=progress_callback,
@@ -664,6 +691,7 @@ class BlockBlobService(BaseBlobService):
                     content_encryption_key=cek,
                     initialization_vector=iv,
                     cpk=cpk,
+                    chunk_sizer=chunk_sizer,
                 )
             else:
                 block_ids = _upload_blob_substream_blocks(
@@ -671,7 +699,7 @@ class BlockBlobService(BaseBlobService):
                     container_name=container_name,
                     blob_name=blob_name,
                     blob_size=count,
-                    block_size=self.MAX_BLOCK_SIZE,
+                    block_size=block_size,
                     stream=stream,
                     max_connections=max_connections,
                     progress_callback=progress_callback,
@@ -680,6 +708,7 @@ class BlockBlobService(BaseBlobService):
                     uploader_class=_BlockBlobChunkUploader,
                     timeout=timeout,
                     cpk=cpk,
+                    chunk_sizer=chunk_sizer,
                 )
 
             return self._put_block_list(
@@ -698,6 +727,7 @@ class BlockBlobService(BaseBlobService):
                 encryption_data=encryption_data,
                 standard_blob_tier=standard_blob_tier,
                 cpk=cpk,
+                _operation_name='create_blob_from_stream',
             )
 
     def create_blob_from_bytes(self, container_name, blob_name, blob, index=0, count=None, content_settings=None,
@@ -914,7 +944,7 @@ class BlockBlobService(BaseBlobService):
         request = self._get_basic_set_blob_tier_http_request(container_name, blob_name, standard_blob_tier,
                                                              timeout=timeout, rehydrate_priority=rehydrate_priority)
 
-        self._perform_request(request)
+        return self._perform_request(request, operation_name='set_standard_blob_tier')
 
     def batch_set_standard_blob_tier(
             self, batch_set_blob_tier_sub_requests, timeout=None):
@@ -957,7 +987,8 @@ class BlockBlobService(BaseBlobService):
         request.body = _serialize_batch_body(batch_http_requests, batch_id)
 
         return self._perform_request(request, parser=_ingest_batch_response,
-                                     parser_args=[batch_set_blob_tier_sub_requests])
+                                     parser_args=[batch_set_blob_tier_sub_requests],
+                                     operation_name='batch_set_standard_blob_tier')
 
     def _construct_batch_set_blob_tier_sub_http_request(self, content_id, batch_set_blob_tier_sub_request):
         """
@@ -1155,13 +1186,14 @@ class BlockBlobService(BaseBlobService):
                                incremental_copy=False,
                                requires_sync=requires_sync,
                                standard_blob_tier=standard_blob_tier,
-                               rehydrate_priority=rehydrate_priority)
+                               rehydrate_priority=rehydrate_priority,
+                               _operation_name='copy_blob')
 
     # -----Helper methods------------------------------------
     def _put_blob(self, container_name, blob_name, blob, content_settings=None,
                   metadata=None, validate_content=False, lease_id=None, if_modified_since=None,
                   if_unmodified_since=None, if_match=None, if_none_match=None,
-                  cpk=None, timeout=None, standard_blob_tier=None):
+                  cpk=None, timeout=None, standard_blob_tier=None, _operation_name=None):
         '''
         Creates a blob or updates an existing blob.
 
@@ -1255,10 +1287,10 @@ class BlockBlobService(BaseBlobService):
             computed_md5 = _get_content_md5(request.body)
             request.headers['Content-MD5'] = _to_str(computed_md5)
 
-        return self._perform_request(request, _parse_base_properties)
+        return self._perform_request(request, _parse_base_properties, operation_name=_operation_name)
 
     def _put_block(self, container_name, blob_name, block, block_id,
-                   validate_content=False, lease_id=None, cpk=None, timeout=None):
+                   validate_content=False, lease_id=None, cpk=None, timeout=None, _operation_name=None):
         '''
         See put_block for more details. This helper method
         allows for encryption or other such special behavior because
@@ -1298,13 +1330,13 @@ class BlockBlobService(BaseBlobService):
             computed_md5 = _get_content_md5(request.body)
             request.headers['Content-MD5'] = _to_str(computed_md5)
 
-        self._perform_request(request)
+        return self._perform_request(request, operation_name=_operation_name)
 
     def _put_block_list(
             self, container_name, blob_name, block_list, content_settings=None,
             metadata=None, validate_content=False, lease_id=None, if_modified_since=None,
             if_unmodified_since=None, if_match=None, if_none_match=None,
-            timeout=None, encryption_data=None, cpk=None, standard_blob_tier=None):
+            timeout=None, encryption_data=None, cpk=None, standard_blob_tier=None, _operation_name=None):
         '''
         See put_block_list for more details. This helper method
         allows for encryption or other such special behavior because
@@ -1349,4 +1381,4 @@ class BlockBlobService(BaseBlobService):
         if encryption_data is not None:
             request.headers['x-ms-meta-encryptiondata'] = encryption_data
 
-        return self._perform_request(request, _parse_base_properties)
+        return self._perform_request(request, _parse_base_properties, operation_name=_operation_name)
@@ -3,7 +3,13 @@
 # Licensed under the MIT License. See License.txt in the project root for
 # license information.
 # --------------------------------------------------------------------------
+from array import array
+
 from azure.storage.common._common_conversion import _to_str
+from azure.storage.common._deserialization import (
+    _to_column,
+    _INT64_COLUMN_TYPECODE,
+)
 
 
 class Container(object):
@@ -293,6 +299,59 @@ class BlobPrefix(object):
         self.name = None
 
 
+class BlobColumns(object):
+    '''
+    The blobs of a listing, as returned by 
+    :func:`~azure.storage.blob.baseblobservice.BaseBlobService.list_blob_columns`, 
+    with a column for each property rather than an object for each blob. The 
+    numeric columns are NumPy arrays when NumPy is installed, and array.array 
+    buffers otherwise, so that listings can be compared with vectorized operations. 
+    On Python 2.7 builds where long is 32 bits, the array.array buffers hold the 
+    64 bit integer columns as doubles.
+
+    :ivar list(str) names:
+        The names of the blobs.
+    :ivar content_lengths:
+        The sizes of the blobs in bytes, as 64 bit integers.
+    :vartype content_lengths: numpy.ndarray or array.array
+    :ivar last_modified:
+        The times the blobs were last modified, in whole seconds since the 
+        epoch, as 64 bit integers.
+    :vartype last_modified: numpy.ndarray or array.array
+    :ivar list(str) etags:
+        The ETags of the blobs.
+    :ivar list(str) blob_tiers:
+        The access tiers of the blobs, or None for blobs the service did not 
+        return a tier for.
+    :ivar str next_marker:
+        The continuation token to list the blobs after these with, if 
+        num_results was reached before all the blobs were listed.
+    '''
+
+    def __init__(self):
+        self.names = []
+        self.content_lengths = array(_INT64_COLUMN_TYPECODE)
+        self.last_modified = array(_INT64_COLUMN_TYPECODE)
+        self.etags = []
+        self.blob_tiers = []
+        self.next_marker = None
+
+    def __len__(self):
+        return len(self.names)
+
+    def _extend(self, page):
+        self.names.extend(page.names)
+        self.content_lengths.extend(page.content_lengths)
+        self.last_modified.extend(page.last_modified)
+        self.etags.extend(page.etags)
+        self.blob_tiers.extend(page.blob_tiers)
+        self.next_marker = page.next_marker
+
+    def _finish(self):
+        self.content_lengths = _to_column(self.content_lengths)
+        self.last_modified = _to_column(self.last_modified)
+
+
 class BlobBlockState(object):
     '''Block blob block types.'''
 
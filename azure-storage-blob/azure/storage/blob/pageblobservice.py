@@ -23,6 +23,7 @@ from azure.storage.common._error import (
     _validate_encryption_unsupported,
     _ERROR_VALUE_NEGATIVE,
 )
+from azure.storage.common._memory_mapping import _open_file_for_upload
 from azure.storage.common._http import HTTPRequest
 from azure.storage.common._serialization import (
     _get_data_bytes_only,
@@ -44,6 +45,7 @@ from ._serialization import (
 )
 from ._upload_chunking import (
     _PageBlobChunkUploader,
+    _get_adaptive_page_size,
     _upload_blob_chunks,
 )
 from .baseblobservice import BaseBlobService
@@ -75,9 +77,15 @@ class PageBlobService(BaseBlobService):
         The size of the pages put by create_blob_from_* methods. Smaller pages 
         may be put if there is less data provided. The maximum page size the service 
         supports is 4MB. When using the create_blob_from_* methods, empty pages are skipped.
+    :ivar bool ADAPTIVE_PAGE_SIZE:
+        If True, the create_blob_from_* methods tune the size of the pages they
+        put as they upload, starting at MAX_PAGE_SIZE. The pages grow while larger
+        pages raise the throughput of a put, up to 4MB, and shrink when a put
+        takes more than ten seconds.
     '''
 
     MAX_PAGE_SIZE = 4 * 1024 * 1024
+    ADAPTIVE_PAGE_SIZE = False
 
     def __init__(self, account_name=None, account_key=None, sas_token=None, is_emulated=False,
                  protocol=DEFAULT_PROTOCOL, endpoint_suffix=SERVICE_HOST_BASE, custom_domain=None,
@@ -213,6 +221,7 @@ class PageBlobService(BaseBlobService):
             if_none_match=if_none_match,
             timeout=timeout,
             cpk=cpk,
+            _operation_name='create_blob',
         )
 
     def incremental_copy_blob(self, container_name, blob_name, copy_source,
@@ -296,7 +305,8 @@ class PageBlobService(BaseBlobService):
                                destination_if_none_match=destination_if_none_match,
                                destination_lease_id=destination_lease_id,
                                source_lease_id=source_lease_id, timeout=timeout,
-                               incremental_copy=True)
+                               incremental_copy=True,
+                               _operation_name='incremental_copy_blob')
 
     def update_page(
             self, container_name, blob_name, page, start_range, end_range,
@@ -391,7 +401,8 @@ class PageBlobService(BaseBlobService):
             if_match=if_match,
             if_none_match=if_none_match,
             cpk=cpk,
-            timeout=timeout
+            timeout=timeout,
+            _operation_name='update_page',
         )
 
     def update_page_from_url(self, container_name, blob_name, start_range, end_range, copy_source_url,
@@ -528,7 +539,7 @@ class PageBlobService(BaseBlobService):
             source_range_start+(end_range-start_range),
             range_header_name="x-ms-source-range")
 
-        return self._perform_request(request, _parse_page_properties)
+        return self._perform_request(request, _parse_page_properties, operation_name='update_page_from_url')
 
     def clear_page(
             self, container_name, blob_name, start_range, end_range,
@@ -618,7 +629,7 @@ class PageBlobService(BaseBlobService):
             end_range,
             align_to_page=True)
 
-        return self._perform_request(request, _parse_page_properties)
+        return self._perform_request(request, _parse_page_properties, operation_name='clear_page')
 
     def get_page_ranges(
             self, container_name, blob_name, snapshot=None, start_range=None,
@@ -705,7 +716,7 @@ class PageBlobService(BaseBlobService):
                 end_range_required=False,
                 align_to_page=True)
 
-        return self._perform_request(request, _convert_xml_to_page_ranges)
+        return self._perform_request(request, _convert_xml_to_page_ranges, operation_name='get_page_ranges')
 
     def get_page_ranges_diff(
             self, container_name, blob_name, previous_snapshot, snapshot=None,
@@ -799,7 +810,7 @@ class PageBlobService(BaseBlobService):
                 end_range_required=False,
                 align_to_page=True)
 
-        return self._perform_request(request, _convert_xml_to_page_ranges)
+        return self._perform_request(request, _convert_xml_to_page_ranges, operation_name='get_page_ranges_diff')
 
     def set_sequence_number(
             self, container_name, blob_name, sequence_number_action, sequence_number=None,
@@ -869,7 +880,7 @@ class PageBlobService(BaseBlobService):
             'If-None-Match': _to_str(if_none_match),
         }
 
-        return self._perform_request(request, _parse_page_properties)
+        return self._perform_request(request, _parse_page_properties, operation_name='set_sequence_number')
 
     def resize_blob(
             self, container_name, blob_name, content_length,
@@ -935,7 +946,7 @@ class PageBlobService(BaseBlobService):
             'If-None-Match': _to_str(if_none_match),
         }
 
-        return self._perform_request(request, _parse_page_properties)
+        return self._perform_request(request, _parse_page_properties, operation_name='resize_blob')
 
     # ----Convenience APIs-----------------------------------------------------
 
@@ -947,7 +958,9 @@ class PageBlobService(BaseBlobService):
         '''
         Creates a new blob from a file path, or updates the content of an
         existing blob, with automatic chunking and progress notifications.
-        Empty chunks are skipped, while non-emtpy ones(even if only partly filled) are uploaded.
+        Empty pages are skipped, and the holes of a sparse file are not read.
+        The file is memory-mapped when it can be, and each chunk is sent
+        straight from the mapping, so no chunk is buffered in memory.
 
         :param str container_name:
             Name of existing container.
@@ -1018,7 +1031,7 @@ class PageBlobService(BaseBlobService):
         _validate_not_none('file_path', file_path)
 
         count = path.getsize(file_path)
-        with open(file_path, 'rb') as stream:
+        with _open_file_for_upload(file_path) as stream:
             return self.create_blob_from_stream(
                 container_name=container_name,
                 blob_name=blob_name,
@@ -1047,7 +1060,7 @@ class PageBlobService(BaseBlobService):
         '''
         Creates a new blob from a file/stream, or updates the content of an
         existing blob, with automatic chunking and progress notifications.
-        Empty chunks are skipped, while non-emtpy ones(even if only partly filled) are uploaded.
+        Empty pages are skipped, and the holes of a sparse file are not read.
 
         :param str container_name:
             Name of existing container.
@@ -1148,6 +1161,7 @@ class PageBlobService(BaseBlobService):
             timeout=timeout,
             encryption_data=encryption_data,
             cpk=cpk,
+            _operation_name='create_blob_from_stream',
         )
 
         if count == 0:
@@ -1175,6 +1189,7 @@ class PageBlobService(BaseBlobService):
             initialization_vector=iv,
             resource_properties=resource_properties,
             cpk=cpk,
+            chunk_sizer=_get_adaptive_page_size(self.MAX_PAGE_SIZE) if self.ADAPTIVE_PAGE_SIZE else None,
         )
 
         return resource_properties
@@ -1188,7 +1203,7 @@ class PageBlobService(BaseBlobService):
         '''
         Creates a new blob from an array of bytes, or updates the content
         of an existing blob, with automatic chunking and progress
-        notifications. Empty chunks are skipped, while non-emtpy ones(even if only partly filled) are uploaded.
+        notifications. Empty pages are skipped.
 
         :param str container_name:
             Name of existing container.
@@ -1327,7 +1342,7 @@ class PageBlobService(BaseBlobService):
             'x-ms-access-tier': _to_str(premium_page_blob_tier)
         }
 
-        self._perform_request(request)
+        return self._perform_request(request, operation_name='set_premium_page_blob_tier')
 
     def copy_blob(self, container_name, blob_name, copy_source,
                   metadata=None,
@@ -1467,7 +1482,8 @@ class PageBlobService(BaseBlobService):
                                destination_if_none_match,
                                destination_lease_id,
                                source_lease_id, timeout,
-                               False)
+                               False,
+                               _operation_name='copy_blob')
 
     # -----Helper methods-----------------------------------------------------
 
@@ -1475,7 +1491,7 @@ class PageBlobService(BaseBlobService):
             self, container_name, blob_name, content_length, content_settings=None,
             sequence_number=None, metadata=None, lease_id=None, premium_page_blob_tier=None, if_modified_since=None,
             if_unmodified_since=None, if_match=None, if_none_match=None, timeout=None,
-            encryption_data=None, cpk=None):
+            encryption_data=None, cpk=None, _operation_name=None):
         '''
         See create_blob for more details. This helper method
         allows for encryption or other such special behavior because
@@ -1519,14 +1535,14 @@ class PageBlobService(BaseBlobService):
         if encryption_data is not None:
             request.headers['x-ms-meta-encryptiondata'] = encryption_data
 
-        return self._perform_request(request, _parse_base_properties)
+        return self._perform_request(request, _parse_base_properties, operation_name=_operation_name)
 
     def _update_page(
             self, container_name, blob_name, page, start_range, end_range,
             validate_content=False, lease_id=None, if_sequence_number_lte=None,
             if_sequence_number_lt=None, if_sequence_number_eq=None,
             if_modified_since=None, if_unmodified_since=None,
-            if_match=None, if_none_match=None, cpk=None, timeout=None):
+            if_match=None, if_none_match=None, cpk=None, timeout=None, _operation_name=None):
         '''
         See update_page for more details. This helper method
         allows for encryption or other such special behavior because
@@ -1565,4 +1581,4 @@ class PageBlobService(BaseBlobService):
             computed_md5 = _get_content_md5(request.body)
             request.headers['Content-MD5'] = _to_str(computed_md5)
 
-        return self._perform_request(request, _parse_page_properties)
+        return self._perform_request(request, _parse_page_properties, operation_name=_operation_name)
@@ -0,0 +1,132 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import threading
+from collections import OrderedDict
+from timeit import default_timer
+
+
+class _CacheEntry(object):
+    __slots__ = ('value', 'etag', 'expiry')
+
+    def __init__(self, value, etag, expiry):
+        self.value = value
+        self.etag = etag
+        self.expiry = expiry
+
+    def is_fresh(self):
+        return default_timer() < self.expiry
+
+
+class PropertiesCache(object):
+    '''
+    A cache of the properties and metadata of blobs and containers, which a
+    service object answers get_blob_properties, get_blob_metadata,
+    get_container_properties, get_container_metadata and exists from when it is
+    set as its properties_cache. Calls which pass a lease id, access conditions
+    or a customer provided key always go to the service.
+
+    Entries are used as they are for ttl seconds. After that, the entry of a
+    blob is revalidated with a request conditional on its ETag, which the
+    service answers with 304 Not Modified and no properties while the blob is
+    unchanged, and the entry of a container is fetched again. At most
+    max_entries are kept, evicting the least recently used.
+
+    Writes made through a service object using the cache invalidate the entries
+    of the blobs and containers they change. Changes made by other clients are
+    only seen once the entries are revalidated, so ttl bounds how stale the
+    results can be. A cache may be shared by several service objects for the
+    same account.
+    '''
+
+    def __init__(self, max_entries=1024, ttl=10):
+        '''
+        :param int max_entries:
+            The most blobs and containers to keep the properties of.
+        :param float ttl:
+            The number of seconds an entry is used for before it is revalidated.
+        '''
+        if max_entries < 1:
+            raise ValueError('max_entries must be at least 1.')
+
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        # the keys of the entries, by container and blob, to invalidate them with
+        self._index = {}
+        # advanced by each invalidation, so that a fetch overlapping a write is not stored
+        self._generation = 0
+
+    def clear(self):
+        '''
+        Removes all entries from the cache.
+        '''
+        with self._lock:
+            self._entries.clear()
+            self._index.clear()
+            self._generation += 1
+
+    def _lookup(self, key):
+        '''
+        Returns the entry for the key, or None, along with the generation to
+        store or renew it at.
+        '''
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                # most recently used
+                self._entries[key] = entry
+            return entry, self._generation
+
+    def _store(self, key, value, etag, generation):
+        with self._lock:
+            # the value may be older than a write made while it was fetched
+            if generation != self._generation:
+                return
+
+            self._entries.pop(key, None)
+            self._entries[key] = _CacheEntry(value, etag, default_timer() + self.ttl)
+            container_name, blob_name, snapshot = key
+            self._index.setdefault(container_name, {}).setdefault(blob_name, set()).add(snapshot)
+
+            while len(self._entries) > self.max_entries:
+                evicted_key, _ = self._entries.popitem(last=False)
+                self._remove_from_index(evicted_key)
+
+    def _renew(self, key, entry, generation):
+        with self._lock:
+            if generation == self._generation and self._entries.get(key) is entry:
+                entry.expiry = default_timer() + self.ttl
+
+    def _invalidate(self, container_name, blob_name=None):
+        '''
+        Removes the entries of all snapshots of the blob or, if blob_name is
+        None, of the container and all its blobs.
+        '''
+        with self._lock:
+            self._generation += 1
+
+            blobs = self._index.get(container_name)
+            if blobs is None:
+                return
+
+            blob_names = list(blobs) if blob_name is None else [blob_name]
+            for name in blob_names:
+                for snapshot in blobs.pop(name, ()):
+                    del self._entries[(container_name, name, snapshot)]
+            if not blobs:
+                del self._index[container_name]
+
+    def _remove_from_index(self, key):
+        # must be called while holding the lock
+        container_name, blob_name, snapshot = key
+        blobs = self._index[container_name]
+        snapshots = blobs[blob_name]
+        snapshots.discard(snapshot)
+        if not snapshots:
+            del blobs[blob_name]
+            if not blobs:
+                del self._index[container_name]
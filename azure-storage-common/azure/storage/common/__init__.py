@@ -26,14 +26,30 @@ from .models import (
     GeoReplication,
     LocationMode,
     RetryContext,
+    ConnectionPoolStats,
+    BandwidthUtilization,
+    RequestObserver,
+    RequestPhase,
+    RequestPhaseEvent,
 )
+from .bandwidthlimiter import BandwidthLimiter
+from .hedging import HedgingPolicy
 from .retry import (
     ExponentialRetry,
     LinearRetry,
+    AdaptiveRetry,
     no_retry,
 )
 from .sharedaccesssignature import (
     SharedAccessSignature,
 )
 from .tokencredential import TokenCredential
-from ._error import AzureSigningError
+from .transferexecutor import TransferExecutor
+from .transport import (
+    HTTPTransport,
+    Urllib3Transport,
+)
+from ._error import (
+    AzureSigningError,
+    AzureCircuitOpenError,
+)
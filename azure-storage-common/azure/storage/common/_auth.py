@@ -3,8 +3,12 @@
 # Licensed under the MIT License. See License.txt in the project root for
 # license information.
 # --------------------------------------------------------------------------
+import hashlib
+import hmac
+
 from ._common_conversion import (
-    _sign_string,
+    _decode_base64_to_bytes,
+    _encode_base64,
 )
 from ._constants import (
     DEV_ACCOUNT_NAME,
@@ -24,19 +28,38 @@ from ._error import (
     AzureSigningError,
     _wrap_exception,
 )
+from .models import _unicode_type
 
 
 class _StorageSharedKeyAuthentication(object):
+    # The standard headers signed with shared key, in the order they appear in the string to sign
+    _HEADERS_TO_SIGN = (
+        'content-encoding', 'content-language', 'content-length',
+        'content-md5', 'content-type', 'date', 'if-modified-since',
+        'if-match', 'if-none-match', 'if-unmodified-since', 'byte_range'
+    )
+
     def __init__(self, account_name, account_key, is_emulated=False):
         self.account_name = account_name
         self.account_key = account_key
         self.is_emulated = is_emulated
 
-    def _get_headers(self, request, headers_to_sign):
-        headers = dict((name.lower(), value) for name, value in request.headers.items() if value)
-        if 'content-length' in headers and headers['content-length'] == '0':
-            del headers['content-length']
-        return '\n'.join(headers.get(x, '') for x in headers_to_sign) + '\n'
+    @property
+    def account_key(self):
+        return self._account_key
+
+    @account_key.setter
+    def account_key(self, value):
+        self._account_key = value
+
+        # the key is decoded and the HMAC keyed with it when the first request is signed
+        self._hmac = None
+
+    def _get_hmac(self):
+        # Keying the HMAC digests the key, so a keyed HMAC is kept and copied for each request
+        if self._hmac is None:
+            self._hmac = hmac.HMAC(_decode_base64_to_bytes(self._account_key), digestmod=hashlib.sha256)
+        return self._hmac.copy()
 
     def _get_verb(self, request):
         return request.method + '\n'
@@ -52,21 +75,39 @@ class _StorageSharedKeyAuthentication(object):
 
         return '/' + self.account_name + uri_path
 
-    def _get_canonicalized_headers(self, request):
-        string_to_sign = ''
+    def _get_headers_and_canonicalized_headers(self, request):
+        '''
+        Returns the values of the standard headers to sign and the canonicalized 
+        x-ms- headers, reading the request headers once.
+        '''
+        headers = {}
         x_ms_headers = []
         for name, value in request.headers.items():
             if name.startswith('x-ms-'):
-                x_ms_headers.append((name.lower(), value))
+                if value is not None:
+                    x_ms_headers.append((name.lower(), value))
+            elif value:
+                headers[name.lower()] = value
+
+        if headers.get('content-length') == '0':
+            del headers['content-length']
+
         x_ms_headers.sort()
-        for name, value in x_ms_headers:
-            if value is not None:
-                string_to_sign += ''.join([name, ':', value, '\n'])
-        return string_to_sign
+        parts = [headers.get(name, '') for name in self._HEADERS_TO_SIGN]
+        parts.append(''.join([name + ':' + value + '\n' for name, value in x_ms_headers]))
+        return '\n'.join(parts)
+
+    def _get_canonicalized_resource_query(self, request):
+        sorted_queries = sorted((name, value) for name, value in request.query.items() if value is not None)
+        return ''.join(['\n' + name.lower() + ':' + value for name, value in sorted_queries])
 
     def _add_authorization_header(self, request, string_to_sign):
         try:
-            signature = _sign_string(self.account_key, string_to_sign)
+            signed_hmac_sha256 = self._get_hmac()
+            if isinstance(string_to_sign, _unicode_type):
+                string_to_sign = string_to_sign.encode('utf-8')
+            signed_hmac_sha256.update(string_to_sign)
+            signature = _encode_base64(signed_hmac_sha256.digest())
             auth_string = 'SharedKey ' + self.account_name + ':' + signature
             request.headers['Authorization'] = auth_string
         except Exception as ex:
@@ -75,34 +116,16 @@ class _StorageSharedKeyAuthentication(object):
             raise _wrap_exception(ex, AzureSigningError)
 
     def sign_request(self, request):
-        string_to_sign = \
-            self._get_verb(request) + \
-            self._get_headers(
-                request,
-                [
-                    'content-encoding', 'content-language', 'content-length',
-                    'content-md5', 'content-type', 'date', 'if-modified-since',
-                    'if-match', 'if-none-match', 'if-unmodified-since', 'byte_range'
-                ]
-            ) + \
-            self._get_canonicalized_headers(request) + \
-            self._get_canonicalized_resource(request) + \
-            self._get_canonicalized_resource_query(request)
+        string_to_sign = ''.join([
+            self._get_verb(request),
+            self._get_headers_and_canonicalized_headers(request),
+            self._get_canonicalized_resource(request),
+            self._get_canonicalized_resource_query(request),
+        ])
 
         self._add_authorization_header(request, string_to_sign)
         logger.debug("String_to_sign=%s", string_to_sign)
 
-    def _get_canonicalized_resource_query(self, request):
-        sorted_queries = [(name, value) for name, value in request.query.items()]
-        sorted_queries.sort()
-
-        string_to_sign = ''
-        for name, value in sorted_queries:
-            if value is not None:
-                string_to_sign += '\n' + name.lower() + ':' + value
-
-        return string_to_sign
-
 
 class _StorageNoAuthentication(object):
     def sign_request(self, request):
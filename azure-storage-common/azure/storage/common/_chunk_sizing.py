@@ -0,0 +1,77 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import threading
+
+from ._constants import (
+    _ADAPTIVE_CHUNK_GROWTH_THRESHOLD,
+    _ADAPTIVE_CHUNK_MAX_REQUEST_SECONDS,
+    _ADAPTIVE_CHUNK_MIN_SIZE,
+)
+
+
+class _AdaptiveChunkSize(object):
+    '''
+    Tunes the chunk size of an upload from the throughput and duration of the
+    requests which send its chunks. Each request spends a fixed latency on top
+    of the time to send its data, so while that latency is a large part of a
+    request, larger chunks raise the throughput as well as making for fewer
+    requests. The size doubles while doubling it raised the throughput of a
+    request by more than _ADAPTIVE_CHUNK_GROWTH_THRESHOLD, and goes back when
+    doubling lowered it by as much. It halves when a request takes longer than
+    _ADAPTIVE_CHUNK_MAX_REQUEST_SECONDS, so that a failed request has less to
+    send again. The size stays a multiple of alignment between min_size and
+    max_size.
+    '''
+
+    def __init__(self, size, max_size, min_size=None, alignment=1):
+        self._lock = threading.Lock()
+        self.size = size
+        self.max_size = max(size, max_size)
+        self.min_size = min(size, _ADAPTIVE_CHUNK_MIN_SIZE if min_size is None else min_size)
+        self.alignment = alignment
+
+        # the throughput of the requests of each size the chunks have had, averaged over the latest of them
+        self._throughputs = {}
+
+    def record(self, length, seconds):
+        '''
+        Records a request which sent length bytes of an upload in seconds. Only
+        the requests which send a whole chunk tune the size.
+        '''
+        if seconds <= 0:
+            return
+
+        with self._lock:
+            if length != self.size and length not in self._throughputs:
+                # the last chunk of the upload, or part of a chunk
+                return
+
+            throughput = length / float(seconds)
+            previous = self._throughputs.get(length)
+            self._throughputs[length] = throughput if previous is None else (previous + throughput) / 2
+
+            # the chunks in flight when the size changed still tell the throughput of their size
+            if length != self.size:
+                return
+
+            if seconds > _ADAPTIVE_CHUNK_MAX_REQUEST_SECONDS:
+                self._resize(self.size // 2)
+                return
+
+            throughput = self._throughputs[self.size]
+            smaller = max([size for size in self._throughputs if size < self.size] or [0])
+            larger = min([size for size in self._throughputs if size > self.size] or [0])
+            if smaller and throughput < self._throughputs[smaller] * (1 - _ADAPTIVE_CHUNK_GROWTH_THRESHOLD):
+                self._resize(smaller)
+            elif (not smaller or throughput > self._throughputs[smaller] * (1 + _ADAPTIVE_CHUNK_GROWTH_THRESHOLD)) \
+                    and (not larger or self._throughputs[larger] > throughput) \
+                    and seconds * 2 <= _ADAPTIVE_CHUNK_MAX_REQUEST_SECONDS:
+                self._resize(self.size * 2)
+
+    def _resize(self, size):
+        # must be called while holding the lock
+        size -= size % self.alignment
+        self.size = max(self.min_size, min(size, self.max_size))
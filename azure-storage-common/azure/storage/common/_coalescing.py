@@ -0,0 +1,92 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import threading
+
+from ._constants import (
+    _AUTHORIZATION_HEADER_NAME,
+    _CLIENT_REQUEST_ID_HEADER_NAME,
+)
+from ._http import HTTPResponse
+
+# the headers which differ between identical requests, and so are left out when comparing them
+_PER_REQUEST_HEADER_NAMES = frozenset([
+    _AUTHORIZATION_HEADER_NAME.lower(),
+    _CLIENT_REQUEST_ID_HEADER_NAME.lower(),
+    'x-ms-date',
+])
+
+
+def _get_coalescing_key(request):
+    '''
+    Returns what identifies the response to the request: its method, host, path,
+    query and every header other than those set anew for each request, such
+    as the date and signature. Conditional, range and lease headers are kept,
+    so requests which could be answered differently are never coalesced.
+    '''
+    query = tuple(sorted((name, value) for name, value in request.query.items() if value is not None))
+    headers = tuple(sorted((name.lower(), value) for name, value in request.headers.items()
+                           if value is not None and name.lower() not in _PER_REQUEST_HEADER_NAMES))
+    return request.method, request.host, request.path, query, headers
+
+
+class _InFlightRead(object):
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.exception = None
+
+
+class _ReadCoalescer(object):
+    '''
+    Shares one in-flight response between identical requests sent at the same
+    time. The first request is sent; the others wait for its response and are
+    each given their own copy of it. The copies leave out the echoed client
+    request id, which only matches the request that was sent. A request sent
+    once the response has arrived is sent anew, so nothing is cached.
+    '''
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight = {}
+
+    def send(self, request, send):
+        '''
+        Returns the response to the request, calling send to get it unless an
+        identical request is already in flight. send must read the body in full.
+        '''
+        key = _get_coalescing_key(request)
+        with self._lock:
+            read = self._in_flight.get(key)
+            if read is None:
+                read = self._in_flight[key] = _InFlightRead()
+                is_leader = True
+            else:
+                is_leader = False
+
+        if not is_leader:
+            read.done.wait()
+            if read.exception is not None:
+                raise read.exception
+            return _copy_response(read.response)
+
+        try:
+            response = send()
+            # the followers copy a snapshot, as the parser of the leader may change its response
+            read.response = _copy_response(response)
+            return response
+        except BaseException as ex:
+            read.exception = ex
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            read.done.set()
+
+
+def _copy_response(response):
+    headers = dict(response.headers)
+    headers.pop(_CLIENT_REQUEST_ID_HEADER_NAME, None)
+    return HTTPResponse(response.status, response.message, headers, response.body)
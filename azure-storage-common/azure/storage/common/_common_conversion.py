@@ -20,6 +20,9 @@ from .models import (
     _unicode_type,
 )
 
+# the request bodies sent as they are, including the buffers chunked uploads send without copying them
+_BYTES_TYPES = (bytes, bytearray, memoryview)
+
 if sys.version_info < (3,):
     def _str(value):
         if isinstance(value, unicode):
@@ -102,7 +105,7 @@ def _sign_string(key, string_to_sign, key_is_base64=True):
 
 def _get_content_md5(data):
     md5 = hashlib.md5()
-    if isinstance(data, bytes):
+    if isinstance(data, _BYTES_TYPES):
         md5.update(data)
     elif hasattr(data, 'read'):
         pos = 0
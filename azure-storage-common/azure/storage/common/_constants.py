@@ -43,6 +43,39 @@ if sys.version_info >= (3, 5):
     # the 2000 seconds was calculated with: 100MB (max block size)/ 50KB/s (an arbitrarily chosen minimum upload speed)
     DEFAULT_SOCKET_TIMEOUT = (20, 2000)
 
+# The most connections per host the client keeps pooled when it sizes the pools to match
+# the parallelism of the transfers in progress
+DEFAULT_MAX_CONNECTION_POOL_SIZE = 64
+
+# The most worker threads, and so chunks in flight, shared by the chunked transfers of all
+# the service objects, and how long in seconds an idle worker waits for more chunks
+DEFAULT_MAX_TRANSFER_WORKERS = 64
+_TRANSFER_WORKER_IDLE_TIMEOUT = 60
+
+# How long in seconds an idle worker thread of the hedged reads waits for more requests
+_HEDGE_WORKER_IDLE_TIMEOUT = 60
+
+# How long in seconds a request waits before asking the adaptive retry policy again to be sent
+_ADMISSION_POLL_INTERVAL = 0.01
+
+# The size of the pieces in which streamed response bodies are read off the connection
+_STREAMED_RESPONSE_READ_SIZE = 64 * 1024
+
+# How many seconds of bandwidth a bandwidth limiter lets through at once after being idle, and
+# over how many seconds it measures the current rates
+_BANDWIDTH_BURST_SECONDS = 0.1
+_BANDWIDTH_MEASUREMENT_WINDOW = 1.0
+
+# The most distinct values shared between the entries of listings
+_MAX_SHARED_VALUES = 1024
+
+# The smallest chunk size an adaptive upload shrinks to unless it starts smaller, the longest a request
+# of one of its chunks may take before the size is halved, and by how much doubling the size must raise
+# the throughput of a request for it to keep growing
+_ADAPTIVE_CHUNK_MIN_SIZE = 1024 * 1024
+_ADAPTIVE_CHUNK_MAX_REQUEST_SECONDS = 10
+_ADAPTIVE_CHUNK_GROWTH_THRESHOLD = 0.1
+
 # Encryption constants
 _ENCRYPTION_PROTOCOL_V1 = '1.0'
 
@@ -3,9 +3,28 @@
 # Licensed under the MIT License. See License.txt in the project root for
 # license information.
 # --------------------------------------------------------------------------
-from dateutil import parser
-
-from ._common_conversion import _to_str
+import hashlib
+import re
+from array import array
+from calendar import timegm
+from datetime import datetime
+from io import UnsupportedOperation
+
+from dateutil.tz import tzutc
+
+from ._common_conversion import (
+    _to_str,
+    _encode_base64,
+)
+from ._constants import (
+    _STREAMED_RESPONSE_READ_SIZE,
+    _MAX_SHARED_VALUES,
+)
+from ._error import (
+    _ERROR_INCOMPLETE_RESPONSE_BODY,
+    _validate_content_match,
+    AzureException,
+)
 
 try:
     from xml.etree import cElementTree as ETree
@@ -26,6 +45,85 @@ from .models import (
 )
 
 
+_MONTHS = {'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+           'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12}
+
+# Thu, 09 May 2019 00:57:50 GMT
+_RFC1123_PATTERN = re.compile(r'[A-Z][a-z]{2}, (\d{2}) ([A-Z][a-z]{2}) (\d{4}) (\d{2}):(\d{2}):(\d{2}) GMT\Z')
+
+# 2019-05-09T00:57:50.1234567Z, with optional fractional seconds and time zone
+_ISO8601_PATTERN = re.compile(r'(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\.(\d+))?(Z?)\Z')
+
+_UTC = tzutc()
+
+
+def _parse_datetime(value, ignoretz=False):
+    '''
+    Parses the RFC 1123 and ISO 8601 timestamps sent by the service, falling back 
+    to dateutil for any other format. Matches dateutil.parser.parse, but takes a 
+    fraction of the time, which adds up when listing thousands of resources.
+    '''
+    try:
+        match = _RFC1123_PATTERN.match(value)
+        if match is not None:
+            day, month, year, hour, minute, second = match.groups()
+            return datetime(int(year), _MONTHS[month], int(day), int(hour), int(minute), int(second),
+                            tzinfo=None if ignoretz else _UTC)
+
+        match = _ISO8601_PATTERN.match(value)
+        if match is not None:
+            year, month, day, hour, minute, second, fraction, zone = match.groups()
+            # like dateutil, keep the microseconds and drop any finer digits
+            microsecond = int(fraction[:6].ljust(6, '0')) if fraction else 0
+            return datetime(int(year), int(month), int(day), int(hour), int(minute), int(second), microsecond,
+                            tzinfo=_UTC if zone and not ignoretz else None)
+    except (KeyError, ValueError):
+        pass
+
+    # the parser is only needed for formats the service does not send, so it is imported on first use
+    from dateutil import parser
+    return parser.parse(value, ignoretz=ignoretz)
+
+
+def _to_epoch_seconds(value):
+    '''
+    Converts a timestamp sent by the service to the whole seconds since the epoch, 
+    without creating a datetime for the common RFC 1123 format.
+    '''
+    match = _RFC1123_PATTERN.match(value)
+    if match is not None and match.group(2) in _MONTHS:
+        day, month, year, hour, minute, second = match.groups()
+        return timegm((int(year), _MONTHS[month], int(day), int(hour), int(minute), int(second)))
+
+    return timegm(_parse_datetime(value).utctimetuple())
+
+
+try:
+    array('q')
+    _INT64_COLUMN_TYPECODE = 'q'
+except ValueError:
+    # Python 2.7 has no 'q' type code. Where long is 32 bits, doubles are used
+    # instead, which hold the integers exactly up to 2 ** 53.
+    _INT64_COLUMN_TYPECODE = 'l' if array('l').itemsize == 8 else 'd'
+
+# the NumPy types of the array.array columns of columnar listings, by type code
+_NUMPY_COLUMN_TYPES = {'q': 'int64', 'l': 'int64', 'd': 'float64', 'B': 'bool'}
+
+
+def _to_column(values):
+    '''
+    Returns an array.array column of a columnar listing as a NumPy array sharing 
+    its buffer when NumPy is installed, and as it is otherwise.
+    '''
+    try:
+        import numpy
+    except ImportError:
+        return values
+
+    column = numpy.frombuffer(values, dtype=_NUMPY_COLUMN_TYPES[values.typecode])
+    return column.astype('int64') if values.typecode == 'd' else column
+
+
 def _to_int(value):
     return value if value is None else int(value)
 
@@ -34,6 +132,25 @@ def _bool(value):
     return value.lower() == 'true'
 
 
+_shared_values = {}
+
+
+def _to_shared_str(value):
+    '''
+    Converts a value which repeats across the entries of a listing, such as a 
+    blob type or a lease state, returning the same string object each time it 
+    is seen rather than a copy per entry. Once _MAX_SHARED_VALUES distinct values 
+    have been seen, any others are converted as they are.
+    '''
+    value = _to_str(value)
+    shared = _shared_values.get(value)
+    if shared is not None:
+        return shared
+    if value is not None and len(_shared_values) < _MAX_SHARED_VALUES:
+        _shared_values[value] = value
+    return value
+
+
 def _to_upper_str(value):
     return _to_str(value).upper() if value is not None else None
 
@@ -50,7 +167,7 @@ def _get_download_size(start_range, end_range, resource_size):
 
 
 GET_PROPERTIES_ATTRIBUTE_MAP = {
-    'last-modified': (None, 'last_modified', parser.parse),
+    'last-modified': (None, 'last_modified', _parse_datetime),
     'etag': (None, 'etag', _to_str),
     'x-ms-blob-type': (None, 'blob_type', _to_str),
     'content-length': (None, 'content_length', _to_int),
@@ -59,13 +176,13 @@ GET_PROPERTIES_ATTRIBUTE_MAP = {
     'x-ms-blob-committed-block-count': (None, 'append_blob_committed_block_count', _to_int),
     'x-ms-blob-public-access': (None, 'public_access', _to_str),
     'x-ms-access-tier': (None, 'blob_tier', _to_str),
-    'x-ms-access-tier-change-time': (None, 'blob_tier_change_time', parser.parse),
+    'x-ms-access-tier-change-time': (None, 'blob_tier_change_time', _parse_datetime),
     'x-ms-access-tier-inferred': (None, 'blob_tier_inferred', _bool),
     'x-ms-archive-status': (None, 'rehydration_status', _to_str),
     'x-ms-share-quota': (None, 'quota', _to_int),
     'x-ms-server-encrypted': (None, 'server_encrypted', _bool),
     'x-ms-encryption-key-sha256': (None, 'encryption_key_sha256', _to_str),
-    'x-ms-creation-time': (None, 'creation_time', parser.parse),
+    'x-ms-creation-time': (None, 'creation_time', _parse_datetime),
     'content-type': ('content_settings', 'content_type', _to_str),
     'cache-control': ('content_settings', 'cache_control', _to_str),
     'content-encoding': ('content_settings', 'content_encoding', _to_str),
@@ -79,15 +196,15 @@ GET_PROPERTIES_ATTRIBUTE_MAP = {
     'x-ms-copy-source': ('copy', 'source', _to_str),
     'x-ms-copy-status': ('copy', 'status', _to_str),
     'x-ms-copy-progress': ('copy', 'progress', _to_str),
-    'x-ms-copy-completion-time': ('copy', 'completion_time', parser.parse),
+    'x-ms-copy-completion-time': ('copy', 'completion_time', _parse_datetime),
     'x-ms-copy-destination-snapshot': ('copy', 'destination_snapshot_time', _to_str),
     'x-ms-copy-status-description': ('copy', 'status_description', _to_str),
     'x-ms-has-immutability-policy': (None, 'has_immutability_policy', _bool),
     'x-ms-has-legal-hold': (None, 'has_legal_hold', _bool),
     'x-ms-file-attributes': ('smb_properties', 'ntfs_attributes', _to_str),
-    'x-ms-file-creation-time': ('smb_properties', 'creation_time', parser.parse, True),
-    'x-ms-file-last-write-time': ('smb_properties', 'last_write_time', parser.parse, True),
-    'x-ms-file-change-time': ('smb_properties', 'change_time', parser.parse, True),
+    'x-ms-file-creation-time': ('smb_properties', 'creation_time', _parse_datetime, True),
+    'x-ms-file-last-write-time': ('smb_properties', 'last_write_time', _parse_datetime, True),
+    'x-ms-file-change-time': ('smb_properties', 'change_time', _parse_datetime, True),
     'x-ms-file-permission-key': ('smb_properties', 'permission_key', _to_str),
     'x-ms-file-id': ('smb_properties', 'file_id', _to_str),
     'x-ms-file-parent-id': ('smb_properties', 'parent_id', _to_str),
@@ -130,7 +247,7 @@ def _parse_properties(response, result_class):
                 # if info[3] is True, time zones in parsed strings are ignored and a naive :class:`datetime` object
                 # will be returned.
                 ignoretz = info[3] if len(info) > 3 else False
-                header_value = info[2](value, ignoretz=ignoretz) if info[2] is parser.parse else info[2](value)
+                header_value = info[2](value, ignoretz=ignoretz) if info[2] is _parse_datetime else info[2](value)
                 setattr(attr, info[1], header_value)
 
     if hasattr(props, 'blob_type') and props.blob_type == 'PageBlob' and hasattr(props, 'blob_tier') and props.blob_tier is not None:
@@ -151,6 +268,133 @@ def _parse_length_from_content_range(content_range):
     return int(content_range.split(' ', 1)[1].split('/', 1)[1])
 
 
+def _get_seekable_stream_writer(stream):
+    '''
+    Returns a writer which places streamed response data at its offset relative 
+    to the current position of the stream, or None if the stream cannot seek. 
+    Writing by offset lets a retried request overwrite what a failed attempt 
+    already wrote.
+    '''
+    try:
+        if hasattr(stream, 'seekable') and not stream.seekable():
+            return None
+        start = stream.tell()
+    except (AttributeError, IOError, OSError, UnsupportedOperation):
+        return None
+
+    def write(offset, data):
+        position = start + offset
+        if stream.tell() != position:
+            stream.seek(position)
+        stream.write(data)
+
+    return write
+
+
+def _write_response_body(response, writer, validate_content=False):
+    '''
+    Copies the body of a streamed response to the writer in fixed-size pieces, 
+    calling writer(offset, data) for each one, so the body is never held in 
+    memory as a whole. The transactional MD5 is computed on the fly if 
+    validate_content is True.
+
+    A body with a Content-Encoding, such as a blob stored gzipped, may be 
+    decoded by the HTTP client as it is read, so its length need not match 
+    the Content-Length. It is read as a whole instead, as it was before the 
+    bodies were streamed.
+    '''
+    md5 = hashlib.md5() if validate_content else None
+    encoded = bool(response.headers.get('content-encoding'))
+    if encoded:
+        pieces = [response.body or b'']
+    else:
+        pieces = response.iter_content(_STREAMED_RESPONSE_READ_SIZE)
+
+    offset = 0
+    for data in pieces:
+        if md5 is not None:
+            md5.update(data)
+        writer(offset, data)
+        offset += len(data)
+
+    expected_length = response.headers.get('content-length')
+    if expected_length is not None and offset != int(expected_length) and not encoded:
+        raise AzureException(_ERROR_INCOMPLETE_RESPONSE_BODY.format(offset, expected_length))
+
+    if md5 is not None:
+        _validate_content_match(response.headers['content-md5'], _encode_base64(md5.digest()))
+
+    return offset
+
+
+class _ResponseBodyReader(object):
+    '''
+    A file-like view of the body of a response which reads it off the connection 
+    in fixed-size pieces as it is consumed.
+    '''
+
+    def __init__(self, response):
+        self._pieces = response.iter_content(_STREAMED_RESPONSE_READ_SIZE)
+        self._buffer = b''
+
+    def is_empty(self):
+        '''
+        Returns whether the body is empty, reading its first piece to find out.
+        '''
+        if not self._buffer:
+            self._buffer = next(self._pieces, b'')
+        return not self._buffer
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            data = self._buffer + b''.join(self._pieces)
+            self._buffer = b''
+            return data
+
+        # a short read is fine as long as it is not empty before the end of the body
+        if not self._buffer:
+            self._buffer = next(self._pieces, b'')
+        data = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return data
+
+
+def _iterparse_list(body, items_tag, result):
+    '''
+    Parses a listing response as its body is read off the connection and yields 
+    each element within the items_tag element once it is complete. The body is 
+    a _ResponseBodyReader. The element is cleared and dropped from the items_tag 
+    element once the caller has converted it, so neither the body nor the 
+    element tree is held in memory. The next marker is set on result once it 
+    has been parsed.
+
+    <EnumerationResults>
+      <items_tag>
+        <item>...</item>
+      </items_tag>
+      <NextMarker>string-value</NextMarker>
+    </EnumerationResults>
+    '''
+    result.next_marker = None
+    path = []
+    items_element = None
+    for event, element in ETree.iterparse(body, events=('start', 'end')):
+        if event == 'start':
+            path.append(element.tag)
+            if len(path) == 2 and element.tag == items_tag:
+                items_element = element
+            continue
+
+        path.pop()
+        if len(path) == 2 and path[1] == items_tag:
+            yield element
+            # the items element is still being built, so clearing the root would not drop the item
+            items_element.clear()
+        elif len(path) == 1 and element.tag == 'NextMarker':
+            # match findtext, which returns an empty string for an empty element
+            result.next_marker = element.text or ''
+
+
 def _convert_xml_to_signed_identifiers(response):
     '''
     <?xml version="1.0" encoding="utf-8"?>
@@ -181,11 +425,11 @@ def _convert_xml_to_signed_identifiers(response):
         if access_policy_element is not None:
             start_element = access_policy_element.find('Start')
             if start_element is not None:
-                access_policy.start = parser.parse(start_element.text)
+                access_policy.start = _parse_datetime(start_element.text)
 
             expiry_element = access_policy_element.find('Expiry')
             if expiry_element is not None:
-                access_policy.expiry = parser.parse(expiry_element.text)
+                access_policy.expiry = _parse_datetime(expiry_element.text)
 
             access_policy.permission = access_policy_element.findtext('Permission')
 
@@ -214,7 +458,7 @@ def _convert_xml_to_service_stats(response):
     geo_replication = GeoReplication()
     geo_replication.status = geo_replication_element.find('Status').text
     last_sync_time = geo_replication_element.find('LastSyncTime').text
-    geo_replication.last_sync_time = parser.parse(last_sync_time) if last_sync_time else None
+    geo_replication.last_sync_time = _parse_datetime(last_sync_time) if last_sync_time else None
 
     service_stats = ServiceStats()
     service_stats.geo_replication = geo_replication
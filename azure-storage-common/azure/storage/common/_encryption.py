@@ -5,11 +5,6 @@
 # --------------------------------------------------------------------------
 from collections import OrderedDict
 
-from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives.ciphers import Cipher
-from cryptography.hazmat.primitives.ciphers.algorithms import AES
-from cryptography.hazmat.primitives.ciphers.modes import CBC
-
 from ._common_conversion import (
     _encode_base64,
     _decode_base64_to_bytes,
@@ -187,6 +182,11 @@ def _generate_AES_CBC_cipher(cek, iv):
     :return: A cipher for encrypting in AES256 CBC.
     :rtype: ~cryptography.hazmat.primitives.ciphers.Cipher
     '''
+    # cryptography is imported on first use, so that importing the packages does not load it
+    from cryptography.hazmat.backends import default_backend
+    from cryptography.hazmat.primitives.ciphers import Cipher
+    from cryptography.hazmat.primitives.ciphers.algorithms import AES
+    from cryptography.hazmat.primitives.ciphers.modes import CBC
 
     backend = default_backend()
     algorithm = AES(cek)
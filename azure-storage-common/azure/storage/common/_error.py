@@ -55,6 +55,8 @@ _ERROR_RANGE_TOO_LARGE_FOR_MD5 = \
     'is not supported.'
 _ERROR_MD5_MISMATCH = \
     'MD5 mismatch. Expected value is \'{0}\', computed value is \'{1}\'.'
+_ERROR_INCOMPLETE_RESPONSE_BODY = \
+    'The response body ended after {0} bytes, but {1} bytes were expected.'
 _ERROR_TOO_MANY_ACCESS_POLICIES = \
     'Too many access policies provided. The server does not support setting more than 5 access policies on a single resource.'
 _ERROR_OBJECT_INVALID = \
@@ -216,3 +218,13 @@ class AzureSigningError(AzureException):
     Please visit https://docs.microsoft.com/en-us/azure/storage/common/storage-create-storage-account for more info.
     """
     pass
+
+
+class AzureCircuitOpenError(AzureException):
+    """
+    Represents a request which was not sent because too many of the recent requests to 
+    the same endpoint failed, and the circuit breaker of the 
+    :class:`~azure.storage.common.retry.AdaptiveRetry` policy is shedding load to let it recover.
+    Requests are sent again once the break duration of the policy has passed.
+    """
+    pass
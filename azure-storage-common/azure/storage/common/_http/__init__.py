@@ -46,6 +46,17 @@ class HTTPResponse(object):
         self.headers = headers
         self.body = body
 
+    def iter_content(self, chunk_size):
+        '''
+        Iterates over the body in pieces of at most chunk_size bytes.
+        '''
+        body = self.body or b''
+        for i in range(0, len(body), chunk_size):
+            yield body[i:i + chunk_size]
+
+    def close(self):
+        pass
+
 
 class HTTPRequest(object):
     '''
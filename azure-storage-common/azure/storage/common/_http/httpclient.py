@@ -5,12 +5,83 @@
 # --------------------------------------------------------------------------
 
 import logging
+
+import requests
+from requests.adapters import (
+    DEFAULT_POOLSIZE,
+    HTTPAdapter,
+)
+
 from . import HTTPResponse
 from .._serialization import _get_data_bytes_or_stream_only
+from ..models import ConnectionPoolStats
+from ..transport import (
+    HTTPTransport,
+    _count_pool_manager_connections,
+)
 logger = logging.getLogger(__name__)
 
 
-class _HTTPClient(object):
+def _create_session():
+    '''
+    Creates the session used when the caller does not provide one. Its 
+    connection pools are sized by the client to match the parallelism of the 
+    transfers in progress.
+    '''
+    session = requests.Session()
+    adapter = _ResizableHTTPAdapter()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def _count_pool_connections(adapter):
+    '''
+    Returns how many requests sent through the live pools of an adapter reused 
+    a pooled connection and how many had to open a new one.
+    '''
+    hits = 0
+    misses = 0
+    for pool_manager in [adapter.poolmanager] + list(adapter.proxy_manager.values()):
+        pool_manager_hits, pool_manager_misses = _count_pool_manager_connections(pool_manager)
+        hits += pool_manager_hits
+        misses += pool_manager_misses
+    return hits, misses
+
+
+class _ResizableHTTPAdapter(HTTPAdapter):
+    '''
+    An HTTPAdapter whose per-host connection pools can be grown while it is in 
+    use. Growing replaces the pools, so the reuse counts of the replaced pools 
+    are kept to report them along with those of the live pools.
+    '''
+
+    def __init__(self, pool_maxsize=DEFAULT_POOLSIZE):
+        self._retired_hits = 0
+        self._retired_misses = 0
+        super(_ResizableHTTPAdapter, self).__init__(pool_maxsize=pool_maxsize)
+
+    @property
+    def pool_maxsize(self):
+        return self._pool_maxsize
+
+    def resize(self, pool_maxsize):
+        hits, misses = _count_pool_connections(self)
+        retired_pool_manager = self.poolmanager
+
+        self.init_poolmanager(self._pool_connections, pool_maxsize, block=self._pool_block)
+        self._retired_hits += hits
+        self._retired_misses += misses
+
+        # connections still in use are closed instead of being returned to the retired pools
+        retired_pool_manager.clear()
+
+    def count_connections(self):
+        hits, misses = _count_pool_connections(self)
+        return self._retired_hits + hits, self._retired_misses + misses
+
+
+class _HTTPClient(HTTPTransport):
     '''
     Takes the request and sends it to cloud service and returns the response.
     '''
@@ -24,9 +95,7 @@ class _HTTPClient(object):
         :param int timeout:
             timeout for the http request, in seconds.
         '''
-        self.protocol = protocol
-        self.session = session
-        self.timeout = timeout
+        super(_HTTPClient, self).__init__(protocol, session, timeout)
 
         # By default, requests adds an Accept:*/* and Accept-Encoding to the session, 
         # which causes issues with some Azure REST APIs. Removing these here gives us 
@@ -37,7 +106,36 @@ class _HTTPClient(object):
         if 'Accept-Encoding' in self.session.headers:
             del self.session.headers['Accept-Encoding']
 
-        self.proxies = None
+    def _get_adapters(self):
+        adapters = []
+        for adapter in self.session.adapters.values():
+            if isinstance(adapter, HTTPAdapter) and adapter not in adapters:
+                adapters.append(adapter)
+        return adapters
+
+    def _grow_pools(self, pool_size):
+        # the pools of a session provided by the caller are left as they are
+        for adapter in self._get_adapters():
+            if isinstance(adapter, _ResizableHTTPAdapter) and adapter.pool_maxsize < pool_size:
+                logger.info("Growing the connection pools to hold %s connections per host.", pool_size)
+                adapter.resize(pool_size)
+
+    def get_connection_pool_stats(self):
+        '''
+        Returns how well the connections of the session are being reused.
+
+        :rtype: :class:`~azure.storage.common.models.ConnectionPoolStats`
+        '''
+        stats = ConnectionPoolStats()
+        for adapter in self._get_adapters():
+            if isinstance(adapter, _ResizableHTTPAdapter):
+                hits, misses = adapter.count_connections()
+            else:
+                hits, misses = _count_pool_connections(adapter)
+            stats.pool_size = max(stats.pool_size, adapter._pool_maxsize)
+            stats.hits += hits
+            stats.misses += misses
+        return stats
 
     def set_proxy(self, host, port, user, password):
         '''
@@ -57,21 +155,18 @@ class _HTTPClient(object):
         :param str password:
             Password for proxy authorization.
         '''
-        if user and password:
-            proxy_string = '{}:{}@{}:{}'.format(user, password, host, port)
-        else:
-            proxy_string = '{}:{}'.format(host, port)
-
-        self.proxies = {'http': 'http://{}'.format(proxy_string),
-                        'https': 'https://{}'.format(proxy_string)}
+        super(_HTTPClient, self).set_proxy(host, port, user, password)
 
-    def perform_request(self, request):
+    def perform_request(self, request, stream=False):
         '''
         Sends an HTTPRequest to Azure Storage and returns an HTTPResponse. If 
         the response code indicates an error, raise an HTTPError.    
         
         :param HTTPRequest request:
             The request to serialize and send.
+        :param bool stream:
+            If True, the response body is left on the connection and must be 
+            consumed through the returned response, which must then be closed.
         :return: An HTTPResponse containing the parsed HTTP response.
         :rtype: :class:`~azure.storage.common._http.HTTPResponse`
         '''
@@ -89,7 +184,8 @@ class _HTTPClient(object):
                                         headers=request.headers,
                                         data=request.body or None,
                                         timeout=self.timeout,
-                                        proxies=self.proxies)
+                                        proxies=self.proxies,
+                                        stream=stream)
 
         # Parse the response
         status = int(response.status_code)
@@ -101,7 +197,38 @@ class _HTTPClient(object):
             else:
                 response_headers[key.lower()] = name
 
+        if stream:
+            return _StreamingHTTPResponse(status, response.reason, response_headers, response)
+
         wrap = HTTPResponse(status, response.reason, response_headers, response.content)
         response.close()
 
         return wrap
+
+
+class _StreamingHTTPResponse(HTTPResponse):
+    '''
+    An HTTPResponse whose body is left on the connection until it is read, either 
+    all at once through the body attribute or in fixed-size pieces through 
+    iter_content. The connection is released when the response is closed.
+    '''
+
+    def __init__(self, status, message, headers, response):
+        self._response = response
+        super(_StreamingHTTPResponse, self).__init__(status, message, headers, None)
+
+    @property
+    def body(self):
+        if self._body is None and self._response is not None:
+            self._body = self._response.content
+        return self._body
+
+    @body.setter
+    def body(self, value):
+        self._body = value
+
+    def iter_content(self, chunk_size):
+        return self._response.iter_content(chunk_size)
+
+    def close(self):
+        self._response.close()
@@ -0,0 +1,100 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import mmap
+from io import (IOBase, SEEK_CUR, SEEK_END, SEEK_SET)
+
+
+def _open_file_for_upload(file_path):
+    '''
+    Opens the file at file_path for reading, memory-mapped if it can be. Empty
+    files, and files which cannot be mapped, are opened as regular files.
+    '''
+    try:
+        return _MemoryMappedFile(file_path)
+    except (ValueError, TypeError, EnvironmentError):
+        # mmap refuses empty files, and Python 2.7 cannot take a memoryview of a mapping
+        return open(file_path, 'rb')
+
+
+class _MemoryMappedFile(IOBase):
+    '''
+    A read-only stream over a file mapped into memory. get_view returns the rest
+    of the file without copying it or moving the position, so parallel uploads
+    can each send their own range of it without sharing a lock or a buffer.
+    '''
+
+    def __init__(self, file_path):
+        # the file is kept open for fileno, so that its holes can be found
+        self._file = open(file_path, 'rb')
+        try:
+            self._mapping = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._view = memoryview(self._mapping)
+        except:
+            self._file.close()
+            raise
+        self._position = 0
+
+    def __len__(self):
+        return len(self._view)
+
+    def close(self):
+        if not self.closed:
+            self._view.release()
+            try:
+                self._mapping.close()
+            except BufferError:
+                # a view handed out is still referenced, the mapping is unmapped once it is released
+                pass
+            self._file.close()
+        IOBase.close(self)
+
+    def fileno(self):
+        return self._file.fileno()
+
+    def get_view(self):
+        if self.closed:
+            raise ValueError("Stream is closed.")
+        return self._view[self._position:]
+
+    def read(self, n=-1):
+        if self.closed:
+            raise ValueError("Stream is closed.")
+
+        end = len(self._view) if n is None or n < 0 else min(self._position + n, len(self._view))
+        data = self._view[self._position:end].tobytes()
+        self._position += len(data)
+        return data
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if self.closed:
+            raise ValueError("Stream is closed.")
+
+        data = self._view[self._position:self._position + len(b)]
+        b[:len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def seek(self, offset, whence=SEEK_SET):
+        if whence == SEEK_SET:
+            start_index = 0
+        elif whence == SEEK_CUR:
+            start_index = self._position
+        elif whence == SEEK_END:
+            start_index = len(self._view)
+        else:
+            raise ValueError("Invalid argument for the 'whence' parameter.")
+
+        self._position = max(0, start_index + offset)
+        return self._position
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
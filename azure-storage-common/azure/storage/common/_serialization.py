@@ -32,6 +32,7 @@ from .models import (
     _unicode_type,
 )
 from ._common_conversion import (
+    _BYTES_TYPES,
     _str,
 )
 from ._constants import _CLIENT_REQUEST_ID_HEADER_NAME
@@ -90,11 +91,12 @@ def _add_date_header(request):
 
 def _get_data_bytes_only(param_name, param_value):
     '''Validates the request body passed in and converts it to bytes
-    if our policy allows it.'''
+    if our policy allows it. Buffers such as bytearray and memoryview are
+    passed through, so chunks can be sent without copying them.'''
     if param_value is None:
         return b''
 
-    if isinstance(param_value, bytes):
+    if isinstance(param_value, _BYTES_TYPES):
         return param_value
 
     raise TypeError(_ERROR_VALUE_SHOULD_BE_BYTES.format(param_name))
@@ -106,7 +108,7 @@ def _get_data_bytes_or_stream_only(param_name, param_value):
     if param_value is None:
         return b''
 
-    if isinstance(param_value, bytes) or hasattr(param_value, 'read'):
+    if isinstance(param_value, _BYTES_TYPES) or hasattr(param_value, 'read'):
         return param_value
 
     raise TypeError(_ERROR_VALUE_SHOULD_BE_BYTES_OR_STREAM.format(param_name))
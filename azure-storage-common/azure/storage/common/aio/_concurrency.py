@@ -0,0 +1,44 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import asyncio
+
+
+async def _run_concurrently(process, items, max_connections):
+    '''
+    Awaits process(item) for every item with at most max_connections of them in flight
+    and returns the results in the order of the items.
+
+    Like the thread pool used by the synchronous service objects, the next item is only
+    taken from items once a connection frees up, so a generator reading chunks from a
+    stream buffers at most max_connections + 1 of them. The first failure cancels the
+    work still in flight and is raised.
+    '''
+    throttler = asyncio.Semaphore(max_connections)
+    tasks = []
+
+    async def process_and_release(item):
+        try:
+            return await process(item)
+        finally:
+            throttler.release()
+
+    try:
+        for item in items:
+            await throttler.acquire()
+
+            # Check for exceptions and fail fast.
+            for task in tasks:
+                if task.done() and not task.cancelled() and task.exception() is not None:
+                    raise task.exception()
+
+            tasks.append(asyncio.ensure_future(process_and_release(item)))
+
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
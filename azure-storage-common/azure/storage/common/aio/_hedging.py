@@ -0,0 +1,62 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import asyncio
+from timeit import default_timer
+
+from ..hedging import (
+    _PRIMARY,
+    _SECONDARY,
+    _get_hedge_winner,
+)
+
+
+async def _send_hedged(policy, send, request, hedge_request):
+    '''
+    Awaits send(request) and, if it has not completed by the hedge delay, 
+    send(hedge_request) as well, picking the winner as the synchronous service 
+    objects do. The loser is cancelled. Returns the winning response along with 
+    the request which won, or raises the exception of the primary request if 
+    neither succeeded.
+    '''
+    async def send_primary():
+        start = default_timer()
+        try:
+            response = await send(request)
+        except asyncio.CancelledError:
+            # the primary lost, but how long it took so far is still a lower bound of its latency
+            policy._record_latency(default_timer() - start)
+            raise
+        policy._record_latency(default_timer() - start)
+        return response
+
+    tasks = {_PRIMARY: asyncio.ensure_future(send_primary())}
+    try:
+        done, _ = await asyncio.wait(tasks.values(), timeout=policy.get_hedge_delay())
+        hedged = not done
+        if hedged:
+            tasks[_SECONDARY] = asyncio.ensure_future(send(hedge_request))
+
+        while True:
+            outcomes = dict((location, _get_outcome(task)) for location, task in tasks.items() if task.done())
+            winner = _get_hedge_winner(outcomes.get(_PRIMARY), outcomes.get(_SECONDARY), hedged)
+            if winner is not None:
+                break
+            await asyncio.wait([task for task in tasks.values() if not task.done()],
+                               return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks.values():
+            if not task.done():
+                task.cancel()
+
+    response, exception = outcomes[winner]
+    if exception is not None:
+        raise exception
+    return response, request if winner == _PRIMARY else hedge_request
+
+
+def _get_outcome(task):
+    exception = task.exception()
+    return (None, exception) if exception is not None else (task.result(), None)
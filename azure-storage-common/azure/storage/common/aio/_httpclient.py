@@ -0,0 +1,108 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import logging
+from urllib.parse import urlencode
+
+from .._http import HTTPResponse
+from .._serialization import _get_data_bytes_or_stream_only
+
+logger = logging.getLogger(__name__)
+
+# aiohttp limits a session to 100 connections by default, which is too few to keep
+# thousands of short operations such as queue polls in flight
+_DEFAULT_CONNECTION_LIMIT = 1000
+
+
+class _AsyncHTTPClient(object):
+    '''
+    Takes the request and sends it to cloud service over an aiohttp session 
+    and returns the response.
+    '''
+
+    def __init__(self, protocol=None, session=None, timeout=None):
+        '''
+        :param str protocol:
+            http or https.
+        :param aiohttp.ClientSession session:
+            session object created with the aiohttp library. If not provided, 
+            one is created on first use and closed with the client.
+        :param timeout:
+            timeout for the http request, in seconds, or a (connect, read) tuple.
+        '''
+        self.protocol = protocol
+        self.session = session
+        self.timeout = timeout
+        self.proxies = None
+        self._owns_session = session is None
+
+    def _get_session(self):
+        if self.session is None:
+            import aiohttp
+
+            # Responses are handed to the parsers exactly as sent, so they must not be decompressed
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=_DEFAULT_CONNECTION_LIMIT),
+                auto_decompress=False)
+        return self.session
+
+    def _get_timeout(self):
+        import aiohttp
+
+        if isinstance(self.timeout, tuple):
+            return aiohttp.ClientTimeout(sock_connect=self.timeout[0], sock_read=self.timeout[1])
+        return aiohttp.ClientTimeout(sock_connect=self.timeout, sock_read=self.timeout)
+
+    async def close(self):
+        if self.session is not None and self._owns_session:
+            await self.session.close()
+            self.session = None
+
+    async def perform_request(self, request):
+        '''
+        Sends an HTTPRequest to Azure Storage and returns an HTTPResponse with 
+        the full body read.
+
+        :param HTTPRequest request:
+            The request to serialize and send.
+        :return: An HTTPResponse containing the parsed HTTP response.
+        :rtype: :class:`~azure.storage.common._http.HTTPResponse`
+        '''
+        from yarl import URL
+
+        # Verify the body is in bytes or either a file-like/stream object
+        if request.body:
+            request.body = _get_data_bytes_or_stream_only('request.body', request.body)
+
+        # Construct the URI. The path is already quoted and the query is encoded the 
+        # way requests would, so the URL must be sent without being re-encoded.
+        uri = self.protocol.lower() + '://' + request.host + request.path
+        query = [(key, value) for key, value in request.query.items() if value is not None]
+        if query:
+            uri += '?' + urlencode(query)
+
+        headers = {key: value for key, value in request.headers.items() if value is not None}
+
+        # Skip the headers aiohttp would otherwise add, as they are not part of the signed request
+        session = self._get_session()
+        async with session.request(request.method,
+                                   URL(uri, encoded=True),
+                                   headers=headers,
+                                   data=request.body or None,
+                                   timeout=self._get_timeout(),
+                                   proxy=self.proxies['http'] if self.proxies else None,
+                                   skip_auto_headers=('Accept', 'Accept-Encoding', 'Content-Type')) as response:
+            body = await response.read()
+
+            # Parse the response
+            response_headers = {}
+            for key, name in response.headers.items():
+                # Preserve the case of metadata
+                if key.lower().startswith('x-ms-meta-'):
+                    response_headers[key] = name
+                else:
+                    response_headers[key.lower()] = name
+
+            return HTTPResponse(response.status, response.reason, response_headers, body)
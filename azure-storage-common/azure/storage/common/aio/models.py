@@ -0,0 +1,105 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import asyncio
+
+from ..models import ListGenerator
+
+
+class AsyncListGenerator(object):
+    '''
+    An asynchronous generator object used to list storage resources. It behaves 
+    like :class:`~azure.storage.common.models.ListGenerator`, but is iterated with 
+    ``async for`` and awaits each further page of results from the service.
+
+    If max_results is specified and the account has more than that number of 
+    resources, the generator will have a populated next_marker field once it 
+    finishes. This marker can be used to create a new generator if more 
+    results are desired.
+
+    If prefetch_pages is greater than 0, the following pages are requested in a 
+    background task while the current page is iterated, keeping up to that 
+    many pages fetched ahead.
+    '''
+
+    def __init__(self, resources, list_method, list_args, list_kwargs, prefetch_pages=0):
+        self.items = resources
+        self.next_marker = resources.next_marker
+
+        self._list_method = list_method
+        self._list_args = list_args
+        self._list_kwargs = list_kwargs
+        self._prefetch_pages = prefetch_pages or 0
+
+    # the arguments of each page are worked out exactly as they are by the synchronous generator
+    _set_next_page_args = ListGenerator._set_next_page_args
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        if self._prefetch_pages > 0:
+            pages = _AsyncPagePrefetcher(self, self._prefetch_pages)
+        else:
+            pages = self._iter_pages()
+
+        try:
+            # return results
+            for i in self.items:
+                yield i
+
+            async for resources in pages:
+                self.items = resources
+                self.next_marker = resources.next_marker
+
+                # return results
+                for i in self.items:
+                    yield i
+        finally:
+            if isinstance(pages, _AsyncPagePrefetcher):
+                pages.stop()
+
+    async def _iter_pages(self):
+        resources = self.items
+        while self._set_next_page_args(resources):
+            # get the next segment
+            resources = await self._list_method(*self._list_args, **self._list_kwargs)
+            yield resources
+
+
+class _AsyncPagePrefetcher(object):
+    '''
+    Fetches the pages of an AsyncListGenerator in a background task, keeping up 
+    to prefetch_pages of them ahead of the one being iterated.
+    '''
+
+    def __init__(self, list_generator, prefetch_pages):
+        self._pages = asyncio.Queue()
+        self._room = asyncio.Semaphore(prefetch_pages)
+        self._task = asyncio.ensure_future(self._fetch(list_generator._iter_pages()))
+
+    async def __aiter__(self):
+        while True:
+            resources, exception = await self._pages.get()
+            if exception is not None:
+                raise exception
+            if resources is None:
+                return
+            self._room.release()
+            yield resources
+
+    def stop(self):
+        self._task.cancel()
+
+    async def _fetch(self, pages):
+        try:
+            while True:
+                await self._room.acquire()
+                resources = await pages.__anext__()
+                self._pages.put_nowait((resources, None))
+        except StopAsyncIteration:
+            self._pages.put_nowait((None, None))
+        except Exception as ex:
+            self._pages.put_nowait((None, ex))
@@ -0,0 +1,181 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import asyncio
+
+from azure.common import AzureException
+
+from .._constants import (
+    _ADMISSION_POLL_INTERVAL,
+    _AUTHORIZATION_HEADER_NAME,
+)
+from .._error import _wrap_exception
+from ..models import (
+    RequestPhase,
+    _OperationContext,
+)
+from ..storageclient import StorageClient
+from ._hedging import _send_hedged
+from ._httpclient import _AsyncHTTPClient
+
+
+async def _sleep_if_needed(delay):
+    if delay > 0:
+        await asyncio.sleep(delay)
+
+
+class AsyncStorageClient(StorageClient):
+    '''
+    This is the base class for the asyncio variants of the service objects. 
+    Requests are built, signed and parsed exactly as they are by the synchronous 
+    service objects, but they are sent over an aiohttp session and retried 
+    without blocking the event loop, so the operations of the service object 
+    are coroutines which must be awaited.
+
+    The aiohttp session is created on first use inside the running event loop. 
+    It is released by awaiting close(), or by using the service object as an 
+    async context manager.
+    '''
+
+    _async_httpclient = None
+
+    @property
+    def async_session(self):
+        '''
+        The aiohttp.ClientSession used to send requests. A session set by the 
+        caller is not closed by close().
+        '''
+        return self._get_async_httpclient().session
+
+    @async_session.setter
+    def async_session(self, value):
+        self._async_httpclient = _AsyncHTTPClient(session=value)
+
+    async def close(self):
+        '''
+        Closes the aiohttp session created by this service object, if any.
+        '''
+        if self._async_httpclient is not None:
+            await self._async_httpclient.close()
+            self._async_httpclient = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    def _get_async_httpclient(self):
+        if self._async_httpclient is None:
+            self._async_httpclient = _AsyncHTTPClient()
+
+        # the connection settings are kept on the synchronous client and may change at any time
+        self._async_httpclient.protocol = self._httpclient.protocol
+        self._async_httpclient.timeout = self._httpclient.timeout
+        self._async_httpclient.proxies = self._httpclient.proxies
+        return self._async_httpclient
+
+    def _prepare_attempt(self, request, retry_context, client_request_id_prefix, operation_name=None):
+        super(AsyncStorageClient, self)._prepare_attempt(request, retry_context, client_request_id_prefix,
+                                                         operation_name)
+
+        # A token credential signs the requests session rather than the request itself
+        if not hasattr(self.authentication, 'sign_request'):
+            request.headers[_AUTHORIZATION_HEADER_NAME] = self.request_session.headers[_AUTHORIZATION_HEADER_NAME]
+
+    def _perform_request(self, request, parser=None, parser_args=None, operation_context=None,
+                         expected_errors=None, stream=False, operation_name=None):
+        '''
+        Returns a coroutine which sends the request and returns the response. 
+        Catches HTTPError and hands it to error handler. Response bodies are 
+        always read in full, so stream only exists for compatibility with the 
+        synchronous service objects.
+        '''
+        return self._perform_request_async(request, parser, parser_args, operation_context, expected_errors,
+                                           operation_name)
+
+    async def _admit_attempt_async(self, request):
+        '''
+        Waits without blocking the event loop until the adaptive retry policy, if 
+        one is used, admits the attempt and returns it.
+        '''
+        policy = self._get_adaptive_retry()
+        if policy is None:
+            return None
+
+        attempt = policy._admit(request.host)
+        while attempt is None:
+            await asyncio.sleep(_ADMISSION_POLL_INTERVAL)
+            attempt = policy._admit(request.host)
+        return attempt
+
+    async def _send_async(self, http_client, request, retry_context):
+        '''
+        Sends the request, hedging it on the secondary endpoint if the hedging 
+        policy applies to it, within the budget of the bandwidth limiter if 
+        there is one.
+        '''
+        limiter = self.bandwidth_limiter
+        if limiter is not None:
+            await _sleep_if_needed(limiter._reserve_write(int(request.headers.get('Content-Length') or 0)))
+
+        hedge_request = self._get_hedge_request(request, retry_context)
+        if hedge_request is None:
+            response = await http_client.perform_request(request)
+        else:
+            response, sent_request = await _send_hedged(self.hedging_policy, http_client.perform_request, request,
+                                                        hedge_request)
+            self._apply_hedge_host(request, sent_request, retry_context)
+
+        # the body has already been read in full, so it is paced as a whole
+        if limiter is not None:
+            await _sleep_if_needed(limiter._reserve_read(len(response.body or b'')))
+        return response
+
+    async def _perform_request_async(self, request, parser, parser_args, operation_context, expected_errors,
+                                     operation_name):
+        operation_context = operation_context or _OperationContext()
+        retry_context, client_request_id_prefix = self._begin_request(request, operation_context)
+        http_client = self._get_async_httpclient()
+
+        with self._observe(RequestPhase.OPERATION, operation_name, request, retry_context) as operation_event:
+            while True:
+                try:
+                    response = None
+                    attempt = None
+                    attempt_exception = None
+                    try:
+                        attempt = await self._admit_attempt_async(request)
+                        self._prepare_attempt(request, retry_context, client_request_id_prefix, operation_name)
+
+                        # Perform the request
+                        with self._observe(RequestPhase.SEND, operation_name, request, retry_context) as event:
+                            response = await self._send_async(http_client, request, retry_context)
+                            self._set_bytes_received(event, response)
+
+                        return self._process_response(request, response, retry_context, client_request_id_prefix,
+                                                      parser, parser_args, operation_name)
+                    except AzureException as ex:
+                        retry_context.exception = attempt_exception = ex
+                        raise ex
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as ex:
+                        retry_context.exception = attempt_exception = ex
+                        raise _wrap_exception(ex, AzureException)
+                    finally:
+                        if attempt is not None:
+                            attempt.end(response, attempt_exception)
+
+                except AzureException as ex:
+                    retry_interval = self._get_retry_interval(ex, retry_context, client_request_id_prefix,
+                                                              expected_errors)
+
+                    # Wait for the desired retry interval without blocking the event loop
+                    with self._observe(RequestPhase.BACKOFF, operation_name, request, retry_context):
+                        await asyncio.sleep(retry_interval)
+                finally:
+                    self._end_attempt(request, operation_context, retry_context)
+                    self._set_retry_state(operation_event, retry_context)
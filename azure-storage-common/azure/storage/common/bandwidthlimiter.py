@@ -0,0 +1,214 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import threading
+from collections import deque
+from time import sleep
+from timeit import default_timer
+
+from ._constants import (
+    _BANDWIDTH_BURST_SECONDS,
+    _BANDWIDTH_MEASUREMENT_WINDOW,
+)
+from ._http import HTTPResponse
+from .models import BandwidthUtilization
+
+
+class _TokenBucket(object):
+    '''
+    Paces the bytes transferred in one direction to a rate. Each transfer takes
+    its bytes from the bucket, which refills at the rate and holds at most
+    _BANDWIDTH_BURST_SECONDS of it. A transfer which takes more than the bucket
+    holds leaves it in debt and waits until the debt is paid off, so transfers
+    are let through in the order they asked, however large they are.
+    '''
+
+    def __init__(self, rate):
+        self._lock = threading.Lock()
+        self._rate = rate
+        self._tokens = self._get_capacity()
+        self._updated = default_timer()
+
+        # the bytes transferred and the time each transfer is let through, to measure the current rate
+        self._transfers = deque()
+        self.total = 0
+
+    def _get_capacity(self):
+        return self._rate * _BANDWIDTH_BURST_SECONDS if self._rate else 0
+
+    def _refill(self, now):
+        # must be called while holding the lock
+        if self._rate:
+            self._tokens = min(self._tokens + (now - self._updated) * self._rate, self._get_capacity())
+        self._updated = now
+
+    @property
+    def rate(self):
+        return self._rate
+
+    @rate.setter
+    def rate(self, value):
+        with self._lock:
+            self._refill(default_timer())
+            self._rate = value
+            self._tokens = min(self._tokens, self._get_capacity())
+
+    def reserve(self, count):
+        '''
+        Takes count bytes from the bucket and returns how many seconds to wait
+        before transferring them.
+        '''
+        with self._lock:
+            now = default_timer()
+            self._refill(now)
+
+            delay = 0
+            if self._rate:
+                self._tokens -= count
+                if self._tokens < 0:
+                    delay = -self._tokens / float(self._rate)
+
+            self.total += count
+            self._transfers.append((now + delay, count))
+            while self._transfers[0][0] < now - _BANDWIDTH_MEASUREMENT_WINDOW:
+                self._transfers.popleft()
+            return delay
+
+    def get_current_rate(self):
+        with self._lock:
+            now = default_timer()
+            transferred = sum(count for time, count in self._transfers
+                              if now - _BANDWIDTH_MEASUREMENT_WINDOW <= time <= now)
+        return transferred / _BANDWIDTH_MEASUREMENT_WINDOW
+
+
+class BandwidthLimiter(object):
+    '''
+    Caps the bytes per second the service objects it is set on read and write,
+    so that bulk transfers leave bandwidth for other traffic. Reads, the bodies
+    of responses, and writes, the bodies of requests, have separate budgets.
+
+    Each request body is paced as a whole before it is sent, so a chunked
+    upload is paced chunk by chunk. Streamed response bodies, such as the
+    ranges of a chunked download, are paced piece by piece as they are read
+    off the connection; other responses are paced once they have been read.
+    Either way the wait happens on the thread, or coroutine, making the request,
+    and transfers wait their turn in the order they asked.
+
+    Set the limiter as the bandwidth_limiter of a service object to cap it
+    alone, or of several service objects to cap them together, up to every
+    service object of the process. The rates may be changed at any time.
+
+    :ivar int max_read_rate:
+        The most bytes per second read, or None to not limit reads.
+    :ivar int max_write_rate:
+        The most bytes per second written, or None to not limit writes.
+    '''
+
+    def __init__(self, max_read_rate=None, max_write_rate=None):
+        '''
+        :param int max_read_rate:
+            The most bytes per second read, or None to not limit reads.
+        :param int max_write_rate:
+            The most bytes per second written, or None to not limit writes.
+        '''
+        self._reads = _TokenBucket(max_read_rate)
+        self._writes = _TokenBucket(max_write_rate)
+
+    @property
+    def max_read_rate(self):
+        return self._reads.rate
+
+    @max_read_rate.setter
+    def max_read_rate(self, value):
+        self._reads.rate = value
+
+    @property
+    def max_write_rate(self):
+        return self._writes.rate
+
+    @max_write_rate.setter
+    def max_write_rate(self, value):
+        self._writes.rate = value
+
+    def get_utilization(self):
+        '''
+        Returns the bandwidth currently used against the limits.
+
+        :rtype: :class:`~azure.storage.common.models.BandwidthUtilization`
+        '''
+        utilization = BandwidthUtilization()
+        utilization.max_read_rate = self._reads.rate
+        utilization.max_write_rate = self._writes.rate
+        utilization.read_rate = self._reads.get_current_rate()
+        utilization.write_rate = self._writes.get_current_rate()
+        if utilization.max_read_rate:
+            utilization.read_utilization = utilization.read_rate / utilization.max_read_rate
+        if utilization.max_write_rate:
+            utilization.write_utilization = utilization.write_rate / utilization.max_write_rate
+        utilization.bytes_read = self._reads.total
+        utilization.bytes_written = self._writes.total
+        return utilization
+
+    def _reserve_read(self, count):
+        return self._reads.reserve(count)
+
+    def _reserve_write(self, count):
+        return self._writes.reserve(count)
+
+    def _limit_request(self, request):
+        '''
+        Waits until the body of the request may be sent.
+        '''
+        delay = self._reserve_write(int(request.headers.get('Content-Length') or 0))
+        if delay > 0:
+            sleep(delay)
+
+    def _limit_response(self, response, stream):
+        '''
+        Returns the response, paced so that its body is read within the budget.
+        '''
+        if stream:
+            return _LimitedStreamingResponse(self, response)
+
+        delay = self._reserve_read(len(response.body or b''))
+        if delay > 0:
+            sleep(delay)
+        return response
+
+
+class _LimitedStreamingResponse(HTTPResponse):
+    '''
+    A streamed HTTPResponse whose body is read off the connection no faster than
+    the read budget of a bandwidth limiter allows.
+    '''
+
+    def __init__(self, limiter, response):
+        self._limiter = limiter
+        self._response = response
+        super(_LimitedStreamingResponse, self).__init__(response.status, response.message, response.headers, None)
+
+    @property
+    def body(self):
+        if self._body is None:
+            self._body = self._response.body
+            delay = self._limiter._reserve_read(len(self._body or b''))
+            if delay > 0:
+                sleep(delay)
+        return self._body
+
+    @body.setter
+    def body(self, value):
+        self._body = value
+
+    def iter_content(self, chunk_size):
+        for data in self._response.iter_content(chunk_size):
+            delay = self._limiter._reserve_read(len(data))
+            if delay > 0:
+                sleep(delay)
+            yield data
+
+    def close(self):
+        self._response.close()
@@ -0,0 +1,250 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import copy
+import math
+import threading
+from collections import deque
+from timeit import default_timer
+
+from ._constants import _HEDGE_WORKER_IDLE_TIMEOUT
+
+
+class HedgingPolicy(object):
+    '''
+    Hedges the reads of RA-GRS accounts across the primary and secondary
+    endpoints. If the primary endpoint has not answered a read within the given
+    percentile of its recent latencies, the same read is sent to the secondary
+    endpoint and the first of the two to answer is used. The primary endpoint
+    is authoritative: its response is used unless it failed with a server error
+    while the hedge is still in flight. A response from the secondary endpoint
+    is only used if it succeeded, as the secondary may not have caught up with
+    the primary yet.
+
+    Only reads which may be sent to either location, and which the location mode
+    sends to the primary endpoint, are hedged; writes never are. Operations which
+    must stay on one location, such as downloads in ranges and listings, are
+    hedged on their first request and then stay on the location which answered
+    it. Set the hedging_policy of a service object to enable hedging.
+    '''
+
+    def __init__(self, latency_percentile=95, initial_delay=0.1, min_delay=0.01, sample_count=100,
+                 min_sample_count=10):
+        '''
+        :param float latency_percentile:
+            The percentile of the recent latencies of the primary endpoint after
+            which a read is hedged.
+        :param float initial_delay:
+            The seconds to wait before hedging until enough latencies are known.
+        :param float min_delay:
+            The fewest seconds to wait before hedging, however fast the primary
+            endpoint has been.
+        :param int sample_count:
+            The number of recent latencies of the primary endpoint to keep.
+        :param int min_sample_count:
+            The number of latencies needed before the percentile is used.
+        '''
+        if not 0 < latency_percentile <= 100:
+            raise ValueError('latency_percentile must be greater than 0 and at most 100.')
+
+        self.latency_percentile = latency_percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.min_sample_count = min_sample_count
+        self._latencies = deque(maxlen=sample_count)
+        self._lock = threading.Lock()
+
+    def get_hedge_delay(self):
+        '''
+        Returns the number of seconds to wait for the primary endpoint before
+        hedging a read.
+
+        :return: The number of seconds to wait.
+        :rtype: float
+        '''
+        with self._lock:
+            latencies = sorted(self._latencies)
+
+        if len(latencies) < max(self.min_sample_count, 1):
+            return max(self.initial_delay, self.min_delay)
+
+        index = int(math.ceil(self.latency_percentile / 100.0 * len(latencies))) - 1
+        return max(latencies[max(index, 0)], self.min_delay)
+
+    def _record_latency(self, latency):
+        with self._lock:
+            self._latencies.append(latency)
+
+
+def _create_hedge_request(request, primary_location, secondary_location):
+    '''
+    Copies a signed request to send it to the secondary location, or returns
+    None if the request is not addressed to the primary location. A location
+    may carry a path prefix, such as the account name of the emulator, which is
+    swapped along with the host. The copy only needs to be signed again if its
+    path changed.
+    '''
+    primary_host, primary_prefix = _split_location(primary_location)
+    secondary_host, secondary_prefix = _split_location(secondary_location)
+    if request.host != primary_host or not request.path.startswith(primary_prefix):
+        return None
+
+    hedge_request = copy.copy(request)
+    hedge_request.headers = request.headers.copy()
+    hedge_request.query = request.query.copy()
+    hedge_request.host = secondary_host
+    hedge_request.path = secondary_prefix + request.path[len(primary_prefix):]
+    return hedge_request
+
+
+def _split_location(location):
+    # the path of a location is moved onto the path of the request before it is sent
+    host, _, prefix = location.partition('/')
+    return host, '/' + prefix if prefix else ''
+
+
+_PRIMARY = 'primary'
+_SECONDARY = 'secondary'
+
+
+def _get_hedge_winner(primary, secondary, hedged):
+    '''
+    Returns the location whose outcome should be used, given the (response,
+    exception) outcomes received so far, or None to keep waiting.
+    '''
+    # The primary is authoritative, but if it failed while the hedge is still
+    # in flight, the hedge may yet succeed.
+    if primary is not None and (not hedged or _is_final_response(primary[0])):
+        return _PRIMARY
+    if secondary is not None and _is_hedge_response(secondary[0]):
+        return _SECONDARY
+    if primary is not None and secondary is not None:
+        return _PRIMARY
+    return None
+
+
+def _is_hedge_response(response):
+    return response is not None and response.status < 300
+
+
+def _is_final_response(response):
+    return response is not None and response.status < 500
+
+
+class _HedgeWorkers(object):
+    '''
+    The threads which send the requests of hedged reads. A worker is kept once
+    it is idle, so a read reuses it rather than starting a thread of its own,
+    and stops once it has been idle for _HEDGE_WORKER_IDLE_TIMEOUT.
+    '''
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._tasks = deque()
+        self._idle_workers = 0
+
+    def submit(self, task):
+        with self._condition:
+            self._tasks.append(task)
+            if len(self._tasks) <= self._idle_workers:
+                self._condition.notify()
+                return
+
+        worker = threading.Thread(target=self._work)
+        worker.daemon = True
+        worker.start()
+
+    def _work(self):
+        while True:
+            with self._condition:
+                idle_since = default_timer()
+                while not self._tasks:
+                    remaining = _HEDGE_WORKER_IDLE_TIMEOUT - (default_timer() - idle_since)
+                    if remaining <= 0:
+                        return
+                    self._idle_workers += 1
+                    try:
+                        self._condition.wait(remaining)
+                    finally:
+                        self._idle_workers -= 1
+                task = self._tasks.popleft()
+            task()
+
+
+_hedge_workers = _HedgeWorkers()
+
+
+class _HedgedSend(object):
+    '''
+    Sends a read to the primary endpoint and, if it has not answered by the
+    hedge delay, to the secondary endpoint as well. Both are sent on pooled
+    worker threads so the caller can return as soon as one of them wins. The
+    response of the loser is closed once it arrives, releasing its connection.
+    '''
+
+    def __init__(self, policy, send, close):
+        self.policy = policy
+        self.send = send
+        self.close = close
+        self._condition = threading.Condition()
+        self._outcomes = {}
+        self._settled = False
+
+    def run(self, request, hedge_request):
+        '''
+        Returns the winning response along with the request which won, or
+        raises the exception of the primary request if neither succeeded.
+        '''
+        self._start(request, True)
+        with self._condition:
+            end = default_timer() + self.policy.get_hedge_delay()
+            while _PRIMARY not in self._outcomes:
+                remaining = end - default_timer()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            hedged = _PRIMARY not in self._outcomes
+
+        if hedged:
+            self._start(hedge_request, False)
+
+        with self._condition:
+            while True:
+                winner = _get_hedge_winner(self._outcomes.get(_PRIMARY), self._outcomes.get(_SECONDARY), hedged)
+                if winner is not None:
+                    break
+                self._condition.wait()
+
+            self._settled = True
+            for location, (response, _) in self._outcomes.items():
+                if location != winner and response is not None:
+                    self.close(response)
+            response, exception = self._outcomes[winner]
+
+        if exception is not None:
+            raise exception
+        return response, request if winner == _PRIMARY else hedge_request
+
+    def _start(self, request, is_primary):
+        _hedge_workers.submit(lambda: self._send(request, is_primary))
+
+    def _send(self, request, is_primary):
+        start = default_timer()
+        try:
+            outcome = (self.send(request), None)
+        except Exception as ex:
+            outcome = (None, ex)
+
+        if is_primary and outcome[0] is not None:
+            self.policy._record_latency(default_timer() - start)
+
+        with self._condition:
+            if self._settled:
+                # this request lost, so its response is no longer needed
+                if outcome[0] is not None:
+                    self.close(outcome[0])
+                return
+            self._outcomes[_PRIMARY if is_primary else _SECONDARY] = outcome
+            self._condition.notify_all()
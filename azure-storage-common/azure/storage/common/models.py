@@ -4,6 +4,8 @@
 # license information.
 # --------------------------------------------------------------------------
 import sys
+import threading
+from collections import deque
 
 if sys.version_info < (3,):
     from collections import Iterable
@@ -14,8 +16,11 @@ else:
 
     _unicode_type = str
 
+from azure.common import AzureException
+
 from ._error import (
-    _validate_not_none
+    _validate_not_none,
+    _wrap_exception,
 )
 
 
@@ -29,6 +34,100 @@ class _list(list):
     pass
 
 
+class _StreamedList(object):
+    '''
+    A page of results which are converted as the body of the response is read 
+    off the connection, so that the first of them are returned before the 
+    rest of the page has arrived. The results read are kept, so the page can be 
+    iterated again. Asking for the length or the next marker, or for the page 
+    as a list, reads the rest of the page first. The connection is released 
+    once the page has been read, or once it is closed or garbage collected.
+
+    If reading the page fails part way through, it is requested again with 
+    reload and its results resume after those already read. It is only 
+    requested again while each attempt reads more results, or once if one 
+    reads none.
+    '''
+
+    def __init__(self, response, iter_items):
+        self._response = response
+        # the results read so far; iter_items sets the next marker on the list it is given once it is parsed
+        self._page = _list()
+        self._parsed_page = self._page
+        self._items = iter_items(self._page)
+        self._skip = 0
+        self._read_in_attempt = 0
+        self._stalled = False
+        self._done = False
+        self._reload = None
+
+    @property
+    def next_marker(self):
+        return self._to_list().next_marker
+
+    def __len__(self):
+        return len(self._to_list())
+
+    def __iter__(self):
+        index = 0
+        while index < len(self._page) or self._read_next():
+            yield self._page[index]
+            index += 1
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        response, self._response = getattr(self, '_response', None), None
+        if response is not None:
+            response.close()
+
+    def _to_list(self):
+        '''
+        Reads the rest of the page and returns its results as a list with the 
+        next marker set on it.
+        '''
+        while self._read_next():
+            pass
+        return self._page
+
+    def _read_next(self):
+        '''
+        Reads the next result of the page, returning False once there are none left.
+        '''
+        while not self._done:
+            try:
+                item = next(self._items)
+            except StopIteration:
+                self._page.next_marker = self._parsed_page.next_marker
+                self._done = True
+                self.close()
+            except Exception as ex:
+                if self._reload is None or (self._stalled and self._read_in_attempt == 0):
+                    self.close()
+                    raise _wrap_exception(ex, AzureException)
+                self._stalled = self._read_in_attempt == 0
+                self._resume()
+            else:
+                if self._skip:
+                    self._skip -= 1
+                    continue
+                self._page.append(item)
+                self._read_in_attempt += 1
+                return True
+        return False
+
+    def _resume(self):
+        # requests the page again, and skips the results which have already been read
+        self.close()
+        page = self._reload()
+        self._response, page._response = page._response, None
+        self._parsed_page = page._parsed_page
+        self._items = page._items
+        self._skip = len(self._page)
+        self._read_in_attempt = 0
+
+
 class _dict(dict):
     '''Used so that additional properties can be set on the return dictionary'''
     pass
@@ -60,49 +159,154 @@ class ListGenerator(Iterable):
     resources, the generator will have a populated next_marker field once it 
     finishes. This marker can be used to create a new generator if more 
     results are desired.
+
+    If prefetch_pages is greater than 0, the following pages are requested on a 
+    background thread while the current page is iterated, keeping up to that 
+    many pages fetched ahead. The pages are still requested one after the other, 
+    each with the marker of the one before it.
     '''
 
-    def __init__(self, resources, list_method, list_args, list_kwargs):
-        self.items = resources
-        self.next_marker = resources.next_marker
+    def __init__(self, resources, list_method, list_args, list_kwargs, prefetch_pages=0):
+        self._items = resources
 
         self._list_method = list_method
         self._list_args = list_args
         self._list_kwargs = list_kwargs
+        self._prefetch_pages = prefetch_pages or 0
 
-    def __iter__(self):
-        # return results
-        for i in self.items:
-            yield i
+    @property
+    def items(self):
+        # a page streamed off the connection is read to the end when it is asked for as a list
+        if isinstance(self._items, _StreamedList):
+            self._items = self._items._to_list()
+        return self._items
 
-        while True:
-            # if no more results on the service, return
-            if not self.next_marker:
-                break
+    @items.setter
+    def items(self, value):
+        self._items = value
 
-            # update the marker args
-            self._list_kwargs['marker'] = self.next_marker
+    @property
+    def next_marker(self):
+        return self._items.next_marker
 
-            # handle max results, if present
-            max_results = self._list_kwargs.get('max_results')
-            if max_results is not None:
-                max_results = max_results - len(self.items)
+    def __iter__(self):
+        if self._prefetch_pages > 0:
+            pages = _PagePrefetcher(self, self._prefetch_pages)
+        else:
+            pages = self._iter_pages()
 
-                # if we've reached max_results, return
-                # else, update the max_results arg
-                if max_results <= 0:
-                    break
-                else:
-                    self._list_kwargs['max_results'] = max_results
+        try:
+            # return results
+            for i in self._items:
+                yield i
 
+            for resources in pages:
+                self._items = resources
+
+                # return results
+                for i in resources:
+                    yield i
+        finally:
+            if isinstance(pages, _PagePrefetcher):
+                pages.stop()
+            elif isinstance(self._items, _StreamedList):
+                # the rest of a page which was not read is left on the connection
+                self._items.close()
+
+    def _iter_pages(self):
+        resources = self._items
+        while self._set_next_page_args(resources):
             # get the next segment
             resources = self._list_method(*self._list_args, **self._list_kwargs)
-            self.items = resources
-            self.next_marker = resources.next_marker
+            yield resources
 
-            # return results
-            for i in self.items:
-                yield i
+    def _set_next_page_args(self, resources):
+        '''
+        Updates the list arguments to request the page which follows resources, 
+        returning False if there is no such page.
+        '''
+        # if no more results on the service, return
+        if not resources.next_marker:
+            return False
+
+        # update the marker args
+        self._list_kwargs['marker'] = resources.next_marker
+
+        # handle max results, if present
+        max_results = self._list_kwargs.get('max_results')
+        if max_results is not None:
+            max_results = max_results - len(resources)
+
+            # if we've reached max_results, return
+            # else, update the max_results arg
+            if max_results <= 0:
+                return False
+            else:
+                self._list_kwargs['max_results'] = max_results
+
+        return True
+
+
+class _PagePrefetcher(object):
+    '''
+    Fetches the pages of a ListGenerator on a background thread, keeping up to 
+    prefetch_pages of them ahead of the one being iterated. An exception raised 
+    while fetching a page is raised by the iteration once it reaches that page.
+    '''
+
+    def __init__(self, list_generator, prefetch_pages):
+        self._condition = threading.Condition()
+        self._pages = deque()
+        self._prefetch_pages = prefetch_pages
+        self._done = False
+        self._stopped = False
+
+        fetcher = threading.Thread(target=self._fetch, args=(list_generator._iter_pages(),))
+        fetcher.daemon = True
+        fetcher.start()
+
+    def __iter__(self):
+        while True:
+            with self._condition:
+                while not self._pages and not self._done:
+                    self._condition.wait()
+                if not self._pages:
+                    return
+                resources, exception = self._pages.popleft()
+                self._condition.notify_all()
+
+            if exception is not None:
+                raise exception
+            yield resources
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+    def _fetch(self, pages):
+        try:
+            while True:
+                with self._condition:
+                    while len(self._pages) >= self._prefetch_pages and not self._stopped:
+                        self._condition.wait()
+                    if self._stopped:
+                        return
+
+                resources = next(pages, None)
+                if resources is None:
+                    return
+
+                with self._condition:
+                    self._pages.append((resources, None))
+                    self._condition.notify_all()
+        except Exception as ex:
+            with self._condition:
+                self._pages.append((None, ex))
+        finally:
+            with self._condition:
+                self._done = True
+                self._condition.notify_all()
 
 
 class RetryContext(object):
@@ -135,6 +339,104 @@ class RetryContext(object):
         self.body_position = None
 
 
+class RequestPhase(object):
+    '''
+    Specifies a phase of an operation reported to a 
+    :class:`~azure.storage.common.models.RequestObserver`.
+    '''
+
+    OPERATION = 'operation'
+    ''' The whole operation, from the first attempt until it returns or fails. '''
+
+    SIGN = 'sign'
+    ''' Dating and signing an attempt before it is sent. '''
+
+    SEND = 'send'
+    ''' Sending an attempt and receiving its response. Unless the response is streamed, this includes reading the body. '''
+
+    PARSE = 'parse'
+    ''' Parsing the body of a successful response. A streamed body is read during this phase. '''
+
+    BACKOFF = 'backoff'
+    ''' Waiting before retrying a failed attempt. '''
+
+
+class RequestPhaseEvent(object):
+    '''
+    Describes a phase of an operation. The same event is passed to the observer 
+    when the phase starts and when it ends.
+
+    :ivar str phase:
+        The phase, one of the values of :class:`~azure.storage.common.models.RequestPhase`.
+    :ivar str operation_name:
+        The name of the service object method which sent the request, for example 'list_blobs'.
+    :ivar str client_request_id:
+        The client request id sent with the request.
+    :ivar int retry_count:
+        The number of retries performed before the phase started.
+    :ivar LocationMode location_mode:
+        The location the request was sent to.
+    :ivar int bytes_sent:
+        The length of the request body. Only set for the send phase.
+    :ivar int bytes_received:
+        The length of the response body. Only set for the send phase, once it ends.
+    :ivar float start_time:
+        When the phase started, in seconds, as measured by timeit.default_timer.
+    :ivar float end_time:
+        When the phase ended, in seconds, as measured by timeit.default_timer.
+    :ivar Exception exception:
+        The exception which ended the phase, if any.
+    '''
+
+    def __init__(self, phase, operation_name):
+        self.phase = phase
+        self.operation_name = operation_name
+        self.client_request_id = None
+        self.retry_count = 0
+        self.location_mode = None
+        self.bytes_sent = None
+        self.bytes_received = None
+        self.start_time = None
+        self.end_time = None
+        self.exception = None
+
+    @property
+    def duration(self):
+        '''
+        The time spent in the phase, in seconds, once it has ended.
+        '''
+        if self.start_time is None or self.end_time is None:
+            return None
+        return self.end_time - self.start_time
+
+
+class RequestObserver(object):
+    '''
+    Observes the phases of the operations performed by a service object, for 
+    example to build latency histograms. Set an instance of a subclass as the 
+    request_observer of the service object. The methods are called on the thread 
+    performing the operation and should return quickly.
+    '''
+
+    def on_phase_start(self, event):
+        '''
+        Called when a phase starts.
+
+        :param ~azure.storage.common.models.RequestPhaseEvent event:
+            The phase which started.
+        '''
+        pass
+
+    def on_phase_end(self, event):
+        '''
+        Called when a phase ends, whether it succeeded or failed.
+
+        :param ~azure.storage.common.models.RequestPhaseEvent event:
+            The phase which ended.
+        '''
+        pass
+
+
 class LocationMode(object):
     '''
     Specifies the location the request should be sent to. This mode only applies 
@@ -149,6 +451,61 @@ class LocationMode(object):
     ''' Requests should be sent to the secondary location, if possible. '''
 
 
+class ConnectionPoolStats(object):
+    '''
+    Describes how well a service object reuses its pooled connections. A 
+    request sent on a pooled connection is a hit. A request which had to open 
+    a new connection, and so possibly perform a new TLS handshake, is a miss.
+
+    :ivar int pool_size:
+        The most connections kept pooled for each host.
+    :ivar int hits:
+        The number of requests sent on a pooled connection.
+    :ivar int misses:
+        The number of requests which opened a new connection.
+    '''
+
+    def __init__(self):
+        self.pool_size = 0
+        self.hits = 0
+        self.misses = 0
+
+
+class BandwidthUtilization(object):
+    '''
+    Describes the bandwidth used by the service objects which share a
+    bandwidth limiter. Reads are the bodies of responses and writes are the
+    bodies of requests.
+
+    :ivar int max_read_rate:
+        The most bytes per second read, or None if reads are not limited.
+    :ivar int max_write_rate:
+        The most bytes per second written, or None if writes are not limited.
+    :ivar float read_rate:
+        The bytes per second read over the last second.
+    :ivar float write_rate:
+        The bytes per second written over the last second.
+    :ivar float read_utilization:
+        read_rate as a fraction of max_read_rate, or None if reads are not limited.
+    :ivar float write_utilization:
+        write_rate as a fraction of max_write_rate, or None if writes are not limited.
+    :ivar int bytes_read:
+        The number of bytes read since the limiter was created.
+    :ivar int bytes_written:
+        The number of bytes written since the limiter was created.
+    '''
+
+    def __init__(self):
+        self.max_read_rate = None
+        self.max_write_rate = None
+        self.read_rate = 0.0
+        self.write_rate = 0.0
+        self.read_utilization = None
+        self.write_utilization = None
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+
 class RetentionPolicy(object):
     '''
     By default, Storage Analytics will not delete any logging or metrics data. Blobs
@@ -4,15 +4,19 @@
 # license information.
 # --------------------------------------------------------------------------
 from abc import ABCMeta
+from collections import deque
 from math import pow
 import random
+import threading
 from io import (SEEK_SET, UnsupportedOperation)
+from timeit import default_timer
 
 from .models import LocationMode
 from ._constants import (
     DEV_ACCOUNT_NAME,
     DEV_ACCOUNT_SECONDARY_NAME
 )
+from ._error import AzureCircuitOpenError
 
 
 class _Retry(object):
@@ -293,6 +297,202 @@ class LinearRetry(_Retry):
         return random_generator.uniform(self.random_range_start, self.random_range_end)
 
 
+class _AdaptiveAttempt(object):
+    '''
+    An attempt admitted by an AdaptiveRetry policy. Ending it releases its 
+    concurrency slot and records its outcome against the endpoint.
+    '''
+
+    def __init__(self, policy, endpoint):
+        self.policy = policy
+        self.endpoint = endpoint
+        self.start_time = default_timer()
+
+    def end(self, response, exception):
+        self.policy._end_attempt(self, response, exception)
+
+
+class _EndpointState(object):
+    '''
+    The state an AdaptiveRetry policy shares across the requests to one endpoint.
+    '''
+
+    def __init__(self, retry_budget, max_concurrency):
+        self.retry_tokens = float(retry_budget)
+        self.concurrency_limit = float(max_concurrency)
+        self.in_flight = 0
+        self.last_decrease_time = None
+        self.outcomes = deque()
+        self.failures = 0
+        self.open_until = None
+        self.probing = False
+
+
+class AdaptiveRetry(ExponentialRetry):
+    '''
+    Exponential retry which adapts to the load the service is under by sharing state 
+    across the requests to the same endpoint, including requests made by different 
+    service objects which use the same policy.
+
+    - Retry budget: each retry spends a token from a bucket which successful requests 
+      slowly refill, so retries cannot multiply the load on an endpoint which is 
+      failing most requests.
+    - Concurrency limit: the number of requests in flight to the endpoint grows by 
+      about one for each limit's worth of successful requests and is halved when the 
+      endpoint is throttling (AIMD). Requests over the limit wait to be sent.
+    - Circuit breaker: when most of the recent requests to the endpoint failed, 
+      requests fail fast with AzureCircuitOpenError for break_duration seconds. A 
+      single request is then let through to probe whether the endpoint recovered.
+
+    Throttling and server errors (408, 500 and 503), as well as failures to get a 
+    response at all, count as failures. Set the retry method of the policy as the 
+    retry of the service object, as for the other retry policies.
+    '''
+
+    def __init__(self, initial_backoff=15, increment_base=3, max_attempts=3,
+                 retry_to_secondary=False, random_jitter_range=3, retry_budget=10, retry_budget_ratio=0.1,
+                 max_concurrency=64, min_concurrency=1, failure_threshold=0.5, failure_window=20,
+                 break_duration=10):
+        '''
+        Constructs an Adaptive retry object. The backoff between retries is the 
+        same as for :class:`~azure.storage.common.retry.ExponentialRetry`.
+
+        :param int initial_backoff: 
+            The initial backoff interval, in seconds, for the first retry.
+        :param int increment_base:
+            The base, in seconds, to increment the initial_backoff by after the 
+            first retry.
+        :param int max_attempts: 
+            The maximum number of retry attempts.
+        :param bool retry_to_secondary:
+            Whether the request should be retried to secondary, if able. This should 
+            only be enabled of RA-GRS accounts are used and potentially stale data 
+            can be handled.
+        :param int random_jitter_range:
+            A number in seconds which indicates a range to jitter/randomize for the back-off interval.
+            For example, a random_jitter_range of 3 results in the back-off interval x to vary between x+3 and x-3.
+        :param int retry_budget:
+            The most retries an endpoint can have saved up. The budget starts full.
+        :param float retry_budget_ratio:
+            The share of a retry each successful request adds to the budget. For example, 
+            0.1 allows one retry for every ten successful requests.
+        :param int max_concurrency:
+            The most requests in flight to an endpoint, which is also the starting limit.
+        :param int min_concurrency:
+            The fewest requests in flight to an endpoint the limit can be lowered to.
+        :param float failure_threshold:
+            The share of the recent requests to an endpoint which must fail to open the circuit.
+        :param int failure_window:
+            The number of recent requests to an endpoint the failure share is computed over. 
+            The circuit does not open before this many requests were made.
+        :param int break_duration:
+            The time, in seconds, requests to the endpoint fail fast once the circuit opens.
+        '''
+        self.retry_budget = retry_budget
+        self.retry_budget_ratio = retry_budget_ratio
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.failure_threshold = failure_threshold
+        self.failure_window = failure_window
+        self.break_duration = break_duration
+        self._endpoints = {}
+        self._lock = threading.Lock()
+        super(AdaptiveRetry, self).__init__(initial_backoff, increment_base, max_attempts,
+                                            retry_to_secondary, random_jitter_range)
+
+    '''
+    A function which determines whether and how to retry.
+
+    :param ~azure.storage.models.RetryContext context: 
+        The retry context. This contains the request, response, and other data 
+        which can be used to determine whether or not to retry.
+    :return: 
+        An integer indicating how long to wait before retrying the request, 
+        or None to indicate no retry should be performed.
+    :rtype: int or None
+    '''
+
+    def retry(self, context):
+        endpoint = context.request.host
+        backoff_interval = self._retry(context, self._backoff)
+        if backoff_interval is None:
+            return None
+
+        # Spend a token of the budget of the endpoint which failed
+        with self._lock:
+            state = self._get_endpoint_state(endpoint)
+            if state.retry_tokens < 1:
+                return None
+            state.retry_tokens -= 1
+
+        return backoff_interval
+
+    def _get_endpoint_state(self, endpoint):
+        # must be called while holding the lock
+        state = self._endpoints.get(endpoint)
+        if state is None:
+            state = _EndpointState(self.retry_budget, self.max_concurrency)
+            self._endpoints[endpoint] = state
+        return state
+
+    def _admit(self, endpoint):
+        '''
+        Admits an attempt to send a request to the endpoint.
+
+        :return:
+            The admitted attempt, which must be ended once it completes, or None if 
+            the endpoint has as many requests in flight as its limit allows.
+        :raises AzureCircuitOpenError:
+            If the circuit of the endpoint is open.
+        '''
+        with self._lock:
+            state = self._get_endpoint_state(endpoint)
+
+            if state.open_until is not None:
+                # Once the break is over, let a single request through to probe the endpoint
+                if default_timer() < state.open_until or state.probing:
+                    raise AzureCircuitOpenError(
+                        'Too many of the recent requests to {0} failed; the request was not sent.'.format(endpoint))
+                state.probing = True
+            elif state.in_flight >= int(state.concurrency_limit):
+                return None
+
+            state.in_flight += 1
+            return _AdaptiveAttempt(self, endpoint)
+
+    def _end_attempt(self, attempt, response, exception):
+        failed = exception is not None and (response is None or response.status in (408, 500, 503))
+
+        with self._lock:
+            state = self._get_endpoint_state(attempt.endpoint)
+            state.in_flight -= 1
+
+            if state.probing:
+                state.probing = False
+                state.outcomes.clear()
+                state.failures = 0
+                state.open_until = default_timer() + self.break_duration if failed else None
+
+            state.outcomes.append(failed)
+            state.failures += failed
+            if len(state.outcomes) > self.failure_window:
+                state.failures -= state.outcomes.popleft()
+
+            if failed:
+                # Halve the limit at most once for the requests in flight when the endpoint started throttling
+                if state.last_decrease_time is None or attempt.start_time > state.last_decrease_time:
+                    state.concurrency_limit = max(state.concurrency_limit / 2, self.min_concurrency)
+                    state.last_decrease_time = default_timer()
+
+                if state.open_until is None and len(state.outcomes) >= self.failure_window and \
+                        state.failures >= self.failure_threshold * len(state.outcomes):
+                    state.open_until = default_timer() + self.break_duration
+            else:
+                state.retry_tokens = min(state.retry_tokens + self.retry_budget_ratio, self.retry_budget)
+                state.concurrency_limit = min(state.concurrency_limit + 1 / state.concurrency_limit,
+                                              self.max_concurrency)
+
+
 def no_retry(context):
     '''
     Specifies never to retry.
@@ -4,10 +4,10 @@
 # license information.
 # --------------------------------------------------------------------------
 
-import requests
 from abc import ABCMeta
 import logging
 from time import sleep
+from timeit import default_timer
 import sys
 
 from azure.common import (
@@ -25,15 +25,17 @@ from ._constants import (
     _REDACTED_VALUE,
     _COPY_SOURCE_HEADER_NAME,
     _CLIENT_REQUEST_ID_HEADER_NAME,
+    _ADMISSION_POLL_INTERVAL,
 )
 from ._error import (
     _ERROR_DECRYPTION_FAILURE,
     _http_error_handler,
     _wrap_exception,
     AzureSigningError,
+    AzureCircuitOpenError,
 )
+from ._coalescing import _ReadCoalescer
 from ._http import HTTPError
-from ._http.httpclient import _HTTPClient
 from ._serialization import (
     _update_request,
     _add_date_header,
@@ -41,11 +43,22 @@ from ._serialization import (
 from .models import (
     RetryContext,
     LocationMode,
+    RequestPhase,
+    RequestPhaseEvent,
     _OperationContext,
+    _StreamedList,
+)
+from .hedging import (
+    _HedgedSend,
+    _create_hedge_request,
+)
+from .retry import (
+    AdaptiveRetry,
+    ExponentialRetry,
 )
-from .retry import ExponentialRetry
 from io import UnsupportedOperation
 from .sharedaccesssignature import _QueryStringConstants
+from .transferexecutor import _get_default_transfer_executor
 
 if sys.version_info >= (3,):
     from urllib.parse import (
@@ -64,6 +77,37 @@ else:
 logger = logging.getLogger(__name__)
 
 
+class _PhaseObservation(object):
+    '''
+    Reports the start and the end of a phase to the request observer.
+    '''
+
+    def __init__(self, observer, event):
+        self.observer = observer
+        self.event = event
+
+    def __enter__(self):
+        self.event.start_time = default_timer()
+        self.observer.on_phase_start(self.event)
+        return self.event
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.event.end_time = default_timer()
+        self.event.exception = exc_value
+        self.observer.on_phase_end(self.event)
+
+
+class _NoPhaseObservation(object):
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+_NO_PHASE_OBSERVATION = _NoPhaseObservation()
+
+
 class StorageClient(object):
     '''
     This is the base class for service objects. Service objects are used to do 
@@ -100,10 +144,37 @@ class StorageClient(object):
         types do not allow reading from secondary. If the location_mode is set to 
         LocationMode.SECONDARY, read requests will be sent to the secondary endpoint. 
         Write requests will continue to be sent to primary.
+    :ivar ~azure.storage.common.hedging.HedgingPolicy hedging_policy:
+        If set, reads sent to the primary endpoint of an RA-GRS account are also 
+        sent to the secondary endpoint when the primary is slow to answer, and 
+        the first response is used. Defaults to None.
     :ivar str protocol:
         The protocol to use for requests. Defaults to https.
     :ivar requests.Session request_session:
         The session object to use for http requests.
+    :ivar ~azure.storage.common.transport.HTTPTransport transport:
+        Sends the requests of the service object. Defaults to a transport which 
+        sends them through request_session. Setting another transport, such as a 
+        Urllib3Transport, carries the protocol, socket timeout, proxy and 
+        max_connection_pool_size of the current transport over to it.
+    :ivar int max_connection_pool_size:
+        The most connections kept pooled for each host. Unless a request_session 
+        is given, the connection pools grow to hold the connections used by the 
+        parallel transfers in progress, up to this size. Defaults to 64.
+    :ivar ~azure.storage.common.transferexecutor.TransferExecutor transfer_executor:
+        The pool of worker threads which processes the chunks of parallel uploads 
+        and downloads. Defaults to an executor shared by all service objects.
+    :ivar bool coalesce_reads:
+        If True, GET and HEAD requests sent while an identical request of the 
+        service object is in flight wait for its response instead of being 
+        sent. Requests are identical if their method, path, query and headers, 
+        including any conditional and range headers, are the same. Coalesced 
+        responses are read in full rather than streamed. Applies to the 
+        synchronous service objects. Defaults to False.
+    :ivar ~azure.storage.common.bandwidthlimiter.BandwidthLimiter bandwidth_limiter:
+        If set, caps the bytes per second read and written by the service 
+        object. Set the same limiter on several service objects to cap them 
+        together. Defaults to None.
     :ivar function(request) request_callback:
         A function called immediately before each request is sent. This function 
         takes as a parameter the request object and returns nothing. It may be 
@@ -116,6 +187,10 @@ class StorageClient(object):
         A function called immediately after retry evaluation is performed. This 
         function takes as a parameter the retry context object and returns nothing. 
         It may be used to detect retries and log context information.
+    :ivar ~azure.storage.common.models.RequestObserver request_observer:
+        An object notified when each phase of an operation starts and ends, such 
+        as signing, sending an attempt, parsing the response and waiting before 
+        a retry. Defaults to None.
     '''
 
     __metaclass__ = ABCMeta
@@ -133,8 +208,15 @@ class StorageClient(object):
         self.primary_endpoint = connection_params.primary_endpoint
         self.secondary_endpoint = connection_params.secondary_endpoint
 
+        # the http client imports requests, which is the slowest part of importing the packages, so it is
+        # only imported once a service object is created
+        from ._http.httpclient import (
+            _HTTPClient,
+            _create_session,
+        )
+
         protocol = connection_params.protocol
-        request_session = connection_params.request_session or requests.Session()
+        request_session = connection_params.request_session or _create_session()
         socket_timeout = connection_params.socket_timeout or DEFAULT_SOCKET_TIMEOUT
         self._httpclient = _HTTPClient(
             protocol=protocol,
@@ -143,11 +225,17 @@ class StorageClient(object):
         )
 
         self.retry = ExponentialRetry().retry
+        self.transfer_executor = _get_default_transfer_executor()
         self.location_mode = LocationMode.PRIMARY
+        self.hedging_policy = None
+        self.bandwidth_limiter = None
+        self.coalesce_reads = False
+        self._read_coalescer = _ReadCoalescer()
 
         self.request_callback = None
         self.response_callback = None
         self.retry_callback = None
+        self.request_observer = None
         self._X_MS_VERSION = DEFAULT_X_MS_VERSION
         self._USER_AGENT_STRING = DEFAULT_USER_AGENT_STRING
         self._is_validating_request_id = True
@@ -181,6 +269,49 @@ class StorageClient(object):
     def request_session(self, value):
         self._httpclient.session = value
 
+    @property
+    def transport(self):
+        return self._httpclient
+
+    @transport.setter
+    def transport(self, value):
+        current = self._httpclient
+        value.protocol = current.protocol
+        value.timeout = current.timeout
+        value.proxies = current.proxies
+        value.max_pool_size = current.max_pool_size
+        self._httpclient = value
+
+    @property
+    def max_connection_pool_size(self):
+        return self._httpclient.max_pool_size
+
+    @max_connection_pool_size.setter
+    def max_connection_pool_size(self, value):
+        self._httpclient.max_pool_size = value
+
+    def get_connection_pool_stats(self):
+        '''
+        Returns how many requests reused a pooled connection and how many had 
+        to open a new one.
+
+        :return: The connection pool statistics.
+        :rtype: :class:`~azure.storage.common.models.ConnectionPoolStats`
+        '''
+        return self._httpclient.get_connection_pool_stats()
+
+    def _reserve_connections(self, count):
+        return self._httpclient.reserve_connections(count)
+
+    def _transfer_chunks(self, process, chunks, max_connections):
+        '''
+        Processes the chunks of a parallel transfer on the transfer executor and 
+        returns the results in the order of the chunks.
+        '''
+        executor = self.transfer_executor
+        with self._reserve_connections(min(max_connections, executor.max_workers)):
+            return executor.map(process, chunks, max_connections)
+
     def set_proxy(self, host, port, user=None, password=None):
         '''
         Sets the proxy server host and port for the HTTP CONNECT Tunnelling.
@@ -272,12 +403,189 @@ class StorageClient(object):
                     response.headers[_CLIENT_REQUEST_ID_HEADER_NAME], request.headers[_CLIENT_REQUEST_ID_HEADER_NAME],
                     response.headers['x-ms-request-id']))
 
-    def _perform_request(self, request, parser=None, parser_args=None, operation_context=None, expected_errors=None):
+    def _perform_request(self, request, parser=None, parser_args=None, operation_context=None, expected_errors=None,
+                         stream=False, operation_name=None):
         '''
         Sends the request and return response. Catches HTTPError and hands it
-        to error handler
+        to error handler. If stream is True, the response body is not read 
+        up front; the parser consumes it from the connection, which is released 
+        once the parser returns or the attempt fails, or once the list returned 
+        by the parser has been read if it is a _StreamedList. The operation_name is the 
+        public service object method the request is sent for, which is passed 
+        to the request observer.
         '''
         operation_context = operation_context or _OperationContext()
+        retry_context, client_request_id_prefix = self._begin_request(request, operation_context)
+
+        with self._observe(RequestPhase.OPERATION, operation_name, request, retry_context) as operation_event:
+            while True:
+                try:
+                    response = None
+                    result = None
+                    attempt = None
+                    attempt_exception = None
+                    try:
+                        attempt = self._admit_attempt(request)
+                        self._prepare_attempt(request, retry_context, client_request_id_prefix, operation_name)
+
+                        # Perform the request
+                        with self._observe(RequestPhase.SEND, operation_name, request, retry_context) as event:
+                            response = self._send(request, stream, retry_context)
+                            self._set_bytes_received(event, response)
+
+                        result = self._process_response(request, response, retry_context, client_request_id_prefix,
+                                                        parser, parser_args, operation_name)
+                        return result
+                    except AzureException as ex:
+                        retry_context.exception = attempt_exception = ex
+                        raise ex
+                    except Exception as ex:
+                        retry_context.exception = attempt_exception = ex
+                        raise _wrap_exception(ex, AzureException)
+                    finally:
+                        if attempt is not None:
+                            attempt.end(response, attempt_exception)
+
+                        # Release the connection of a streamed response before any retry, unless the
+                        # parser returned a list which reads the rest of the body as it is iterated
+                        if stream and response is not None and not isinstance(result, _StreamedList):
+                            response.close()
+
+                except AzureException as ex:
+                    retry_interval = self._get_retry_interval(ex, retry_context, client_request_id_prefix,
+                                                              expected_errors)
+
+                    # Sleep for the desired retry interval
+                    with self._observe(RequestPhase.BACKOFF, operation_name, request, retry_context):
+                        sleep(retry_interval)
+                finally:
+                    self._end_attempt(request, operation_context, retry_context)
+                    self._set_retry_state(operation_event, retry_context)
+
+    def _send(self, request, stream, retry_context):
+        '''
+        Sends the request, or waits for the response to an identical request 
+        in flight if reads are coalesced.
+        '''
+        if self.coalesce_reads and self._can_coalesce(request):
+            return self._read_coalescer.send(request, lambda: self._send_attempt(request, False, retry_context))
+        return self._send_attempt(request, stream, retry_context)
+
+    def _can_coalesce(self, request):
+        '''
+        Returns whether the response to the request may be shared with identical 
+        requests. Service objects override this to exclude reads which change 
+        what they read.
+        '''
+        return request.method in ('GET', 'HEAD') and not request.body
+
+    def _send_attempt(self, request, stream, retry_context):
+        '''
+        Sends the request, hedging it on the secondary endpoint if the hedging 
+        policy applies to it, within the budget of the bandwidth limiter if 
+        there is one.
+        '''
+        limiter = self.bandwidth_limiter
+        if limiter is not None:
+            limiter._limit_request(request)
+
+        hedge_request = self._get_hedge_request(request, retry_context)
+        if hedge_request is None:
+            response = self._httpclient.perform_request(request, stream)
+        else:
+            hedged_send = _HedgedSend(self.hedging_policy,
+                                      lambda sent_request: self._httpclient.perform_request(sent_request, stream),
+                                      lambda response: response.close())
+            response, sent_request = hedged_send.run(request, hedge_request)
+            self._apply_hedge_host(request, sent_request, retry_context)
+
+        if limiter is not None:
+            response = limiter._limit_response(response, stream)
+        return response
+
+    def _get_hedge_request(self, request, retry_context):
+        '''
+        Returns a copy of the request to send to the secondary endpoint if the 
+        request should be hedged, or None.
+        '''
+        if self.hedging_policy is None or retry_context.location_mode != LocationMode.PRIMARY:
+            return None
+
+        # Once a location locked operation has picked its location, only that location is allowed.
+        primary_location = request.host_locations.get(LocationMode.PRIMARY)
+        secondary_location = request.host_locations.get(LocationMode.SECONDARY)
+        if not primary_location or not secondary_location:
+            return None
+
+        hedge_request = _create_hedge_request(request, primary_location, secondary_location)
+        if hedge_request is not None and hedge_request.path != request.path:
+            try:
+                self.authentication.sign_request(hedge_request)
+            except AttributeError:
+                # the session is signed instead
+                pass
+        return hedge_request
+
+    @staticmethod
+    def _apply_hedge_host(request, sent_request, retry_context):
+        # the rest of the attempt, and any retry, carries on from the location which answered
+        if sent_request is not request:
+            request.host = sent_request.host
+            request.path = sent_request.path
+            retry_context.location_mode = LocationMode.SECONDARY
+
+    def _get_adaptive_retry(self):
+        # an adaptive policy is set as its bound retry method
+        policy = getattr(self.retry, '__self__', None)
+        return policy if isinstance(policy, AdaptiveRetry) else None
+
+    def _admit_attempt(self, request):
+        '''
+        Waits until the adaptive retry policy, if one is used, admits the attempt 
+        and returns it. The attempt must be ended once it completes.
+        '''
+        policy = self._get_adaptive_retry()
+        if policy is None:
+            return None
+
+        attempt = policy._admit(request.host)
+        while attempt is None:
+            sleep(_ADMISSION_POLL_INTERVAL)
+            attempt = policy._admit(request.host)
+        return attempt
+
+    def _observe(self, phase, operation_name, request, retry_context):
+        '''
+        Returns a context manager which reports the phase to the request observer, 
+        or does nothing if there is no observer.
+        '''
+        observer = self.request_observer
+        if observer is None:
+            return _NO_PHASE_OBSERVATION
+
+        event = RequestPhaseEvent(phase, operation_name)
+        event.client_request_id = request.headers.get(_CLIENT_REQUEST_ID_HEADER_NAME)
+        self._set_retry_state(event, retry_context)
+        if phase == RequestPhase.SEND:
+            event.bytes_sent = int(request.headers.get('Content-Length') or 0)
+        return _PhaseObservation(observer, event)
+
+    @staticmethod
+    def _set_retry_state(event, retry_context):
+        if event is not None:
+            event.retry_count = getattr(retry_context, 'count', 0)
+            event.location_mode = retry_context.location_mode
+
+    @staticmethod
+    def _set_bytes_received(event, response):
+        if event is not None:
+            event.bytes_received = int(response.headers.get('content-length') or 0)
+
+    def _begin_request(self, request, operation_context):
+        '''
+        Applies the settings which are common to every attempt of the request 
+        and returns the retry context and client request id prefix used to log it.
+        '''
         retry_context = RetryContext()
         retry_context.is_emulated = self.is_emulated
 
@@ -296,161 +604,172 @@ class StorageClient(object):
         _update_request(request, self._X_MS_VERSION, self._USER_AGENT_STRING)
         client_request_id_prefix = str.format("Client-Request-ID={0}", request.headers[_CLIENT_REQUEST_ID_HEADER_NAME])
 
-        while True:
-            try:
-                try:
-                    # Execute the request callback 
-                    if self.request_callback:
-                        self.request_callback(request)
+        return retry_context, client_request_id_prefix
 
-                    # Add date and auth after the callback so date doesn't get too old and 
-                    # authentication is still correct if signed headers are added in the request 
-                    # callback. This also ensures retry policies with long back offs 
-                    # will work as it resets the time sensitive headers.
-                    _add_date_header(request)
+    def _prepare_attempt(self, request, retry_context, client_request_id_prefix, operation_name=None):
+        '''
+        Runs the request callback, then dates, signs and logs the request 
+        before it is sent.
+        '''
+        # Execute the request callback 
+        if self.request_callback:
+            self.request_callback(request)
 
-                    try:
-                        # request can be signed individually
-                        self.authentication.sign_request(request)
-                    except AttributeError:
-                        # session can also be signed
-                        self.request_session = self.authentication.signed_session(self.request_session)
-
-                    # Set the request context
-                    retry_context.request = request
-
-                    # Log the request before it goes out
-                    # Avoid unnecessary scrubbing if the logger is not on
-                    if logger.isEnabledFor(logging.INFO):
-                        logger.info("%s Outgoing request: Method=%s, Path=%s, Query=%s, Headers=%s.",
-                                    client_request_id_prefix,
-                                    request.method,
-                                    request.path,
-                                    self._scrub_query_parameters(request.query),
-                                    str(self._scrub_headers(request.headers)).replace('\n', ''))
-
-                    # Perform the request
-                    response = self._httpclient.perform_request(request)
-
-                    # Execute the response callback
-                    if self.response_callback:
-                        self.response_callback(response)
-
-                    # Validate the client request ID
-                    if self._is_validating_request_id:
-                        self._validate_echoed_client_request_id(request, response)
-
-                    # Set the response context
-                    retry_context.response = response
-
-                    # Log the response when it comes back
-                    logger.info("%s Receiving Response: "
-                                "%s, HTTP Status Code=%s, Message=%s, Headers=%s.",
-                                client_request_id_prefix,
-                                self.extract_date_and_request_id(retry_context),
-                                response.status,
-                                response.message,
-                                str(response.headers).replace('\n', ''))
-
-                    # Parse and wrap HTTP errors in AzureHttpError which inherits from AzureException
-                    if response.status >= 300:
-                        # This exception will be caught by the general error handler
-                        # and raised as an azure http exception
-                        _http_error_handler(
-                            HTTPError(response.status, response.message, response.headers, response.body))
-
-                    # Parse the response
-                    if parser:
-                        if parser_args:
-                            args = [response]
-                            args.extend(parser_args)
-                            return parser(*args)
-                        else:
-                            return parser(response)
-                    else:
-                        return
-                except AzureException as ex:
-                    retry_context.exception = ex
-                    raise ex
-                except Exception as ex:
-                    retry_context.exception = ex
-                    raise _wrap_exception(ex, AzureException)
-
-            except AzureException as ex:
-                # only parse the strings used for logging if logging is at least enabled for CRITICAL
-                exception_str_in_one_line = ''
-                status_code = ''
-                timestamp_and_request_id = ''
-                if logger.isEnabledFor(logging.CRITICAL):
-                    exception_str_in_one_line = str(ex).replace('\n', '')
-                    status_code = retry_context.response.status if retry_context.response is not None else 'Unknown'
-                    timestamp_and_request_id = self.extract_date_and_request_id(retry_context)
-
-                # if the http error was expected, we should short-circuit
-                if isinstance(ex, AzureHttpError) and expected_errors is not None and ex.error_code in expected_errors:
-                    logger.info("%s Received expected http error: "
-                                "%s, HTTP status code=%s, Exception=%s.",
-                                client_request_id_prefix,
-                                timestamp_and_request_id,
-                                status_code,
-                                exception_str_in_one_line)
-                    raise ex
-                elif isinstance(ex, AzureSigningError):
-                    logger.info("%s Unable to sign the request: Exception=%s.",
-                                client_request_id_prefix,
-                                exception_str_in_one_line)
-                    raise ex
-
-                logger.info("%s Operation failed: checking if the operation should be retried. "
-                            "Current retry count=%s, %s, HTTP status code=%s, Exception=%s.",
-                            client_request_id_prefix,
-                            retry_context.count if hasattr(retry_context, 'count') else 0,
-                            timestamp_and_request_id,
-                            status_code,
-                            exception_str_in_one_line)
-
-                # Decryption failures (invalid objects, invalid algorithms, data unencrypted in strict mode, etc)
-                # will not be resolved with retries.
-                if str(ex) == _ERROR_DECRYPTION_FAILURE:
-                    logger.error("%s Encountered decryption failure: this cannot be retried. "
-                                 "%s, HTTP status code=%s, Exception=%s.",
-                                 client_request_id_prefix,
-                                 timestamp_and_request_id,
-                                 status_code,
-                                 exception_str_in_one_line)
-                    raise ex
-
-                # Determine whether a retry should be performed and if so, how 
-                # long to wait before performing retry.
-                retry_interval = self.retry(retry_context)
-                if retry_interval is not None:
-                    # Execute the callback
-                    if self.retry_callback:
-                        self.retry_callback(retry_context)
-
-                    logger.info(
-                        "%s Retry policy is allowing a retry: Retry count=%s, Interval=%s.",
+        with self._observe(RequestPhase.SIGN, operation_name, request, retry_context):
+            # Add date and auth after the callback so date doesn't get too old and 
+            # authentication is still correct if signed headers are added in the request 
+            # callback. This also ensures retry policies with long back offs 
+            # will work as it resets the time sensitive headers.
+            _add_date_header(request)
+
+            try:
+                # request can be signed individually
+                self.authentication.sign_request(request)
+            except AttributeError:
+                # session can also be signed
+                self.request_session = self.authentication.signed_session(self.request_session)
+
+        # Set the request context
+        retry_context.request = request
+
+        # Log the request before it goes out
+        # Avoid unnecessary scrubbing if the logger is not on
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("%s Outgoing request: Method=%s, Path=%s, Query=%s, Headers=%s.",
                         client_request_id_prefix,
-                        retry_context.count,
-                        retry_interval)
+                        request.method,
+                        request.path,
+                        self._scrub_query_parameters(request.query),
+                        str(self._scrub_headers(request.headers)).replace('\n', ''))
 
-                    # Sleep for the desired retry interval
-                    sleep(retry_interval)
+    def _process_response(self, request, response, retry_context, client_request_id_prefix, parser, parser_args,
+                          operation_name=None):
+        '''
+        Validates and logs the response, raises an AzureHttpError if it is an 
+        error response and otherwise returns the parsed result.
+        '''
+        # Execute the response callback
+        if self.response_callback:
+            self.response_callback(response)
+
+        # Validate the client request ID
+        if self._is_validating_request_id:
+            self._validate_echoed_client_request_id(request, response)
+
+        # Set the response context
+        retry_context.response = response
+
+        # Log the response when it comes back
+        logger.info("%s Receiving Response: "
+                    "%s, HTTP Status Code=%s, Message=%s, Headers=%s.",
+                    client_request_id_prefix,
+                    self.extract_date_and_request_id(retry_context),
+                    response.status,
+                    response.message,
+                    str(response.headers).replace('\n', ''))
+
+        # Parse and wrap HTTP errors in AzureHttpError which inherits from AzureException
+        if response.status >= 300:
+            # This exception will be caught by the general error handler
+            # and raised as an azure http exception
+            _http_error_handler(
+                HTTPError(response.status, response.message, response.headers, response.body))
+
+        # Parse the response
+        if parser:
+            with self._observe(RequestPhase.PARSE, operation_name, request, retry_context):
+                if parser_args:
+                    args = [response]
+                    args.extend(parser_args)
+                    return parser(*args)
                 else:
-                    logger.error("%s Retry policy did not allow for a retry: "
-                                 "%s, HTTP status code=%s, Exception=%s.",
-                                 client_request_id_prefix,
-                                 timestamp_and_request_id,
-                                 status_code,
-                                 exception_str_in_one_line)
-                    raise ex
-            finally:
-                # If this is a location locked operation and the location is not set, 
-                # this is the first request of that operation. Set the location to 
-                # be used for subsequent requests in the operation.
-                if operation_context.location_lock and not operation_context.host_location:
-                    # note: to cover the emulator scenario, the host_location is grabbed
-                    # from request.host_locations(which includes the dev account name)
-                    # instead of request.host(which at this point no longer includes the dev account name)
-                    operation_context.host_location = {
-                        retry_context.location_mode: request.host_locations[retry_context.location_mode]}
+                    return parser(response)
+
+    def _get_retry_interval(self, ex, retry_context, client_request_id_prefix, expected_errors):
+        '''
+        Returns how long to wait before retrying the failed attempt, or raises 
+        the exception if the request should not be retried.
+        '''
+        # only parse the strings used for logging if logging is at least enabled for CRITICAL
+        exception_str_in_one_line = ''
+        status_code = ''
+        timestamp_and_request_id = ''
+        if logger.isEnabledFor(logging.CRITICAL):
+            exception_str_in_one_line = str(ex).replace('\n', '')
+            status_code = retry_context.response.status if retry_context.response is not None else 'Unknown'
+            timestamp_and_request_id = self.extract_date_and_request_id(retry_context)
+
+        # if the http error was expected, we should short-circuit
+        if isinstance(ex, AzureHttpError) and expected_errors is not None and ex.error_code in expected_errors:
+            logger.info("%s Received expected http error: "
+                        "%s, HTTP status code=%s, Exception=%s.",
+                        client_request_id_prefix,
+                        timestamp_and_request_id,
+                        status_code,
+                        exception_str_in_one_line)
+            raise ex
+        elif isinstance(ex, AzureSigningError):
+            logger.info("%s Unable to sign the request: Exception=%s.",
+                        client_request_id_prefix,
+                        exception_str_in_one_line)
+            raise ex
+        elif isinstance(ex, AzureCircuitOpenError):
+            logger.warning("%s The request was shed by the circuit breaker: Exception=%s.",
+                           client_request_id_prefix,
+                           exception_str_in_one_line)
+            raise ex
+
+        logger.info("%s Operation failed: checking if the operation should be retried. "
+                    "Current retry count=%s, %s, HTTP status code=%s, Exception=%s.",
+                    client_request_id_prefix,
+                    retry_context.count if hasattr(retry_context, 'count') else 0,
+                    timestamp_and_request_id,
+                    status_code,
+                    exception_str_in_one_line)
+
+        # Decryption failures (invalid objects, invalid algorithms, data unencrypted in strict mode, etc)
+        # will not be resolved with retries.
+        if str(ex) == _ERROR_DECRYPTION_FAILURE:
+            logger.error("%s Encountered decryption failure: this cannot be retried. "
+                         "%s, HTTP status code=%s, Exception=%s.",
+                         client_request_id_prefix,
+                         timestamp_and_request_id,
+                         status_code,
+                         exception_str_in_one_line)
+            raise ex
+
+        # Determine whether a retry should be performed and if so, how 
+        # long to wait before performing retry.
+        retry_interval = self.retry(retry_context)
+        if retry_interval is not None:
+            # Execute the callback
+            if self.retry_callback:
+                self.retry_callback(retry_context)
+
+            logger.info(
+                "%s Retry policy is allowing a retry: Retry count=%s, Interval=%s.",
+                client_request_id_prefix,
+                retry_context.count,
+                retry_interval)
+
+            return retry_interval
+        else:
+            logger.error("%s Retry policy did not allow for a retry: "
+                         "%s, HTTP status code=%s, Exception=%s.",
+                         client_request_id_prefix,
+                         timestamp_and_request_id,
+                         status_code,
+                         exception_str_in_one_line)
+            raise ex
+
+    @staticmethod
+    def _end_attempt(request, operation_context, retry_context):
+        # If this is a location locked operation and the location is not set, 
+        # this is the first request of that operation. Set the location to 
+        # be used for subsequent requests in the operation.
+        if operation_context.location_lock and not operation_context.host_location:
+            # note: to cover the emulator scenario, the host_location is grabbed
+            # from request.host_locations(which includes the dev account name)
+            # instead of request.host(which at this point no longer includes the dev account name)
+            operation_context.host_location = {
+                retry_context.location_mode: request.host_locations[retry_context.location_mode]}
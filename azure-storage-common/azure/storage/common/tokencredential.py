@@ -4,8 +4,6 @@
 # license information.
 # --------------------------------------------------------------------------
 
-import requests
-
 
 class TokenCredential(object):
     """
@@ -36,7 +34,9 @@ class TokenCredential(object):
         :type session: requests.Session
         :rtype: requests.Session
         """
-        session = session or requests.Session()
+        if session is None:
+            import requests
+            session = requests.Session()
         session.headers['Authorization'] = "Bearer {}".format(self.token)
 
         return session
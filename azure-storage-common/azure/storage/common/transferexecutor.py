@@ -0,0 +1,206 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import threading
+from collections import deque
+from timeit import default_timer
+
+from ._constants import (
+    DEFAULT_MAX_TRANSFER_WORKERS,
+    _TRANSFER_WORKER_IDLE_TIMEOUT,
+)
+
+
+class _Transfer(object):
+    def __init__(self, process, max_connections):
+        self.process = process
+        self.max_connections = max_connections
+        self.pending = deque()
+        self.in_flight = 0
+        self.results = {}
+        self.exception = None
+        self.scheduled = False
+
+    def is_ready(self):
+        return self.exception is None and len(self.pending) > 0 and self.in_flight < self.max_connections
+
+
+class TransferExecutor(object):
+    '''
+    A pool of worker threads shared by the chunked uploads and downloads of the
+    service objects. Each transfer keeps at most max_connections of its chunks in
+    flight and the workers take the chunks of the transfers in turn, so a large
+    transfer does not hold up the others. The number of workers, and so the
+    number of chunks in flight across all transfers, is capped by max_workers.
+
+    Workers are started as they are needed and stop once they have been idle for
+    a minute. By default, all service objects share one executor; set the
+    transfer_executor of a service object to give it its own.
+
+    A transfer started from one of the workers, such as by a progress callback,
+    is processed on that worker one item at a time. Waiting on the other
+    workers instead could deadlock once every worker is waiting.
+    '''
+
+    def __init__(self, max_workers=DEFAULT_MAX_TRANSFER_WORKERS):
+        '''
+        :param int max_workers:
+            The most worker threads, and so chunks in flight, across all transfers.
+        '''
+        if max_workers < 1:
+            raise ValueError('max_workers must be at least 1.')
+
+        self.max_workers = max_workers
+        self._condition = threading.Condition()
+        self._ready = deque()
+        self._workers = 0
+        self._idle_workers = 0
+        self._worker_state = threading.local()
+
+    def map(self, process, items, max_connections):
+        '''
+        Calls process on each item and returns the results in the order of the
+        items. The items are taken from the iterable on the calling thread only
+        as the chunks in flight complete, so at most max_connections + 1 of them
+        are buffered at once. If processing an item fails, no further items are
+        started and, once those in flight complete, the exception is raised.
+
+        :param process:
+            The function called with each item.
+        :param items:
+            The iterable of items to process.
+        :param int max_connections:
+            The most items of this transfer processed at the same time.
+        :return: The results of process, in the order of the items.
+        :rtype: list
+        '''
+        if getattr(self._worker_state, 'is_worker', False):
+            # the worker would otherwise hold its place while waiting on the others
+            return [process(item) for item in items]
+
+        transfer = _Transfer(process, max_connections)
+        items = iter(items)
+        count = 0
+
+        while True:
+            with self._condition:
+                # Bound the buffered items, and check for exceptions to fail fast.
+                while transfer.exception is None and \
+                        len(transfer.pending) + transfer.in_flight > max_connections:
+                    self._condition.wait()
+                if transfer.exception is not None:
+                    break
+
+            # The next item may be read from a stream, so it is taken without holding the lock.
+            try:
+                item = next(items)
+            except StopIteration:
+                break
+            except BaseException as ex:
+                with self._condition:
+                    transfer.exception = ex
+                break
+
+            with self._condition:
+                transfer.pending.append((count, item))
+                count += 1
+                self._schedule(transfer)
+
+        with self._condition:
+            while transfer.in_flight > 0 or (transfer.exception is None and transfer.pending):
+                self._condition.wait()
+
+        if transfer.exception is not None:
+            raise transfer.exception
+        return [transfer.results[index] for index in range(count)]
+
+    def _schedule(self, transfer):
+        # must be called while holding the condition
+        if transfer.scheduled or not transfer.is_ready():
+            return
+
+        transfer.scheduled = True
+        self._ready.append(transfer)
+        if self._idle_workers > 0:
+            self._condition.notify_all()
+        elif self._workers < self.max_workers:
+            self._workers += 1
+            worker = threading.Thread(target=self._work)
+            worker.daemon = True
+            worker.start()
+
+    def _next_chunk(self):
+        # must be called while holding the condition; returns None once the worker has been idle too long
+        idle_since = default_timer()
+        while True:
+            while not self._ready:
+                remaining = _TRANSFER_WORKER_IDLE_TIMEOUT - (default_timer() - idle_since)
+                if remaining <= 0:
+                    return None
+
+                self._idle_workers += 1
+                try:
+                    self._condition.wait(remaining)
+                finally:
+                    self._idle_workers -= 1
+
+            transfer = self._ready.popleft()
+            transfer.scheduled = False
+
+            # a transfer which failed after it was scheduled does not start any more chunks
+            if transfer.is_ready():
+                break
+
+        index, item = transfer.pending.popleft()
+        transfer.in_flight += 1
+
+        # Go to the back of the line so the other transfers get the next workers.
+        self._schedule(transfer)
+        return transfer, index, item
+
+    def _work(self):
+        self._worker_state.is_worker = True
+        with self._condition:
+            chunk = self._next_chunk()
+            if chunk is None:
+                self._workers -= 1
+                return
+
+        while True:
+            transfer, index, item = chunk
+            try:
+                result = transfer.process(item)
+                exception = None
+            except BaseException as ex:
+                result = None
+                exception = ex
+
+            with self._condition:
+                transfer.in_flight -= 1
+                if exception is None:
+                    transfer.results[index] = result
+                elif transfer.exception is None:
+                    transfer.exception = exception
+                self._schedule(transfer)
+
+                # Wake the threads waiting for their transfers to progress.
+                self._condition.notify_all()
+
+                chunk = self._next_chunk()
+                if chunk is None:
+                    self._workers -= 1
+                    return
+
+
+_default_transfer_executor = None
+_default_transfer_executor_lock = threading.Lock()
+
+
+def _get_default_transfer_executor():
+    global _default_transfer_executor
+    with _default_transfer_executor_lock:
+        if _default_transfer_executor is None:
+            _default_transfer_executor = TransferExecutor()
+        return _default_transfer_executor
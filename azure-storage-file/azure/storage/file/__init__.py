@@ -11,6 +11,7 @@ from .models import (
     FileProperties,
     Directory,
     DirectoryProperties,
+    FileColumns,
     FileRange,
     ContentSettings,
     CopyProperties,
@@ -9,3 +9,6 @@ __version__ = '2.1.0'
 
 # x-ms-version for storage service.
 X_MS_VERSION = '2019-02-02'
+
+# service limit on the range written by one request
+_MAX_RANGE_SIZE = 4 * 1024 * 1024
@@ -3,7 +3,6 @@
 # Licensed under the MIT License. See License.txt in the project root for
 # license information.
 # --------------------------------------------------------------------------
-from dateutil import parser
 
 try:
     from xml.etree import cElementTree as ETree
@@ -13,6 +12,7 @@ from .models import (
     Share,
     Directory,
     File,
+    FileColumns,
     Handle,
     FileProperties,
     FileRange,
@@ -23,8 +23,12 @@ from azure.storage.common.models import (
     _list,
 )
 from azure.storage.common._deserialization import (
+    _iterparse_list,
+    _ResponseBodyReader,
+    _parse_datetime,
     _parse_properties,
     _parse_metadata,
+    _write_response_body,
 )
 from azure.storage.common._error import _validate_content_match
 from azure.storage.common._common_conversion import (
@@ -78,7 +82,7 @@ def _parse_permission(response):
     return response.body
 
 
-def _parse_file(response, name, validate_content=False):
+def _parse_file(response, name, validate_content=False, stream_writer=None):
     if response is None:
         return None
 
@@ -93,6 +97,11 @@ def _parse_file(response, name, validate_content=False):
         else:
             delattr(content_settings, 'content_md5')
 
+    if stream_writer is not None:
+        # The body is copied to the writer as it is read and is not kept on the file
+        _write_response_body(response, stream_writer, validate_content)
+        return File(name, None, props, metadata)
+
     if validate_content:
         computed_md5 = _get_content_md5(response.body)
         _validate_content_match(response.headers['content-md5'], computed_md5)
@@ -100,6 +109,10 @@ def _parse_file(response, name, validate_content=False):
     return File(name, response.body, props, metadata)
 
 
+def _parse_copy_properties(response):
+    return _parse_properties(response, FileProperties).copy
+
+
 def _convert_xml_to_shares(response):
     '''
     <?xml version="1.0" encoding="utf-8"?>
@@ -153,7 +166,7 @@ def _convert_xml_to_shares(response):
 
         # Properties
         properties_element = share_element.find('Properties')
-        share.properties.last_modified = parser.parse(properties_element.findtext('Last-Modified'))
+        share.properties.last_modified = _parse_datetime(properties_element.findtext('Last-Modified'))
         share.properties.etag = properties_element.findtext('Etag')
         share.properties.quota = int(properties_element.findtext('Quota'))
 
@@ -218,6 +231,33 @@ def _convert_xml_to_directories_and_files(response):
     return entries
 
 
+def _convert_xml_to_file_columns(response):
+    '''
+    Converts a page of a directory listing into FileColumns, appending the 
+    properties of each entry to the columns as it is read rather than creating 
+    a File or Directory for it.
+    '''
+    if response is None:
+        return None
+
+    body = _ResponseBodyReader(response)
+    if body.is_empty():
+        return None
+
+    columns = FileColumns()
+    for element in _iterparse_list(body, 'Entries', columns):
+        columns.names.append(element.findtext('Name'))
+        if element.tag == 'File':
+            columns.content_lengths.append(int(element.find('Properties').findtext('Content-Length')))
+            columns.is_directory.append(False)
+        else:
+            columns.content_lengths.append(0)
+            columns.is_directory.append(True)
+
+    columns.next_marker = columns.next_marker or None
+    return columns
+
+
 def _convert_xml_to_handles(response):
     """
     <?xml version="1.0" encoding="utf-8"?>
@@ -258,11 +298,11 @@ def _convert_xml_to_handles(response):
         handle.parent_id = handle_element.findtext('ParentId')
         handle.session_id = handle_element.findtext('SessionId')
         handle.client_ip = handle_element.findtext('ClientIp')
-        handle.open_time = parser.parse(handle_element.findtext('OpenTime'))
+        handle.open_time = _parse_datetime(handle_element.findtext('OpenTime'))
 
         last_connect_time_string = handle_element.findtext('LastReconnectTime')
         if last_connect_time_string is not None:
-            handle.last_reconnect_time = parser.parse(last_connect_time_string)
+            handle.last_reconnect_time = _parse_datetime(last_connect_time_string)
 
         # Add file to list
         entries.append(handle)
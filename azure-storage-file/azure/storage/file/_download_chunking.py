@@ -5,6 +5,8 @@
 # --------------------------------------------------------------------------
 import threading
 
+from azure.storage.common._deserialization import _get_seekable_stream_writer
+
 
 def _download_file_chunks(file_service, share_name, directory_name, file_name,
                           download_size, block_size, progress, start_range, end_range,
@@ -32,9 +34,7 @@ def _download_file_chunks(file_service, share_name, directory_name, file_name,
     )
 
     if max_connections > 1:
-        import concurrent.futures
-        executor = concurrent.futures.ThreadPoolExecutor(max_connections)
-        list(executor.map(downloader.process_chunk, downloader.get_chunk_offsets()))
+        file_service._transfer_chunks(downloader.process_chunk, downloader.get_chunk_offsets(), max_connections)
     else:
         for chunk in downloader.get_chunk_offsets():
             downloader.process_chunk(chunk)
@@ -75,16 +75,22 @@ class _FileChunkDownloader(object):
             yield index
             index += self.chunk_size
 
-    def process_chunk(self, chunk_start):
+    def get_chunk_end(self, chunk_start):
         if chunk_start + self.chunk_size > self.file_end:
-            chunk_end = self.file_end
-        else:
-            chunk_end = chunk_start + self.chunk_size
+            return self.file_end
+        return chunk_start + self.chunk_size
 
-        chunk_data = self._download_chunk(chunk_start, chunk_end).content
+    def process_chunk(self, chunk_start):
+        chunk_end = self.get_chunk_end(chunk_start)
+        self.process_chunk_response(self._download_chunk(chunk_start, chunk_end), chunk_start, chunk_end)
+
+    def process_chunk_response(self, response, chunk_start, chunk_end):
+        # the chunk is written to the stream as it arrives when possible, in which case no content is returned
+        chunk_data = response.content
         length = chunk_end - chunk_start
         if length > 0:
-            self._write_to_stream(chunk_data, chunk_start)
+            if chunk_data is not None:
+                self._write_to_stream(chunk_data, chunk_start)
             self._update_progress(length)
 
     # should be provided by the subclass
@@ -95,6 +101,10 @@ class _FileChunkDownloader(object):
     def _write_to_stream(self, chunk_data, chunk_start):
         pass
 
+    # should be provided by the subclass
+    def _get_stream_writer(self, chunk_start):
+        return None
+
     def _download_chunk(self, chunk_start, chunk_end):
         return self.file_service._get_file(
             self.share_name,
@@ -105,7 +115,9 @@ class _FileChunkDownloader(object):
             validate_content=self.validate_content,
             timeout=self.timeout,
             _context=self.operation_context,
-            snapshot=self.snapshot
+            snapshot=self.snapshot,
+            _stream_writer=self._get_stream_writer(chunk_start),
+            _operation_name='get_file_to_stream',
         )
 
 
@@ -139,6 +151,16 @@ class _ParallelFileChunkDownloader(_FileChunkDownloader):
             self.stream.seek(self.stream_start + (chunk_start - self.start_index))
             self.stream.write(chunk_data)
 
+    def _get_stream_writer(self, chunk_start):
+        chunk_position = self.stream_start + (chunk_start - self.start_index)
+
+        def write(offset, data):
+            with self.stream_lock:
+                self.stream.seek(chunk_position + offset)
+                self.stream.write(data)
+
+        return write
+
 
 class _SequentialFileChunkDownloader(_FileChunkDownloader):
     def __init__(self, file_service, share_name, directory_name, file_name, download_size, chunk_size, progress,
@@ -157,3 +179,7 @@ class _SequentialFileChunkDownloader(_FileChunkDownloader):
     def _write_to_stream(self, chunk_data, chunk_start):
         # chunk_start is ignored in the case of sequential download since we cannot seek the destination stream
         self.stream.write(chunk_data)
+
+    def _get_stream_writer(self, chunk_start):
+        # the body can only be streamed if a failed attempt can be rewritten from the start of the chunk
+        return _get_seekable_stream_writer(self.stream)
@@ -4,11 +4,16 @@
 # license information.
 # --------------------------------------------------------------------------
 import threading
+from timeit import default_timer
+
+from azure.storage.common._chunk_sizing import _AdaptiveChunkSize
+from azure.storage.common._memory_mapping import _MemoryMappedFile
+from ._constants import _MAX_RANGE_SIZE
 
 
 def _upload_file_chunks(file_service, share_name, directory_name, file_name,
                         file_size, block_size, stream, max_connections,
-                        progress_callback, validate_content, timeout):
+                        progress_callback, validate_content, timeout, chunk_sizer=None):
     uploader = _FileChunkUploader(
         file_service,
         share_name,
@@ -22,23 +27,31 @@ def _upload_file_chunks(file_service, share_name, directory_name, file_name,
         validate_content,
         timeout
     )
+    uploader.chunk_sizer = chunk_sizer
 
     if progress_callback is not None:
         progress_callback(0, file_size)
 
     if max_connections > 1:
-        import concurrent.futures
-        executor = concurrent.futures.ThreadPoolExecutor(max_connections)
-        range_ids = list(executor.map(uploader.process_chunk, uploader.get_chunk_offsets()))
+        range_ids = file_service._transfer_chunks(uploader.process_chunk, uploader.get_chunk_ranges(),
+                                                  max_connections)
     else:
         if file_size is not None:
-            range_ids = [uploader.process_chunk(start) for start in uploader.get_chunk_offsets()]
+            range_ids = [uploader.process_chunk(chunk_range) for chunk_range in uploader.get_chunk_ranges()]
         else:
             range_ids = uploader.process_all_unknown_size()
 
     return range_ids
 
 
+def _get_adaptive_range_size(range_size):
+    '''
+    Returns the chunk size of an adaptive file upload, which starts at
+    range_size and grows up to the most a request may write.
+    '''
+    return _AdaptiveChunkSize(range_size, _MAX_RANGE_SIZE)
+
+
 class _FileChunkUploader(object):
     def __init__(self, file_service, share_name, directory_name, file_name,
                  file_size, chunk_size, stream, parallel, progress_callback,
@@ -58,26 +71,30 @@ class _FileChunkUploader(object):
         self.validate_content = validate_content
         self.timeout = timeout
 
-    def get_chunk_offsets(self):
+        # an adaptive upload tunes the size of its ranges as they are sent
+        self.chunk_sizer = None
+
+        # the ranges of a memory-mapped file are views of the mapping, which need no lock
+        self.stream_view = stream.get_view() if isinstance(stream, _MemoryMappedFile) else None
+
+    def get_chunk_ranges(self):
+        # the size of each range is taken as it is created, as an adaptive upload may have changed it
         index = 0
-        if self.file_size is None:
-            # we don't know the size of the stream, so we have no
-            # choice but to seek
-            while True:
+        while self.file_size is None or index < self.file_size:
+            size = self._get_chunk_size()
+            if self.file_size is None:
+                # we don't know the size of the stream, so we have no
+                # choice but to seek
                 data = self._read_from_stream(index, 1)
                 if not data:
                     break
-                yield index
-                index += self.chunk_size
-        else:
-            while index < self.file_size:
-                yield index
-                index += self.chunk_size
-
-    def process_chunk(self, chunk_offset):
-        size = self.chunk_size
-        if self.file_size is not None:
-            size = min(size, self.file_size - chunk_offset)
+            else:
+                size = min(size, self.file_size - index)
+            yield index, size
+            index += size
+
+    def process_chunk(self, chunk_range):
+        chunk_offset, size = chunk_range
         chunk_data = self._read_from_stream(chunk_offset, size)
         return self._upload_chunk_with_progress(chunk_offset, chunk_data)
 
@@ -86,7 +103,7 @@ class _FileChunkUploader(object):
         range_ids = []
         index = 0
         while True:
-            data = self._read_from_stream(None, self.chunk_size)
+            data = self._read_from_stream(None, self._get_chunk_size())
             if data:
                 index += len(data)
                 range_id = self._upload_chunk_with_progress(index, data)
@@ -96,7 +113,17 @@ class _FileChunkUploader(object):
 
         return range_ids
 
+    def _get_chunk_size(self):
+        return self.chunk_size if self.chunk_sizer is None else self.chunk_sizer.size
+
+    def _record_request(self, length, start_time):
+        # an adaptive upload tunes its range size from how long its requests take
+        if self.chunk_sizer is not None:
+            self.chunk_sizer.record(length, default_timer() - start_time)
+
     def _read_from_stream(self, offset, count):
+        if self.stream_view is not None and offset is not None:
+            return self.stream_view[offset:offset + count]
         if self.stream_lock is not None:
             with self.stream_lock:
                 self.stream.seek(self.stream_start + offset)
@@ -118,6 +145,7 @@ class _FileChunkUploader(object):
 
     def _upload_chunk_with_progress(self, chunk_start, chunk_data):
         chunk_end = chunk_start + len(chunk_data) - 1
+        start_time = default_timer()
         self.file_service.update_range(
             self.share_name,
             self.directory_name,
@@ -128,6 +156,7 @@ class _FileChunkUploader(object):
             self.validate_content,
             timeout=self.timeout
         )
+        self._record_request(len(chunk_data), start_time)
         range_id = 'bytes={0}-{1}'.format(chunk_start, chunk_end)
         self._update_progress(len(chunk_data))
         return range_id
@@ -0,0 +1,48 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+from azure.storage.common.aio._concurrency import _run_concurrently
+
+from .._download_chunking import (
+    _ParallelFileChunkDownloader,
+    _SequentialFileChunkDownloader,
+)
+
+
+async def _download_file_chunks(file_service, share_name, directory_name, file_name,
+                                download_size, block_size, progress, start_range, end_range,
+                                stream, max_connections, progress_callback, validate_content,
+                                timeout, operation_context, snapshot):
+
+    downloader_class = _ParallelFileChunkDownloader if max_connections > 1 else _SequentialFileChunkDownloader
+
+    downloader = downloader_class(
+        file_service,
+        share_name,
+        directory_name,
+        file_name,
+        download_size,
+        block_size,
+        progress,
+        start_range,
+        end_range,
+        stream,
+        progress_callback,
+        validate_content,
+        timeout,
+        operation_context,
+        snapshot,
+    )
+
+    async def process_chunk(chunk_start):
+        chunk_end = downloader.get_chunk_end(chunk_start)
+        response = await downloader._download_chunk(chunk_start, chunk_end)
+        downloader.process_chunk_response(response, chunk_start, chunk_end)
+
+    if max_connections > 1:
+        await _run_concurrently(process_chunk, downloader.get_chunk_offsets(), max_connections)
+    else:
+        for chunk in downloader.get_chunk_offsets():
+            await process_chunk(chunk)
@@ -0,0 +1,62 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+from timeit import default_timer
+
+from azure.storage.common.aio._concurrency import _run_concurrently
+
+from .._upload_chunking import _FileChunkUploader
+
+
+async def _upload_file_chunks(file_service, share_name, directory_name, file_name,
+                              file_size, block_size, stream, max_connections,
+                              progress_callback, validate_content, timeout, chunk_sizer=None):
+    uploader = _AsyncFileChunkUploader(
+        file_service,
+        share_name,
+        directory_name,
+        file_name,
+        file_size,
+        block_size,
+        stream,
+        max_connections > 1,
+        progress_callback,
+        validate_content,
+        timeout
+    )
+    uploader.chunk_sizer = chunk_sizer
+
+    if progress_callback is not None:
+        progress_callback(0, file_size)
+
+    if max_connections > 1:
+        return await _run_concurrently(uploader.process_chunk, uploader.get_chunk_ranges(), max_connections)
+
+    return [await uploader.process_chunk(chunk_range) for chunk_range in uploader.get_chunk_ranges()]
+
+
+class _AsyncFileChunkUploader(_FileChunkUploader):
+    async def process_chunk(self, chunk_range):
+        chunk_offset, size = chunk_range
+        chunk_data = self._read_from_stream(chunk_offset, size)
+        return await self._upload_chunk_with_progress(chunk_offset, chunk_data)
+
+    async def _upload_chunk_with_progress(self, chunk_start, chunk_data):
+        chunk_end = chunk_start + len(chunk_data) - 1
+        start_time = default_timer()
+        await self.file_service.update_range(
+            self.share_name,
+            self.directory_name,
+            self.file_name,
+            chunk_data,
+            chunk_start,
+            chunk_end,
+            self.validate_content,
+            timeout=self.timeout
+        )
+        self._record_request(len(chunk_data), start_time)
+        range_id = 'bytes={0}-{1}'.format(chunk_start, chunk_end)
+        self._update_progress(len(chunk_data))
+        return range_id
@@ -0,0 +1,579 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import math
+import sys
+from io import BytesIO
+from os import path
+
+from azure.common import AzureHttpError
+
+from azure.storage.common._deserialization import (
+    _get_seekable_stream_writer,
+    _parse_length_from_content_range,
+)
+from azure.storage.common._error import (
+    _dont_fail_not_exist,
+    _dont_fail_on_exist,
+    _validate_not_none,
+    _ERROR_VALUE_NEGATIVE,
+    _ERROR_PARALLEL_NOT_SEEKABLE,
+)
+from azure.storage.common._memory_mapping import _open_file_for_upload
+from azure.storage.common.aio import (
+    AsyncListGenerator,
+    AsyncStorageClient,
+)
+from azure.storage.common.models import _OperationContext
+from ..fileservice import (
+    FileService,
+    _GB,
+    _RESOURCE_ALREADY_EXISTS_ERROR_CODE,
+    _RESOURCE_NOT_FOUND_ERROR_CODE,
+    _SHARE_ALREADY_EXISTS_ERROR_CODE,
+    _SHARE_NOT_FOUND_ERROR_CODE,
+)
+from .._deserialization import _convert_xml_to_file_columns
+from .._upload_chunking import _get_adaptive_range_size
+from ..models import (
+    FileColumns,
+    SMBProperties,
+)
+from ._download_chunking import _download_file_chunks
+from ._upload_chunking import _upload_file_chunks
+
+
+class AsyncFileService(AsyncStorageClient, FileService):
+    '''
+    The asyncio variant of :class:`~azure.storage.file.fileservice.FileService`.
+    It is created with the same arguments and exposes the same operations, but
+    every operation is a coroutine and the list operations return an
+    :class:`~azure.storage.common.aio.AsyncListGenerator` to be iterated with
+    ``async for``. Chunked uploads and downloads run their range requests
+    concurrently on the event loop instead of in a thread pool.
+
+    create_file_from_bytes and create_file_from_text are inherited and return
+    the coroutine of create_file_from_stream.
+
+    Requests are sent over an aiohttp session, so the aiohttp package must be
+    installed. Await close() or use the service as an async context manager to
+    release it.
+    '''
+
+    async def list_shares(self, prefix=None, marker=None, num_results=None,
+                          include_metadata=False, timeout=None, include_snapshots=False, prefetch_pages=0):
+        '''
+        Returns an asynchronous generator to list the shares under the
+        specified account. See :meth:`FileService.list_shares`.
+
+        :rtype: :class:`~azure.storage.common.aio.AsyncListGenerator`
+        '''
+        include = 'snapshots' if include_snapshots else None
+        if include_metadata:
+            if include is not None:
+                include = include + ',metadata'
+            else:
+                include = 'metadata'
+        operation_context = _OperationContext(location_lock=True)
+        kwargs = {'prefix': prefix, 'marker': marker, 'max_results': num_results,
+                  'include': include, 'timeout': timeout, '_context': operation_context,
+                  '_operation_name': 'list_shares'}
+        resp = await self._list_shares(**kwargs)
+
+        return AsyncListGenerator(resp, self._list_shares, (), kwargs, prefetch_pages)
+
+    async def create_share(self, share_name, metadata=None, quota=None,
+                           fail_on_exist=False, timeout=None):
+        '''
+        Creates a new share under the specified account. See
+        :meth:`FileService.create_share`.
+
+        :return: True if share is created, False if share already exists.
+        :rtype: bool
+        '''
+        request = self._get_create_share_http_request(share_name, metadata, quota, timeout)
+
+        if not fail_on_exist:
+            try:
+                await self._perform_request(request, expected_errors=[_SHARE_ALREADY_EXISTS_ERROR_CODE],
+                                            operation_name='create_share')
+                return True
+            except AzureHttpError as ex:
+                _dont_fail_on_exist(ex)
+                return False
+        else:
+            await self._perform_request(request, operation_name='create_share')
+            return True
+
+    async def get_share_stats(self, share_name, timeout=None):
+        '''
+        Gets the approximate size of the data stored on the share,
+        rounded up to the nearest gigabyte. See :meth:`FileService.get_share_stats`.
+
+        :rtype: int
+        '''
+        usage = await self.get_share_stats_in_bytes(share_name, timeout=timeout)
+        return int(math.ceil(float(usage) / _GB))
+
+    async def delete_share(self, share_name, fail_not_exist=False, timeout=None, snapshot=None,
+                           delete_snapshots=None):
+        '''
+        Marks the specified share for deletion. See :meth:`FileService.delete_share`.
+
+        :return: True if share is deleted, False share doesn't exist.
+        :rtype: bool
+        '''
+        request = self._get_delete_share_http_request(share_name, timeout, snapshot, delete_snapshots)
+
+        if not fail_not_exist:
+            try:
+                await self._perform_request(request, expected_errors=[_SHARE_NOT_FOUND_ERROR_CODE],
+                                            operation_name='delete_share')
+                return True
+            except AzureHttpError as ex:
+                _dont_fail_not_exist(ex)
+                return False
+        else:
+            await self._perform_request(request, operation_name='delete_share')
+            return True
+
+    async def create_directory(self, share_name, directory_name, metadata=None,
+                               fail_on_exist=False, timeout=None, file_permission=None,
+                               smb_properties=SMBProperties()):
+        '''
+        Creates a new directory under the specified share or parent directory.
+        See :meth:`FileService.create_directory`.
+
+        :return: True if directory is created, False if directory already exists.
+        :rtype: bool
+        '''
+        request = self._get_create_directory_http_request(share_name, directory_name, metadata, timeout,
+                                                          file_permission, smb_properties)
+
+        if not fail_on_exist:
+            try:
+                await self._perform_request(request, expected_errors=_RESOURCE_ALREADY_EXISTS_ERROR_CODE,
+                                            operation_name='create_directory')
+                return True
+            except AzureHttpError as ex:
+                _dont_fail_on_exist(ex)
+                return False
+        else:
+            await self._perform_request(request, operation_name='create_directory')
+            return True
+
+    async def delete_directory(self, share_name, directory_name,
+                               fail_not_exist=False, timeout=None):
+        '''
+        Deletes the specified empty directory. See :meth:`FileService.delete_directory`.
+
+        :return: True if directory is deleted, False otherwise.
+        :rtype: bool
+        '''
+        request = self._get_delete_directory_http_request(share_name, directory_name, timeout)
+
+        if not fail_not_exist:
+            try:
+                await self._perform_request(request, expected_errors=[_RESOURCE_NOT_FOUND_ERROR_CODE],
+                                            operation_name='delete_directory')
+                return True
+            except AzureHttpError as ex:
+                _dont_fail_not_exist(ex)
+                return False
+        else:
+            await self._perform_request(request, operation_name='delete_directory')
+            return True
+
+    async def list_directories_and_files(self, share_name, directory_name=None,
+                                         num_results=None, marker=None, timeout=None,
+                                         prefix=None, snapshot=None, prefetch_pages=0):
+        '''
+        Returns an asynchronous generator to list the directories and files
+        under the specified share. See :meth:`FileService.list_directories_and_files`.
+
+        :rtype: :class:`~azure.storage.common.aio.AsyncListGenerator`
+        '''
+        operation_context = _OperationContext(location_lock=True)
+        args = (share_name, directory_name)
+        kwargs = {'marker': marker, 'max_results': num_results, 'timeout': timeout,
+                  '_context': operation_context, 'prefix': prefix, 'snapshot': snapshot,
+                  '_operation_name': 'list_directories_and_files'}
+
+        resp = await self._list_directories_and_files(*args, **kwargs)
+
+        return AsyncListGenerator(resp, self._list_directories_and_files, args, kwargs, prefetch_pages)
+
+    async def list_directory_and_file_columns(self, share_name, directory_name=None, num_results=None,
+                                              marker=None, timeout=None, prefix=None, snapshot=None):
+        '''
+        Lists the directories and files under the specified directory as columns
+        of their names, sizes and whether they are directories. See
+        :meth:`FileService.list_directory_and_file_columns`.
+
+        :rtype: :class:`~azure.storage.file.models.FileColumns`
+        '''
+        _validate_not_none('share_name', share_name)
+        operation_context = _OperationContext(location_lock=True)
+        columns = FileColumns()
+        while True:
+            page = await self._list_directories_and_files(
+                share_name, directory_name, marker=marker,
+                max_results=num_results - len(columns) if num_results else None,
+                timeout=timeout, prefix=prefix, _context=operation_context,
+                snapshot=snapshot, _converter=_convert_xml_to_file_columns,
+                _operation_name='list_directory_and_file_columns')
+            columns._extend(page)
+            marker = page.next_marker
+            if not marker or (num_results and len(columns) >= num_results):
+                break
+
+        columns._finish()
+        return columns
+
+    async def list_handles(self, share_name, directory_name=None, file_name=None, recursive=None,
+                           max_results=None, marker=None, snapshot=None, timeout=None):
+        '''
+        Returns an asynchronous generator to list opened handles on a directory
+        or a file under the specified share. See :meth:`FileService.list_handles`.
+
+        :rtype: :class:`~azure.storage.common.aio.AsyncListGenerator`
+        '''
+        operation_context = _OperationContext(location_lock=True)
+        args = (share_name, directory_name, file_name)
+        kwargs = {'marker': marker, 'max_results': max_results, 'timeout': timeout, 'recursive': recursive,
+                  '_context': operation_context, 'snapshot': snapshot,
+                  '_operation_name': 'list_handles'}
+
+        resp = await self._list_handles(*args, **kwargs)
+
+        return AsyncListGenerator(resp, self._list_handles, args, kwargs)
+
+    async def close_handles(self, share_name, directory_name=None, file_name=None, recursive=None,
+                            handle_id=None, marker=None, snapshot=None, timeout=None):
+        '''
+        Returns an asynchronous generator to close opened handles on a directory
+        or a file under the specified share. See :meth:`FileService.close_handles`.
+
+        :rtype: :class:`~azure.storage.common.aio.AsyncListGenerator`
+        '''
+        operation_context = _OperationContext(location_lock=True)
+        args = (share_name, directory_name, file_name)
+        kwargs = {'marker': marker, 'handle_id': handle_id, 'timeout': timeout, 'recursive': recursive,
+                  '_context': operation_context, 'snapshot': snapshot,
+                  '_operation_name': 'close_handles'}
+
+        resp = await self._close_handles(*args, **kwargs)
+
+        return AsyncListGenerator(resp, self._close_handles, args, kwargs)
+
+    async def exists(self, share_name, directory_name=None, file_name=None, timeout=None, snapshot=None):
+        '''
+        Returns a boolean indicating whether the share, directory or file exists.
+        See :meth:`FileService.exists`.
+
+        :rtype: bool
+        '''
+        request, expected_errors = self._get_exists_http_request(share_name, directory_name, file_name, timeout,
+                                                                 snapshot)
+        try:
+            await self._perform_request(request, expected_errors=expected_errors, operation_name='exists')
+            return True
+        except AzureHttpError as ex:
+            _dont_fail_not_exist(ex)
+            return False
+
+    async def create_file_from_path(self, share_name, directory_name, file_name,
+                                    local_file_path, content_settings=None,
+                                    metadata=None, validate_content=False, progress_callback=None,
+                                    max_connections=2, file_permission=None, smb_properties=SMBProperties(),
+                                    timeout=None):
+        '''
+        Creates a new azure file from a local file path, or updates the content
+        of an existing file, with automatic chunking and progress notifications.
+        See :meth:`FileService.create_file_from_path`.
+        '''
+        _validate_not_none('share_name', share_name)
+        _validate_not_none('file_name', file_name)
+        _validate_not_none('local_file_path', local_file_path)
+
+        count = path.getsize(local_file_path)
+        with _open_file_for_upload(local_file_path) as stream:
+            await self.create_file_from_stream(
+                share_name, directory_name, file_name, stream,
+                count, content_settings, metadata, validate_content, progress_callback,
+                max_connections, file_permission=file_permission, smb_properties=smb_properties, timeout=timeout)
+
+    async def create_file_from_stream(
+            self, share_name, directory_name, file_name, stream, count,
+            content_settings=None, metadata=None, validate_content=False,
+            progress_callback=None, max_connections=2, timeout=None,
+            file_permission=None, smb_properties=SMBProperties()):
+        '''
+        Creates a new file from a file/stream, or updates the content of an
+        existing file, with automatic chunking and progress notifications.
+        See :meth:`FileService.create_file_from_stream`.
+
+        Ranges are read from the stream on the event loop, so the stream should
+        not block for long.
+        '''
+        _validate_not_none('share_name', share_name)
+        _validate_not_none('file_name', file_name)
+        _validate_not_none('stream', stream)
+        _validate_not_none('count', count)
+
+        if count < 0:
+            raise TypeError(_ERROR_VALUE_NEGATIVE.format('count'))
+
+        await self.create_file(
+            share_name,
+            directory_name,
+            file_name,
+            count,
+            content_settings,
+            metadata,
+            file_permission=file_permission,
+            smb_properties=smb_properties,
+            timeout=timeout
+        )
+
+        await _upload_file_chunks(
+            self,
+            share_name,
+            directory_name,
+            file_name,
+            count,
+            self.MAX_RANGE_SIZE,
+            stream,
+            max_connections,
+            progress_callback,
+            validate_content,
+            timeout,
+            chunk_sizer=_get_adaptive_range_size(self.MAX_RANGE_SIZE) if self.ADAPTIVE_RANGE_SIZE else None,
+        )
+
+    async def get_file_to_path(self, share_name, directory_name, file_name, file_path,
+                               open_mode='wb', start_range=None, end_range=None,
+                               validate_content=False, progress_callback=None,
+                               max_connections=2, timeout=None, snapshot=None):
+        '''
+        Downloads a file to a file path, with automatic chunking and progress
+        notifications. See :meth:`FileService.get_file_to_path`.
+
+        :rtype: :class:`~azure.storage.file.models.File`
+        '''
+        _validate_not_none('share_name', share_name)
+        _validate_not_none('file_name', file_name)
+        _validate_not_none('file_path', file_path)
+        _validate_not_none('open_mode', open_mode)
+
+        if max_connections > 1 and 'a' in open_mode:
+            raise ValueError(_ERROR_PARALLEL_NOT_SEEKABLE)
+
+        with open(file_path, open_mode) as stream:
+            file = await self.get_file_to_stream(
+                share_name, directory_name, file_name, stream,
+                start_range, end_range, validate_content,
+                progress_callback, max_connections, timeout, snapshot)
+
+        return file
+
+    async def get_file_to_stream(
+            self, share_name, directory_name, file_name, stream,
+            start_range=None, end_range=None, validate_content=False,
+            progress_callback=None, max_connections=2, timeout=None, snapshot=None):
+        '''
+        Downloads a file to a stream, with automatic chunking and progress
+        notifications. See :meth:`FileService.get_file_to_stream`.
+
+        Up to max_connections ranges are downloaded at the same time. Writes to
+        the stream are made from the event loop and must not block for long.
+
+        :rtype: :class:`~azure.storage.file.models.File`
+        '''
+        _validate_not_none('share_name', share_name)
+        _validate_not_none('file_name', file_name)
+        _validate_not_none('stream', stream)
+
+        if end_range is not None:
+            _validate_not_none("start_range", start_range)
+
+        # the stream must be seekable if parallel download is required
+        if max_connections > 1:
+            if sys.version_info >= (3,) and not stream.seekable():
+                raise ValueError(_ERROR_PARALLEL_NOT_SEEKABLE)
+            else:
+                try:
+                    stream.seek(stream.tell())
+                except (NotImplementedError, AttributeError):
+                    raise ValueError(_ERROR_PARALLEL_NOT_SEEKABLE)
+
+        # The service only provides transactional MD5s for chunks under 4MB.
+        # If validate_content is on, get only self.MAX_CHUNK_GET_SIZE for the first
+        # chunk so a transactional MD5 can be retrieved.
+        first_get_size = self.MAX_SINGLE_GET_SIZE if not validate_content else self.MAX_CHUNK_GET_SIZE
+
+        initial_request_start = start_range if start_range is not None else 0
+
+        if end_range is not None and end_range - start_range < first_get_size:
+            initial_request_end = end_range
+        else:
+            initial_request_end = initial_request_start + first_get_size - 1
+
+        # Send a context object to make sure we always retry to the initial location
+        operation_context = _OperationContext(location_lock=True)
+
+        # If the stream is seekable, the first download is written to it as it arrives
+        stream_writer = _get_seekable_stream_writer(stream)
+        try:
+            file = await self._get_file(share_name,
+                                        directory_name,
+                                        file_name,
+                                        start_range=initial_request_start,
+                                        end_range=initial_request_end,
+                                        validate_content=validate_content,
+                                        timeout=timeout,
+                                        _context=operation_context,
+                                        snapshot=snapshot,
+                                        _stream_writer=stream_writer,
+                                        _operation_name='get_file_to_stream')
+
+            # Parse the total file size and adjust the download size if ranges
+            # were specified
+            file_size = _parse_length_from_content_range(file.properties.content_range)
+            if end_range is not None:
+                # Use the end_range unless it is over the end of the file
+                download_size = min(file_size, end_range - start_range + 1)
+            elif start_range is not None:
+                download_size = file_size - start_range
+            else:
+                download_size = file_size
+        except AzureHttpError as ex:
+            if start_range is None and ex.status_code == 416:
+                # Get range will fail on an empty file. If the user did not
+                # request a range, do a regular get request in order to get
+                # any properties.
+                file = await self._get_file(share_name,
+                                            directory_name,
+                                            file_name,
+                                            validate_content=validate_content,
+                                            timeout=timeout,
+                                            _context=operation_context,
+                                            snapshot=snapshot,
+                                            _stream_writer=stream_writer,
+                                            _operation_name='get_file_to_stream')
+
+                # Set the download size to empty
+                download_size = 0
+            else:
+                raise ex
+
+        # Mark the first progress chunk. If the file is small, this is the only call
+        if progress_callback:
+            progress_callback(file.properties.content_length, download_size)
+
+        # Write the content to the user stream
+        # Clear file content since output has been written to user stream
+        if file.content is not None:
+            stream.write(file.content)
+            file.content = None
+
+        # If the file is small, the download is complete at this point.
+        # If file size is large, download the rest of the file in chunks.
+        if file.properties.content_length != download_size:
+            end_file = file_size
+            if end_range is not None:
+                # Use the end_range unless it is over the end of the file
+                end_file = min(file_size, end_range + 1)
+
+            await _download_file_chunks(
+                self,
+                share_name,
+                directory_name,
+                file_name,
+                download_size,
+                self.MAX_CHUNK_GET_SIZE,
+                first_get_size,
+                initial_request_end + 1,  # start where the first download ended
+                end_file,
+                stream,
+                max_connections,
+                progress_callback,
+                validate_content,
+                timeout,
+                operation_context,
+                snapshot
+            )
+
+            # Set the content length to the download size instead of the size of
+            # the last range
+            file.properties.content_length = download_size
+
+            # Overwrite the content range to the user requested range
+            file.properties.content_range = 'bytes {0}-{1}/{2}'.format(start_range, end_range, file_size)
+
+            # Overwrite the content MD5 as it is the MD5 for the last range instead
+            # of the stored MD5
+            # TODO: Set to the stored MD5 when the service returns this
+            file.properties.content_md5 = None
+
+        return file
+
+    async def get_file_to_bytes(self, share_name, directory_name, file_name,
+                                start_range=None, end_range=None, validate_content=False,
+                                progress_callback=None, max_connections=2, timeout=None, snapshot=None):
+        '''
+        Downloads a file as an array of bytes, with automatic chunking and
+        progress notifications. See :meth:`FileService.get_file_to_bytes`.
+
+        :rtype: :class:`~azure.storage.file.models.File`
+        '''
+        _validate_not_none('share_name', share_name)
+        _validate_not_none('file_name', file_name)
+
+        stream = BytesIO()
+        file = await self.get_file_to_stream(
+            share_name,
+            directory_name,
+            file_name,
+            stream,
+            start_range,
+            end_range,
+            validate_content,
+            progress_callback,
+            max_connections,
+            timeout,
+            snapshot)
+
+        file.content = stream.getvalue()
+        return file
+
+    async def get_file_to_text(
+            self, share_name, directory_name, file_name, encoding='utf-8',
+            start_range=None, end_range=None, validate_content=False,
+            progress_callback=None, max_connections=2, timeout=None, snapshot=None):
+        '''
+        Downloads a file as unicode text, with automatic chunking and progress
+        notifications. See :meth:`FileService.get_file_to_text`.
+
+        :rtype: :class:`~azure.storage.file.models.File`
+        '''
+        _validate_not_none('share_name', share_name)
+        _validate_not_none('file_name', file_name)
+        _validate_not_none('encoding', encoding)
+
+        file = await self.get_file_to_bytes(
+            share_name,
+            directory_name,
+            file_name,
+            start_range,
+            end_range,
+            validate_content,
+            progress_callback,
+            max_connections,
+            timeout,
+            snapshot)
+
+        file.content = file.content.decode(encoding)
+        return file
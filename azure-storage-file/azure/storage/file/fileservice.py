@@ -34,6 +34,7 @@ from azure.storage.common._deserialization import (
     _parse_metadata,
     _parse_properties,
     _parse_length_from_content_range,
+    _get_seekable_stream_writer,
 )
 from azure.storage.common._error import (
     _dont_fail_not_exist,
@@ -46,6 +47,7 @@ from azure.storage.common._error import (
     _ERROR_PARALLEL_NOT_SEEKABLE,
     _validate_access_policies,
 )
+from azure.storage.common._memory_mapping import _open_file_for_upload
 from azure.storage.common._http import HTTPRequest
 from azure.storage.common._serialization import (
     _get_request_body,
@@ -66,11 +68,13 @@ from azure.storage.common.storageclient import StorageClient
 from ._deserialization import (
     _convert_xml_to_shares,
     _convert_xml_to_directories_and_files,
+    _convert_xml_to_file_columns,
     _convert_xml_to_handles,
     _parse_close_handle_response,
     _convert_xml_to_ranges,
     _convert_xml_to_share_stats,
     _parse_file,
+    _parse_copy_properties,
     _parse_share,
     _parse_snapshot_share,
     _parse_directory,
@@ -80,8 +84,12 @@ from ._serialization import (
     _get_path,
     _validate_and_format_range_headers,
     _validate_and_return_file_permission)
-from ._upload_chunking import _upload_file_chunks
+from ._upload_chunking import (
+    _get_adaptive_range_size,
+    _upload_file_chunks,
+)
 from .models import (
+    FileColumns,
     FileProperties,
     SMBProperties)
 
@@ -130,10 +138,16 @@ class FileService(StorageClient):
         The size of the ranges put by create_file_from_* methods. Smaller ranges
         may be put if there is less data provided. The maximum range size the service
         supports is 4MB.
+    :ivar bool ADAPTIVE_RANGE_SIZE:
+        If True, the create_file_from_* methods tune the size of the ranges they
+        put as they upload, starting at MAX_RANGE_SIZE. The ranges grow while
+        larger ranges raise the throughput of a put, up to 4MB, and shrink when a
+        put takes more than ten seconds.
     '''
     MAX_SINGLE_GET_SIZE = 32 * 1024 * 1024
     MAX_CHUNK_GET_SIZE = 8 * 1024 * 1024
     MAX_RANGE_SIZE = 4 * 1024 * 1024
+    ADAPTIVE_RANGE_SIZE = False
 
     def __init__(self, account_name=None, account_key=None, sas_token=None,
                  protocol=DEFAULT_PROTOCOL, endpoint_suffix=SERVICE_HOST_BASE,
@@ -511,7 +525,7 @@ class FileService(StorageClient):
         request.body = _get_request_body(
             _convert_service_properties_to_xml(None, hour_metrics, minute_metrics, cors))
 
-        self._perform_request(request)
+        return self._perform_request(request, operation_name='set_file_service_properties')
 
     def get_file_service_properties(self, timeout=None):
         '''
@@ -534,10 +548,11 @@ class FileService(StorageClient):
             'timeout': _int_to_str(timeout),
         }
 
-        return self._perform_request(request, _convert_xml_to_service_properties)
+        return self._perform_request(request, _convert_xml_to_service_properties,
+                                     operation_name='get_file_service_properties')
 
     def list_shares(self, prefix=None, marker=None, num_results=None,
-                    include_metadata=False, timeout=None, include_snapshots=False):
+                    include_metadata=False, timeout=None, include_snapshots=False, prefetch_pages=0):
         '''
         Returns a generator to list the shares under the specified account.
         The generator will lazily follow the continuation tokens returned by
@@ -566,6 +581,10 @@ class FileService(StorageClient):
             The timeout parameter is expressed in seconds.
         :param bool include_snapshots:
             Specifies that share snapshots be returned in the response.
+        :param int prefetch_pages:
+            The number of pages of results to request ahead, in the background, 
+            while the current page is being iterated. Defaults to 0, which 
+            requests each page only once the previous one has been iterated.
         '''
         include = 'snapshots' if include_snapshots else None
         if include_metadata:
@@ -575,13 +594,14 @@ class FileService(StorageClient):
                 include = 'metadata'
         operation_context = _OperationContext(location_lock=True)
         kwargs = {'prefix': prefix, 'marker': marker, 'max_results': num_results,
-                  'include': include, 'timeout': timeout, '_context': operation_context}
+                  'include': include, 'timeout': timeout, '_context': operation_context,
+                  '_operation_name': 'list_shares'}
         resp = self._list_shares(**kwargs)
 
-        return ListGenerator(resp, self._list_shares, (), kwargs)
+        return ListGenerator(resp, self._list_shares, (), kwargs, prefetch_pages)
 
     def _list_shares(self, prefix=None, marker=None, max_results=None,
-                     include=None, timeout=None, _context=None):
+                     include=None, timeout=None, _context=None, _operation_name=None):
         '''
         Returns a list of the shares under the specified account.
 
@@ -620,7 +640,8 @@ class FileService(StorageClient):
             'timeout': _int_to_str(timeout),
         }
 
-        return self._perform_request(request, _convert_xml_to_shares, operation_context=_context)
+        return self._perform_request(request, _convert_xml_to_shares, operation_context=_context,
+                                     operation_name=_operation_name)
 
     def create_share(self, share_name, metadata=None, quota=None,
                      fail_on_exist=False, timeout=None):
@@ -647,6 +668,21 @@ class FileService(StorageClient):
         :return: True if share is created, False if share already exists.
         :rtype: bool
         '''
+        request = self._get_create_share_http_request(share_name, metadata, quota, timeout)
+
+        if not fail_on_exist:
+            try:
+                self._perform_request(request, expected_errors=[_SHARE_ALREADY_EXISTS_ERROR_CODE],
+                                      operation_name='create_share')
+                return True
+            except AzureHttpError as ex:
+                _dont_fail_on_exist(ex)
+                return False
+        else:
+            self._perform_request(request, operation_name='create_share')
+            return True
+
+    def _get_create_share_http_request(self, share_name, metadata=None, quota=None, timeout=None):
         _validate_not_none('share_name', share_name)
         request = HTTPRequest()
         request.method = 'PUT'
@@ -660,17 +696,7 @@ class FileService(StorageClient):
             'x-ms-share-quota': _int_to_str(quota)
         }
         _add_metadata_headers(metadata, request)
-
-        if not fail_on_exist:
-            try:
-                self._perform_request(request, expected_errors=[_SHARE_ALREADY_EXISTS_ERROR_CODE])
-                return True
-            except AzureHttpError as ex:
-                _dont_fail_on_exist(ex)
-                return False
-        else:
-            self._perform_request(request)
-            return True
+        return request
 
     def snapshot_share(self, share_name, metadata=None, quota=None, timeout=None):
         '''
@@ -705,7 +731,7 @@ class FileService(StorageClient):
         }
         _add_metadata_headers(metadata, request)
 
-        return self._perform_request(request, _parse_snapshot_share, [share_name])
+        return self._perform_request(request, _parse_snapshot_share, [share_name], operation_name='snapshot_share')
 
     def get_share_properties(self, share_name, timeout=None, snapshot=None):
         '''
@@ -733,7 +759,7 @@ class FileService(StorageClient):
             'sharesnapshot': _to_str(snapshot)
         }
 
-        return self._perform_request(request, _parse_share, [share_name])
+        return self._perform_request(request, _parse_share, [share_name], operation_name='get_share_properties')
 
     def set_share_properties(self, share_name, quota, timeout=None):
         '''
@@ -762,7 +788,7 @@ class FileService(StorageClient):
             'x-ms-share-quota': _int_to_str(quota)
         }
 
-        self._perform_request(request)
+        return self._perform_request(request, operation_name='set_share_properties')
 
     def get_share_metadata(self, share_name, timeout=None, snapshot=None):
         '''
@@ -790,7 +816,7 @@ class FileService(StorageClient):
             'sharesnapshot': _to_str(snapshot),
         }
 
-        return self._perform_request(request, _parse_metadata)
+        return self._perform_request(request, _parse_metadata, operation_name='get_share_metadata')
 
     def set_share_metadata(self, share_name, metadata=None, timeout=None):
         '''
@@ -820,7 +846,7 @@ class FileService(StorageClient):
         }
         _add_metadata_headers(metadata, request)
 
-        self._perform_request(request)
+        return self._perform_request(request, operation_name='set_share_metadata')
 
     def get_share_acl(self, share_name, timeout=None):
         '''
@@ -844,7 +870,7 @@ class FileService(StorageClient):
             'timeout': _int_to_str(timeout),
         }
 
-        return self._perform_request(request, _convert_xml_to_signed_identifiers)
+        return self._perform_request(request, _convert_xml_to_signed_identifiers, operation_name='get_share_acl')
 
     def set_share_acl(self, share_name, signed_identifiers=None, timeout=None):
         '''
@@ -875,7 +901,7 @@ class FileService(StorageClient):
         request.body = _get_request_body(
             _convert_signed_identifiers_to_xml(signed_identifiers))
 
-        self._perform_request(request)
+        return self._perform_request(request, operation_name='set_share_acl')
 
     def get_share_stats(self, share_name, timeout=None):
         '''
@@ -903,7 +929,7 @@ class FileService(StorageClient):
             'timeout': _int_to_str(timeout),
         }
 
-        usage = self._perform_request(request, _convert_xml_to_share_stats)
+        usage = self._perform_request(request, _convert_xml_to_share_stats, operation_name='get_share_stats')
         return int(math.ceil(float(usage) / _GB))
 
     def get_share_stats_in_bytes(self, share_name, timeout=None):
@@ -931,7 +957,7 @@ class FileService(StorageClient):
             'timeout': _int_to_str(timeout),
         }
 
-        return self._perform_request(request, _convert_xml_to_share_stats)
+        return self._perform_request(request, _convert_xml_to_share_stats, operation_name='get_share_stats_in_bytes')
 
     def delete_share(self, share_name, fail_not_exist=False, timeout=None, snapshot=None, delete_snapshots=None):
         '''
@@ -956,6 +982,21 @@ class FileService(StorageClient):
         :return: True if share is deleted, False share doesn't exist.
         :rtype: bool
         '''
+        request = self._get_delete_share_http_request(share_name, timeout, snapshot, delete_snapshots)
+
+        if not fail_not_exist:
+            try:
+                self._perform_request(request, expected_errors=[_SHARE_NOT_FOUND_ERROR_CODE],
+                                      operation_name='delete_share')
+                return True
+            except AzureHttpError as ex:
+                _dont_fail_not_exist(ex)
+                return False
+        else:
+            self._perform_request(request, operation_name='delete_share')
+            return True
+
+    def _get_delete_share_http_request(self, share_name, timeout=None, snapshot=None, delete_snapshots=None):
         _validate_not_none('share_name', share_name)
         request = HTTPRequest()
         request.method = 'DELETE'
@@ -969,17 +1010,7 @@ class FileService(StorageClient):
             'timeout': _int_to_str(timeout),
             'sharesnapshot': _to_str(snapshot),
         }
-
-        if not fail_not_exist:
-            try:
-                self._perform_request(request, expected_errors=[_SHARE_NOT_FOUND_ERROR_CODE])
-                return True
-            except AzureHttpError as ex:
-                _dont_fail_not_exist(ex)
-                return False
-        else:
-            self._perform_request(request)
-            return True
+        return request
 
     def create_directory(self, share_name, directory_name, metadata=None,
                          fail_on_exist=False, timeout=None, file_permission=None, smb_properties=SMBProperties()):
@@ -1010,6 +1041,23 @@ class FileService(StorageClient):
         :return: True if directory is created, False if directory already exists.
         :rtype: bool
         '''
+        request = self._get_create_directory_http_request(share_name, directory_name, metadata, timeout,
+                                                          file_permission, smb_properties)
+
+        if not fail_on_exist:
+            try:
+                self._perform_request(request, expected_errors=_RESOURCE_ALREADY_EXISTS_ERROR_CODE,
+                                      operation_name='create_directory')
+                return True
+            except AzureHttpError as ex:
+                _dont_fail_on_exist(ex)
+                return False
+        else:
+            self._perform_request(request, operation_name='create_directory')
+            return True
+
+    def _get_create_directory_http_request(self, share_name, directory_name, metadata, timeout, file_permission,
+                                           smb_properties):
         _validate_not_none('share_name', share_name)
         _validate_not_none('directory_name', directory_name)
         current_time = datetime.utcnow()
@@ -1034,17 +1082,7 @@ class FileService(StorageClient):
         _add_metadata_headers(metadata, request)
         request.headers.update({'x-ms-file-permission': file_permission})
         request.headers.update(smb_properties._to_request_headers())
-
-        if not fail_on_exist:
-            try:
-                self._perform_request(request, expected_errors=_RESOURCE_ALREADY_EXISTS_ERROR_CODE)
-                return True
-            except AzureHttpError as ex:
-                _dont_fail_on_exist(ex)
-                return False
-        else:
-            self._perform_request(request)
-            return True
+        return request
 
     def set_directory_properties(self, share_name, directory_name, file_permission=None,
                                  smb_properties=SMBProperties(), timeout=None):
@@ -1067,7 +1105,7 @@ class FileService(StorageClient):
                                                                                 file_permission, smb_properties,
                                                                                 timeout)
         request.query.update({'restype': 'directory'})
-        self._perform_request(request)
+        return self._perform_request(request, operation_name='set_directory_properties')
 
     def delete_directory(self, share_name, directory_name,
                          fail_not_exist=False, timeout=None):
@@ -1093,6 +1131,21 @@ class FileService(StorageClient):
         :return: True if directory is deleted, False otherwise.
         :rtype: bool
         '''
+        request = self._get_delete_directory_http_request(share_name, directory_name, timeout)
+
+        if not fail_not_exist:
+            try:
+                self._perform_request(request, expected_errors=[_RESOURCE_NOT_FOUND_ERROR_CODE],
+                                      operation_name='delete_directory')
+                return True
+            except AzureHttpError as ex:
+                _dont_fail_not_exist(ex)
+                return False
+        else:
+            self._perform_request(request, operation_name='delete_directory')
+            return True
+
+    def _get_delete_directory_http_request(self, share_name, directory_name, timeout=None):
         _validate_not_none('share_name', share_name)
         _validate_not_none('directory_name', directory_name)
         request = HTTPRequest()
@@ -1103,17 +1156,7 @@ class FileService(StorageClient):
             'restype': 'directory',
             'timeout': _int_to_str(timeout),
         }
-
-        if not fail_not_exist:
-            try:
-                self._perform_request(request, expected_errors=[_RESOURCE_NOT_FOUND_ERROR_CODE])
-                return True
-            except AzureHttpError as ex:
-                _dont_fail_not_exist(ex)
-                return False
-        else:
-            self._perform_request(request)
-            return True
+        return request
 
     def get_directory_properties(self, share_name, directory_name, timeout=None, snapshot=None):
         '''
@@ -1144,7 +1187,8 @@ class FileService(StorageClient):
             'sharesnapshot': _to_str(snapshot)
         }
 
-        return self._perform_request(request, _parse_directory, [directory_name])
+        return self._perform_request(request, _parse_directory, [directory_name],
+                                     operation_name='get_directory_properties')
 
     def get_directory_metadata(self, share_name, directory_name, timeout=None, snapshot=None):
         '''
@@ -1175,7 +1219,7 @@ class FileService(StorageClient):
             'sharesnapshot': _to_str(snapshot)
         }
 
-        return self._perform_request(request, _parse_metadata)
+        return self._perform_request(request, _parse_metadata, operation_name='get_directory_metadata')
 
     def set_directory_metadata(self, share_name, directory_name, metadata=None, timeout=None):
         '''
@@ -1208,11 +1252,11 @@ class FileService(StorageClient):
         }
         _add_metadata_headers(metadata, request)
 
-        self._perform_request(request)
+        return self._perform_request(request, operation_name='set_directory_metadata')
 
     def list_directories_and_files(self, share_name, directory_name=None,
                                    num_results=None, marker=None, timeout=None,
-                                   prefix=None, snapshot=None):
+                                   prefix=None, snapshot=None, prefetch_pages=0):
 
         '''
         Returns a generator to list the directories and files under the specified share.
@@ -1225,6 +1269,9 @@ class FileService(StorageClient):
         field once it finishes. This marker can be used to create a new generator 
         if more results are desired.
 
+        To hold a large listing in memory, use :meth:`list_directory_and_file_columns`, 
+        which does not create an object per entry.
+
         :param str share_name:
             Name of existing share.
         :param str directory_name:
@@ -1247,19 +1294,80 @@ class FileService(StorageClient):
             List only the files and/or directories with the given prefix.
         :param str snapshot:
             A string that represents the snapshot version, if applicable.
+        :param int prefetch_pages:
+            The number of pages of results to request ahead, in the background, 
+            while the current page is being iterated. Defaults to 0, which 
+            requests each page only once the previous one has been iterated.
         '''
         operation_context = _OperationContext(location_lock=True)
         args = (share_name, directory_name)
         kwargs = {'marker': marker, 'max_results': num_results, 'timeout': timeout,
-                  '_context': operation_context, 'prefix': prefix, 'snapshot': snapshot}
+                  '_context': operation_context, 'prefix': prefix, 'snapshot': snapshot,
+                  '_operation_name': 'list_directories_and_files'}
 
         resp = self._list_directories_and_files(*args, **kwargs)
 
-        return ListGenerator(resp, self._list_directories_and_files, args, kwargs)
+        return ListGenerator(resp, self._list_directories_and_files, args, kwargs, prefetch_pages)
+
+    def list_directory_and_file_columns(self, share_name, directory_name=None, num_results=None,
+                                        marker=None, timeout=None, prefix=None, snapshot=None):
+        '''
+        Lists the directories and files under the specified directory as columns 
+        of their names, sizes and whether they are directories, following the 
+        continuation tokens returned by the service until all entries have been 
+        listed or num_results is reached.
+
+        The columns are filled in as each page is parsed, without creating an 
+        object for each entry. The sizes and directory flags are returned as 
+        NumPy arrays when NumPy is installed, and as array.array buffers otherwise.
+
+        If num_results is specified and the directory has more than that number 
+        of entries, the next_marker of the columns is populated. This marker can 
+        be used to list the remaining entries.
+
+        :param str share_name:
+            Name of existing share.
+        :param str directory_name:
+            The path to the directory.
+        :param int num_results:
+            Specifies the maximum number of files and directories to return.
+        :param str marker:
+            An opaque continuation token. This value can be retrieved from the 
+            next_marker field of a previous listing if num_results was specified 
+            and it did not return all the entries. If specified, the listing 
+            begins from the point where the previous one stopped.
+        :param int timeout:
+            The timeout parameter is expressed in seconds. This function may make 
+            multiple calls to the service in which case the timeout value specified 
+            will be applied to each individual call.
+        :param str prefix:
+            List only the files and/or directories with the given prefix.
+        :param str snapshot:
+            A string that represents the snapshot version, if applicable.
+        :return: The directories and files under the directory, as columns.
+        :rtype: :class:`~azure.storage.file.models.FileColumns`
+        '''
+        _validate_not_none('share_name', share_name)
+        operation_context = _OperationContext(location_lock=True)
+        columns = FileColumns()
+        while True:
+            page = self._list_directories_and_files(share_name, directory_name, marker=marker,
+                                                    max_results=num_results - len(columns) if num_results else None,
+                                                    timeout=timeout, prefix=prefix, _context=operation_context,
+                                                    snapshot=snapshot, _converter=_convert_xml_to_file_columns,
+                                                    _operation_name='list_directory_and_file_columns')
+            columns._extend(page)
+            marker = page.next_marker
+            if not marker or (num_results and len(columns) >= num_results):
+                break
+
+        columns._finish()
+        return columns
 
     def _list_directories_and_files(self, share_name, directory_name=None,
                                     marker=None, max_results=None, timeout=None,
-                                    prefix=None, _context=None, snapshot=None):
+                                    prefix=None, _context=None, snapshot=None,
+                                    _converter=_convert_xml_to_directories_and_files, _operation_name=None):
         '''
         Returns a list of the directories and files under the specified share.
 
@@ -1302,8 +1410,7 @@ class FileService(StorageClient):
             'sharesnapshot': _to_str(snapshot)
         }
 
-        return self._perform_request(request, _convert_xml_to_directories_and_files,
-                                     operation_context=_context)
+        return self._perform_request(request, _converter, operation_context=_context, operation_name=_operation_name)
 
     def list_handles(self, share_name, directory_name=None, file_name=None, recursive=None,
                      max_results=None, marker=None, snapshot=None, timeout=None):
@@ -1347,14 +1454,15 @@ class FileService(StorageClient):
         operation_context = _OperationContext(location_lock=True)
         args = (share_name, directory_name, file_name)
         kwargs = {'marker': marker, 'max_results': max_results, 'timeout': timeout, 'recursive': recursive,
-                  '_context': operation_context, 'snapshot': snapshot}
+                  '_context': operation_context, 'snapshot': snapshot,
+                  '_operation_name': 'list_handles'}
 
         resp = self._list_handles(*args, **kwargs)
 
         return ListGenerator(resp, self._list_handles, args, kwargs)
 
     def _list_handles(self, share_name, directory_name=None, file_name=None, recursive=None,
-                      marker=None, max_results=None, timeout=None, _context=None, snapshot=None):
+                      marker=None, max_results=None, timeout=None, _context=None, snapshot=None, _operation_name=None):
         """
         Returns a list of the directories and files under the specified share.
 
@@ -1401,7 +1509,7 @@ class FileService(StorageClient):
         }
 
         return self._perform_request(request, _convert_xml_to_handles,
-                                     operation_context=_context)
+                                     operation_context=_context, operation_name=_operation_name)
 
     def close_handles(self, share_name, directory_name=None, file_name=None, recursive=None,
                       handle_id=None, marker=None, snapshot=None, timeout=None):
@@ -1438,14 +1546,15 @@ class FileService(StorageClient):
         operation_context = _OperationContext(location_lock=True)
         args = (share_name, directory_name, file_name)
         kwargs = {'marker': marker, 'handle_id': handle_id, 'timeout': timeout, 'recursive': recursive,
-                  '_context': operation_context, 'snapshot': snapshot}
+                  '_context': operation_context, 'snapshot': snapshot,
+                  '_operation_name': 'close_handles'}
 
         resp = self._close_handles(*args, **kwargs)
 
         return ListGenerator(resp, self._close_handles, args, kwargs)
 
     def _close_handles(self, share_name, directory_name=None, file_name=None, recursive=None, handle_id=None,
-                       marker=None, timeout=None, _context=None, snapshot=None):
+                       marker=None, timeout=None, _context=None, snapshot=None, _operation_name=None):
         """
         Returns the number of handles that got closed.
 
@@ -1484,7 +1593,8 @@ class FileService(StorageClient):
             'x-ms-handle-id': _to_str(handle_id),
         }
 
-        return self._perform_request(request, _parse_close_handle_response, operation_context=_context)
+        return self._perform_request(request, _parse_close_handle_response, operation_context=_context,
+                                     operation_name=_operation_name)
 
     def get_file_properties(self, share_name, directory_name, file_name, timeout=None, snapshot=None):
         '''
@@ -1513,7 +1623,7 @@ class FileService(StorageClient):
         request.path = _get_path(share_name, directory_name, file_name)
         request.query = {'timeout': _int_to_str(timeout), 'sharesnapshot': _to_str(snapshot)}
 
-        return self._perform_request(request, _parse_file, [file_name])
+        return self._perform_request(request, _parse_file, [file_name], operation_name='get_file_properties')
 
     def exists(self, share_name, directory_name=None, file_name=None, timeout=None, snapshot=None):
         '''
@@ -1535,35 +1645,40 @@ class FileService(StorageClient):
         :return: A boolean indicating whether the resource exists.
         :rtype: bool
         '''
-        _validate_not_none('share_name', share_name)
+        request, expected_errors = self._get_exists_http_request(share_name, directory_name, file_name, timeout,
+                                                                 snapshot)
         try:
-            request = HTTPRequest()
-            request.method = 'HEAD' if file_name is not None else 'GET'
-            request.host_locations = self._get_host_locations()
-            request.path = _get_path(share_name, directory_name, file_name)
-
-            if file_name is not None:
-                restype = None
-                expected_errors = [_RESOURCE_NOT_FOUND_ERROR_CODE, _PARENT_NOT_FOUND_ERROR_CODE]
-            elif directory_name is not None:
-                restype = 'directory'
-                expected_errors = [_RESOURCE_NOT_FOUND_ERROR_CODE, _SHARE_NOT_FOUND_ERROR_CODE,
-                                   _PARENT_NOT_FOUND_ERROR_CODE]
-            else:
-                restype = 'share'
-                expected_errors = [_SHARE_NOT_FOUND_ERROR_CODE]
-
-            request.query = {
-                'restype': restype,
-                'timeout': _int_to_str(timeout),
-                'sharesnapshot': _to_str(snapshot)
-            }
-            self._perform_request(request, expected_errors=expected_errors)
+            self._perform_request(request, expected_errors=expected_errors, operation_name='exists')
             return True
         except AzureHttpError as ex:
             _dont_fail_not_exist(ex)
             return False
 
+    def _get_exists_http_request(self, share_name, directory_name=None, file_name=None, timeout=None, snapshot=None):
+        _validate_not_none('share_name', share_name)
+        request = HTTPRequest()
+        request.method = 'HEAD' if file_name is not None else 'GET'
+        request.host_locations = self._get_host_locations()
+        request.path = _get_path(share_name, directory_name, file_name)
+
+        if file_name is not None:
+            restype = None
+            expected_errors = [_RESOURCE_NOT_FOUND_ERROR_CODE, _PARENT_NOT_FOUND_ERROR_CODE]
+        elif directory_name is not None:
+            restype = 'directory'
+            expected_errors = [_RESOURCE_NOT_FOUND_ERROR_CODE, _SHARE_NOT_FOUND_ERROR_CODE,
+                               _PARENT_NOT_FOUND_ERROR_CODE]
+        else:
+            restype = 'share'
+            expected_errors = [_SHARE_NOT_FOUND_ERROR_CODE]
+
+        request.query = {
+            'restype': restype,
+            'timeout': _int_to_str(timeout),
+            'sharesnapshot': _to_str(snapshot)
+        }
+        return request, expected_errors
+
     def resize_file(self, share_name, directory_name, file_name, content_length, timeout=None):
         '''
         Resizes a file to the specified size. If the specified byte
@@ -1588,7 +1703,7 @@ class FileService(StorageClient):
                                                                                 None, SMBProperties(), timeout)
         request.headers.update({'x-ms-content-length': _to_str(content_length)})
 
-        self._perform_request(request)
+        return self._perform_request(request, operation_name='resize_file')
 
     def set_file_properties(self, share_name, directory_name, file_name,
                             content_settings, timeout=None, file_permission=None, smb_properties=SMBProperties()):
@@ -1619,7 +1734,7 @@ class FileService(StorageClient):
                                                                                 timeout)
         request.headers.update(content_settings._to_headers())
 
-        self._perform_request(request)
+        return self._perform_request(request, operation_name='set_file_properties')
 
     def _get_basic_set_file_or_directory_properties_http_request(self, share_name, directory_name, file_name,
                                                                  file_permission, smb_properties, timeout):
@@ -1677,7 +1792,7 @@ class FileService(StorageClient):
             'sharesnapshot': _to_str(snapshot),
         }
 
-        return self._perform_request(request, _parse_metadata)
+        return self._perform_request(request, _parse_metadata, operation_name='get_file_metadata')
 
     def set_file_metadata(self, share_name, directory_name,
                           file_name, metadata=None, timeout=None):
@@ -1711,7 +1826,7 @@ class FileService(StorageClient):
         }
         _add_metadata_headers(metadata, request)
 
-        self._perform_request(request)
+        return self._perform_request(request, operation_name='set_file_metadata')
 
     def copy_file(self, share_name, directory_name, file_name, copy_source,
                   metadata=None, timeout=None):
@@ -1765,7 +1880,7 @@ class FileService(StorageClient):
         }
         _add_metadata_headers(metadata, request)
 
-        return self._perform_request(request, _parse_properties, [FileProperties]).copy
+        return self._perform_request(request, _parse_copy_properties, operation_name='copy_file')
 
     def abort_copy_file(self, share_name, directory_name, file_name, copy_id, timeout=None):
         '''
@@ -1800,7 +1915,7 @@ class FileService(StorageClient):
             'x-ms-copy-action': 'abort',
         }
 
-        self._perform_request(request)
+        return self._perform_request(request, operation_name='abort_copy_file')
 
     def delete_file(self, share_name, directory_name, file_name, timeout=None):
         '''
@@ -1824,7 +1939,7 @@ class FileService(StorageClient):
         request.path = _get_path(share_name, directory_name, file_name)
         request.query = {'timeout': _int_to_str(timeout)}
 
-        self._perform_request(request)
+        return self._perform_request(request, operation_name='delete_file')
 
     def create_file(self, share_name, directory_name, file_name,
                     content_length, content_settings=None, metadata=None, timeout=None,
@@ -1885,7 +2000,7 @@ class FileService(StorageClient):
             request.headers.update(content_settings._to_headers())
         request.headers.update(smb_properties._to_request_headers())
 
-        self._perform_request(request)
+        return self._perform_request(request, operation_name='create_file')
 
     def create_file_from_path(self, share_name, directory_name, file_name,
                               local_file_path, content_settings=None,
@@ -1894,6 +2009,8 @@ class FileService(StorageClient):
         '''
         Creates a new azure file from a local file path, or updates the content of an
         existing file, with automatic chunking and progress notifications.
+        The file is memory-mapped when it can be, and each range is sent
+        straight from the mapping, so no range is buffered in memory.
 
         :param str share_name:
             Name of existing share.
@@ -1936,7 +2053,7 @@ class FileService(StorageClient):
         _validate_not_none('local_file_path', local_file_path)
 
         count = path.getsize(local_file_path)
-        with open(local_file_path, 'rb') as stream:
+        with _open_file_for_upload(local_file_path) as stream:
             self.create_file_from_stream(
                 share_name, directory_name, file_name, stream,
                 count, content_settings, metadata, validate_content, progress_callback,
@@ -1989,7 +2106,7 @@ class FileService(StorageClient):
             _validate_not_none('encoding', encoding)
             text = text.encode(encoding)
 
-        self.create_file_from_bytes(
+        return self.create_file_from_bytes(
             share_name, directory_name, file_name, text, count=len(text),
             content_settings=content_settings, metadata=metadata,
             validate_content=validate_content, file_permission=file_permission, smb_properties=smb_properties,
@@ -2060,7 +2177,7 @@ class FileService(StorageClient):
         stream = BytesIO(file)
         stream.seek(index)
 
-        self.create_file_from_stream(
+        return self.create_file_from_stream(
             share_name, directory_name, file_name, stream, count,
             content_settings, metadata, validate_content, progress_callback,
             max_connections, file_permission=file_permission, smb_properties=smb_properties, timeout=timeout)
@@ -2145,12 +2262,13 @@ class FileService(StorageClient):
             max_connections,
             progress_callback,
             validate_content,
-            timeout
+            timeout,
+            chunk_sizer=_get_adaptive_range_size(self.MAX_RANGE_SIZE) if self.ADAPTIVE_RANGE_SIZE else None,
         )
 
     def _get_file(self, share_name, directory_name, file_name,
                   start_range=None, end_range=None, validate_content=False,
-                  timeout=None, _context=None, snapshot=None):
+                  timeout=None, _context=None, snapshot=None, _stream_writer=None, _operation_name=None):
         '''
         Downloads a file's content, metadata, and properties. You can specify a
         range if you don't need to download the file in its entirety. If no range
@@ -2202,8 +2320,9 @@ class FileService(StorageClient):
             check_content_md5=validate_content)
 
         return self._perform_request(request, _parse_file,
-                                     [file_name, validate_content],
-                                     operation_context=_context)
+                                     [file_name, validate_content, _stream_writer],
+                                     operation_context=_context, stream=_stream_writer is not None,
+                                     operation_name=_operation_name)
 
     def get_file_to_path(self, share_name, directory_name, file_name, file_path,
                          open_mode='wb', start_range=None, end_range=None,
@@ -2385,6 +2504,9 @@ class FileService(StorageClient):
 
         # Send a context object to make sure we always retry to the initial location
         operation_context = _OperationContext(location_lock=True)
+
+        # If the stream is seekable, the first download is written to it as it arrives
+        stream_writer = _get_seekable_stream_writer(stream)
         try:
             file = self._get_file(share_name,
                                   directory_name,
@@ -2394,7 +2516,9 @@ class FileService(StorageClient):
                                   validate_content=validate_content,
                                   timeout=timeout,
                                   _context=operation_context,
-                                  snapshot=snapshot)
+                                  snapshot=snapshot,
+                                  _stream_writer=stream_writer,
+                                  _operation_name='get_file_to_stream')
 
             # Parse the total file size and adjust the download size if ranges
             # were specified
@@ -2417,7 +2541,9 @@ class FileService(StorageClient):
                                       validate_content=validate_content,
                                       timeout=timeout,
                                       _context=operation_context,
-                                      snapshot=snapshot)
+                                      snapshot=snapshot,
+                                      _stream_writer=stream_writer,
+                                      _operation_name='get_file_to_stream')
 
                 # Set the download size to empty
                 download_size = 0
@@ -2688,7 +2814,7 @@ class FileService(StorageClient):
             computed_md5 = _get_content_md5(request.body)
             request.headers['Content-MD5'] = _to_str(computed_md5)
 
-        self._perform_request(request)
+        return self._perform_request(request, operation_name='update_range')
 
     def update_range_from_file_url(self, share_name, directory_name, file_name, start_range, end_range, source,
                                    source_start_range, timeout=None):
@@ -2743,7 +2869,7 @@ class FileService(StorageClient):
             'Content-Length': _int_to_str(0)
         })
 
-        self._perform_request(request)
+        return self._perform_request(request, operation_name='update_range_from_file_url')
 
     def _get_basic_update_file_http_request(self, share_name, directory_name, file_name, timeout=None):
         _validate_not_none('share_name', share_name)
@@ -2804,7 +2930,7 @@ class FileService(StorageClient):
         _validate_and_format_range_headers(
             request, start_range, end_range)
 
-        self._perform_request(request)
+        return self._perform_request(request, operation_name='clear_range')
 
     def list_ranges(self, share_name, directory_name, file_name,
                     start_range=None, end_range=None, timeout=None, snapshot=None):
@@ -2851,7 +2977,7 @@ class FileService(StorageClient):
                 start_range_required=False,
                 end_range_required=False)
 
-        return self._perform_request(request, _convert_xml_to_ranges)
+        return self._perform_request(request, _convert_xml_to_ranges, operation_name='list_ranges')
 
     def create_permission_for_share(self, share_name, file_permission, timeout=None):
         """
@@ -2880,7 +3006,8 @@ class FileService(StorageClient):
             'timeout': _int_to_str(timeout),
         }
         request.body = file_permission
-        return self._perform_request(request, parser=_parse_permission_key)
+        return self._perform_request(request, parser=_parse_permission_key,
+                                     operation_name='create_permission_for_share')
 
     def get_permission_for_share(self, share_name, file_permission_key, timeout=None):
         """
@@ -2913,4 +3040,4 @@ class FileService(StorageClient):
         }
         request.body = None
 
-        return self._perform_request(request, parser=_parse_permission)
+        return self._perform_request(request, parser=_parse_permission, operation_name='get_permission_for_share')
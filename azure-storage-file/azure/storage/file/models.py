@@ -3,7 +3,13 @@
 # Licensed under the MIT License. See License.txt in the project root for
 # license information.
 # --------------------------------------------------------------------------
+from array import array
+
 from azure.storage.common._common_conversion import _to_str
+from azure.storage.common._deserialization import (
+    _to_column,
+    _INT64_COLUMN_TYPECODE,
+)
 
 
 class Share(object):
@@ -363,6 +369,50 @@ class CopyProperties(object):
         self.status_description = None
 
 
+class FileColumns(object):
+    '''
+    The files and directories of a directory listing, as returned by 
+    :func:`~azure.storage.file.fileservice.FileService.list_directory_and_file_columns`, 
+    with a column for each property rather than an object for each entry. The 
+    numeric columns are NumPy arrays when NumPy is installed, and array.array 
+    buffers otherwise, so that listings can be compared with vectorized operations. 
+    On Python 2.7 builds where long is 32 bits, the array.array buffers hold the 
+    64 bit integer columns as doubles.
+
+    :ivar list(str) names:
+        The names of the files and directories.
+    :ivar content_lengths:
+        The sizes of the files in bytes, as 64 bit integers, and 0 for the 
+        directories.
+    :vartype content_lengths: numpy.ndarray or array.array
+    :ivar is_directory:
+        Whether each entry is a directory rather than a file, as booleans.
+    :vartype is_directory: numpy.ndarray or array.array
+    :ivar str next_marker:
+        The continuation token to list the entries after these with, if 
+        num_results was reached before all the entries were listed.
+    '''
+
+    def __init__(self):
+        self.names = []
+        self.content_lengths = array(_INT64_COLUMN_TYPECODE)
+        self.is_directory = array('B')
+        self.next_marker = None
+
+    def __len__(self):
+        return len(self.names)
+
+    def _extend(self, page):
+        self.names.extend(page.names)
+        self.content_lengths.extend(page.content_lengths)
+        self.is_directory.extend(page.is_directory)
+        self.next_marker = page.next_marker
+
+    def _finish(self):
+        self.content_lengths = _to_column(self.content_lengths)
+        self.is_directory = _to_column(self.is_directory)
+
+
 class FileRange(object):
     '''
     File Range.
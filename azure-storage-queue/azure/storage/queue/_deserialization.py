@@ -3,7 +3,6 @@
 # Licensed under the MIT License. See License.txt in the project root for
 # license information.
 # --------------------------------------------------------------------------
-from dateutil import parser
 
 try:
     from xml.etree import cElementTree as ETree
@@ -18,6 +17,7 @@ from azure.storage.common.models import (
     _list,
 )
 from azure.storage.common._deserialization import (
+    _parse_datetime,
     _to_int,
     _parse_metadata,
 )
@@ -42,7 +42,7 @@ def _parse_queue_message_from_headers(response):
     '''
     message = QueueMessage()
     message.pop_receipt = response.headers.get('x-ms-popreceipt')
-    message.time_next_visible = parser.parse(response.headers.get('x-ms-time-next-visible'))
+    message.time_next_visible = _parse_datetime(response.headers.get('x-ms-time-next-visible'))
 
     return message
 
@@ -135,16 +135,22 @@ def _convert_xml_to_queue_messages(response, decode_function, require_encryption
                                                          key_encryption_key, resolver)
             message.content = decode_function(message.content)
 
-        message.insertion_time = parser.parse(message_element.findtext('InsertionTime'))
-        message.expiration_time = parser.parse(message_element.findtext('ExpirationTime'))
+        message.insertion_time = _parse_datetime(message_element.findtext('InsertionTime'))
+        message.expiration_time = _parse_datetime(message_element.findtext('ExpirationTime'))
 
         message.pop_receipt = message_element.findtext('PopReceipt')
 
         time_next_visible = message_element.find('TimeNextVisible')
         if time_next_visible is not None:
-            message.time_next_visible = parser.parse(time_next_visible.text)
+            message.time_next_visible = _parse_datetime(time_next_visible.text)
 
         # Add message to list
         messages.append(message)
 
     return messages
+
+
+def _convert_xml_to_queue_message(response, decode_function, require_encryption, key_encryption_key, resolver,
+                                  content=None):
+    return _convert_xml_to_queue_messages(response, decode_function, require_encryption, key_encryption_key,
+                                          resolver, content)[0]
@@ -13,8 +13,6 @@ from json import (
 from azure.common import (
     AzureException,
 )
-from cryptography.hazmat.primitives.padding import PKCS7
-
 from azure.storage.common._common_conversion import (
     _encode_base64,
     _decode_base64_to_bytes
@@ -53,6 +51,7 @@ def _encrypt_queue_message(message, key_encryption_key):
     :return: A json-formatted string containing the encrypted message and the encryption metadata.
     :rtype: str
     '''
+    from cryptography.hazmat.primitives.padding import PKCS7
 
     _validate_not_none('message', message)
     _validate_not_none('key_encryption_key', key_encryption_key)
@@ -139,6 +138,7 @@ def _decrypt(message, encryption_data, key_encryption_key=None, resolver=None):
     :return: The decrypted plaintext.
     :rtype: str
     '''
+    from cryptography.hazmat.primitives.padding import PKCS7
     _validate_not_none('message', message)
     content_encryption_key = _validate_and_unwrap_cek(encryption_data, key_encryption_key, resolver)
 
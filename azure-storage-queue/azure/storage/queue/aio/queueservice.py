@@ -0,0 +1,128 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+from azure.common import (
+    AzureConflictHttpError,
+    AzureHttpError,
+)
+
+from azure.storage.common._error import (
+    _dont_fail_not_exist,
+    _dont_fail_on_exist,
+    _ERROR_CONFLICT,
+)
+from azure.storage.common.aio import (
+    AsyncListGenerator,
+    AsyncStorageClient,
+)
+from azure.storage.common.models import _OperationContext
+from ..queueservice import (
+    QueueService,
+    _HTTP_RESPONSE_NO_CONTENT,
+    _QUEUE_ALREADY_EXISTS_ERROR_CODE,
+    _QUEUE_NOT_FOUND_ERROR_CODE,
+)
+
+
+class AsyncQueueService(AsyncStorageClient, QueueService):
+    '''
+    The asyncio variant of :class:`~azure.storage.queue.queueservice.QueueService`.
+    It is created with the same arguments and exposes the same operations, but
+    every operation is a coroutine and list_queues returns an
+    :class:`~azure.storage.common.aio.AsyncListGenerator` to be iterated with
+    ``async for``. Retries wait on the event loop, so a single process can keep
+    many polls of get_messages in flight at the same time.
+
+    Requests are sent over an aiohttp session, so the aiohttp package must be
+    installed. Await close() or use the service as an async context manager to
+    release it.
+    '''
+
+    async def list_queues(self, prefix=None, num_results=None, include_metadata=False,
+                          marker=None, timeout=None, prefetch_pages=0):
+        '''
+        Returns an asynchronous generator to list the queues. See
+        :meth:`QueueService.list_queues`.
+
+        :rtype: :class:`~azure.storage.common.aio.AsyncListGenerator`
+        '''
+        include = 'metadata' if include_metadata else None
+        operation_context = _OperationContext(location_lock=True)
+        kwargs = {'prefix': prefix, 'max_results': num_results, 'include': include,
+                  'marker': marker, 'timeout': timeout, '_context': operation_context,
+                  '_operation_name': 'list_queues'}
+        resp = await self._list_queues(**kwargs)
+
+        return AsyncListGenerator(resp, self._list_queues, (), kwargs, prefetch_pages)
+
+    async def create_queue(self, queue_name, metadata=None, fail_on_exist=False, timeout=None):
+        '''
+        Creates a queue under the given account. See :meth:`QueueService.create_queue`.
+
+        :return:
+            A boolean indicating whether the queue was created. If fail_on_exist 
+            was set to True, this will throw instead of returning false.
+        :rtype: bool
+        '''
+        request = self._get_create_queue_http_request(queue_name, metadata, timeout)
+
+        def _return_request(request):
+            return request
+
+        if not fail_on_exist:
+            try:
+                response = await self._perform_request(request, parser=_return_request,
+                                                       expected_errors=[_QUEUE_ALREADY_EXISTS_ERROR_CODE],
+                                                       operation_name='create_queue')
+                if response.status == _HTTP_RESPONSE_NO_CONTENT:
+                    return False
+                return True
+            except AzureHttpError as ex:
+                _dont_fail_on_exist(ex)
+                return False
+        else:
+            response = await self._perform_request(request, parser=_return_request, operation_name='create_queue')
+            if response.status == _HTTP_RESPONSE_NO_CONTENT:
+                raise AzureConflictHttpError(
+                    _ERROR_CONFLICT.format(response.message), response.status)
+            return True
+
+    async def delete_queue(self, queue_name, fail_not_exist=False, timeout=None):
+        '''
+        Deletes the specified queue and any messages it contains. See
+        :meth:`QueueService.delete_queue`.
+
+        :return:
+            A boolean indicating whether the queue was deleted. If fail_not_exist 
+            was set to True, this will throw instead of returning false.
+        :rtype: bool
+        '''
+        request = self._get_delete_queue_http_request(queue_name, timeout)
+        if not fail_not_exist:
+            try:
+                await self._perform_request(request, expected_errors=[_QUEUE_NOT_FOUND_ERROR_CODE],
+                                            operation_name='delete_queue')
+                return True
+            except AzureHttpError as ex:
+                _dont_fail_not_exist(ex)
+                return False
+        else:
+            await self._perform_request(request, operation_name='delete_queue')
+            return True
+
+    async def exists(self, queue_name, timeout=None):
+        '''
+        Returns a boolean indicating whether the queue exists. See
+        :meth:`QueueService.exists`.
+
+        :rtype: bool
+        '''
+        request = self._get_exists_http_request(queue_name, timeout)
+        try:
+            await self._perform_request(request, expected_errors=[_QUEUE_NOT_FOUND_ERROR_CODE], operation_name='exists')
+            return True
+        except AzureHttpError as ex:
+            _dont_fail_not_exist(ex)
+            return False
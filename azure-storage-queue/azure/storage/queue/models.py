@@ -7,8 +7,6 @@ from base64 import (
     b64encode,
     b64decode,
 )
-from xml.sax.saxutils import escape as xml_escape
-from xml.sax.saxutils import unescape as xml_unescape
 
 from ._error import (
     _validate_message_type_bytes,
@@ -146,6 +144,8 @@ class QueueMessageFormat:
         :return: XML encoded data.
         :rtype: str
         '''
+        # saxutils imports urllib.request, so it is imported on first use rather than with the package
+        from xml.sax.saxutils import escape as xml_escape
         _validate_message_type_text(data)
         return xml_escape(data)
 
@@ -158,6 +158,7 @@ class QueueMessageFormat:
         :return: XML decoded data.
         :rtype: str
         '''
+        from xml.sax.saxutils import unescape as xml_unescape
         return xml_unescape(data)
 
     @staticmethod
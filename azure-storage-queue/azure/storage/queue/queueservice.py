@@ -59,6 +59,7 @@ from azure.storage.common.storageclient import StorageClient
 from ._deserialization import (
     _convert_xml_to_queues,
     _convert_xml_to_queue_messages,
+    _convert_xml_to_queue_message,
     _parse_queue_message_from_headers,
     _parse_metadata_and_message_count,
 )
@@ -202,6 +203,12 @@ class QueueService(StorageClient):
         self._X_MS_VERSION = X_MS_VERSION
         self._update_user_agent_string(package_version)
 
+    def _can_coalesce(self, request):
+        # getting messages dequeues them, so only peeked messages may be shared
+        if request.path.endswith('/messages') and request.query.get('peekonly') != 'true':
+            return False
+        return super(QueueService, self)._can_coalesce(request)
+
     def generate_account_shared_access_signature(self, resource_types, permission,
                                                  expiry, start=None, ip=None, protocol=None):
         '''
@@ -347,7 +354,7 @@ class QueueService(StorageClient):
             'timeout': _int_to_str(timeout),
         }
 
-        return self._perform_request(request, _convert_xml_to_service_stats)
+        return self._perform_request(request, _convert_xml_to_service_stats, operation_name='get_queue_service_stats')
 
     def get_queue_service_properties(self, timeout=None):
         '''
@@ -369,7 +376,8 @@ class QueueService(StorageClient):
             'timeout': _int_to_str(timeout),
         }
 
-        return self._perform_request(request, _convert_xml_to_service_properties)
+        return self._perform_request(request, _convert_xml_to_service_properties,
+                                     operation_name='get_queue_service_properties')
 
     def set_queue_service_properties(self, logging=None, hour_metrics=None,
                                      minute_metrics=None, cors=None, timeout=None):
@@ -409,10 +417,10 @@ class QueueService(StorageClient):
         }
         request.body = _get_request_body(
             _convert_service_properties_to_xml(logging, hour_metrics, minute_metrics, cors))
-        self._perform_request(request)
+        return self._perform_request(request, operation_name='set_queue_service_properties')
 
     def list_queues(self, prefix=None, num_results=None, include_metadata=False,
-                    marker=None, timeout=None):
+                    marker=None, timeout=None, prefetch_pages=0):
         '''
         Returns a generator to list the queues. The generator will lazily follow 
         the continuation tokens returned by the service and stop when all queues 
@@ -440,17 +448,22 @@ class QueueService(StorageClient):
             The server timeout, expressed in seconds. This function may make multiple 
             calls to the service in which case the timeout value specified will be 
             applied to each individual call.
+        :param int prefetch_pages:
+            The number of pages of results to request ahead, in the background, 
+            while the current page is being iterated. Defaults to 0, which 
+            requests each page only once the previous one has been iterated.
         '''
         include = 'metadata' if include_metadata else None
         operation_context = _OperationContext(location_lock=True)
         kwargs = {'prefix': prefix, 'max_results': num_results, 'include': include,
-                  'marker': marker, 'timeout': timeout, '_context': operation_context}
+                  'marker': marker, 'timeout': timeout, '_context': operation_context,
+                  '_operation_name': 'list_queues'}
         resp = self._list_queues(**kwargs)
 
-        return ListGenerator(resp, self._list_queues, (), kwargs)
+        return ListGenerator(resp, self._list_queues, (), kwargs, prefetch_pages)
 
     def _list_queues(self, prefix=None, marker=None, max_results=None,
-                     include=None, timeout=None, _context=None):
+                     include=None, timeout=None, _context=None, _operation_name=None):
         '''
         Returns a list of queues under the specified account. Makes a single list 
         request to the service. Used internally by the list_queues method.
@@ -488,7 +501,8 @@ class QueueService(StorageClient):
             'timeout': _int_to_str(timeout)
         }
 
-        return self._perform_request(request, _convert_xml_to_queues, operation_context=_context)
+        return self._perform_request(request, _convert_xml_to_queues, operation_context=_context,
+                                     operation_name=_operation_name)
 
     def create_queue(self, queue_name, metadata=None, fail_on_exist=False, timeout=None):
         '''
@@ -515,13 +529,7 @@ class QueueService(StorageClient):
             was set to True, this will throw instead of returning false.
         :rtype: bool
         '''
-        _validate_not_none('queue_name', queue_name)
-        request = HTTPRequest()
-        request.method = 'PUT'
-        request.host_locations = self._get_host_locations()
-        request.path = _get_path(queue_name)
-        request.query = {'timeout': _int_to_str(timeout)}
-        _add_metadata_headers(metadata, request)
+        request = self._get_create_queue_http_request(queue_name, metadata, timeout)
 
         def _return_request(request):
             return request
@@ -529,7 +537,8 @@ class QueueService(StorageClient):
         if not fail_on_exist:
             try:
                 response = self._perform_request(request, parser=_return_request,
-                                                 expected_errors=[_QUEUE_ALREADY_EXISTS_ERROR_CODE])
+                                                 expected_errors=[_QUEUE_ALREADY_EXISTS_ERROR_CODE],
+                                                 operation_name='create_queue')
                 if response.status == _HTTP_RESPONSE_NO_CONTENT:
                     return False
                 return True
@@ -537,12 +546,22 @@ class QueueService(StorageClient):
                 _dont_fail_on_exist(ex)
                 return False
         else:
-            response = self._perform_request(request, parser=_return_request)
+            response = self._perform_request(request, parser=_return_request, operation_name='create_queue')
             if response.status == _HTTP_RESPONSE_NO_CONTENT:
                 raise AzureConflictHttpError(
                     _ERROR_CONFLICT.format(response.message), response.status)
             return True
 
+    def _get_create_queue_http_request(self, queue_name, metadata=None, timeout=None):
+        _validate_not_none('queue_name', queue_name)
+        request = HTTPRequest()
+        request.method = 'PUT'
+        request.host_locations = self._get_host_locations()
+        request.path = _get_path(queue_name)
+        request.query = {'timeout': _int_to_str(timeout)}
+        _add_metadata_headers(metadata, request)
+        return request
+
     def delete_queue(self, queue_name, fail_not_exist=False, timeout=None):
         '''
         Deletes the specified queue and any messages it contains.
@@ -566,23 +585,28 @@ class QueueService(StorageClient):
             was set to True, this will throw instead of returning false.
         :rtype: bool
         '''
-        _validate_not_none('queue_name', queue_name)
-        request = HTTPRequest()
-        request.method = 'DELETE'
-        request.host_locations = self._get_host_locations()
-        request.path = _get_path(queue_name)
-        request.query = {'timeout': _int_to_str(timeout)}
+        request = self._get_delete_queue_http_request(queue_name, timeout)
         if not fail_not_exist:
             try:
-                self._perform_request(request, expected_errors=[_QUEUE_NOT_FOUND_ERROR_CODE])
+                self._perform_request(request, expected_errors=[_QUEUE_NOT_FOUND_ERROR_CODE],
+                                      operation_name='delete_queue')
                 return True
             except AzureHttpError as ex:
                 _dont_fail_not_exist(ex)
                 return False
         else:
-            self._perform_request(request)
+            self._perform_request(request, operation_name='delete_queue')
             return True
 
+    def _get_delete_queue_http_request(self, queue_name, timeout=None):
+        _validate_not_none('queue_name', queue_name)
+        request = HTTPRequest()
+        request.method = 'DELETE'
+        request.host_locations = self._get_host_locations()
+        request.path = _get_path(queue_name)
+        request.query = {'timeout': _int_to_str(timeout)}
+        return request
+
     def get_queue_metadata(self, queue_name, timeout=None):
         '''
         Retrieves user-defined metadata and queue properties on the specified
@@ -608,7 +632,7 @@ class QueueService(StorageClient):
             'timeout': _int_to_str(timeout),
         }
 
-        return self._perform_request(request, _parse_metadata_and_message_count)
+        return self._perform_request(request, _parse_metadata_and_message_count, operation_name='get_queue_metadata')
 
     def set_queue_metadata(self, queue_name, metadata=None, timeout=None):
         '''
@@ -634,7 +658,7 @@ class QueueService(StorageClient):
         }
         _add_metadata_headers(metadata, request)
 
-        self._perform_request(request)
+        return self._perform_request(request, operation_name='set_queue_metadata')
 
     def exists(self, queue_name, timeout=None):
         '''
@@ -647,24 +671,26 @@ class QueueService(StorageClient):
         :return: A boolean indicating whether the queue exists.
         :rtype: bool
         '''
-        _validate_not_none('queue_name', queue_name)
-
+        request = self._get_exists_http_request(queue_name, timeout)
         try:
-            request = HTTPRequest()
-            request.method = 'GET'
-            request.host_locations = self._get_host_locations(secondary=True)
-            request.path = _get_path(queue_name)
-            request.query = {
-                'comp': 'metadata',
-                'timeout': _int_to_str(timeout),
-            }
-
-            self._perform_request(request, expected_errors=[_QUEUE_NOT_FOUND_ERROR_CODE])
+            self._perform_request(request, expected_errors=[_QUEUE_NOT_FOUND_ERROR_CODE], operation_name='exists')
             return True
         except AzureHttpError as ex:
             _dont_fail_not_exist(ex)
             return False
 
+    def _get_exists_http_request(self, queue_name, timeout=None):
+        _validate_not_none('queue_name', queue_name)
+        request = HTTPRequest()
+        request.method = 'GET'
+        request.host_locations = self._get_host_locations(secondary=True)
+        request.path = _get_path(queue_name)
+        request.query = {
+            'comp': 'metadata',
+            'timeout': _int_to_str(timeout),
+        }
+        return request
+
     def get_queue_acl(self, queue_name, timeout=None):
         '''
         Returns details about any stored access policies specified on the
@@ -687,7 +713,7 @@ class QueueService(StorageClient):
             'timeout': _int_to_str(timeout),
         }
 
-        return self._perform_request(request, _convert_xml_to_signed_identifiers)
+        return self._perform_request(request, _convert_xml_to_signed_identifiers, operation_name='get_queue_acl')
 
     def set_queue_acl(self, queue_name, signed_identifiers=None, timeout=None):
         '''
@@ -727,7 +753,7 @@ class QueueService(StorageClient):
         }
         request.body = _get_request_body(
             _convert_signed_identifiers_to_xml(signed_identifiers))
-        self._perform_request(request)
+        return self._perform_request(request, operation_name='set_queue_acl')
 
     def put_message(self, queue_name, content, visibility_timeout=None,
                     time_to_live=None, timeout=None):
@@ -788,10 +814,9 @@ class QueueService(StorageClient):
         request.body = _get_request_body(_convert_queue_message_xml(content, self.encode_function,
                                                                     self.key_encryption_key))
 
-        message_list = self._perform_request(request, _convert_xml_to_queue_messages,
-                                             [self.decode_function, False,
-                                              None, None, content])
-        return message_list[0]
+        return self._perform_request(request, _convert_xml_to_queue_message,
+                                     [self.decode_function, False,
+                                      None, None, content], operation_name='put_message')
 
     def get_messages(self, queue_name, num_messages=None,
                      visibility_timeout=None, timeout=None):
@@ -840,7 +865,8 @@ class QueueService(StorageClient):
 
         return self._perform_request(request, _convert_xml_to_queue_messages,
                                      [self.decode_function, self.require_encryption,
-                                      self.key_encryption_key, self.key_resolver_function])
+                                      self.key_encryption_key, self.key_resolver_function],
+                                      operation_name='get_messages')
 
     def peek_messages(self, queue_name, num_messages=None, timeout=None):
         '''
@@ -889,7 +915,8 @@ class QueueService(StorageClient):
 
         return self._perform_request(request, _convert_xml_to_queue_messages,
                                      [self.decode_function, self.require_encryption,
-                                      self.key_encryption_key, self.key_resolver_function])
+                                      self.key_encryption_key, self.key_resolver_function],
+                                      operation_name='peek_messages')
 
     def delete_message(self, queue_name, message_id, pop_receipt, timeout=None):
         '''
@@ -926,7 +953,7 @@ class QueueService(StorageClient):
             'popreceipt': _to_str(pop_receipt),
             'timeout': _int_to_str(timeout)
         }
-        self._perform_request(request)
+        return self._perform_request(request, operation_name='delete_message')
 
     def clear_messages(self, queue_name, timeout=None):
         '''
@@ -943,7 +970,7 @@ class QueueService(StorageClient):
         request.host_locations = self._get_host_locations()
         request.path = _get_path(queue_name, True)
         request.query = {'timeout': _int_to_str(timeout)}
-        self._perform_request(request)
+        return self._perform_request(request, operation_name='clear_messages')
 
     def update_message(self, queue_name, message_id, pop_receipt, visibility_timeout,
                        content=None, timeout=None):
@@ -1006,4 +1033,4 @@ class QueueService(StorageClient):
             request.body = _get_request_body(_convert_queue_message_xml(content, self.encode_function,
                                                                         self.key_encryption_key))
 
-        return self._perform_request(request, _parse_queue_message_from_headers)
+        return self._perform_request(request, _parse_queue_message_from_headers, operation_name='update_message')
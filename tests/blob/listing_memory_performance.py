@@ -0,0 +1,43 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import gc
+import tracemalloc
+
+from azure.storage.blob._deserialization import (
+    _convert_xml_to_blob_columns,
+    _convert_xml_to_blob_list,
+)
+from tests.blob.date_parsing_performance import (
+    BLOB_COUNT,
+    load_listing_page,
+)
+
+# Measures the memory held by the blobs of a parsed listing page, built from a
+# recorded listing response, as the bytes allocated per listed blob, both as
+# blob objects and as columns.
+
+
+def measure(response, converter):
+    gc.collect()
+    tracemalloc.start()
+    blobs = converter(response)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    if len(blobs) != BLOB_COUNT:
+        raise AssertionError('the page does not hold {0} blobs'.format(BLOB_COUNT))
+    return size / float(len(blobs))
+
+
+def main():
+    response = load_listing_page()
+    print('objects:\t{0:.0f} bytes per listed blob'.format(measure(response, _convert_xml_to_blob_list)))
+    print('columns:\t{0:.0f} bytes per listed blob'.format(measure(response, _convert_xml_to_blob_columns)))
+
+
+if __name__ == '__main__':
+    main()
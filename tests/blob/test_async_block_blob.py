@@ -0,0 +1,284 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import asyncio
+import os
+import unittest
+
+from azure.common import AzureConflictHttpError
+
+from tests.local_storage_server import LocalStorageServer
+from tests.testcase import StorageTestCase
+
+try:
+    import aiohttp
+    from azure.storage.blob import PropertiesCache
+    from azure.storage.blob.aio import AsyncBlockBlobService
+except ImportError:
+    aiohttp = None
+
+FILE_PATH = 'blob_input.temp.dat'
+
+
+# ------------------------------------------------------------------------------
+
+@unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+class StorageAsyncBlockBlobTest(StorageTestCase):
+    def setUp(self):
+        super(StorageAsyncBlockBlobTest, self).setUp()
+        self.server = LocalStorageServer('blob').start()
+        self.loop = asyncio.new_event_loop()
+
+        self.bs = self.server.create_service(AsyncBlockBlobService)
+        self.container_name = self.get_resource_name('utcontainer')
+
+        # test chunking functionality by reducing the threshold
+        # for chunking and the size of each chunk, otherwise
+        # the tests would take too long to execute
+        self.bs.MAX_SINGLE_PUT_SIZE = 32 * 1024
+        self.bs.MAX_BLOCK_SIZE = 4 * 1024
+        self.bs.MAX_SINGLE_GET_SIZE = 32 * 1024
+        self.bs.MAX_CHUNK_GET_SIZE = 4 * 1024
+
+    def tearDown(self):
+        self._run(self.bs.close())
+        self.loop.close()
+        self.server.stop()
+        if os.path.isfile(FILE_PATH):
+            os.remove(FILE_PATH)
+        return super(StorageAsyncBlockBlobTest, self).tearDown()
+
+    # --Helpers-----------------------------------------------------------------
+    def _run(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def _get_block_requests(self):
+        return [request for request in self.server.requests if request[2].get('comp') == 'block']
+
+    # --Test cases--------------------------------------------------------------
+    def test_create_and_delete_container(self):
+        # Act
+        created = self._run(self.bs.create_container(self.container_name))
+        created_again = self._run(self.bs.create_container(self.container_name))
+        exists = self._run(self.bs.exists(self.container_name))
+        deleted = self._run(self.bs.delete_container(self.container_name))
+        deleted_again = self._run(self.bs.delete_container(self.container_name))
+
+        # Assert
+        self.assertTrue(created)
+        self.assertFalse(created_again)
+        self.assertTrue(exists)
+        self.assertTrue(deleted)
+        self.assertFalse(deleted_again)
+
+    def test_create_container_fail_on_exist(self):
+        # Arrange
+        self._run(self.bs.create_container(self.container_name))
+
+        # Act
+        with self.assertRaises(AzureConflictHttpError):
+            self._run(self.bs.create_container(self.container_name, fail_on_exist=True))
+
+    def test_create_small_blob_from_bytes(self):
+        # Arrange
+        self._run(self.bs.create_container(self.container_name))
+        data = self.get_random_bytes(1024)
+
+        # Act
+        resp = self._run(self.bs.create_blob_from_bytes(self.container_name, 'blob', data))
+        blob = self._run(self.bs.get_blob_to_bytes(self.container_name, 'blob'))
+
+        # Assert
+        self.assertIsNotNone(resp.etag)
+        self.assertEqual(blob.content, data)
+        self.assertEqual(self._get_block_requests(), [])
+
+    def test_create_large_blob_from_bytes_parallel(self):
+        # Arrange
+        self._run(self.bs.create_container(self.container_name))
+        data = self.get_random_bytes(self.bs.MAX_SINGLE_PUT_SIZE + 1000)
+        progress = []
+
+        # Act
+        self._run(self.bs.create_blob_from_bytes(self.container_name, 'blob', data, max_connections=4,
+                                                 progress_callback=lambda c, t: progress.append((c, t))))
+        blob = self._run(self.bs.get_blob_to_bytes(self.container_name, 'blob'))
+
+        # Assert
+        self.assertEqual(blob.content, data)
+        self.assertEqual(len(self._get_block_requests()), 9)
+        self.assertEqual(progress[0], (0, len(data)))
+        self.assertEqual(progress[-1], (len(data), len(data)))
+
+    def test_create_blob_from_path(self):
+        # Arrange
+        self._run(self.bs.create_container(self.container_name))
+        data = self.get_random_bytes(self.bs.MAX_SINGLE_PUT_SIZE + 1000)
+        with open(FILE_PATH, 'wb') as stream:
+            stream.write(data)
+
+        # Act
+        self._run(self.bs.create_blob_from_path(self.container_name, 'blob', FILE_PATH))
+        blob = self._run(self.bs.get_blob_to_bytes(self.container_name, 'blob'))
+
+        # Assert
+        self.assertEqual(blob.content, data)
+
+    def test_get_large_blob_to_stream_parallel(self):
+        # Arrange
+        self._run(self.bs.create_container(self.container_name))
+        data = self.get_random_bytes(self.bs.MAX_SINGLE_GET_SIZE + 10 * 1024 + 10)
+        self._run(self.bs.create_blob_from_bytes(self.container_name, 'blob', data))
+        self.server.latency = 0.05
+
+        # Act
+        with open(FILE_PATH, 'wb') as stream:
+            blob = self._run(self.bs.get_blob_to_stream(self.container_name, 'blob', stream, max_connections=4))
+
+        # Assert
+        with open(FILE_PATH, 'rb') as stream:
+            self.assertEqual(stream.read(), data)
+        self.assertEqual(blob.properties.content_length, len(data))
+        self.assertIsNone(blob.content)
+
+    def test_get_blob_range_to_text(self):
+        # Arrange
+        self._run(self.bs.create_container(self.container_name))
+        text = u'hello world ' * 5000
+        self._run(self.bs.create_blob_from_text(self.container_name, 'blob', text))
+
+        # Act
+        blob = self._run(self.bs.get_blob_to_text(self.container_name, 'blob', start_range=6, end_range=40005,
+                                                  max_connections=3))
+
+        # Assert
+        self.assertEqual(blob.content, text[6:40006])
+
+    def test_get_empty_blob(self):
+        # Arrange
+        self._run(self.bs.create_container(self.container_name))
+        self._run(self.bs.create_blob_from_bytes(self.container_name, 'blob', b''))
+
+        # Act
+        blob = self._run(self.bs.get_blob_to_bytes(self.container_name, 'blob'))
+
+        # Assert
+        self.assertEqual(blob.content, b'')
+        self.assertEqual(blob.properties.content_length, 0)
+
+    def test_list_blobs(self):
+        # Arrange
+        self._run(self.bs.create_container(self.container_name))
+        names = ['blob{0}'.format(i) for i in range(5)]
+
+        async def create_blobs():
+            await asyncio.gather(*[self.bs.create_blob_from_bytes(self.container_name, name, b'data')
+                                   for name in names])
+
+        self._run(create_blobs())
+
+        async def list_names():
+            generator = await self.bs.list_blob_names(self.container_name, num_results=3)
+            return [name async for name in generator], generator.next_marker
+
+        # Act
+        listed = self._run(list_names())
+
+        async def list_all():
+            return [blob async for blob in await self.bs.list_blobs(self.container_name)]
+
+        blobs = self._run(list_all())
+
+        # Assert
+        self.assertEqual(listed[0], names[:3])
+        self.assertIsNotNone(listed[1])
+        self.assertEqual([blob.name for blob in blobs], names)
+        self.assertEqual(blobs[0].properties.content_length, 4)
+
+    def test_list_blobs_in_parallel(self):
+        # Arrange
+        names = ['a/1', 'a/2', 'b/2', 'b/c/1', 'd']
+        self._run(self.bs.create_container(self.container_name))
+        for name in names:
+            self._run(self.bs.create_blob_from_bytes(self.container_name, name, b'data'))
+
+        async def list_all():
+            return [blob.name async for blob in
+                    await self.bs.list_blobs_in_parallel(self.container_name, max_connections=3)]
+
+        async def list_first():
+            blobs = (await self.bs.list_blobs_in_parallel(self.container_name, results_per_page=1)).__aiter__()
+            first = await blobs.__anext__()
+            await blobs.aclose()
+            return first
+
+        # Act
+        listed = self._run(list_all())
+        first = self._run(list_first())
+        requests = len(self.server.requests)
+        self._run(asyncio.sleep(0.1))
+
+        # Assert
+        self.assertEqual(sorted(listed), names)
+        self.assertIn(first.name, names)
+        # the workers were cancelled when the generator was closed
+        self.assertEqual(len(self.server.requests), requests)
+
+    def test_list_blob_columns(self):
+        # Arrange
+        self._run(self.bs.create_container(self.container_name))
+        for i in range(3):
+            self._run(self.bs.create_blob_from_bytes(self.container_name, 'blob{0}'.format(i), b'x' * i))
+
+        # Act
+        columns = self._run(self.bs.list_blob_columns(self.container_name, num_results=2))
+        rest = self._run(self.bs.list_blob_columns(self.container_name, marker=columns.next_marker))
+
+        # Assert
+        self.assertEqual(columns.names, ['blob0', 'blob1'])
+        self.assertEqual(list(columns.content_lengths), [0, 1])
+        self.assertEqual(rest.names, ['blob2'])
+        self.assertEqual(list(rest.content_lengths), [2])
+        self.assertEqual(rest.next_marker, '')
+
+    def test_properties_cache(self):
+        # Arrange
+        self.bs.properties_cache = PropertiesCache(ttl=60)
+        self._run(self.bs.create_container(self.container_name, metadata={'kind': 'test'}))
+        self._run(self.bs.create_blob_from_bytes(self.container_name, 'blob', b'hello world',
+                                                 metadata={'number': '1'}))
+        requests = len(self.server.requests)
+
+        async def get_all():
+            return (await self.bs.get_blob_properties(self.container_name, 'blob'),
+                    await self.bs.get_blob_properties(self.container_name, 'blob'),
+                    await self.bs.get_blob_metadata(self.container_name, 'blob'),
+                    await self.bs.exists(self.container_name, 'blob'),
+                    await self.bs.get_container_properties(self.container_name),
+                    await self.bs.get_container_metadata(self.container_name),
+                    await self.bs.exists(self.container_name))
+
+        # Act
+        first, second, metadata, exists, container, container_metadata, container_exists = self._run(get_all())
+        cached_requests = len(self.server.requests)
+        self._run(self.bs.set_blob_metadata(self.container_name, 'blob', {'number': '2'}))
+        changed = self._run(self.bs.get_blob_metadata(self.container_name, 'blob'))
+
+        # Assert
+        # one request for the blob and one for the container
+        self.assertEqual(cached_requests, requests + 2)
+        self.assertEqual(second.properties.etag, first.properties.etag)
+        self.assertEqual(metadata, {'number': '1'})
+        self.assertTrue(exists)
+        self.assertEqual(container.metadata, {'kind': 'test'})
+        self.assertEqual(container_metadata, {'kind': 'test'})
+        self.assertTrue(container_exists)
+        self.assertEqual(changed, {'number': '2'})
+        self.assertEqual(len(self.server.requests), cached_requests + 2)
+
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
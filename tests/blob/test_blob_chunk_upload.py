@@ -0,0 +1,345 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import gzip
+import os
+import unittest
+from io import UnsupportedOperation
+
+from azure.storage.blob import (
+    BlockBlobService,
+    PageBlobService,
+)
+from azure.storage.blob._upload_chunking import (
+    _BlockBlobChunkUploader,
+    _PageBlobChunkUploader,
+    _get_adaptive_block_size,
+    _get_block_size,
+    _SEEK_DATA,
+    _get_next_data_offset,
+)
+from azure.storage.common._chunk_sizing import _AdaptiveChunkSize
+from azure.storage.common._memory_mapping import _MemoryMappedFile
+from tests.local_storage_server import LocalStorageServer
+from tests.testcase import StorageTestCase
+
+BLOCK_SIZE = 1024
+READ_SIZE = 100
+FILE_PATH = 'blob_chunk_upload.temp.dat'
+
+
+class _ShortReadStream(object):
+    '''
+    A non-seekable stream which returns at most READ_SIZE bytes per read, like a
+    socket or a pipe.
+    '''
+
+    def __init__(self, data):
+        self.data = data
+        self.position = 0
+
+    def read(self, size=-1):
+        data = self.data[self.position:self.position + min(size, READ_SIZE)]
+        self.position += len(data)
+        return data
+
+
+class _ShortReadIntoStream(_ShortReadStream):
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+class _UnsupportedReadIntoStream(_ShortReadStream):
+    def readinto(self, buffer):
+        raise UnsupportedOperation()
+
+
+# ------------------------------------------------------------------------------
+
+class StorageBlobChunkUploadTest(StorageTestCase):
+    def setUp(self):
+        super(StorageBlobChunkUploadTest, self).setUp()
+        self.server = LocalStorageServer('blob').start()
+        self.service = self.server.create_service(BlockBlobService)
+        self.service.MAX_SINGLE_PUT_SIZE = BLOCK_SIZE
+        self.service.MAX_BLOCK_SIZE = BLOCK_SIZE
+        self.container_name = self.get_resource_name('utcontainer')
+        self.service.create_container(self.container_name)
+
+    def tearDown(self):
+        self.server.stop()
+        if os.path.isfile(FILE_PATH):
+            os.remove(FILE_PATH)
+        return super(StorageBlobChunkUploadTest, self).tearDown()
+
+    # --Helpers-----------------------------------------------------------------
+    def _assert_upload_from_stream(self, stream_class, count=None, validate_content=False):
+        # Arrange
+        data = self.get_random_bytes(BLOCK_SIZE * 5 + 17)
+
+        # Act
+        self.service.create_blob_from_stream(self.container_name, 'blob', stream_class(data),
+                                             count=len(data) if count is None else count,
+                                             max_connections=1, validate_content=validate_content)
+
+        # Assert
+        blob = self.service.get_blob_to_bytes(self.container_name, 'blob')
+        self.assertEqual(blob.content, data[:count])
+
+    # --Test cases--------------------------------------------------------------
+    def test_upload_from_short_read_stream(self):
+        self._assert_upload_from_stream(_ShortReadStream)
+
+    def test_upload_from_short_readinto_stream(self):
+        self._assert_upload_from_stream(_ShortReadIntoStream)
+
+    def test_upload_from_short_readinto_stream_with_md5(self):
+        self._assert_upload_from_stream(_ShortReadIntoStream, validate_content=True)
+
+    def test_upload_part_of_short_readinto_stream(self):
+        self._assert_upload_from_stream(_ShortReadIntoStream, count=BLOCK_SIZE * 2 + 5)
+
+    def test_upload_from_stream_without_readinto_support(self):
+        self._assert_upload_from_stream(_UnsupportedReadIntoStream)
+
+    def test_chunk_buffers_are_reused(self):
+        # Arrange
+        data = self.get_random_bytes(BLOCK_SIZE * 3)
+        uploader = _BlockBlobChunkUploader(self.service, self.container_name, 'blob', len(data), BLOCK_SIZE,
+                                           _ShortReadIntoStream(data), False, None, False, None, None, None, None,
+                                           None)
+
+        # Act
+        chunks = []
+        for chunk in uploader.get_chunk_streams():
+            chunks.append(bytes(chunk[1]))
+            uploader.process_chunk(chunk)
+
+        # Assert
+        # each chunk is read into the buffer of the previous one once it has been sent
+        self.assertEqual(b''.join(chunks), data)
+        self.assertEqual(len(uploader.free_buffers), 1)
+        self.assertEqual(uploader.chunk_buffers, {})
+
+    def test_upload_from_path_in_parallel(self):
+        # Arrange
+        data = self.get_random_bytes(BLOCK_SIZE * 5 + 17)
+        with open(FILE_PATH, 'wb') as stream:
+            stream.write(data)
+
+        # Act
+        self.service.create_blob_from_path(self.container_name, 'blob', FILE_PATH, max_connections=4)
+
+        # Assert
+        blob = self.service.get_blob_to_bytes(self.container_name, 'blob')
+        self.assertEqual(blob.content, data)
+
+    def test_upload_blocks_of_gzip_stream(self):
+        # Arrange
+        data = self.get_random_bytes(BLOCK_SIZE * 5 + 17)
+        with gzip.open(FILE_PATH, 'wb') as stream:
+            stream.write(data)
+        self.service.MIN_LARGE_BLOCK_UPLOAD_THRESHOLD = BLOCK_SIZE
+
+        for max_connections in (1, 2):
+            # Act
+            # the blocks are substreams of the GzipFile, whose descriptor is that of the compressed file
+            with gzip.open(FILE_PATH, 'rb') as stream:
+                self.service.create_blob_from_stream(self.container_name, 'blob', stream, count=len(data),
+                                                     max_connections=max_connections)
+
+            # Assert
+            blob = self.service.get_blob_to_bytes(self.container_name, 'blob')
+            self.assertEqual(blob.content, data)
+
+    def test_upload_empty_file_from_path(self):
+        # Arrange
+        open(FILE_PATH, 'wb').close()
+
+        # Act
+        self.service.create_blob_from_path(self.container_name, 'blob', FILE_PATH)
+
+        # Assert
+        blob = self.service.get_blob_to_bytes(self.container_name, 'blob')
+        self.assertEqual(blob.content, b'')
+
+    def test_chunks_of_mapped_file_are_views_of_mapping(self):
+        # Arrange
+        data = self.get_random_bytes(BLOCK_SIZE * 3 + 17)
+        with open(FILE_PATH, 'wb') as stream:
+            stream.write(data)
+
+        with _MemoryMappedFile(FILE_PATH) as stream:
+            uploader = _BlockBlobChunkUploader(self.service, self.container_name, 'blob', len(data), BLOCK_SIZE,
+                                               stream, True, None, False, None, None, None, None, None)
+
+            # Act
+            chunks = list(uploader.get_chunk_streams())
+
+            # Assert
+            self.assertEqual([offset for offset, _ in chunks], [0, BLOCK_SIZE, BLOCK_SIZE * 2, BLOCK_SIZE * 3])
+            self.assertEqual(b''.join(bytes(chunk) for _, chunk in chunks), data)
+            for _, chunk in chunks:
+                self.assertIsInstance(chunk.obj, type(stream._mapping))
+            self.assertEqual(uploader.free_buffers, [])
+            self.assertEqual(uploader.chunk_buffers, {})
+
+    def test_page_blob_upload_skips_empty_pages(self):
+        # Arrange
+        chunk_size = 256 * 1024
+        page_service = self.server.create_service(PageBlobService)
+        page_service.MAX_PAGE_SIZE = chunk_size
+        data = bytearray(chunk_size * 4)
+        data[600:700] = self.get_random_bytes(100)
+        data[100 * 1024:100 * 1024 + 10] = self.get_random_bytes(10)
+        data[108 * 1024:108 * 1024 + 10] = self.get_random_bytes(10)
+        data[chunk_size - 1:chunk_size + 1] = b'\x01\x01'
+        data[chunk_size * 4 - BLOCK_SIZE:] = self.get_random_bytes(BLOCK_SIZE)
+
+        # Act
+        page_service.create_blob_from_bytes(self.container_name, 'blob', bytes(data), max_connections=1)
+
+        # Assert
+        # only the pages with data are sent, even where they share a chunk with empty pages, but pages with
+        # data which are close together are sent in one request with the empty pages between them
+        blob = page_service.get_blob_to_bytes(self.container_name, 'blob')
+        self.assertEqual(blob.content, bytes(data))
+        page_ranges = [(page_range.start, page_range.end) for page_range in
+                       page_service.get_page_ranges(self.container_name, 'blob')]
+        self.assertEqual(page_ranges, [(512, 1023), (100 * 1024, 108 * 1024 + 511),
+                                       (chunk_size - 512, chunk_size + 511),
+                                       (chunk_size * 4 - BLOCK_SIZE, chunk_size * 4 - 1)])
+        page_writes = [request for request in self.server.requests if request[2].get('comp') == 'page']
+        self.assertEqual(len(page_writes), 5)
+
+    def test_page_blob_upload_from_gzip_stream(self):
+        # Arrange
+        chunk_size = 64 * 1024
+        page_service = self.server.create_service(PageBlobService)
+        page_service.MAX_PAGE_SIZE = chunk_size
+        # the data lies past the end of the compressed file, where it has no data to find
+        data = bytearray(chunk_size * 16)
+        data[chunk_size * 12:chunk_size * 13] = self.get_random_bytes(chunk_size)
+        with gzip.open(FILE_PATH, 'wb') as stream:
+            stream.write(bytes(data))
+
+        # Act
+        with gzip.open(FILE_PATH, 'rb') as stream:
+            page_service.create_blob_from_stream(self.container_name, 'blob', stream, len(data), max_connections=1)
+
+        # Assert
+        blob = page_service.get_blob_to_bytes(self.container_name, 'blob')
+        self.assertEqual(blob.content, bytes(data))
+
+    def test_holes_of_sparse_file_are_not_read(self):
+        # Arrange
+        # file systems find holes in blocks of a few KB, so the chunks are larger than that here
+        chunk_size = 64 * 1024
+        hole_size = 1024 * 1024
+        data = self.get_random_bytes(chunk_size)
+        with open(FILE_PATH, 'wb') as stream:
+            stream.seek(hole_size)
+            stream.write(data)
+            stream.seek(hole_size * 2 + chunk_size)
+            stream.write(data)
+        with open(FILE_PATH, 'rb') as stream:
+            if _SEEK_DATA is None or _get_next_data_offset(stream.fileno(), 0) != hole_size:
+                self.skipTest('the file system does not report the holes of sparse files')
+            expected_data = stream.read()
+
+        page_service = self.server.create_service(PageBlobService)
+        blob_size = len(expected_data)
+
+        for stream in (open(FILE_PATH, 'rb'), _MemoryMappedFile(FILE_PATH)):
+            with stream:
+                uploader = _PageBlobChunkUploader(page_service, self.container_name, 'blob', blob_size, chunk_size,
+                                                  stream, False, None, False, None, None, None, None, None)
+
+                # Act
+                chunks = list(uploader.get_chunk_streams())
+
+                # Assert
+                # the chunks in the holes are the shared empty chunk rather than read from the file
+                self.assertEqual(sorted(uploader.hole_offsets),
+                                 [offset for offset in range(0, blob_size, chunk_size)
+                                  if offset not in (hole_size, hole_size * 2 + chunk_size)])
+                for offset, chunk in chunks:
+                    self.assertEqual(offset in uploader.hole_offsets, chunk.obj is uploader.empty_chunk)
+                self.assertEqual(b''.join(chunk.tobytes() for _, chunk in chunks), expected_data)
+                self.assertEqual(uploader._get_page_ranges(chunks[0][1]), [])
+
+    def test_block_size_fits_blob_in_block_limit(self):
+        # Arrange
+        block_size = 4 * 1024 * 1024
+
+        # Act
+        sizes = [_get_block_size(blob_size, block_size) for blob_size in
+                 (None, block_size * 50000, block_size * 50000 + 1, block_size * 50000 * 100)]
+        sizer = _get_adaptive_block_size(block_size * 50000 * 3, _get_block_size(block_size * 50000 * 3, block_size))
+
+        # Assert
+        self.assertEqual(sizes, [block_size, block_size, block_size * 2, 100 * 1024 * 1024])
+        self.assertEqual(sizer.size, block_size * 3)
+        self.assertEqual(sizer.min_size, block_size * 3)
+        self.assertEqual(sizer.max_size, 100 * 1024 * 1024)
+
+    def test_chunks_take_size_of_adaptive_upload(self):
+        # Arrange
+        data = self.get_random_bytes(BLOCK_SIZE * 10 + 17)
+        uploader = _BlockBlobChunkUploader(self.service, self.container_name, 'blob', len(data), BLOCK_SIZE,
+                                           _ShortReadIntoStream(data), False, None, False, None, None, None, None,
+                                           None)
+        uploader.chunk_sizer = _AdaptiveChunkSize(BLOCK_SIZE, BLOCK_SIZE * 4)
+        sizes = [BLOCK_SIZE * 2, BLOCK_SIZE * 4, BLOCK_SIZE]
+
+        # Act
+        chunks = []
+        for chunk in uploader.get_chunk_streams():
+            chunks.append((chunk[0], bytes(chunk[1])))
+            # the chunks are not sent, so that only the sizes set here tune the upload
+            uploader._release_sent_chunk(chunk[0])
+            if sizes:
+                uploader.chunk_sizer.size = sizes.pop(0)
+
+        # Assert
+        self.assertEqual([(offset, len(chunk)) for offset, chunk in chunks],
+                         [(0, BLOCK_SIZE), (BLOCK_SIZE, BLOCK_SIZE * 2), (BLOCK_SIZE * 3, BLOCK_SIZE * 4),
+                          (BLOCK_SIZE * 7, BLOCK_SIZE), (BLOCK_SIZE * 8, BLOCK_SIZE), (BLOCK_SIZE * 9, BLOCK_SIZE),
+                          (BLOCK_SIZE * 10, 17)])
+        self.assertEqual(b''.join(chunk for _, chunk in chunks), data)
+
+    def test_upload_with_adaptive_block_size(self):
+        # Arrange
+        data = self.get_random_bytes(BLOCK_SIZE * 40 + 17)
+        with open(FILE_PATH, 'wb') as stream:
+            stream.write(data)
+        self.service.ADAPTIVE_BLOCK_SIZE = True
+        page_service = self.server.create_service(PageBlobService)
+        page_service.MAX_PAGE_SIZE = BLOCK_SIZE
+        page_service.ADAPTIVE_PAGE_SIZE = True
+        page_data = data[:BLOCK_SIZE * 40]
+
+        for max_connections in (1, 4):
+            # Act
+            self.service.create_blob_from_bytes(self.container_name, 'blob', data, max_connections=max_connections)
+            self.service.MIN_LARGE_BLOCK_UPLOAD_THRESHOLD = BLOCK_SIZE
+            with open(FILE_PATH, 'rb') as stream:
+                # the blocks are sent as substreams of the file
+                self.service.create_blob_from_stream(self.container_name, 'substreams', stream,
+                                                     max_connections=max_connections)
+            page_service.create_blob_from_bytes(self.container_name, 'pages', page_data,
+                                                max_connections=max_connections)
+
+            # Assert
+            self.assertEqual(self.service.get_blob_to_bytes(self.container_name, 'blob').content, data)
+            self.assertEqual(self.service.get_blob_to_bytes(self.container_name, 'substreams').content, data)
+            self.assertEqual(page_service.get_blob_to_bytes(self.container_name, 'pages').content, page_data)
+
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
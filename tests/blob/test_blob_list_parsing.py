@@ -0,0 +1,409 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import gc
+import pickle
+import unittest
+from calendar import timegm
+
+from azure.storage.blob import (
+    BlobPrefix,
+    BlockBlobService,
+)
+from azure.storage.blob._deserialization import (
+    _convert_xml_to_blob_columns,
+    _convert_xml_to_blob_list,
+    _convert_xml_to_blob_name_list,
+    _convert_xml_to_streamed_blob_list,
+    _convert_xml_to_streamed_blob_name_list,
+)
+from azure.common import AzureException
+from azure.storage.common._deserialization import _to_shared_str
+from azure.storage.common._http import HTTPResponse
+from azure.storage.common.models import ListGenerator
+from tests.local_storage_server import LocalStorageServer
+from tests.testcase import StorageTestCase
+
+LISTING = u'''﻿<?xml version="1.0" encoding="utf-8"?>
+<EnumerationResults ServiceEndpoint="https://storagename.blob.core.windows.net/" ContainerName="container">
+  <Delimiter>/</Delimiter>
+  <Blobs>
+    <Blob>
+      <Name>a</Name>
+      <Properties>
+        <Last-Modified>Thu, 09 May 2019 00:57:52 GMT</Last-Modified>
+        <Etag>0x8D6D4195D54ABA0</Etag>
+        <Content-Length>11</Content-Length>
+        <BlobType>BlockBlob</BlobType>
+        <LeaseStatus>unlocked</LeaseStatus>
+      </Properties>
+      <Metadata><number>1</number></Metadata>
+    </Blob>
+    <BlobPrefix><Name>b/</Name></BlobPrefix>
+    <Blob>
+      <Name>c</Name>
+      <Snapshot>2019-05-09T00:57:52.5355552Z</Snapshot>
+      <Properties><Content-Length>22</Content-Length></Properties>
+    </Blob>
+  </Blobs>
+  <NextMarker>marker</NextMarker>
+</EnumerationResults>'''
+
+FLAT_LISTING = u'''<?xml version="1.0" encoding="utf-8"?>
+<EnumerationResults ServiceEndpoint="https://storagename.blob.core.windows.net/" ContainerName="container">
+  <Blobs>{0}</Blobs>
+  <NextMarker>marker</NextMarker>
+</EnumerationResults>'''.format(u''.join(
+    u'<Blob><Name>blob{0}</Name><Properties><Content-Length>{0}</Content-Length></Properties></Blob>'.format(i)
+    for i in range(50)))
+
+
+class _PiecewiseResponse(HTTPResponse):
+    '''
+    A response whose body can only be read in small pieces, as if it were
+    streamed off the connection. If fail_after is given, reading the body
+    fails once that many pieces have been read.
+    '''
+
+    def __init__(self, body, piece_size=16, fail_after=None):
+        super(_PiecewiseResponse, self).__init__(200, 'OK', {}, None)
+        self._content = body
+        self._piece_size = piece_size
+        self._fail_after = fail_after
+        self.pieces_read = 0
+        self.closed = False
+
+    @property
+    def body(self):
+        raise AssertionError('the body must not be read as a whole')
+
+    @body.setter
+    def body(self, value):
+        pass
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self._content), self._piece_size):
+            if self.pieces_read == self._fail_after:
+                raise IOError('connection reset')
+            self.pieces_read += 1
+            yield self._content[i:i + self._piece_size]
+
+    def close(self):
+        self.closed = True
+
+
+# ------------------------------------------------------------------------------
+
+class StorageBlobListParsingTest(StorageTestCase):
+    def test_convert_blob_list_in_pieces(self):
+        # Arrange
+        response = _PiecewiseResponse(LISTING.encode('utf-8'))
+
+        # Act
+        blobs = _convert_xml_to_blob_list(response)
+
+        # Assert
+        self.assertGreater(response.pieces_read, 1)
+        self.assertEqual(blobs.next_marker, 'marker')
+        self.assertEqual(len(blobs), 3)
+        self.assertIsInstance(blobs[0], BlobPrefix)
+        self.assertEqual(blobs[0].name, 'b/')
+        self.assertEqual(blobs[1].name, 'a')
+        self.assertEqual(blobs[1].properties.etag, '0x8D6D4195D54ABA0')
+        self.assertEqual(blobs[1].properties.content_length, 11)
+        self.assertEqual(blobs[1].properties.last_modified.year, 2019)
+        self.assertEqual(blobs[1].properties.lease.status, 'unlocked')
+        self.assertEqual(blobs[1].metadata, {'number': '1'})
+        self.assertEqual(blobs[2].name, 'c')
+        self.assertEqual(blobs[2].snapshot, '2019-05-09T00:57:52.5355552Z')
+        self.assertEqual(blobs[2].properties.content_length, 22)
+
+    def test_convert_blob_list_keeps_unknown_properties(self):
+        # Arrange
+        body = LISTING.replace(u'<BlobType>', u'<TagCount>2</TagCount><BlobType>').encode('utf-8')
+
+        # Act
+        blobs = _convert_xml_to_blob_list(HTTPResponse(200, 'OK', {}, body))
+
+        # Assert
+        self.assertEqual(blobs[1].properties.TagCount, '2')
+        self.assertEqual(blobs[1].properties.blob_type, 'BlockBlob')
+        # the blob type is shared with every other blob of the same type
+        self.assertIs(blobs[1].properties.blob_type, _to_shared_str(u''.join([u'Block', u'Blob'])))
+        self.assertIsNone(blobs[2].properties.copy.id)
+
+    def test_listed_blobs_keep_their_attribute_dicts(self):
+        # Act
+        blobs = _convert_xml_to_blob_list(HTTPResponse(200, 'OK', {}, LISTING.encode('utf-8')))
+        unpickled = pickle.loads(pickle.dumps(blobs[1], protocol=0))
+
+        # Assert
+        self.assertEqual(vars(blobs[1])['name'], 'a')
+        self.assertIn('copy', vars(blobs[1].properties))
+        self.assertEqual(unpickled.name, 'a')
+        self.assertEqual(unpickled.properties.content_length, blobs[1].properties.content_length)
+
+    def test_convert_blob_name_list_in_pieces(self):
+        # Arrange
+        response = _PiecewiseResponse(LISTING.encode('utf-8'))
+
+        # Act
+        names = _convert_xml_to_blob_name_list(response)
+
+        # Assert
+        self.assertEqual(names, ['b/', 'a', 'c'])
+        self.assertEqual(names.next_marker, 'marker')
+
+    def test_convert_blob_list_empty_marker(self):
+        # Arrange
+        body = b'<?xml version="1.0" encoding="utf-8"?><EnumerationResults><Blobs /><NextMarker /></EnumerationResults>'
+
+        # Act
+        blobs = _convert_xml_to_blob_list(HTTPResponse(200, 'OK', {}, body))
+
+        # Assert
+        self.assertEqual(len(blobs), 0)
+        self.assertEqual(blobs.next_marker, '')
+
+    def test_convert_empty_blob_list(self):
+        # Act
+        converted = [converter(HTTPResponse(200, 'OK', {}, body))
+                     for converter in (_convert_xml_to_blob_list, _convert_xml_to_blob_name_list,
+                                       _convert_xml_to_blob_columns, _convert_xml_to_streamed_blob_list)
+                     for body in (None, b'')]
+
+        # Assert
+        self.assertEqual(converted, [None] * 8)
+
+    def test_streamed_blob_list_returns_blobs_as_they_are_read(self):
+        # Arrange
+        response = _PiecewiseResponse(FLAT_LISTING.encode('utf-8'))
+
+        # Act
+        blobs = _convert_xml_to_streamed_blob_list(response)
+        items = iter(blobs)
+        first = next(items)
+        pieces_read_for_first = response.pieces_read
+        rest = list(items)
+
+        # Assert
+        self.assertEqual(first.name, 'blob0')
+        self.assertLess(pieces_read_for_first * 4, response.pieces_read)
+        self.assertEqual([blob.name for blob in rest], ['blob{0}'.format(i) for i in range(1, 50)])
+        self.assertEqual(rest[-1].properties.content_length, 49)
+        self.assertEqual(len(blobs), 50)
+        self.assertEqual(blobs.next_marker, 'marker')
+        self.assertTrue(response.closed)
+
+    def test_streamed_blob_list_reads_the_rest_for_the_marker(self):
+        # Arrange
+        response = _PiecewiseResponse(FLAT_LISTING.encode('utf-8'))
+
+        # Act
+        names = _convert_xml_to_streamed_blob_name_list(response)
+        next_marker = names.next_marker
+
+        # Assert
+        self.assertEqual(next_marker, 'marker')
+        self.assertTrue(response.closed)
+        self.assertEqual(list(names), ['blob{0}'.format(i) for i in range(50)])
+
+    def test_streamed_blob_list_resumes_after_failure(self):
+        # Arrange
+        body = FLAT_LISTING.encode('utf-8')
+        responses = [_PiecewiseResponse(body, fail_after=100), _PiecewiseResponse(body, fail_after=200),
+                     _PiecewiseResponse(body)]
+        names = _convert_xml_to_streamed_blob_name_list(responses[0])
+        names._reload = lambda: _convert_xml_to_streamed_blob_name_list(responses.pop(1))
+
+        # Act
+        result = list(names)
+
+        # Assert
+        self.assertEqual(result, ['blob{0}'.format(i) for i in range(50)])
+        self.assertEqual(names.next_marker, 'marker')
+        self.assertEqual(len(responses), 1)
+        self.assertTrue(responses[0].closed)
+
+    def test_streamed_blob_list_raises_when_failures_return_nothing(self):
+        # Arrange
+        body = FLAT_LISTING.encode('utf-8')
+        names = _convert_xml_to_streamed_blob_name_list(_PiecewiseResponse(body, fail_after=100))
+        names._reload = lambda: _convert_xml_to_streamed_blob_name_list(_PiecewiseResponse(body, fail_after=1))
+        result = []
+
+        # Act
+        with self.assertRaises(AzureException):
+            for name in names:
+                result.append(name)
+
+        # Assert
+        self.assertGreater(len(result), 0)
+        self.assertLess(len(result), 50)
+
+    def test_convert_blob_columns_in_pieces(self):
+        # Arrange
+        response = _PiecewiseResponse(LISTING.replace(u'<LeaseStatus>', u'<AccessTier>Hot</AccessTier><LeaseStatus>')
+                                      .replace(u'<Content-Length>22', u'<Last-Modified>Fri, 10 May 2019 00:00:00 GMT'
+                                                                      u'</Last-Modified><Content-Length>22')
+                                      .encode('utf-8'))
+
+        # Act
+        columns = _convert_xml_to_blob_columns(response)
+
+        # Assert
+        self.assertEqual(len(columns), 2)
+        self.assertEqual(columns.names, ['a', 'c'])
+        self.assertEqual(list(columns.content_lengths), [11, 22])
+        self.assertEqual(list(columns.last_modified), [timegm((2019, 5, 9, 0, 57, 52)), timegm((2019, 5, 10, 0, 0, 0))])
+        self.assertEqual(columns.etags, ['0x8D6D4195D54ABA0', None])
+        self.assertEqual(columns.blob_tiers, ['Hot', None])
+        self.assertEqual(columns.next_marker, 'marker')
+
+    def test_list_blob_columns(self):
+        # Arrange
+        with LocalStorageServer('blob') as server:
+            service = server.create_service(BlockBlobService)
+            service.create_container('container')
+            for i in range(10):
+                service.create_blob_from_bytes('container', 'blob{0}'.format(i), b'x' * i)
+
+            # Act
+            columns = service.list_blob_columns('container', prefix='blob', num_results=7)
+            rest = service.list_blob_columns('container', marker=columns.next_marker)
+            properties = service.get_blob_properties('container', 'blob3').properties
+
+        # Assert
+        try:
+            import numpy
+            self.assertIsInstance(columns.content_lengths, numpy.ndarray)
+            self.assertEqual(columns.content_lengths.dtype, numpy.int64)
+        except ImportError:
+            self.assertEqual(columns.content_lengths.typecode, 'q')
+        self.assertEqual(columns.names, ['blob{0}'.format(i) for i in range(7)])
+        self.assertEqual(list(columns.content_lengths), list(range(7)))
+        self.assertEqual(columns.next_marker, 'blob7')
+        self.assertEqual(rest.names, ['blob7', 'blob8', 'blob9'])
+        self.assertEqual(columns.etags[3], properties.etag)
+        self.assertEqual(columns.last_modified[3], timegm(properties.last_modified.utctimetuple()))
+
+    def test_list_blobs_across_pages(self):
+        # Arrange
+        with LocalStorageServer('blob') as server:
+            service = server.create_service(BlockBlobService)
+            service.create_container('container')
+            for i in range(10):
+                service.create_blob_from_bytes('container', 'blob{0}'.format(i), b'x' * i)
+
+            # Act
+            blobs = list(service.list_blobs('container', num_results=7))
+            names = list(service.list_blob_names('container'))
+
+        # Assert
+        self.assertEqual([blob.name for blob in blobs], ['blob{0}'.format(i) for i in range(7)])
+        self.assertEqual([blob.properties.content_length for blob in blobs], list(range(7)))
+        self.assertEqual(names, ['blob{0}'.format(i) for i in range(10)])
+
+    def test_list_blobs_streams_pages_without_a_delimiter(self):
+        # Arrange
+        with LocalStorageServer('blob') as server:
+            service = server.create_service(BlockBlobService)
+            service.create_container('container')
+            for name in ('a/1', 'a/2', 'b', 'c'):
+                service.create_blob_from_bytes('container', name, b'x')
+
+            # Act
+            names = list(service.list_blob_names('container'))
+            prefixed = list(service.list_blob_names('container', delimiter='/'))
+            prefetched = list(service.list_blob_names('container', prefetch_pages=1))
+
+        # Assert
+        self.assertEqual(names, ['a/1', 'a/2', 'b', 'c'])
+        self.assertEqual(prefixed, ['a/', 'b', 'c'])
+        self.assertEqual(prefetched, ['a/1', 'a/2', 'b', 'c'])
+
+    def test_list_blobs_next_marker_before_iterating(self):
+        # Arrange
+        with LocalStorageServer('blob') as server:
+            service = server.create_service(BlockBlobService)
+            service.create_container('container')
+            for name in ('a', 'b', 'c', 'd'):
+                service.create_blob_from_bytes('container', name, b'x')
+
+            # Act
+            generator1 = service.list_blobs('container', num_results=2)
+            generator2 = service.list_blobs('container', marker=generator1.next_marker, num_results=2)
+            blobs1 = list(generator1)
+            blobs2 = list(generator2)
+
+        # Assert
+        self.assertEqual(generator1.next_marker, 'c')
+        self.assertEqual([blob.name for blob in blobs1], ['a', 'b'])
+        self.assertEqual([blob.name for blob in blobs2], ['c', 'd'])
+        self.assertEqual(generator2.next_marker, '')
+
+    def test_list_blobs_items_is_a_list(self):
+        # Arrange
+        with LocalStorageServer('blob') as server:
+            service = server.create_service(BlockBlobService)
+            service.create_container('container')
+            for name in ('a', 'b', 'c'):
+                service.create_blob_from_bytes('container', name, b'x')
+
+            # Act
+            generator = service.list_blobs('container', num_results=2)
+            items = generator.items
+            names = [blob.name for blob in generator]
+            items_after_iterating = generator.items
+
+        # Assert
+        self.assertEqual([blob.name for blob in items], ['a', 'b'])
+        self.assertEqual(items[1].name, 'b')
+        self.assertEqual(items.next_marker, 'c')
+        self.assertEqual(names, ['a', 'b'])
+        self.assertIs(items_after_iterating, items)
+
+    def test_list_blobs_iterated_again(self):
+        # Arrange
+        with LocalStorageServer('blob') as server:
+            service = server.create_service(BlockBlobService)
+            service.create_container('container')
+            for name in ('a', 'b', 'c'):
+                service.create_blob_from_bytes('container', name, b'x')
+
+            # Act
+            generator = service.list_blob_names('container')
+            first = list(generator)
+            second = list(generator)
+
+        # Assert
+        self.assertEqual(first, ['a', 'b', 'c'])
+        self.assertEqual(second, ['a', 'b', 'c'])
+        self.assertEqual(generator.items, ['a', 'b', 'c'])
+
+    def test_unread_page_releases_connection(self):
+        # Arrange
+        body = FLAT_LISTING.encode('utf-8')
+        abandoned_response = _PiecewiseResponse(body)
+        dropped_response = _PiecewiseResponse(body)
+        abandoned = ListGenerator(_convert_xml_to_streamed_blob_list(abandoned_response), None, (), {})
+        dropped = ListGenerator(_convert_xml_to_streamed_blob_list(dropped_response), None, (), {})
+
+        # Act
+        blobs = iter(abandoned)
+        first = next(blobs)
+        blobs.close()
+        del dropped
+        gc.collect()
+
+        # Assert
+        self.assertEqual(first.name, 'blob0')
+        self.assertTrue(abandoned_response.closed)
+        self.assertTrue(dropped_response.closed)
+
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
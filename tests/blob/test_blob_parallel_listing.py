@@ -0,0 +1,124 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import gc
+import time
+import unittest
+
+from azure.common import AzureMissingResourceHttpError
+
+from azure.storage.blob import BlockBlobService
+from azure.storage.common.retry import no_retry
+from tests.local_storage_server import LocalStorageServer
+from tests.testcase import StorageTestCase
+
+BLOB_NAMES = ['a/1/x', 'a/1/y', 'a/2', 'a/3/z/w', 'b', 'c/d', 'c/e', 'c/f/g', 'c/f/h', 'd'] + \
+             ['f/{0:02}'.format(i) for i in range(20)]
+
+
+# ------------------------------------------------------------------------------
+
+class StorageBlobParallelListingTest(StorageTestCase):
+    def setUp(self):
+        super(StorageBlobParallelListingTest, self).setUp()
+        self.server = LocalStorageServer('blob').start()
+        self.bs = self.server.create_service(BlockBlobService)
+        self.bs.retry = no_retry
+        self.container_name = self.get_resource_name('utcontainer')
+        self.bs.create_container(self.container_name)
+        for name in BLOB_NAMES:
+            self.bs.create_blob_from_bytes(self.container_name, name, name.encode('utf-8'))
+
+    def tearDown(self):
+        self.server.stop()
+        return super(StorageBlobParallelListingTest, self).tearDown()
+
+    # --Helpers-----------------------------------------------------------------
+    def _list_requests(self):
+        return [query for method, path, query in self.server.requests if query.get('comp') == 'list']
+
+    # --Test cases--------------------------------------------------------------
+    def test_returns_every_blob_once(self):
+        # Act
+        blobs = list(self.bs.list_blobs_in_parallel(self.container_name, max_connections=4, results_per_page=3))
+
+        # Assert
+        names = [blob.name for blob in blobs]
+        self.assertEqual(sorted(names), sorted(BLOB_NAMES))
+        self.assertEqual(len(names), len(set(names)))
+        self.assertEqual(blobs[names.index('a/2')].properties.content_length, 3)
+
+    def test_lists_each_prefix_separately(self):
+        # Act
+        names = [blob.name for blob in self.bs.list_blobs_in_parallel(self.container_name, prefix='c/')]
+
+        # Assert
+        self.assertEqual(sorted(names), ['c/d', 'c/e', 'c/f/g', 'c/f/h'])
+        prefixes = sorted(query.get('prefix') for query in self._list_requests())
+        self.assertEqual(prefixes, ['c/', 'c/f/'])
+
+    def test_lists_prefixes_concurrently(self):
+        # Arrange
+        self.server.latency = 0.1
+
+        # Act
+        start = time.time()
+        names = [blob.name for blob in self.bs.list_blobs_in_parallel(self.container_name, max_connections=8)]
+        elapsed = time.time() - start
+
+        # Assert
+        # a request for the root and each of the 7 prefixes, taking about as long as the 4 levels of them
+        self.assertEqual(len(names), len(BLOB_NAMES))
+        self.assertEqual(len(self._list_requests()), 8)
+        self.assertLess(elapsed, 0.7)
+
+    def test_custom_delimiter(self):
+        # Act
+        names = [blob.name for blob in self.bs.list_blobs_in_parallel(self.container_name, delimiter='1')]
+
+        # Assert
+        self.assertEqual(sorted(names), sorted(BLOB_NAMES))
+
+    def test_failure_is_raised(self):
+        # Act
+        with self.assertRaises(AzureMissingResourceHttpError):
+            list(self.bs.list_blobs_in_parallel('missing'))
+
+    def test_closing_early_stops_listing(self):
+        # Arrange
+        self.server.latency = 0.05
+        blobs = self.bs.list_blobs_in_parallel(self.container_name, max_connections=1, results_per_page=1)
+
+        # Act
+        next(blobs)
+        blobs.close()
+        time.sleep(0.2)
+        requests = len(self._list_requests())
+        time.sleep(0.2)
+
+        # Assert
+        self.assertEqual(len(self._list_requests()), requests)
+        self.assertLess(requests, 10)
+
+    def test_abandoning_generator_stops_workers(self):
+        # Arrange
+        self.server.latency = 0.05
+        blobs = self.bs.list_blobs_in_parallel(self.container_name, max_connections=4, results_per_page=1)
+
+        # Act
+        next(blobs)
+        del blobs
+        gc.collect()
+        # the workers have been stopped and their requests in flight answered
+        requests = len(self._list_requests())
+        time.sleep(0.2)
+
+        # Assert
+        self.assertEqual(len(self._list_requests()), requests)
+
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,180 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import time
+import unittest
+
+from azure.common import AzureMissingResourceHttpError
+
+from azure.storage.blob import (
+    BlockBlobService,
+    PropertiesCache,
+)
+from tests.local_storage_server import LocalStorageServer
+from tests.testcase import StorageTestCase
+
+
+# ------------------------------------------------------------------------------
+
+class StorageBlobPropertiesCacheTest(StorageTestCase):
+    def setUp(self):
+        super(StorageBlobPropertiesCacheTest, self).setUp()
+        self.server = LocalStorageServer('blob').start()
+        self.bs = self.server.create_service(BlockBlobService)
+        self.bs.properties_cache = PropertiesCache(ttl=60)
+        self.container_name = self.get_resource_name('utcontainer')
+        self.bs.create_container(self.container_name, metadata={'kind': 'test'})
+        self.bs.create_blob_from_bytes(self.container_name, 'blob', b'hello world', metadata={'number': '1'})
+
+    def tearDown(self):
+        self.server.stop()
+        return super(StorageBlobPropertiesCacheTest, self).tearDown()
+
+    # --Helpers-----------------------------------------------------------------
+    def _count_requests(self, method=None):
+        return len([request for request in self.server.requests if method is None or request[0] == method])
+
+    # --Test cases--------------------------------------------------------------
+    def test_blob_properties_are_cached(self):
+        # Arrange
+        requests = self._count_requests()
+
+        # Act
+        first = self.bs.get_blob_properties(self.container_name, 'blob')
+        second = self.bs.get_blob_properties(self.container_name, 'blob')
+        metadata = self.bs.get_blob_metadata(self.container_name, 'blob')
+        exists = self.bs.exists(self.container_name, 'blob')
+
+        # Assert
+        self.assertEqual(self._count_requests(), requests + 1)
+        self.assertEqual(second.properties.etag, first.properties.etag)
+        self.assertEqual(second.properties.content_length, 11)
+        self.assertEqual(metadata, {'number': '1'})
+        self.assertTrue(exists)
+
+    def test_cached_properties_are_copies(self):
+        # Arrange
+        first = self.bs.get_blob_properties(self.container_name, 'blob')
+
+        # Act
+        first.metadata['number'] = '2'
+        first.properties.content_length = 0
+        second = self.bs.get_blob_properties(self.container_name, 'blob')
+
+        # Assert
+        self.assertEqual(second.metadata, {'number': '1'})
+        self.assertEqual(second.properties.content_length, 11)
+
+    def test_container_properties_are_cached(self):
+        # Arrange
+        requests = self._count_requests()
+
+        # Act
+        properties = self.bs.get_container_properties(self.container_name)
+        metadata = self.bs.get_container_metadata(self.container_name)
+        exists = self.bs.exists(self.container_name)
+
+        # Assert
+        self.assertEqual(self._count_requests(), requests + 1)
+        self.assertEqual(properties.metadata, {'kind': 'test'})
+        self.assertEqual(metadata, {'kind': 'test'})
+        self.assertTrue(exists)
+
+    def test_expired_properties_are_revalidated(self):
+        # Arrange
+        self.bs.properties_cache.ttl = 0.1
+        first = self.bs.get_blob_properties(self.container_name, 'blob')
+        time.sleep(0.2)
+
+        # Act
+        second = self.bs.get_blob_properties(self.container_name, 'blob')
+        third = self.bs.get_blob_properties(self.container_name, 'blob')
+
+        # Assert
+        # the second call is answered with 304 Not Modified, and renews the entry for the third
+        self.assertEqual(self._count_requests('HEAD'), 2)
+        self.assertEqual(second.properties.etag, first.properties.etag)
+        self.assertEqual(third.metadata, {'number': '1'})
+
+    def test_expired_properties_are_refetched_once_changed(self):
+        # Arrange
+        self.bs.properties_cache.ttl = 0.1
+        self.bs.get_blob_properties(self.container_name, 'blob')
+        other_client = self.server.create_service(BlockBlobService)
+        other_client.set_blob_metadata(self.container_name, 'blob', {'number': '2'})
+
+        # Act
+        cached = self.bs.get_blob_metadata(self.container_name, 'blob')
+        time.sleep(0.2)
+        revalidated = self.bs.get_blob_metadata(self.container_name, 'blob')
+
+        # Assert
+        self.assertEqual(cached, {'number': '1'})
+        self.assertEqual(revalidated, {'number': '2'})
+
+    def test_writes_invalidate_blob(self):
+        # Arrange
+        self.bs.get_blob_properties(self.container_name, 'blob')
+
+        # Act
+        self.bs.set_blob_metadata(self.container_name, 'blob', {'number': '2'})
+        metadata = self.bs.get_blob_metadata(self.container_name, 'blob')
+        self.bs.create_blob_from_bytes(self.container_name, 'blob', b'hello')
+        properties = self.bs.get_blob_properties(self.container_name, 'blob')
+        self.bs.delete_blob(self.container_name, 'blob')
+        exists = self.bs.exists(self.container_name, 'blob')
+
+        # Assert
+        self.assertEqual(metadata, {'number': '2'})
+        self.assertEqual(properties.properties.content_length, 5)
+        self.assertFalse(exists)
+
+    def test_deleting_container_invalidates_its_blobs(self):
+        # Arrange
+        self.bs.get_container_properties(self.container_name)
+        self.bs.get_blob_properties(self.container_name, 'blob')
+
+        # Act
+        self.bs.delete_container(self.container_name)
+
+        # Assert
+        self.assertFalse(self.bs.exists(self.container_name))
+        with self.assertRaises(AzureMissingResourceHttpError):
+            self.bs.get_blob_properties(self.container_name, 'blob')
+
+    def test_conditional_calls_are_not_cached(self):
+        # Arrange
+        properties = self.bs.get_blob_properties(self.container_name, 'blob')
+        requests = self._count_requests()
+
+        # Act
+        self.bs.get_blob_properties(self.container_name, 'blob', if_match=properties.properties.etag)
+
+        # Assert
+        self.assertEqual(self._count_requests(), requests + 1)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        # Arrange
+        self.bs.properties_cache = PropertiesCache(max_entries=2, ttl=60)
+        for name in ('blob1', 'blob2'):
+            self.bs.create_blob_from_bytes(self.container_name, name, b'data')
+
+        # Act
+        self.bs.get_blob_properties(self.container_name, 'blob')
+        self.bs.get_blob_properties(self.container_name, 'blob1')
+        self.bs.get_blob_properties(self.container_name, 'blob')
+        self.bs.get_blob_properties(self.container_name, 'blob2')
+        requests = self._count_requests()
+        self.bs.get_blob_properties(self.container_name, 'blob')
+        self.bs.get_blob_properties(self.container_name, 'blob1')
+
+        # Assert
+        # blob1 was the least recently used when blob2 was added
+        self.assertEqual(self._count_requests(), requests + 1)
+
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
@@ -993,14 +993,14 @@ class StoragePageBlobTest(StorageTestCase):
         blob = self.bs.get_blob_properties(self.container_name, blob_name)
 
         # Assert
-        # the uploader should have skipped the empty ranges
+        # the uploader should have skipped the empty pages
         self.assertBlobEqual(self.container_name, blob_name, data[:blob_size])
         page_ranges = list(self.bs.get_page_ranges(self.container_name, blob_name))
         self.assertEqual(len(page_ranges), 2)
-        self.assertEqual(page_ranges[0].start, 0)
-        self.assertEqual(page_ranges[0].end, 4095)
+        self.assertEqual(page_ranges[0].start, 512)
+        self.assertEqual(page_ranges[0].end, 1023)
         self.assertEqual(page_ranges[1].start, 8192)
-        self.assertEqual(page_ranges[1].end, 12287)
+        self.assertEqual(page_ranges[1].end, 8703)
         self.assertEqual(blob.properties.etag, create_resp.etag)
         self.assertEqual(blob.properties.last_modified, create_resp.last_modified)
 
@@ -8,17 +8,27 @@
 import os
 
 from azure.storage.blob._upload_chunking import _SubStream
-from threading import Lock
+from threading import (Lock, Thread)
 from io import (BytesIO, SEEK_SET)
 
 from tests.testcase import (
     StorageTestCase,
 )
 
+FILE_PATH = 'upload_chunking.temp.dat'
+
 # ------------------------------------------------------------------------------
 
 
 class StorageBlobUploadChunkingTest(StorageTestCase):
+    def tearDown(self):
+        if os.path.isfile(FILE_PATH):
+            os.remove(FILE_PATH)
+        return super(StorageBlobUploadChunkingTest, self).tearDown()
+
+    def _create_file(self, data):
+        with open(FILE_PATH, 'wb') as stream:
+            stream.write(data)
 
     # this is a white box test that's designed to make sure _Substream behaves properly
     # when the buffer needs to be swapped out at least once
@@ -109,3 +119,69 @@ class StorageBlobUploadChunkingTest(StorageTestCase):
         finally:
             wrapped_stream.close()
             substream.close()
+
+    # this is a white box test that's designed to make sure _Substream reads a regular file
+    # at its own position, so parallel substreams neither seek the file nor need the lock
+    def test_sub_streams_of_file_read_in_parallel(self):
+        data = os.urandom(12 * 1024 * 1024)
+        self._create_file(data)
+        block_size = 3 * 1024 * 1024
+        results = {}
+
+        def read_block(substream):
+            chunks = []
+            while True:
+                chunk = substream.read(8192)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            results[substream] = b''.join(chunks)
+
+        with open(FILE_PATH, 'rb') as wrapped_stream:
+            lockObj = Lock()
+            substreams = [_SubStream(wrapped_stream, stream_begin_index=i * block_size, length=block_size,
+                                     lockObj=lockObj) for i in range(4)]
+            threads = [Thread(target=read_block, args=(substream,)) for substream in substreams]
+
+            # a held lock would block any substream which took it
+            with lockObj:
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+
+            # assert data is consistent and the file was never seeked
+            self.assertEqual(b''.join(results[substream] for substream in substreams), data)
+            self.assertEqual(wrapped_stream.tell(), 0)
+
+            for substream in substreams:
+                substream.close()
+
+    # this is a white box test that's designed to make sure _Substream.readinto fills the
+    # caller's buffer both from its read buffer and from the wrapped stream
+    def test_sub_stream_readinto(self):
+        data = os.urandom(6 * 1024 * 1024)
+        self._create_file(data)
+        expected_data = data[1024: 1024 + 5 * 1024 * 1024]
+
+        for wrapped_stream in (open(FILE_PATH, 'rb'), BytesIO(data)):
+            substream = _SubStream(wrapped_stream, stream_begin_index=1024, length=5 * 1024 * 1024, lockObj=Lock())
+            try:
+                # part of the first read is left in the read buffer
+                data_chunk_1 = substream.read(1024)
+                buffer = bytearray(6 * 1024 * 1024)
+                count = substream.readinto(buffer)
+
+                # assert data is consistent
+                self.assertEqual(count, 5 * 1024 * 1024 - 1024)
+                self.assertEqual(data_chunk_1 + bytes(buffer[:count]), expected_data)
+                self.assertEqual(substream.tell(), 5 * 1024 * 1024)
+                self.assertEqual(substream.readinto(buffer), 0)
+
+                # test readinto after seek
+                substream.seek(2 * 1024 * 1024, SEEK_SET)
+                count = substream.readinto(buffer)
+                self.assertEqual(bytes(buffer[:count]), expected_data[2 * 1024 * 1024:])
+            finally:
+                wrapped_stream.close()
+                substream.close()
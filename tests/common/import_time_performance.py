@@ -0,0 +1,49 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import subprocess
+import sys
+
+# Measures the time taken to import each package in a new interpreter, as
+# reported by -X importtime, and the time taken to import requests, which is
+# deferred until a service object is created. Run it with bytecode already
+# compiled, or the time to compile the modules is measured as well.
+
+PACKAGES = [
+    'azure.storage.common',
+    'azure.storage.blob',
+    'azure.storage.file',
+    'azure.storage.queue',
+]
+CREATE_SERVICE = 'from azure.storage.blob import BlockBlobService; ' \
+                 'BlockBlobService(account_name="account", account_key="a2V5")'
+
+REPEAT_COUNT = 7
+
+
+def measure(statement, module):
+    '''
+    Returns the least cumulative time, in milliseconds, -X importtime reports for
+    importing the module while running the statement.
+    '''
+    times = []
+    for _ in range(REPEAT_COUNT):
+        output = subprocess.check_output([sys.executable, '-X', 'importtime', '-c', statement],
+                                         stderr=subprocess.STDOUT)
+        for line in output.decode('utf-8').splitlines():
+            fields = line.split('|')
+            if len(fields) == 3 and fields[2].strip() == module:
+                times.append(int(fields[1]) / 1000.0)
+    return min(times)
+
+
+def main():
+    for package in PACKAGES:
+        print('import {0}:\t{1:.1f}ms'.format(package, measure('import ' + package, package)))
+    print('requests, on creating a service object:\t{0:.1f}ms'.format(measure(CREATE_SERVICE, 'requests')))
+
+
+if __name__ == '__main__':
+    main()
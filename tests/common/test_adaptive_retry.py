@@ -0,0 +1,200 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import threading
+import time
+import unittest
+
+from azure.common import AzureHttpError
+
+from azure.storage.blob import BlockBlobService
+from azure.storage.common import (
+    AdaptiveRetry,
+    AzureCircuitOpenError,
+)
+from tests.local_storage_server import LocalStorageServer
+from tests.testcase import StorageTestCase
+
+
+# ------------------------------------------------------------------------------
+
+class StorageAdaptiveRetryTest(StorageTestCase):
+    def setUp(self):
+        super(StorageAdaptiveRetryTest, self).setUp()
+        self.server = LocalStorageServer('blob').start()
+        self.container_name = self.get_resource_name('utcontainer')
+
+    def tearDown(self):
+        self.server.stop()
+        return super(StorageAdaptiveRetryTest, self).tearDown()
+
+    # --Helpers-----------------------------------------------------------------
+    def _create_service(self, policy):
+        service = self.server.create_service(BlockBlobService)
+        service.retry = policy.retry
+        return service
+
+    def _create_policy(self, **kwargs):
+        # retry immediately so the tests do not wait on backoff
+        return AdaptiveRetry(initial_backoff=0, increment_base=0, random_jitter_range=0, **kwargs)
+
+    def _get_endpoint_state(self, policy):
+        return list(policy._endpoints.values())[0]
+
+    def _run_concurrently(self, target, count):
+        threads = [threading.Thread(target=target) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    # --Test cases--------------------------------------------------------------
+    def test_retry_within_budget(self):
+        # Arrange
+        service = self._create_service(self._create_policy())
+        self.server.fail_next(2)
+
+        # Act
+        created = service.create_container(self.container_name)
+
+        # Assert
+        self.assertTrue(created)
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_retry_budget_is_shared_across_requests(self):
+        # Arrange
+        policy = self._create_policy(retry_budget=3, retry_budget_ratio=0, max_attempts=10, failure_window=100)
+        first = self._create_service(policy)
+        second = self._create_service(policy)
+        self.server.fail_next(10)
+
+        # Act
+        with self.assertRaises(AzureHttpError):
+            first.create_container(self.container_name)
+        with self.assertRaises(AzureHttpError):
+            second.exists(self.container_name)
+
+        # Assert
+        # the first request spends the whole budget, so the second is not retried
+        self.assertEqual(len(self.server.requests), 5)
+
+    def test_successful_requests_refill_budget(self):
+        # Arrange
+        policy = self._create_policy(retry_budget=1, retry_budget_ratio=0.5)
+        service = self._create_service(policy)
+        self.server.fail_next(1)
+        service.create_container(self.container_name)
+        state = self._get_endpoint_state(policy)
+        self.assertEqual(state.retry_tokens, 0.5)
+
+        # Act
+        service.exists(self.container_name)
+
+        # Assert
+        self.assertEqual(state.retry_tokens, 1)
+
+    def test_throttling_halves_concurrency_limit(self):
+        # Arrange
+        policy = self._create_policy(max_concurrency=8)
+        service = self._create_service(policy)
+        self.server.fail_next(1)
+
+        # Act
+        service.create_container(self.container_name)
+
+        # Assert
+        state = self._get_endpoint_state(policy)
+        self.assertLess(state.concurrency_limit, 4.5)
+        self.assertGreater(state.concurrency_limit, 4)
+
+    def test_requests_over_concurrency_limit_wait(self):
+        # Arrange
+        policy = self._create_policy(max_concurrency=2)
+        service = self._create_service(policy)
+        service.create_container(self.container_name)
+        self.server.latency = 0.2
+
+        # Act
+        start = time.time()
+        self._run_concurrently(lambda: service.exists(self.container_name), 4)
+        elapsed = time.time() - start
+
+        # Assert
+        self.assertGreaterEqual(elapsed, 0.4)
+        self.assertEqual(self._get_endpoint_state(policy).in_flight, 0)
+
+    def test_circuit_opens_when_most_requests_fail(self):
+        # Arrange
+        policy = self._create_policy(max_attempts=0, failure_window=4, break_duration=0.3)
+        service = self._create_service(policy)
+        self.server.fail_next(4)
+        for _ in range(4):
+            with self.assertRaises(AzureHttpError):
+                service.exists(self.container_name)
+
+        # Act
+        with self.assertRaises(AzureCircuitOpenError):
+            service.exists(self.container_name)
+
+        # Assert
+        # the request was shed without reaching the server
+        self.assertEqual(len(self.server.requests), 4)
+
+    def test_circuit_closes_after_successful_probe(self):
+        # Arrange
+        policy = self._create_policy(max_attempts=0, failure_window=4, break_duration=0.3)
+        service = self._create_service(policy)
+        self.server.fail_next(4)
+        for _ in range(4):
+            with self.assertRaises(AzureHttpError):
+                service.exists(self.container_name)
+
+        # Act
+        time.sleep(0.3)
+        exists = service.exists(self.container_name)
+        created = service.create_container(self.container_name)
+
+        # Assert
+        self.assertFalse(exists)
+        self.assertTrue(created)
+        self.assertIsNone(self._get_endpoint_state(policy).open_until)
+
+    def test_circuit_reopens_after_failed_probe(self):
+        # Arrange
+        policy = self._create_policy(max_attempts=0, failure_window=4, break_duration=0.3)
+        service = self._create_service(policy)
+        self.server.fail_next(5)
+        for _ in range(4):
+            with self.assertRaises(AzureHttpError):
+                service.exists(self.container_name)
+
+        # Act
+        time.sleep(0.3)
+        with self.assertRaises(AzureHttpError):
+            service.exists(self.container_name)
+
+        # Assert
+        with self.assertRaises(AzureCircuitOpenError):
+            service.exists(self.container_name)
+        self.assertEqual(len(self.server.requests), 5)
+
+    def test_expected_errors_do_not_count_as_failures(self):
+        # Arrange
+        policy = self._create_policy(failure_window=2)
+        service = self._create_service(policy)
+
+        # Act
+        for _ in range(4):
+            service.exists(self.container_name)
+
+        # Assert
+        state = self._get_endpoint_state(policy)
+        self.assertEqual(state.failures, 0)
+        self.assertEqual(state.concurrency_limit, 64)
+
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
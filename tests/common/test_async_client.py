@@ -0,0 +1,235 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import asyncio
+import time
+import unittest
+
+from azure.common import AzureHttpError
+
+from azure.storage.common.hedging import HedgingPolicy
+from azure.storage.common.models import (
+    RequestObserver,
+    RequestPhase,
+    _list,
+)
+from azure.storage.common.retry import LinearRetry
+from tests.local_storage_server import LocalStorageServer
+from tests.testcase import StorageTestCase
+
+try:
+    import aiohttp
+    from azure.storage.blob.aio import AsyncBlockBlobService
+    from azure.storage.common.aio import AsyncListGenerator
+except ImportError:
+    aiohttp = None
+
+
+# ------------------------------------------------------------------------------
+
+@unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+class StorageAsyncClientTest(StorageTestCase):
+    def setUp(self):
+        super(StorageAsyncClientTest, self).setUp()
+        self.server = LocalStorageServer('blob').start()
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+        self.server.stop()
+        return super(StorageAsyncClientTest, self).tearDown()
+
+    # --Helpers-----------------------------------------------------------------
+    def _run(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def _create_service(self, **kwargs):
+        service = self.server.create_service(AsyncBlockBlobService, **kwargs)
+        service.retry = LinearRetry(backoff=0.2, max_attempts=3).retry
+        return service
+
+    # --Test cases--------------------------------------------------------------
+    def test_retry_does_not_block_event_loop(self):
+        # Arrange
+        ticks = []
+
+        async def tick_until(future):
+            while not future.done():
+                ticks.append(time.time())
+                await asyncio.sleep(0.01)
+
+        async def create_container_with_retries():
+            async with self._create_service() as service:
+                self.server.fail_next(2)
+                future = asyncio.ensure_future(service.create_container('container'))
+                await tick_until(future)
+                return await future
+
+        # Act
+        created = self._run(create_container_with_retries())
+
+        # Assert
+        self.assertTrue(created)
+        self.assertEqual(len(self.server.requests), 3)
+
+        # the event loop kept running during the two retry waits of 0.2 seconds each
+        self.assertGreater(len(ticks), 20)
+
+    def test_retry_gives_up_after_max_attempts(self):
+        # Arrange
+        async def create_container():
+            async with self._create_service() as service:
+                self.server.fail_next(4)
+                await service.create_container('container')
+
+        # Act
+        with self.assertRaises(AzureHttpError):
+            self._run(create_container())
+
+        # Assert
+        self.assertEqual(len(self.server.requests), 4)
+
+    def test_concurrent_requests(self):
+        # Arrange
+        self.server.latency = 0.2
+
+        async def check_exists(count):
+            async with self._create_service() as service:
+                return await asyncio.gather(*[service.exists('container') for _ in range(count)])
+
+        # Act
+        start = time.time()
+        results = self._run(check_exists(20))
+        elapsed = time.time() - start
+
+        # Assert
+        self.assertEqual(results, [False] * 20)
+        self.assertLess(elapsed, 20 * 0.2 / 2)
+
+    def test_cancelled_request_is_not_retried(self):
+        # Arrange
+        self.server.latency = 1
+
+        async def cancel_exists():
+            async with self._create_service() as service:
+                future = asyncio.ensure_future(service.exists('container'))
+                await asyncio.sleep(0.2)
+                future.cancel()
+                await future
+
+        # Act
+        with self.assertRaises(asyncio.CancelledError):
+            self._run(cancel_exists())
+
+        # Assert
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_close_releases_owned_session_only(self):
+        # Arrange
+        async def close_services():
+            session = aiohttp.ClientSession()
+            service = self._create_service()
+            service.async_session = session
+            await service.exists('container')
+            await service.close()
+            shared_closed = session.closed
+            await session.close()
+
+            service = self._create_service()
+            await service.exists('container')
+            owned = service.async_session
+            await service.close()
+            return shared_closed, owned.closed
+
+        # Act
+        shared_closed, owned_closed = self._run(close_services())
+
+        # Assert
+        self.assertFalse(shared_closed)
+        self.assertTrue(owned_closed)
+
+    def test_request_observer_sees_phases(self):
+        # Arrange
+        events = []
+
+        class Observer(RequestObserver):
+            def on_phase_end(self, event):
+                events.append(event)
+
+        async def create_container():
+            async with self._create_service() as service:
+                service.request_observer = Observer()
+                self.server.fail_next(1)
+                await service.create_container('container')
+                await service.get_container_properties('container')
+
+        # Act
+        self._run(create_container())
+
+        # Assert
+        self.assertEqual([event.phase for event in events],
+                         [RequestPhase.SIGN, RequestPhase.SEND, RequestPhase.BACKOFF, RequestPhase.SIGN,
+                          RequestPhase.SEND, RequestPhase.OPERATION, RequestPhase.SIGN, RequestPhase.SEND,
+                          RequestPhase.PARSE, RequestPhase.OPERATION])
+        self.assertEqual(events[5].operation_name, 'create_container')
+        self.assertEqual(events[5].retry_count, 1)
+        self.assertEqual(events[9].operation_name, 'get_container_properties')
+
+    def test_slow_primary_is_hedged_on_secondary(self):
+        # Arrange
+        secondary = LocalStorageServer('blob').start()
+        self.addCleanup(secondary.stop)
+
+        async def get_container_properties():
+            async with self._create_service() as service:
+                await service.create_container('container')
+                service.secondary_endpoint = secondary.url.split('://')[1]
+                service.hedging_policy = HedgingPolicy(initial_delay=0.05)
+
+                # the container exists on the secondary, which answers first
+                async with secondary.create_service(AsyncBlockBlobService) as secondary_service:
+                    await secondary_service.create_container('container')
+                self.server.latency = 0.5
+
+                start = time.time()
+                await service.get_container_properties('container')
+                return time.time() - start
+
+        # Act
+        elapsed = self._run(get_container_properties())
+
+        # Assert
+        self.assertLess(elapsed, 0.4)
+        self.assertEqual(len(secondary.requests), 2)
+
+    def test_list_generator_follows_markers(self):
+        # Arrange
+        pages = {None: ([1, 2], 'second'), 'second': ([3, 4], 'third'), 'third': ([5], None)}
+
+        async def list_method(marker=None, max_results=None):
+            items, next_marker = pages[marker]
+            resources = _list(items)
+            resources.next_marker = next_marker
+            return resources
+
+        async def collect(max_results):
+            first_page = await list_method(max_results=max_results)
+            generator = AsyncListGenerator(first_page, list_method, (), {'max_results': max_results})
+            return [item async for item in generator], generator.next_marker
+
+        # Act
+        all_items, all_marker = self._run(collect(None))
+        some_items, some_marker = self._run(collect(4))
+
+        # Assert
+        self.assertEqual(all_items, [1, 2, 3, 4, 5])
+        self.assertIsNone(all_marker)
+        self.assertEqual(some_items, [1, 2, 3, 4])
+        self.assertEqual(some_marker, 'third')
+
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
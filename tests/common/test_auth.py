@@ -0,0 +1,105 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import unittest
+
+from azure.storage.common import AzureSigningError
+from azure.storage.common._auth import _StorageSharedKeyAuthentication
+from azure.storage.common._common_conversion import _sign_string
+from azure.storage.common._http import HTTPRequest
+from tests.testcase import StorageTestCase
+
+ACCOUNT_NAME = 'account'
+ACCOUNT_KEY = 'Eby8vdM02xNOcqFlqUwJPLlmEtlCDXJ1OUzFT50uSRZ6IFsuFq2UVErCz4I6tq/K1SZFPTOtr/KBHBeksoGMGw=='
+OTHER_ACCOUNT_KEY = 'a2V5a2V5a2V5a2V5a2V5a2V5a2V5a2V5a2V5a2V5a2V5a2V5a2V5a2V5a2V5a2V5'
+
+
+# ------------------------------------------------------------------------------
+
+class StorageSharedKeyAuthenticationTest(StorageTestCase):
+    # --Helpers-----------------------------------------------------------------
+    def _create_request(self):
+        request = HTTPRequest()
+        request.method = 'PUT'
+        request.path = '/container/blob%20name'
+        request.headers = {
+            'Content-Length': '0',
+            'Content-Type': 'text/plain',
+            'x-ms-version': '2019-02-02',
+            'x-ms-date': 'Mon, 01 Jan 2018 00:00:00 GMT',
+            'x-ms-meta-b': 'two',
+            'x-ms-meta-a': 'one',
+            'x-ms-lease-id': None,
+            'If-Match': '',
+        }
+        request.query = {
+            'timeout': '30',
+            'comp': 'block',
+            'blockid': None,
+        }
+        return request
+
+    def _get_expected_authorization(self, account_key):
+        string_to_sign = 'PUT\n' \
+                         '\n\n\n\ntext/plain\n\n\n\n\n\n\n' \
+                         'x-ms-date:Mon, 01 Jan 2018 00:00:00 GMT\n' \
+                         'x-ms-meta-a:one\n' \
+                         'x-ms-meta-b:two\n' \
+                         'x-ms-version:2019-02-02\n' \
+                         '/account/container/blob%20name' \
+                         '\ncomp:block' \
+                         '\ntimeout:30'
+        return 'SharedKey account:' + _sign_string(account_key, string_to_sign)
+
+    # --Test cases--------------------------------------------------------------
+    def test_sign_request(self):
+        # Arrange
+        authentication = _StorageSharedKeyAuthentication(ACCOUNT_NAME, ACCOUNT_KEY)
+        request = self._create_request()
+
+        # Act
+        authentication.sign_request(request)
+
+        # Assert
+        self.assertEqual(request.headers['Authorization'], self._get_expected_authorization(ACCOUNT_KEY))
+
+    def test_sign_request_repeatedly(self):
+        # Arrange
+        authentication = _StorageSharedKeyAuthentication(ACCOUNT_NAME, ACCOUNT_KEY)
+        first = self._create_request()
+        second = self._create_request()
+
+        # Act
+        authentication.sign_request(first)
+        authentication.sign_request(second)
+
+        # Assert
+        self.assertEqual(first.headers['Authorization'], second.headers['Authorization'])
+
+    def test_sign_request_after_key_change(self):
+        # Arrange
+        authentication = _StorageSharedKeyAuthentication(ACCOUNT_NAME, ACCOUNT_KEY)
+        authentication.sign_request(self._create_request())
+        request = self._create_request()
+
+        # Act
+        authentication.account_key = OTHER_ACCOUNT_KEY
+        authentication.sign_request(request)
+
+        # Assert
+        self.assertEqual(request.headers['Authorization'], self._get_expected_authorization(OTHER_ACCOUNT_KEY))
+
+    def test_sign_request_with_invalid_key(self):
+        # Arrange
+        authentication = _StorageSharedKeyAuthentication(ACCOUNT_NAME, 'not a base64 key')
+
+        # Act
+        with self.assertRaises(AzureSigningError):
+            authentication.sign_request(self._create_request())
+
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import unittest
+from timeit import default_timer
+
+from azure.storage.blob import BlockBlobService
+from azure.storage.common import BandwidthLimiter
+from tests.local_storage_server import LocalStorageServer
+from tests.testcase import StorageTestCase
+
+RATE = 1024 * 1024
+TRANSFER_SIZE = 512 * 1024
+
+
+# ------------------------------------------------------------------------------
+
+class StorageBandwidthLimiterTest(StorageTestCase):
+    def setUp(self):
+        super(StorageBandwidthLimiterTest, self).setUp()
+        self.server = LocalStorageServer('blob').start()
+        self.container_name = self.get_resource_name('utcontainer')
+
+    def tearDown(self):
+        self.server.stop()
+        return super(StorageBandwidthLimiterTest, self).tearDown()
+
+    # --Helpers-----------------------------------------------------------------
+    def _create_service(self, limiter):
+        service = self.server.create_service(BlockBlobService)
+        service.MAX_SINGLE_PUT_SIZE = 64 * 1024
+        service.MAX_BLOCK_SIZE = 64 * 1024
+        service.MAX_SINGLE_GET_SIZE = 64 * 1024
+        service.MAX_CHUNK_GET_SIZE = 64 * 1024
+        service.create_container(self.container_name)
+        service.bandwidth_limiter = limiter
+        return service
+
+    def _assert_paced(self, elapsed, size, rate):
+        # the first burst of the bucket is let through at once
+        self.assertGreaterEqual(elapsed, size / float(rate) - 0.1 - 0.05)
+
+    # --Test cases--------------------------------------------------------------
+    def test_reserve_waits_for_debt(self):
+        # Arrange
+        limiter = BandwidthLimiter(max_write_rate=1000)
+
+        # Act
+        first = limiter._reserve_write(100)
+        second = limiter._reserve_write(1000)
+
+        # Assert
+        # the bucket starts with a burst of 100 bytes, so the second reservation waits for a second
+        self.assertEqual(first, 0)
+        self.assertAlmostEqual(second, 1.0, delta=0.05)
+
+    def test_unlimited_direction_is_measured(self):
+        # Arrange
+        limiter = BandwidthLimiter(max_write_rate=1000)
+
+        # Act
+        delay = limiter._reserve_read(10 * 1024 * 1024)
+        utilization = limiter.get_utilization()
+
+        # Assert
+        self.assertEqual(delay, 0)
+        self.assertIsNone(utilization.max_read_rate)
+        self.assertIsNone(utilization.read_utilization)
+        self.assertEqual(utilization.bytes_read, 10 * 1024 * 1024)
+        self.assertEqual(utilization.read_rate, 10 * 1024 * 1024)
+        self.assertEqual(utilization.bytes_written, 0)
+        self.assertEqual(utilization.write_utilization, 0)
+
+    def test_rate_can_be_changed(self):
+        # Arrange
+        limiter = BandwidthLimiter(max_read_rate=1000)
+
+        # Act
+        limiter.max_read_rate = None
+        delay = limiter._reserve_read(1000 * 1000)
+
+        # Assert
+        self.assertEqual(delay, 0)
+        self.assertIsNone(limiter.get_utilization().max_read_rate)
+
+    def test_upload_is_limited(self):
+        # Arrange
+        limiter = BandwidthLimiter(max_write_rate=RATE)
+        service = self._create_service(limiter)
+        data = self.get_random_bytes(TRANSFER_SIZE)
+
+        # Act
+        start = default_timer()
+        service.create_blob_from_bytes(self.container_name, 'blob', data, max_connections=4)
+        elapsed = default_timer() - start
+        utilization = limiter.get_utilization()
+
+        # Assert
+        self._assert_paced(elapsed, TRANSFER_SIZE, RATE)
+        # the block list is written as well
+        self.assertGreaterEqual(utilization.bytes_written, TRANSFER_SIZE)
+        self.assertEqual(utilization.max_write_rate, RATE)
+        self.assertGreater(utilization.write_utilization, 0)
+
+    def test_download_is_limited(self):
+        # Arrange
+        limiter = BandwidthLimiter(max_read_rate=RATE)
+        service = self._create_service(None)
+        data = self.get_random_bytes(TRANSFER_SIZE)
+        service.create_blob_from_bytes(self.container_name, 'blob', data)
+        service.bandwidth_limiter = limiter
+
+        # Act
+        start = default_timer()
+        blob = service.get_blob_to_bytes(self.container_name, 'blob', max_connections=4)
+        elapsed = default_timer() - start
+
+        # Assert
+        self.assertEqual(blob.content, data)
+        self._assert_paced(elapsed, TRANSFER_SIZE, RATE)
+        self.assertEqual(limiter.get_utilization().bytes_read, TRANSFER_SIZE)
+
+    def test_limiter_shared_by_services(self):
+        # Arrange
+        limiter = BandwidthLimiter(max_write_rate=RATE)
+        services = [self._create_service(limiter), self._create_service(limiter)]
+        data = self.get_random_bytes(TRANSFER_SIZE // 2)
+
+        # Act
+        start = default_timer()
+        for i, service in enumerate(services):
+            service.create_blob_from_bytes(self.container_name, 'blob{0}'.format(i), data)
+        elapsed = default_timer() - start
+
+        # Assert
+        self._assert_paced(elapsed, TRANSFER_SIZE, RATE)
+        self.assertGreaterEqual(limiter.get_utilization().bytes_written, TRANSFER_SIZE)
+
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
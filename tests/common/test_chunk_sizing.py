@@ -0,0 +1,117 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import unittest
+
+from azure.storage.common._chunk_sizing import _AdaptiveChunkSize
+from azure.storage.file import FileService
+from tests.local_storage_server import LocalStorageServer
+from tests.testcase import StorageTestCase
+
+MB = 1024 * 1024
+RANGE_SIZE = 1024
+
+
+# ------------------------------------------------------------------------------
+
+class StorageChunkSizingTest(StorageTestCase):
+    # --Test cases--------------------------------------------------------------
+    def test_size_grows_while_throughput_rises(self):
+        # Arrange
+        sizer = _AdaptiveChunkSize(MB, 64 * MB)
+
+        # Act
+        sizer.record(MB, 0.1)
+        grown_once = sizer.size
+        sizer.record(2 * MB, 0.12)
+        grown_twice = sizer.size
+        # doubling the size only doubled the time
+        sizer.record(4 * MB, 0.24)
+
+        # Assert
+        self.assertEqual(grown_once, 2 * MB)
+        self.assertEqual(grown_twice, 4 * MB)
+        self.assertEqual(sizer.size, 4 * MB)
+
+    def test_size_goes_back_when_growing_lowered_throughput(self):
+        # Arrange
+        sizer = _AdaptiveChunkSize(MB, 64 * MB)
+        sizer.record(MB, 0.1)
+
+        # Act
+        sizer.record(2 * MB, 0.4)
+        shrunk = sizer.size
+        sizer.record(MB, 0.1)
+
+        # Assert
+        # the larger size is not tried again, as it was slower
+        self.assertEqual(shrunk, MB)
+        self.assertEqual(sizer.size, MB)
+
+    def test_size_halves_when_requests_are_slow(self):
+        # Arrange
+        sizer = _AdaptiveChunkSize(8 * MB, 64 * MB)
+
+        # Act
+        sizer.record(8 * MB, 20)
+        shrunk = sizer.size
+        # a request of twice the size would take too long, however fast it is
+        sizer.record(4 * MB, 6)
+
+        # Assert
+        self.assertEqual(shrunk, 4 * MB)
+        self.assertEqual(sizer.size, 4 * MB)
+
+    def test_only_whole_chunks_tune_size(self):
+        # Arrange
+        sizer = _AdaptiveChunkSize(MB, 64 * MB)
+
+        # Act
+        sizer.record(MB - 1, 0.001)
+        sizer.record(MB // 2, 20)
+        sizer.record(MB, 0)
+
+        # Assert
+        self.assertEqual(sizer.size, MB)
+
+    def test_size_stays_aligned_and_within_bounds(self):
+        # Arrange
+        sizer = _AdaptiveChunkSize(1536, 4096, alignment=512)
+
+        # Act
+        sizer.record(1536, 0.001)
+        sizer.record(3072, 0.001)
+        largest = sizer.size
+        sizer.record(4096, 20)
+        halved = sizer.size
+        sizer.record(2048, 20)
+
+        # Assert
+        self.assertEqual(largest, 4096)
+        self.assertEqual(halved, 2048)
+        # the size does not shrink below where it started, as that is less than the smallest size
+        self.assertEqual(sizer.size, 1536)
+
+    def test_create_file_with_adaptive_range_size(self):
+        # Arrange
+        data = self.get_random_bytes(RANGE_SIZE * 40 + 17)
+        with LocalStorageServer('file') as server:
+            service = server.create_service(FileService)
+            service.MAX_RANGE_SIZE = RANGE_SIZE
+            service.ADAPTIVE_RANGE_SIZE = True
+            share_name = self.get_resource_name('utshare')
+            service.create_share(share_name)
+
+            for max_connections in (1, 4):
+                # Act
+                service.create_file_from_bytes(share_name, None, 'file', data, max_connections=max_connections)
+
+                # Assert
+                self.assertEqual(service.get_file_to_bytes(share_name, None, 'file').content, data)
+
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
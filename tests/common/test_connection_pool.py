@@ -0,0 +1,81 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import requests
+
+from azure.storage.blob import BlockBlobService
+from tests.local_storage_server import LocalStorageServer
+from tests.testcase import StorageTestCase
+
+
+# ------------------------------------------------------------------------------
+
+class StorageConnectionPoolTest(StorageTestCase):
+    def setUp(self):
+        super(StorageConnectionPoolTest, self).setUp()
+        self.server = LocalStorageServer('blob').start()
+
+        # slow the server down so that the chunks are in flight at the same time
+        self.server.latency = 0.02
+        self.container_name = self.get_resource_name('utcontainer')
+
+    def tearDown(self):
+        self.server.stop()
+        return super(StorageConnectionPoolTest, self).tearDown()
+
+    # --Helpers-----------------------------------------------------------------
+    def _create_service(self, **kwargs):
+        service = self.server.create_service(BlockBlobService, **kwargs)
+        service.MAX_SINGLE_PUT_SIZE = 4 * 1024
+        service.MAX_BLOCK_SIZE = 1024
+        service.MAX_SINGLE_GET_SIZE = 4 * 1024
+        service.MAX_CHUNK_GET_SIZE = 1024
+        service.create_container(self.container_name)
+        return service
+
+    # --Test cases--------------------------------------------------------------
+    def test_pool_grows_to_max_connections(self):
+        # Arrange
+        service = self._create_service()
+        data = self.get_random_bytes(64 * 1024)
+
+        # Act
+        service.create_blob_from_bytes(self.container_name, 'blob', data, max_connections=16)
+        blob = service.get_blob_to_bytes(self.container_name, 'blob', max_connections=16)
+        stats = service.get_connection_pool_stats()
+
+        # Assert
+        self.assertEqual(blob.content, data)
+        self.assertEqual(stats.pool_size, 16)
+
+        # connections are reused rather than discarded once more than 10 are in use
+        self.assertLessEqual(self.server.connections, 16 + 1)
+        self.assertEqual(stats.misses, self.server.connections)
+        self.assertEqual(stats.hits + stats.misses, len(self.server.requests))
+
+    def test_pool_size_is_capped(self):
+        # Arrange
+        service = self._create_service()
+        service.max_connection_pool_size = 12
+        data = self.get_random_bytes(32 * 1024)
+
+        # Act
+        service.create_blob_from_bytes(self.container_name, 'blob', data, max_connections=16)
+
+        # Assert
+        self.assertEqual(service.get_connection_pool_stats().pool_size, 12)
+
+    def test_provided_session_is_not_resized(self):
+        # Arrange
+        service = self._create_service(request_session=requests.Session())
+        data = self.get_random_bytes(32 * 1024)
+
+        # Act
+        service.create_blob_from_bytes(self.container_name, 'blob', data, max_connections=16)
+        stats = service.get_connection_pool_stats()
+
+        # Assert
+        self.assertEqual(stats.pool_size, requests.adapters.DEFAULT_POOLSIZE)
+        self.assertEqual(stats.hits + stats.misses, len(self.server.requests))
@@ -0,0 +1,67 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import unittest
+from datetime import datetime
+
+from dateutil import parser
+from dateutil.tz import tzutc
+
+from azure.storage.common._deserialization import _parse_datetime
+from tests.testcase import StorageTestCase
+
+TIMESTAMPS = [
+    'Thu, 09 May 2019 00:57:50 GMT',
+    'Mon, 29 Feb 2016 23:59:59 GMT',
+    '2019-05-09T00:57:52.5355552Z',
+    '2019-05-09T00:44:12Z',
+    '2011-10-11T00:00:00.0000000Z',
+    '2019-07-01T12:34:56.1234567',
+    '2019-07-01T12:34:56.12Z',
+    # formats the service does not send are left to dateutil
+    '2011-10-11',
+    '2019-05-09T00:44:12+01:00',
+    'Thursday, 09-May-19 00:57:50 GMT',
+]
+
+
+# ------------------------------------------------------------------------------
+
+class StorageDeserializationTest(StorageTestCase):
+    def test_parse_datetime_matches_dateutil(self):
+        for value in TIMESTAMPS:
+            for ignoretz in (False, True):
+                # Act
+                parsed = _parse_datetime(value, ignoretz=ignoretz)
+
+                # Assert
+                expected = parser.parse(value, ignoretz=ignoretz)
+                self.assertEqual(parsed, expected, value)
+                self.assertEqual(parsed.tzinfo is None, expected.tzinfo is None, value)
+                self.assertEqual(parsed.utcoffset(), expected.utcoffset(), value)
+
+    def test_parse_rfc1123(self):
+        # Act
+        parsed = _parse_datetime('Thu, 09 May 2019 00:57:50 GMT')
+
+        # Assert
+        self.assertEqual(parsed, datetime(2019, 5, 9, 0, 57, 50, tzinfo=tzutc()))
+
+    def test_parse_iso8601_truncates_to_microseconds(self):
+        # Act
+        parsed = _parse_datetime('2019-05-09T00:57:52.5355559Z')
+
+        # Assert
+        self.assertEqual(parsed, datetime(2019, 5, 9, 0, 57, 52, 535555, tzinfo=tzutc()))
+
+    def test_parse_invalid_datetime_raises(self):
+        # Act
+        with self.assertRaises(ValueError):
+            _parse_datetime('Thu, 32 May 2019 00:57:50 GMT')
+
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
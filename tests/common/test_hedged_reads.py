@@ -0,0 +1,217 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import threading
+import time
+import unittest
+
+from azure.storage.blob import BlockBlobService
+from azure.storage.common import (
+    HedgingPolicy,
+    LocationMode,
+)
+from azure.storage.common._constants import (
+    DEV_ACCOUNT_NAME,
+    DEV_ACCOUNT_SECONDARY_NAME,
+)
+from azure.storage.common._http import HTTPRequest
+from azure.storage.common.hedging import _create_hedge_request
+from azure.storage.common.retry import LinearRetry
+from tests.local_storage_server import LocalStorageServer
+from tests.testcase import StorageTestCase
+
+
+# ------------------------------------------------------------------------------
+
+class StorageHedgedReadsTest(StorageTestCase):
+    def setUp(self):
+        super(StorageHedgedReadsTest, self).setUp()
+        self.primary = LocalStorageServer('blob').start()
+        self.secondary = LocalStorageServer('blob').start()
+        self.container_name = self.get_resource_name('utcontainer')
+
+        self.bs = self.primary.create_service(BlockBlobService)
+        self.bs.secondary_endpoint = self.secondary.url.split('://')[1]
+        self.bs.retry = LinearRetry(backoff=0, max_attempts=1).retry
+        self.bs.hedging_policy = HedgingPolicy(initial_delay=0.05)
+
+    def tearDown(self):
+        self.primary.stop()
+        self.secondary.stop()
+        return super(StorageHedgedReadsTest, self).tearDown()
+
+    # --Helpers-----------------------------------------------------------------
+    def _create_blob(self, server, content=b'hello world'):
+        service = server.create_service(BlockBlobService)
+        service.create_container(self.container_name)
+        service.create_blob_from_bytes(self.container_name, 'blob', content)
+
+    # --Test cases--------------------------------------------------------------
+    def test_fast_primary_is_not_hedged(self):
+        # Arrange
+        self._create_blob(self.primary)
+
+        # Act
+        blob = self.bs.get_blob_to_bytes(self.container_name, 'blob')
+
+        # Assert
+        self.assertEqual(blob.content, b'hello world')
+        self.assertEqual(len(self.secondary.requests), 0)
+
+    def test_slow_primary_is_hedged_on_secondary(self):
+        # Arrange
+        self._create_blob(self.primary)
+        self._create_blob(self.secondary)
+        self.primary.latency = 0.5
+        requests_before = len(self.secondary.requests)
+
+        # Act
+        start = time.time()
+        properties = self.bs.get_blob_properties(self.container_name, 'blob')
+        elapsed = time.time() - start
+
+        # Assert
+        self.assertEqual(properties.properties.content_length, 11)
+        self.assertLess(elapsed, 0.4)
+        self.assertEqual(len(self.secondary.requests), requests_before + 1)
+
+    def test_download_stays_on_location_which_answered(self):
+        # Arrange
+        self._create_blob(self.primary)
+        self._create_blob(self.secondary)
+        self.primary.latency = 0.5
+        self.bs.MAX_SINGLE_GET_SIZE = 4
+        self.bs.MAX_CHUNK_GET_SIZE = 4
+        primary_requests = len(self.primary.requests)
+        secondary_requests = len(self.secondary.requests)
+
+        # Act
+        blob = self.bs.get_blob_to_bytes(self.container_name, 'blob', max_connections=1)
+
+        # Assert
+        self.assertEqual(blob.content, b'hello world')
+        self.assertEqual(len(self.primary.requests), primary_requests + 1)
+        self.assertEqual(len(self.secondary.requests), secondary_requests + 3)
+
+    def test_failed_hedge_does_not_win(self):
+        # Arrange
+        # the blob has not been replicated to the secondary yet
+        self._create_blob(self.primary)
+        self.primary.latency = 0.2
+
+        # Act
+        blob = self.bs.get_blob_to_bytes(self.container_name, 'blob')
+
+        # Assert
+        self.assertEqual(blob.content, b'hello world')
+        self.assertEqual(len(self.secondary.requests), 1)
+
+    def test_hedge_wins_when_primary_fails(self):
+        # Arrange
+        self._create_blob(self.primary)
+        self._create_blob(self.secondary)
+        self.primary.fail_next(1, delay=0.2)
+
+        # Act
+        exists = self.bs.exists(self.container_name, 'blob')
+
+        # Assert
+        self.assertTrue(exists)
+
+    def test_hedged_reads_reuse_worker_threads(self):
+        # Arrange
+        self._create_blob(self.primary)
+        self.bs.get_blob_properties(self.container_name, 'blob')
+        threads_before = set(thread.ident for thread in threading.enumerate())
+        senders = []
+        perform_request = self.bs._httpclient.perform_request
+
+        def record_sender(request, stream):
+            senders.append(threading.current_thread().ident)
+            return perform_request(request, stream)
+
+        self.bs._httpclient.perform_request = record_sender
+
+        # Act
+        for _ in range(10):
+            self.bs.get_blob_properties(self.container_name, 'blob')
+
+        # Assert
+        self.assertEqual(len(senders), 10)
+        self.assertTrue(set(senders) <= threads_before)
+
+    def test_hedge_request_swaps_path_prefix_of_emulator(self):
+        # Arrange
+        request = HTTPRequest()
+        request.host = '127.0.0.1:10000'
+        request.path = '/{}/container/blob'.format(DEV_ACCOUNT_NAME)
+
+        # Act
+        hedge_request = _create_hedge_request(request,
+                                              '127.0.0.1:10000/' + DEV_ACCOUNT_NAME,
+                                              '127.0.0.1:10000/' + DEV_ACCOUNT_SECONDARY_NAME)
+
+        # Assert
+        self.assertEqual(hedge_request.host, '127.0.0.1:10000')
+        self.assertEqual(hedge_request.path, '/{}/container/blob'.format(DEV_ACCOUNT_SECONDARY_NAME))
+        self.assertEqual(request.path, '/{}/container/blob'.format(DEV_ACCOUNT_NAME))
+
+    def test_hedge_request_swaps_host_and_path_prefix(self):
+        # Arrange
+        request = HTTPRequest()
+        request.host = 'primary.example.com'
+        request.path = '/account/container/blob'
+
+        # Act
+        hedge_request = _create_hedge_request(request, 'primary.example.com/account',
+                                              'secondary.example.com/account-secondary')
+        other_request = _create_hedge_request(request, 'other.example.com/account',
+                                              'secondary.example.com/account-secondary')
+
+        # Assert
+        self.assertEqual(hedge_request.host, 'secondary.example.com')
+        self.assertEqual(hedge_request.path, '/account-secondary/container/blob')
+        self.assertIsNone(other_request)
+
+    def test_writes_are_not_hedged(self):
+        # Arrange
+        self.primary.latency = 0.2
+
+        # Act
+        self.bs.create_container(self.container_name)
+
+        # Assert
+        self.assertEqual(len(self.secondary.requests), 0)
+
+    def test_secondary_location_mode_is_not_hedged(self):
+        # Arrange
+        self._create_blob(self.secondary)
+        self.bs.location_mode = LocationMode.SECONDARY
+        self.secondary.latency = 0.2
+
+        # Act
+        self.bs.get_blob_properties(self.container_name, 'blob')
+
+        # Assert
+        self.assertEqual(len(self.primary.requests), 0)
+
+    def test_hedge_delay_follows_primary_latency(self):
+        # Arrange
+        policy = HedgingPolicy(latency_percentile=90, initial_delay=1, min_delay=0.01, min_sample_count=10)
+
+        # Act
+        initial_delay = policy.get_hedge_delay()
+        for latency in range(1, 11):
+            policy._record_latency(latency / 100.0)
+        delay = policy.get_hedge_delay()
+
+        # Assert
+        self.assertEqual(initial_delay, 1)
+        self.assertEqual(delay, 0.09)
+
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import subprocess
+import sys
+import unittest
+
+from tests.testcase import StorageTestCase
+
+# modules which are only needed once a service object is created, or for encryption, and must not be loaded by
+# importing the packages
+DEFERRED_MODULES = [
+    'requests',
+    'urllib3',
+    'cryptography',
+    'dateutil.parser',
+    'urllib.request',
+    'asyncio',
+]
+
+
+# ------------------------------------------------------------------------------
+
+@unittest.skipIf(sys.version_info < (3, 7), '-X importtime needs Python 3.7 or later')
+class StorageImportTimeTest(StorageTestCase):
+    # --Helpers-----------------------------------------------------------------
+    def _get_import_times(self, statement):
+        '''
+        Runs the statement in a new interpreter with -X importtime, and returns
+        the cumulative import time, in microseconds, of each module it imported.
+        '''
+        process = subprocess.Popen([sys.executable, '-X', 'importtime', '-c', statement],
+                                   stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        _, stderr = process.communicate()
+        self.assertEqual(process.returncode, 0, stderr)
+
+        import_times = {}
+        for line in stderr.decode('utf-8').splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            _, cumulative, module = line.split('|')
+            import_times[module.strip()] = int(cumulative)
+        return import_times
+
+    def _assert_imports_deferred(self, package):
+        import_times = self._get_import_times('import ' + package)
+
+        self.assertIn(package, import_times)
+        self.assertEqual([module for module in DEFERRED_MODULES if module in import_times], [])
+
+    # --Test cases--------------------------------------------------------------
+    def test_import_common_defers_dependencies(self):
+        self._assert_imports_deferred('azure.storage.common')
+
+    def test_import_blob_defers_dependencies(self):
+        self._assert_imports_deferred('azure.storage.blob')
+
+    def test_import_file_defers_dependencies(self):
+        self._assert_imports_deferred('azure.storage.file')
+
+    def test_import_queue_defers_dependencies(self):
+        self._assert_imports_deferred('azure.storage.queue')
+
+    def test_create_service_loads_http_client(self):
+        # Act
+        import_times = self._get_import_times(
+            'from azure.storage.blob import BlockBlobService; '
+            'BlockBlobService(account_name="account", account_key="a2V5")')
+
+        # Assert
+        # the http client is loaded with the service object, encryption only when it is used
+        self.assertIn('requests', import_times)
+        self.assertNotIn('cryptography', import_times)
+
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import threading
+import time
+import unittest
+
+from azure.storage.blob import BlockBlobService
+from azure.storage.common.models import (
+    ListGenerator,
+    _list,
+)
+from tests.local_storage_server import LocalStorageServer
+from tests.testcase import StorageTestCase
+
+
+class _PagedListMethod(object):
+    '''
+    Serves pages of consecutive integers, taking latency seconds for each.
+    '''
+
+    def __init__(self, item_count, page_size, latency=0, fail_on_marker=None):
+        self.item_count = item_count
+        self.page_size = page_size
+        self.latency = latency
+        self.fail_on_marker = fail_on_marker
+        self.calls = []
+        self.threads = set()
+
+    def __call__(self, marker=None, max_results=None):
+        self.calls.append((marker, max_results))
+        self.threads.add(threading.current_thread())
+        time.sleep(self.latency)
+        if marker is not None and marker == self.fail_on_marker:
+            raise ValueError('failed')
+
+        start = marker or 0
+        end = min(start + min(self.page_size, max_results or self.page_size), self.item_count)
+        page = _list(range(start, end))
+        page.next_marker = end if end < self.item_count else None
+        return page
+
+    def create_generator(self, max_results=None, prefetch_pages=0):
+        kwargs = {'marker': None, 'max_results': max_results}
+        return ListGenerator(self(**kwargs), self, (), kwargs, prefetch_pages)
+
+
+# ------------------------------------------------------------------------------
+
+class StorageListGeneratorTest(StorageTestCase):
+    def test_prefetch_returns_all_items_in_order(self):
+        # Arrange
+        list_method = _PagedListMethod(item_count=95, page_size=10)
+
+        # Act
+        items = list(list_method.create_generator(prefetch_pages=2))
+
+        # Assert
+        self.assertEqual(items, list(range(95)))
+        self.assertEqual(len(list_method.calls), 10)
+        self.assertGreater(len(list_method.threads), 1)
+
+    def test_prefetch_respects_max_results(self):
+        # Arrange
+        list_method = _PagedListMethod(item_count=100, page_size=10)
+
+        # Act
+        generator = list_method.create_generator(max_results=25, prefetch_pages=3)
+        items = list(generator)
+
+        # Assert
+        self.assertEqual(items, list(range(25)))
+        self.assertEqual(generator.next_marker, 25)
+        self.assertEqual(list_method.calls, [(None, 25), (10, 15), (20, 5)])
+
+    def test_prefetch_overlaps_fetching_and_processing(self):
+        # Arrange
+        serial = _PagedListMethod(item_count=50, page_size=10, latency=0.1)
+        prefetched = _PagedListMethod(item_count=50, page_size=10, latency=0.1)
+
+        def consume(generator):
+            start = time.time()
+            for i in generator:
+                if i % 10 == 9:
+                    time.sleep(0.1)
+            return time.time() - start
+
+        # Act
+        serial_time = consume(serial.create_generator())
+        prefetched_time = consume(prefetched.create_generator(prefetch_pages=1))
+
+        # Assert
+        self.assertLess(prefetched_time, serial_time * 0.8)
+
+    def test_prefetch_stays_within_depth(self):
+        # Arrange
+        list_method = _PagedListMethod(item_count=100, page_size=10)
+        generator = iter(list_method.create_generator(prefetch_pages=2))
+
+        # Act
+        next(generator)
+        time.sleep(0.2)
+
+        # Assert
+        # the first page, and two pages ahead of it
+        self.assertEqual(len(list_method.calls), 3)
+        generator.close()
+
+    def test_prefetch_raises_failure_at_failed_page(self):
+        # Arrange
+        list_method = _PagedListMethod(item_count=100, page_size=10, fail_on_marker=30)
+        items = []
+
+        # Act
+        with self.assertRaises(ValueError):
+            for i in list_method.create_generator(prefetch_pages=2):
+                items.append(i)
+
+        # Assert
+        self.assertEqual(items, list(range(30)))
+
+    def test_list_blobs_with_prefetch(self):
+        # Arrange
+        with LocalStorageServer('blob') as server:
+            service = server.create_service(BlockBlobService)
+            service.create_container('container')
+            for i in range(12):
+                service.create_blob_from_bytes('container', 'blob{0:02}'.format(i), b'data')
+
+            # Act
+            generator = service.list_blobs('container', num_results=10, prefetch_pages=2)
+            names = [blob.name for blob in generator]
+            pages = [(query.get('marker'), query.get('maxresults')) for method, path, query in server.requests
+                     if query.get('comp') == 'list']
+
+        # Assert
+        self.assertEqual(names, ['blob{0:02}'.format(i) for i in range(10)])
+        self.assertEqual(generator.next_marker, 'blob10')
+        self.assertEqual(pages, [(None, '10')])
+
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import os
+import unittest
+from io import SEEK_END
+
+from azure.storage.common._memory_mapping import (
+    _MemoryMappedFile,
+    _open_file_for_upload,
+)
+from azure.storage.file import FileService
+from tests.local_storage_server import LocalStorageServer
+from tests.testcase import StorageTestCase
+
+FILE_PATH = 'memory_mapping.temp.dat'
+
+
+# ------------------------------------------------------------------------------
+
+class StorageMemoryMappingTest(StorageTestCase):
+    def tearDown(self):
+        if os.path.isfile(FILE_PATH):
+            os.remove(FILE_PATH)
+        return super(StorageMemoryMappingTest, self).tearDown()
+
+    # --Helpers-----------------------------------------------------------------
+    def _create_file(self, size):
+        data = self.get_random_bytes(size)
+        with open(FILE_PATH, 'wb') as stream:
+            stream.write(data)
+        return data
+
+    # --Test cases--------------------------------------------------------------
+    def test_read_and_seek(self):
+        # Arrange
+        data = self._create_file(1000)
+
+        with _open_file_for_upload(FILE_PATH) as stream:
+            # Act
+            first = stream.read(100)
+            stream.seek(-10, SEEK_END)
+            last = stream.read()
+            stream.seek(500)
+            buffer = bytearray(200)
+            count = stream.readinto(buffer)
+
+            # Assert
+            self.assertIsInstance(stream, _MemoryMappedFile)
+            self.assertEqual(len(stream), 1000)
+            self.assertEqual(first, data[:100])
+            self.assertEqual(last, data[-10:])
+            self.assertEqual(count, 200)
+            self.assertEqual(bytes(buffer), data[500:700])
+            self.assertEqual(stream.tell(), 700)
+
+    def test_view_is_not_copied(self):
+        # Arrange
+        data = self._create_file(1000)
+
+        with _MemoryMappedFile(FILE_PATH) as stream:
+            stream.seek(100)
+
+            # Act
+            view = stream.get_view()
+
+            # Assert
+            self.assertIsInstance(view, memoryview)
+            self.assertIs(view.obj, stream._mapping)
+            self.assertEqual(view.tobytes(), data[100:])
+            self.assertEqual(stream.tell(), 100)
+
+        # the view outlives the stream which handed it out
+        self.assertEqual(view.tobytes(), data[100:])
+
+    def test_empty_file_is_opened_as_regular_file(self):
+        # Arrange
+        self._create_file(0)
+
+        # Act
+        with _open_file_for_upload(FILE_PATH) as stream:
+            # Assert
+            self.assertNotIsInstance(stream, _MemoryMappedFile)
+            self.assertEqual(stream.read(), b'')
+
+    def test_create_file_from_path_in_parallel(self):
+        # Arrange
+        data = self._create_file(4 * 1024 * 5 + 17)
+        with LocalStorageServer('file') as server:
+            service = server.create_service(FileService)
+            service.MAX_RANGE_SIZE = 4 * 1024
+            share_name = self.get_resource_name('utshare')
+            service.create_share(share_name)
+
+            # Act
+            service.create_file_from_path(share_name, None, 'file', FILE_PATH, max_connections=4)
+
+            # Assert
+            self.assertEqual(service.get_file_to_bytes(share_name, None, 'file').content, data)
+            range_writes = [request for request in server.requests if request[2].get('comp') == 'range']
+            self.assertEqual(len(range_writes), 6)
+
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
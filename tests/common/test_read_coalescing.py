@@ -0,0 +1,153 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import threading
+import unittest
+
+from azure.storage.blob import BlockBlobService
+from azure.storage.queue import QueueService
+from tests.local_storage_server import LocalStorageServer
+from tests.testcase import StorageTestCase
+
+THREAD_COUNT = 8
+
+
+# ------------------------------------------------------------------------------
+
+class StorageReadCoalescingTest(StorageTestCase):
+    def setUp(self):
+        super(StorageReadCoalescingTest, self).setUp()
+        self.servers = []
+        self.container_name = self.get_resource_name('utcontainer')
+        self.queue_name = self.get_resource_name('utqueue')
+
+    def tearDown(self):
+        for server in self.servers:
+            server.stop()
+        return super(StorageReadCoalescingTest, self).tearDown()
+
+    # --Helpers-----------------------------------------------------------------
+    def _create_service(self, service_name, service_class):
+        server = LocalStorageServer(service_name).start()
+        self.servers.append(server)
+        service = server.create_service(service_class)
+        service.coalesce_reads = True
+        return server, service
+
+    def _create_blob_service(self, data):
+        server, service = self._create_service('blob', BlockBlobService)
+        service.create_container(self.container_name)
+        service.create_blob_from_bytes(self.container_name, 'blob', data)
+
+        # slow the server down so that the reads are in flight at the same time
+        server.latency = 0.2
+        return server, service
+
+    def _run_concurrently(self, functions):
+        results = [None] * len(functions)
+
+        def run(index):
+            results[index] = functions[index]()
+
+        threads = [threading.Thread(target=run, args=(index,)) for index in range(len(functions))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def _count_requests(self, server, method):
+        return len([request for request in server.requests if request[0] == method])
+
+    # --Test cases--------------------------------------------------------------
+    def test_identical_reads_are_coalesced(self):
+        # Arrange
+        data = self.get_random_bytes(1024)
+        server, service = self._create_blob_service(data)
+
+        # Act
+        blobs = self._run_concurrently(
+            [lambda: service.get_blob_to_bytes(self.container_name, 'blob')] * THREAD_COUNT)
+
+        # Assert
+        self.assertEqual(self._count_requests(server, 'GET'), 1)
+        for blob in blobs:
+            self.assertEqual(blob.content, data)
+
+        # each caller gets its own result
+        self.assertEqual(len(set(id(blob) for blob in blobs)), THREAD_COUNT)
+
+    def test_identical_heads_are_coalesced(self):
+        # Arrange
+        server, service = self._create_blob_service(b'abc')
+
+        # Act
+        results = self._run_concurrently(
+            [lambda: service.get_blob_properties(self.container_name, 'blob')] * THREAD_COUNT)
+
+        # Assert
+        self.assertEqual(self._count_requests(server, 'HEAD'), 1)
+        self.assertEqual([blob.properties.content_length for blob in results], [3] * THREAD_COUNT)
+
+    def test_different_reads_are_not_coalesced(self):
+        # Arrange
+        server, service = self._create_blob_service(b'abcdef')
+        etag = service.get_blob_properties(self.container_name, 'blob').properties.etag
+
+        # Act
+        results = self._run_concurrently([
+            lambda: service.get_blob_to_bytes(self.container_name, 'blob', start_range=0, end_range=1),
+            lambda: service.get_blob_to_bytes(self.container_name, 'blob', start_range=2, end_range=3),
+            lambda: service.get_blob_to_bytes(self.container_name, 'blob', if_match=etag),
+        ])
+
+        # Assert
+        self.assertEqual(self._count_requests(server, 'GET'), 3)
+        self.assertEqual([blob.content for blob in results], [b'ab', b'cd', b'abcdef'])
+
+    def test_reads_are_not_coalesced_by_default(self):
+        # Arrange
+        server, service = self._create_blob_service(b'abc')
+        service.coalesce_reads = False
+
+        # Act
+        self._run_concurrently([lambda: service.get_blob_properties(self.container_name, 'blob')] * THREAD_COUNT)
+
+        # Assert
+        self.assertEqual(self._count_requests(server, 'HEAD'), THREAD_COUNT)
+
+    def test_missing_blob_error_is_shared(self):
+        # Arrange
+        server, service = self._create_blob_service(b'abc')
+
+        # Act
+        results = self._run_concurrently([lambda: service.exists(self.container_name, 'missing')] * THREAD_COUNT)
+
+        # Assert
+        self.assertEqual(self._count_requests(server, 'HEAD'), 1)
+        self.assertEqual(results, [False] * THREAD_COUNT)
+
+    def test_got_messages_are_not_coalesced(self):
+        # Arrange
+        server, service = self._create_service('queue', QueueService)
+        service.create_queue(self.queue_name)
+        for i in range(THREAD_COUNT):
+            service.put_message(self.queue_name, u'message{0}'.format(i))
+        server.latency = 0.2
+
+        # Act
+        peeked = self._run_concurrently([lambda: service.peek_messages(self.queue_name)] * THREAD_COUNT)
+        got = self._run_concurrently([lambda: service.get_messages(self.queue_name)] * THREAD_COUNT)
+
+        # Assert
+        # peeking is coalesced, but each get dequeues a message of its own
+        self.assertEqual(self._count_requests(server, 'GET'), 1 + THREAD_COUNT)
+        self.assertEqual([len(messages) for messages in peeked], [1] * THREAD_COUNT)
+        self.assertEqual(len(set(messages[0].id for messages in got)), THREAD_COUNT)
+
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import unittest
+
+from azure.common import AzureHttpError
+
+from azure.storage.blob import (
+    BlockBlobService,
+    PropertiesCache,
+)
+from azure.storage.common import (
+    LocationMode,
+    RequestObserver,
+    RequestPhase,
+)
+from azure.storage.common.retry import LinearRetry
+from tests.local_storage_server import LocalStorageServer
+from tests.testcase import StorageTestCase
+
+
+class _RecordingObserver(RequestObserver):
+    def __init__(self):
+        self.started = []
+        self.ended = []
+
+    def on_phase_start(self, event):
+        self.started.append(event.phase)
+
+    def on_phase_end(self, event):
+        self.ended.append(event)
+
+    def phases(self):
+        return [event.phase for event in self.ended]
+
+
+# ------------------------------------------------------------------------------
+
+class StorageRequestObserverTest(StorageTestCase):
+    def setUp(self):
+        super(StorageRequestObserverTest, self).setUp()
+        self.server = LocalStorageServer('blob').start()
+        self.container_name = self.get_resource_name('utcontainer')
+
+        self.bs = self.server.create_service(BlockBlobService)
+        self.bs.retry = LinearRetry(backoff=0.01, max_attempts=2).retry
+        self.observer = _RecordingObserver()
+
+    def tearDown(self):
+        self.server.stop()
+        return super(StorageRequestObserverTest, self).tearDown()
+
+    # --Test cases--------------------------------------------------------------
+    def test_phases_of_operation(self):
+        # Arrange
+        self.bs.create_container(self.container_name)
+        self.bs.create_blob_from_bytes(self.container_name, 'blob', b'hello world')
+        self.bs.request_observer = self.observer
+
+        # Act
+        blobs = list(self.bs.list_blobs(self.container_name))
+
+        # Assert
+        self.assertEqual(len(blobs), 1)
+        self.assertEqual(self.observer.started, [RequestPhase.OPERATION, RequestPhase.SIGN,
+                                                 RequestPhase.SEND, RequestPhase.PARSE])
+        self.assertEqual(self.observer.phases(), [RequestPhase.SIGN, RequestPhase.SEND,
+                                                  RequestPhase.PARSE, RequestPhase.OPERATION])
+        for event in self.observer.ended:
+            self.assertEqual(event.operation_name, 'list_blobs')
+            self.assertEqual(event.location_mode, LocationMode.PRIMARY)
+            self.assertEqual(event.retry_count, 0)
+            self.assertIsNone(event.exception)
+            self.assertGreaterEqual(event.duration, 0)
+
+        send = self.observer.ended[1]
+        self.assertEqual(send.bytes_sent, 0)
+        self.assertGreater(send.bytes_received, 0)
+
+    def test_phases_of_retried_operation(self):
+        # Arrange
+        self.bs.request_observer = self.observer
+        self.server.fail_next(1)
+
+        # Act
+        self.bs.create_container(self.container_name)
+
+        # Assert
+        self.assertEqual(self.observer.phases(), [RequestPhase.SIGN, RequestPhase.SEND, RequestPhase.BACKOFF,
+                                                  RequestPhase.SIGN, RequestPhase.SEND, RequestPhase.OPERATION])
+        first_send, backoff, second_send, operation = [self.observer.ended[i] for i in (1, 2, 4, 5)]
+        self.assertEqual(first_send.retry_count, 0)
+        self.assertEqual(backoff.retry_count, 1)
+        self.assertGreaterEqual(backoff.duration, 0.01)
+        self.assertEqual(second_send.retry_count, 1)
+        self.assertIsNone(second_send.exception)
+        self.assertEqual(operation.operation_name, 'create_container')
+        self.assertEqual(operation.retry_count, 1)
+
+    def test_phases_of_failed_operation(self):
+        # Arrange
+        self.bs.request_observer = self.observer
+        self.server.fail_next(3)
+
+        # Act
+        with self.assertRaises(AzureHttpError):
+            self.bs.create_container(self.container_name, fail_on_exist=True)
+
+        # Assert
+        operation = self.observer.ended[-1]
+        self.assertEqual(operation.phase, RequestPhase.OPERATION)
+        self.assertIsInstance(operation.exception, AzureHttpError)
+
+    def test_phases_of_upload_report_bytes_sent(self):
+        # Arrange
+        self.bs.create_container(self.container_name)
+        self.bs.request_observer = self.observer
+
+        # Act
+        self.bs.create_blob_from_bytes(self.container_name, 'blob', b'hello world')
+
+        # Assert
+        send = [event for event in self.observer.ended if event.phase == RequestPhase.SEND][0]
+        self.assertEqual(send.operation_name, 'create_blob_from_stream')
+        self.assertEqual(send.bytes_sent, 11)
+
+    def test_operation_names_are_public_methods(self):
+        # Arrange
+        self.bs.MAX_SINGLE_PUT_SIZE = 1024
+        self.bs.MAX_BLOCK_SIZE = 1024
+        self.bs.create_container(self.container_name)
+        self.bs.properties_cache = PropertiesCache()
+        self.bs.request_observer = self.observer
+
+        # Act
+        self.bs.create_blob_from_bytes(self.container_name, 'blob1', b'a' * 2048)
+        self.bs.create_blob_from_bytes(self.container_name, 'blob2', b'b')
+        list(self.bs.list_blob_names(self.container_name, num_results=1))
+        self.bs.get_blob_to_bytes(self.container_name, 'blob1')
+        self.bs.get_blob_properties(self.container_name, 'blob2')
+
+        # Assert
+        names = [event.operation_name for event in self.observer.ended if event.phase == RequestPhase.OPERATION]
+        self.assertEqual(names, ['create_blob_from_stream'] * 4 + ['list_blob_names'] +
+                         ['get_blob_to_stream', 'get_blob_properties'])
+
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import gzip
+import unittest
+from io import BytesIO
+
+from azure.common import AzureException
+
+from azure.storage.blob import (
+    BlockBlobService,
+    ContentSettings,
+)
+from azure.storage.common._common_conversion import _get_content_md5
+from azure.storage.common._deserialization import (
+    _get_seekable_stream_writer,
+    _write_response_body,
+)
+from azure.storage.common._http import HTTPResponse
+from azure.storage.file import (
+    ContentSettings as FileContentSettings,
+    FileService,
+)
+from tests.local_storage_server import LocalStorageServer
+from tests.testcase import StorageTestCase
+
+
+# ------------------------------------------------------------------------------
+
+class StorageResponseStreamingTest(StorageTestCase):
+    def _get_response(self, body, content_length=None):
+        headers = {
+            'content-length': str(len(body) if content_length is None else content_length),
+            'content-md5': _get_content_md5(body),
+        }
+        return HTTPResponse(206, 'Partial Content', headers, body)
+
+    def _get_gzipped(self, data):
+        stream = BytesIO()
+        gzip_file = gzip.GzipFile(fileobj=stream, mode='wb')
+        gzip_file.write(data)
+        gzip_file.close()
+        return stream.getvalue()
+
+    def test_write_response_body_in_pieces(self):
+        # Arrange
+        body = self.get_random_bytes(200 * 1024)
+        response = self._get_response(body)
+        pieces = []
+
+        # Act
+        length = _write_response_body(response, lambda offset, data: pieces.append((offset, data)), True)
+
+        # Assert
+        self.assertEqual(length, len(body))
+        self.assertTrue(len(pieces) > 1)
+        self.assertEqual(b''.join(data for _, data in pieces), body)
+        self.assertEqual(pieces[-1][0], len(body) - len(pieces[-1][1]))
+
+    def test_write_response_body_incomplete(self):
+        # Arrange
+        body = self.get_random_bytes(1024)
+        response = self._get_response(body, content_length=2048)
+
+        # Act
+        with self.assertRaises(AzureException):
+            _write_response_body(response, lambda offset, data: None)
+
+    def test_write_response_body_md5_mismatch(self):
+        # Arrange
+        body = self.get_random_bytes(1024)
+        response = self._get_response(body)
+        response.headers['content-md5'] = _get_content_md5(b'invalid')
+
+        # Act
+        with self.assertRaises(AzureException):
+            _write_response_body(response, lambda offset, data: None, True)
+
+    def test_seekable_stream_writer_overwrites_failed_attempt(self):
+        # Arrange
+        stream = BytesIO(b'head')
+        stream.seek(0, 2)
+        writer = _get_seekable_stream_writer(stream)
+        body = self.get_random_bytes(1024)
+
+        # Act
+        writer(0, b'partial')
+        _write_response_body(self._get_response(body), writer)
+
+        # Assert
+        self.assertEqual(stream.getvalue(), b'head' + body)
+        self.assertEqual(stream.tell(), 4 + len(body))
+
+    def test_download_gzip_encoded_blob(self):
+        # Arrange
+        data = b'gzip encoded content ' * 1000
+        with LocalStorageServer('blob') as server:
+            service = server.create_service(BlockBlobService)
+            service.create_container('container')
+            service.create_blob_from_bytes('container', 'blob', self._get_gzipped(data),
+                                           content_settings=ContentSettings(content_encoding='gzip'))
+
+            # Act
+            blob = service.get_blob_to_bytes('container', 'blob')
+
+        # Assert
+        # the body is decoded by the HTTP client, as it was before the body was streamed
+        self.assertEqual(blob.content, data)
+
+    def test_download_gzip_encoded_file(self):
+        # Arrange
+        data = b'gzip encoded content ' * 1000
+        with LocalStorageServer('file') as server:
+            service = server.create_service(FileService)
+            service.create_share('share')
+            service.create_file_from_bytes('share', None, 'file', self._get_gzipped(data),
+                                           content_settings=FileContentSettings(content_encoding='gzip'))
+
+            # Act
+            file = service.get_file_to_bytes('share', None, 'file')
+
+        # Assert
+        self.assertEqual(file.content, data)
+
+    def test_seekable_stream_writer_non_seekable_stream(self):
+        # Arrange
+        class NonSeekableStream(object):
+            def write(self, data):
+                pass
+
+        # Act
+        writer = _get_seekable_stream_writer(NonSeekableStream())
+
+        # Assert
+        self.assertIsNone(writer)
+
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
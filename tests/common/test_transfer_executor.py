@@ -0,0 +1,151 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import threading
+import time
+import unittest
+
+from azure.storage.common import TransferExecutor
+from tests.testcase import StorageTestCase
+
+
+class _ConcurrencyCounter(object):
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current = 0
+        self.peak = 0
+        self.processed = []
+
+    def process(self, item):
+        with self.lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+        time.sleep(0.01)
+        with self.lock:
+            self.current -= 1
+            self.processed.append(item)
+        return item * 2
+
+
+# ------------------------------------------------------------------------------
+
+class StorageTransferExecutorTest(StorageTestCase):
+    def test_results_are_in_order(self):
+        # Arrange
+        executor = TransferExecutor(max_workers=8)
+        counter = _ConcurrencyCounter()
+
+        # Act
+        results = executor.map(counter.process, range(50), 4)
+
+        # Assert
+        self.assertEqual(results, [item * 2 for item in range(50)])
+        self.assertEqual(counter.peak, 4)
+
+    def test_workers_are_capped_across_transfers(self):
+        # Arrange
+        executor = TransferExecutor(max_workers=6)
+        counter = _ConcurrencyCounter()
+        results = {}
+
+        def transfer(name):
+            results[name] = executor.map(counter.process, range(40), 4)
+
+        # Act
+        threads = [threading.Thread(target=transfer, args=(name,)) for name in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        self.assertEqual(counter.peak, 6)
+        for name in range(4):
+            self.assertEqual(results[name], [item * 2 for item in range(40)])
+
+    def test_transfers_share_workers_fairly(self):
+        # Arrange
+        executor = TransferExecutor(max_workers=2)
+        order = []
+
+        def process(item):
+            order.append(item)
+            time.sleep(0.01)
+
+        # Act
+        large = threading.Thread(target=executor.map, args=(process, ['large'] * 40, 2))
+        large.start()
+        time.sleep(0.05)
+        executor.map(process, ['small'] * 4, 2)
+        large.join()
+
+        # Assert
+        # the small transfer completes while the large one still has most of its chunks to go
+        last_small = len(order) - order[::-1].index('small')
+        self.assertLess(last_small, 25)
+
+    def test_items_are_read_as_chunks_complete(self):
+        # Arrange
+        executor = TransferExecutor(max_workers=8)
+        counter = _ConcurrencyCounter()
+        buffered = []
+
+        def items():
+            for item in range(20):
+                with counter.lock:
+                    buffered.append(item - len(counter.processed))
+                yield item
+
+        # Act
+        executor.map(counter.process, items(), 3)
+
+        # Assert
+        self.assertLessEqual(max(buffered), 3)
+
+    def test_failure_stops_transfer(self):
+        # Arrange
+        executor = TransferExecutor(max_workers=4)
+        processed = []
+
+        def process(item):
+            processed.append(item)
+            time.sleep(0.01)
+            if item == 5:
+                raise ValueError('failed')
+
+        # Act
+        with self.assertRaises(ValueError):
+            executor.map(process, range(100), 2)
+
+        # Assert
+        self.assertLess(len(processed), 20)
+
+        # the executor is still usable afterwards
+        self.assertEqual(executor.map(lambda item: item, range(5), 2), [0, 1, 2, 3, 4])
+
+    def test_transfers_started_by_workers_do_not_deadlock(self):
+        # Arrange
+        executor = TransferExecutor(max_workers=2)
+        counter = _ConcurrencyCounter()
+        results = []
+
+        def process(item):
+            # every worker starts a transfer of its own, as a progress callback might
+            return executor.map(counter.process, range(item), 4)
+
+        # Act
+        thread = threading.Thread(target=lambda: results.append(executor.map(process, range(1, 6), 4)))
+        thread.daemon = True
+        thread.start()
+        thread.join(10)
+
+        # Assert
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(results, [[[item * 2 for item in range(count)] for count in range(1, 6)]])
+
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
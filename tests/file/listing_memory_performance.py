@@ -0,0 +1,45 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import gc
+import tracemalloc
+
+from azure.storage.common._http import HTTPResponse
+from azure.storage.file._deserialization import _convert_xml_to_directories_and_files
+
+# Measures the memory held by the files of a parsed page of a directory
+# listing, as the bytes allocated per listed file.
+
+FILE_COUNT = 5000
+
+
+def create_listing_page():
+    files = ''.join('<File><Name>file{0:05}</Name><Properties><Content-Length>{0}</Content-Length></Properties>'
+                    '</File>'.format(i) for i in range(FILE_COUNT))
+    body = '<?xml version="1.0" encoding="utf-8"?><EnumerationResults><Entries>{0}</Entries><NextMarker />' \
+           '</EnumerationResults>'.format(files)
+    return HTTPResponse(200, 'OK', {}, body.encode('utf-8'))
+
+
+def measure(response):
+    gc.collect()
+    tracemalloc.start()
+    entries = _convert_xml_to_directories_and_files(response)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    if len(entries) != FILE_COUNT:
+        raise AssertionError('the page does not hold {0} files'.format(FILE_COUNT))
+    return size / float(len(entries))
+
+
+def main():
+    response = create_listing_page()
+    print('{0:.0f} bytes per listed file'.format(measure(response)))
+
+
+if __name__ == '__main__':
+    main()
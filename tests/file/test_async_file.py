@@ -0,0 +1,124 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import asyncio
+import os
+import unittest
+
+from tests.local_storage_server import LocalStorageServer
+from tests.testcase import StorageTestCase
+
+try:
+    import aiohttp
+    from azure.storage.file.aio import AsyncFileService
+except ImportError:
+    aiohttp = None
+
+FILE_PATH = 'file_output.temp.dat'
+
+
+# ------------------------------------------------------------------------------
+
+@unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+class StorageAsyncFileTest(StorageTestCase):
+    def setUp(self):
+        super(StorageAsyncFileTest, self).setUp()
+        self.server = LocalStorageServer('file').start()
+        self.loop = asyncio.new_event_loop()
+
+        self.fs = self.server.create_service(AsyncFileService)
+        self.share_name = self.get_resource_name('utshare')
+
+        # test chunking functionality by reducing the size of each chunk,
+        # otherwise the tests would take too long to execute
+        self.fs.MAX_RANGE_SIZE = 4 * 1024
+        self.fs.MAX_SINGLE_GET_SIZE = 32 * 1024
+        self.fs.MAX_CHUNK_GET_SIZE = 4 * 1024
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.fs.close())
+        self.loop.close()
+        self.server.stop()
+        if os.path.isfile(FILE_PATH):
+            os.remove(FILE_PATH)
+        return super(StorageAsyncFileTest, self).tearDown()
+
+    # --Helpers-----------------------------------------------------------------
+    def _run(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    # --Test cases--------------------------------------------------------------
+    def test_create_and_delete_share_and_directory(self):
+        # Act
+        share_created = self._run(self.fs.create_share(self.share_name))
+        share_created_again = self._run(self.fs.create_share(self.share_name))
+        directory_created = self._run(self.fs.create_directory(self.share_name, 'dir1'))
+        directory_exists = self._run(self.fs.exists(self.share_name, 'dir1'))
+        directory_deleted = self._run(self.fs.delete_directory(self.share_name, 'dir1'))
+        directory_deleted_again = self._run(self.fs.delete_directory(self.share_name, 'dir1'))
+        share_deleted = self._run(self.fs.delete_share(self.share_name))
+
+        # Assert
+        self.assertTrue(share_created)
+        self.assertFalse(share_created_again)
+        self.assertTrue(directory_created)
+        self.assertTrue(directory_exists)
+        self.assertTrue(directory_deleted)
+        self.assertFalse(directory_deleted_again)
+        self.assertTrue(share_deleted)
+
+    def test_create_and_get_large_file_parallel(self):
+        # Arrange
+        self._run(self.fs.create_share(self.share_name))
+        data = self.get_random_bytes(self.fs.MAX_SINGLE_GET_SIZE + 10 * 1024 + 10)
+
+        # Act
+        self._run(self.fs.create_file_from_bytes(self.share_name, None, 'file1', data, max_connections=4))
+        with open(FILE_PATH, 'wb') as stream:
+            file = self._run(self.fs.get_file_to_stream(self.share_name, None, 'file1', stream,
+                                                        max_connections=4))
+
+        # Assert
+        with open(FILE_PATH, 'rb') as stream:
+            self.assertEqual(stream.read(), data)
+        self.assertEqual(file.properties.content_length, len(data))
+        ranges = [request for request in self.server.requests if request[2].get('comp') == 'range']
+        self.assertEqual(len(ranges), 11)
+
+    def test_create_file_from_text_and_get_range(self):
+        # Arrange
+        self._run(self.fs.create_share(self.share_name))
+        text = u'hello world ' * 5000
+
+        # Act
+        self._run(self.fs.create_file_from_text(self.share_name, None, 'file1', text))
+        file = self._run(self.fs.get_file_to_text(self.share_name, None, 'file1', start_range=6, end_range=40005))
+
+        # Assert
+        self.assertEqual(file.content, text[6:40006])
+
+    def test_list_directory_and_file_columns(self):
+        # Arrange
+        self._run(self.fs.create_share(self.share_name))
+        self._run(self.fs.create_directory(self.share_name, 'dir'))
+        for i in range(3):
+            self._run(self.fs.create_file_from_bytes(self.share_name, 'dir', 'file{0}'.format(i), b'x' * i))
+
+        # Act
+        columns = self._run(self.fs.list_directory_and_file_columns(self.share_name, 'dir', num_results=2))
+        rest = self._run(self.fs.list_directory_and_file_columns(self.share_name, 'dir',
+                                                                 marker=columns.next_marker))
+
+        # Assert
+        self.assertEqual(columns.names, ['file0', 'file1'])
+        self.assertEqual(list(columns.content_lengths), [0, 1])
+        self.assertEqual(rest.names, ['file2'])
+        self.assertEqual(list(rest.content_lengths), [2])
+        self.assertIsNone(rest.next_marker)
+
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
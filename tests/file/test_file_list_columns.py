@@ -0,0 +1,63 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import unittest
+
+from azure.storage.file import FileService
+from tests.local_storage_server import LocalStorageServer
+from tests.testcase import StorageTestCase
+
+
+# ------------------------------------------------------------------------------
+
+class StorageFileListColumnsTest(StorageTestCase):
+    def setUp(self):
+        super(StorageFileListColumnsTest, self).setUp()
+        self.server = LocalStorageServer('file').start()
+        self.fs = self.server.create_service(FileService)
+        self.share_name = self.get_resource_name('utshare')
+        self.fs.create_share(self.share_name)
+        self.fs.create_directory(self.share_name, 'dir')
+        self.fs.create_directory(self.share_name, 'dir/sub')
+        for i in range(5):
+            self.fs.create_file_from_bytes(self.share_name, 'dir', 'file{0}'.format(i), b'x' * i)
+
+    def tearDown(self):
+        self.server.stop()
+        return super(StorageFileListColumnsTest, self).tearDown()
+
+    # --Test cases--------------------------------------------------------------
+    def test_list_directory_and_file_columns(self):
+        # Act
+        columns = self.fs.list_directory_and_file_columns(self.share_name, 'dir')
+
+        # Assert
+        self.assertEqual(columns.names, ['file0', 'file1', 'file2', 'file3', 'file4', 'sub'])
+        self.assertEqual(list(columns.content_lengths), [0, 1, 2, 3, 4, 0])
+        self.assertEqual([bool(value) for value in columns.is_directory], [False] * 5 + [True])
+        self.assertIsNone(columns.next_marker)
+
+    def test_list_columns_across_pages(self):
+        # Act
+        columns = self.fs.list_directory_and_file_columns(self.share_name, 'dir', num_results=4)
+        rest = self.fs.list_directory_and_file_columns(self.share_name, 'dir', marker=columns.next_marker)
+
+        # Assert
+        self.assertEqual(columns.names, ['file0', 'file1', 'file2', 'file3'])
+        self.assertEqual(columns.next_marker, 'file4')
+        self.assertEqual(rest.names, ['file4', 'sub'])
+        self.assertEqual(list(rest.content_lengths), [4, 0])
+
+    def test_list_columns_with_prefix(self):
+        # Act
+        columns = self.fs.list_directory_and_file_columns(self.share_name, 'dir', prefix='su')
+
+        # Assert
+        self.assertEqual(columns.names, ['sub'])
+
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
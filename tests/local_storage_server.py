@@ -0,0 +1,651 @@
+# coding: utf-8
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+'''
+A small in-memory stand-in for the blob, queue and file services, used by the
+tests which need to exercise the wire behaviour of the clients (connection
+reuse, retries, concurrency, streaming) without recordings or an account.
+
+It implements just enough of the REST API for the operations the clients send
+in those tests. Requests are not authenticated, but the Authorization header is
+recorded. Failures and latency can be injected to drive the retry logic.
+'''
+import base64
+import hashlib
+import threading
+import time
+import uuid
+from email.utils import formatdate
+from xml.sax.saxutils import escape
+
+try:
+    from xml.etree import cElementTree as ETree
+except ImportError:
+    from xml.etree import ElementTree as ETree
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import urlparse, parse_qs, unquote
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import urlparse, parse_qs
+    from urllib import unquote
+
+ACCOUNT_NAME = 'localaccount'
+ACCOUNT_KEY = base64.b64encode(b'local storage server account key').decode('utf-8')
+
+
+class _Blob(object):
+    def __init__(self, content, blob_type='BlockBlob'):
+        self.content = bytes(content)
+        self.blob_type = blob_type
+        self.etag = '"0x{0}"'.format(uuid.uuid4().hex[:15].upper())
+        self.last_modified = formatdate(usegmt=True)
+        self.metadata = {}
+        self.tier = 'Hot'
+        self.content_encoding = None
+        # the offsets of the pages written to a page blob
+        self.pages = set()
+
+
+class _Message(object):
+    def __init__(self, text, visibility_timeout):
+        self.id = str(uuid.uuid4())
+        self.text = text
+        self.dequeue_count = 0
+        self.pop_receipt = None
+        self.insertion_time = time.time()
+        self.visible_at = self.insertion_time + visibility_timeout
+
+
+class _ServerError(Exception):
+    def __init__(self, status, code):
+        self.status = status
+        self.code = code
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class LocalStorageServer(object):
+    '''
+    Serves one storage service on a free port of the loopback interface.
+
+    :ivar str service: 'blob', 'queue' or 'file'.
+    :ivar list requests: (method, path, query) of each request received.
+    :ivar int connections: the number of TCP connections accepted.
+    '''
+
+    def __init__(self, service='blob'):
+        self.service = service
+        self.requests = []
+        self.connections = 0
+        self.latency = 0
+        self.authorization_headers = []
+
+        self._lock = threading.Lock()
+        self._failures = []
+        self._containers = {}
+        self._queues = {}
+        self._shares = {}
+        # the content encoding of each file, by share name and path
+        self._file_content_encodings = {}
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:{0}'.format(self._server.server_address[1])
+
+    def create_service(self, service_class, **kwargs):
+        '''
+        Creates a service object of the given class which targets this server.
+        '''
+        connection_string = 'DefaultEndpointsProtocol=http;AccountName={0};AccountKey={1};{2}Endpoint={3}'.format(
+            ACCOUNT_NAME, ACCOUNT_KEY, self.service.capitalize(), self.url)
+        return service_class(connection_string=connection_string, **kwargs)
+
+    def start(self):
+        server = self
+
+        class Handler(_RequestHandler):
+            storage_server = server
+
+        class Server(_ThreadingHTTPServer):
+            def get_request(self):
+                with server._lock:
+                    server.connections += 1
+                return _ThreadingHTTPServer.get_request(self)
+
+        self._server = Server(('127.0.0.1', 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def fail_next(self, count=1, status=503, code='ServerBusy', delay=0):
+        '''
+        Fails the next count requests with the given status and error code,
+        after waiting delay seconds.
+        '''
+        with self._lock:
+            self._failures.extend([(status, code, delay)] * count)
+
+    def add_blobs(self, container_name, blob_names, content=b''):
+        '''
+        Adds blobs to a container, creating it if needed, without sending
+        requests, for the tests which need more blobs than is practical to upload.
+        '''
+        with self._lock:
+            container = self._containers.setdefault(container_name, {'blobs': {}, 'blocks': {}, 'metadata': {}})
+            for blob_name in blob_names:
+                container['blobs'][blob_name] = _Blob(content)
+
+    def _next_failure(self):
+        with self._lock:
+            return self._failures.pop(0) if self._failures else None
+
+    def _record(self, method, path, query, headers):
+        with self._lock:
+            self.requests.append((method, path, query))
+            self.authorization_headers.append(headers.get('Authorization'))
+
+    # ---------------------------------------------------------------------
+    # Blob service
+
+    def _blob(self, method, parts, query, headers, body):
+        if not parts:
+            if query.get('comp') == 'list':
+                return self._list_containers(query)
+            if method == 'POST' and query.get('comp') == 'batch':
+                return self._batch(headers, body)
+            raise _ServerError(400, 'InvalidQueryParameterValue')
+
+        container_name = parts[0]
+        container = self._containers.get(container_name)
+        if len(parts) == 1:
+            if query.get('restype') != 'container':
+                raise _ServerError(400, 'InvalidQueryParameterValue')
+            if method == 'PUT' and 'comp' not in query:
+                if container is not None:
+                    raise _ServerError(409, 'ContainerAlreadyExists')
+                self._containers[container_name] = {'blobs': {}, 'blocks': {}, 'metadata': _get_metadata(headers)}
+                return 201, {}, b''
+            if container is None:
+                raise _ServerError(404, 'ContainerNotFound')
+            if method == 'DELETE':
+                del self._containers[container_name]
+                return 202, {}, b''
+            if query.get('comp') == 'list':
+                return self._list_blobs(container, query)
+            if method == 'PUT' and query.get('comp') == 'metadata':
+                container['metadata'] = _get_metadata(headers)
+                return 200, {}, b''
+            if method in ('GET', 'HEAD'):
+                return 200, _metadata_headers(container['metadata']), b''
+            raise _ServerError(400, 'UnsupportedHttpVerb')
+
+        if container is None:
+            raise _ServerError(404, 'ContainerNotFound')
+        blob_name = '/'.join(parts[1:])
+        blobs = container['blobs']
+        blob = blobs.get(blob_name)
+        comp = query.get('comp')
+
+        if method == 'PUT' and comp == 'block':
+            container['blocks'].setdefault(blob_name, {})[query['blockid']] = body
+            return 201, {}, b''
+        if method == 'PUT' and comp == 'blocklist':
+            staged = container['blocks'].pop(blob_name, {})
+            block_ids = [element.text for element in ETree.fromstring(body)]
+            if any(block_id not in staged for block_id in block_ids):
+                raise _ServerError(400, 'InvalidBlockList')
+            blob = _Blob(b''.join(staged[block_id] for block_id in block_ids))
+            blob.metadata = _get_metadata(headers)
+            blobs[blob_name] = blob
+            return 201, _blob_headers(blob), b''
+        if method == 'PUT' and comp is None:
+            if headers.get('x-ms-blob-type') == 'PageBlob':
+                blob = _Blob(bytearray(int(headers['x-ms-blob-content-length'])), 'PageBlob')
+            else:
+                blob = _Blob(body)
+            blob.metadata = _get_metadata(headers)
+            blob.content_encoding = headers.get('x-ms-blob-content-encoding')
+            blobs[blob_name] = blob
+            response_headers = _blob_headers(blob)
+            response_headers['Content-MD5'] = _md5(body)
+            return 201, response_headers, b''
+
+        if blob is None:
+            raise _ServerError(404, 'BlobNotFound')
+        if method == 'DELETE':
+            del blobs[blob_name]
+            return 202, {}, b''
+        if method == 'PUT' and comp == 'metadata':
+            blob.metadata = _get_metadata(headers)
+            blob.etag = _Blob(b'').etag
+            return 200, _blob_headers(blob), b''
+        if method == 'PUT' and comp == 'tier':
+            blob.tier = headers['x-ms-access-tier']
+            return 200, {}, b''
+        if method == 'PUT' and comp == 'page':
+            start, end = _parse_range(headers['x-ms-range'])
+            if blob.blob_type != 'PageBlob' or start % 512 != 0 or (end + 1) % 512 != 0 or \
+                    len(body) != end + 1 - start:
+                raise _ServerError(400, 'InvalidPageRange')
+            blob.content = blob.content[:start] + body + blob.content[end + 1:]
+            blob.pages.update(range(start, end + 1, 512))
+            blob.etag = _Blob(b'').etag
+            response_headers = _blob_headers(blob)
+            response_headers['x-ms-request-server-encrypted'] = 'true'
+            return 201, response_headers, b''
+        if method == 'GET' and comp == 'pagelist':
+            return self._list_pages(blob)
+        if method in ('GET', 'HEAD') and comp is None:
+            if headers.get('If-None-Match') == blob.etag:
+                raise _ServerError(304, 'ConditionNotMet')
+            return _get_range(blob.content, headers, _blob_headers(blob))
+        raise _ServerError(400, 'UnsupportedHttpVerb')
+
+    def _batch(self, headers, body):
+        boundary = headers['Content-Type'].split('boundary=', 1)[1]
+        response_boundary = 'batchresponse_' + str(uuid.uuid4())
+        response_body = ''
+        for part in body.decode('utf-8').split('--' + boundary)[1:-1]:
+            envelope, request = part.strip('\r\n').split('\r\n\r\n')[:2]
+            content_id = _CaseInsensitiveDict(_parse_headers(envelope.split('\r\n')))['Content-ID']
+            request_lines = request.split('\r\n')
+            method, url, _ = request_lines[0].split(' ')
+            parsed = urlparse(url)
+            sub_query = dict((key, values[0]) for key, values in parse_qs(parsed.query).items())
+            sub_parts = [unquote(part) for part in parsed.path.split('/') if part]
+            try:
+                status, response_headers, _ = self._blob(method, sub_parts, sub_query,
+                                                         _CaseInsensitiveDict(_parse_headers(request_lines[1:])), b'')
+            except _ServerError as ex:
+                status, response_headers = ex.status, {'x-ms-error-code': ex.code}
+
+            response_body += '--{0}\r\nContent-Type: application/http\r\nContent-ID: {1}\r\n\r\n' \
+                             'HTTP/1.1 {2} {3}\r\n'.format(response_boundary, content_id, status,
+                                                             _RequestHandler.responses[status][0])
+            response_body += ''.join('{0}: {1}\r\n'.format(key, value) for key, value in response_headers.items())
+            response_body += '\r\n'
+        response_body += '--{0}--\r\n'.format(response_boundary)
+        return 202, {'Content-Type': 'multipart/mixed; boundary=' + response_boundary}, response_body.encode('utf-8')
+
+    def _list_pages(self, blob):
+        ranges = []
+        for offset in sorted(blob.pages):
+            if ranges and ranges[-1][1] == offset - 1:
+                ranges[-1][1] = offset + 511
+            else:
+                ranges.append([offset, offset + 511])
+        body = '<?xml version="1.0" encoding="utf-8"?><PageList>{0}</PageList>'.format(''.join(
+            '<PageRange><Start>{0}</Start><End>{1}</End></PageRange>'.format(start, end) for start, end in ranges))
+        response_headers = _blob_headers(blob)
+        response_headers['Content-Type'] = 'application/xml'
+        return 200, response_headers, body.encode('utf-8')
+
+    def _list_containers(self, query):
+        names = sorted(name for name in self._containers if name.startswith(query.get('prefix', '')))
+        names, next_marker = _page(names, query)
+        items = ''.join('<Container><Name>{0}</Name><Properties /></Container>'.format(escape(name))
+                        for name in names)
+        return _list_response('Containers', items, next_marker)
+
+    def _list_blobs(self, container, query):
+        prefix = query.get('prefix', '')
+        delimiter = query.get('delimiter')
+        entries = []
+        for name in sorted(container['blobs']):
+            if not name.startswith(prefix):
+                continue
+            if delimiter and delimiter in name[len(prefix):]:
+                virtual = name[:len(prefix) + name[len(prefix):].index(delimiter) + len(delimiter)]
+                if not entries or entries[-1] != (virtual, None):
+                    entries.append((virtual, None))
+            else:
+                entries.append((name, container['blobs'][name]))
+
+        entries, next_marker = _page(entries, query, key=lambda entry: entry[0])
+        items = ''
+        for name, blob in entries:
+            if blob is None:
+                items += '<BlobPrefix><Name>{0}</Name></BlobPrefix>'.format(escape(name))
+            else:
+                items += '<Blob><Name>{0}</Name><Properties><Last-Modified>{1}</Last-Modified><Etag>{2}</Etag>' \
+                         '<Content-Length>{3}</Content-Length><BlobType>BlockBlob</BlobType></Properties>' \
+                         '</Blob>'.format(escape(name), blob.last_modified, blob.etag, len(blob.content))
+        return _list_response('Blobs', items, next_marker)
+
+    # ---------------------------------------------------------------------
+    # Queue service
+
+    def _queue(self, method, parts, query, headers, body):
+        if not parts:
+            if query.get('comp') == 'list':
+                names = sorted(name for name in self._queues if name.startswith(query.get('prefix', '')))
+                names, next_marker = _page(names, query)
+                items = ''.join('<Queue><Name>{0}</Name></Queue>'.format(escape(name)) for name in names)
+                return _list_response('Queues', items, next_marker)
+            raise _ServerError(400, 'InvalidQueryParameterValue')
+
+        queue_name = parts[0]
+        queue = self._queues.get(queue_name)
+        if len(parts) == 1:
+            if method == 'PUT':
+                metadata = _get_metadata(headers)
+                if queue is not None:
+                    if queue['metadata'] != metadata:
+                        raise _ServerError(409, 'QueueAlreadyExists')
+                    return 204, {}, b''
+                self._queues[queue_name] = {'messages': [], 'metadata': metadata}
+                return 201, {}, b''
+            if queue is None:
+                raise _ServerError(404, 'QueueNotFound')
+            if method == 'DELETE':
+                del self._queues[queue_name]
+                return 204, {}, b''
+            response_headers = _metadata_headers(queue['metadata'])
+            response_headers['x-ms-approximate-messages-count'] = str(len(queue['messages']))
+            return 200, response_headers, b''
+
+        if queue is None:
+            raise _ServerError(404, 'QueueNotFound')
+        messages = queue['messages']
+        now = time.time()
+
+        if len(parts) == 3:
+            message = next((m for m in messages if m.id == parts[2]), None)
+            if message is None or message.pop_receipt != query.get('popreceipt'):
+                raise _ServerError(404, 'MessageNotFound')
+            messages.remove(message)
+            return 204, {}, b''
+        if method == 'DELETE':
+            del messages[:]
+            return 204, {}, b''
+        if method == 'POST':
+            text = ETree.fromstring(body).findtext('MessageText')
+            message = _Message(text, int(query.get('visibilitytimeout', 0)))
+            message.pop_receipt = uuid.uuid4().hex
+            messages.append(message)
+            return 201, {}, _messages_response([message], include_text=False)
+
+        count = int(query.get('numofmessages', 1))
+        visible = [m for m in messages if m.visible_at <= now][:count]
+        if query.get('peekonly') != 'true':
+            for message in visible:
+                message.dequeue_count += 1
+                message.pop_receipt = uuid.uuid4().hex
+                message.visible_at = now + int(query.get('visibilitytimeout', 30))
+        return 200, {}, _messages_response(visible, include_text=True)
+
+    # ---------------------------------------------------------------------
+    # File service
+
+    def _file(self, method, parts, query, headers, body):
+        if not parts:
+            raise _ServerError(400, 'InvalidQueryParameterValue')
+
+        share_name = parts[0]
+        share = self._shares.get(share_name)
+        restype = query.get('restype')
+        if len(parts) == 1 and restype == 'share':
+            if method == 'PUT' and 'comp' not in query:
+                if share is not None:
+                    raise _ServerError(409, 'ShareAlreadyExists')
+                self._shares[share_name] = {'': None}
+                return 201, {}, b''
+            if share is None:
+                raise _ServerError(404, 'ShareNotFound')
+            if method == 'DELETE':
+                del self._shares[share_name]
+                return 202, {}, b''
+            return 200, {}, b''
+
+        if share is None:
+            raise _ServerError(404, 'ShareNotFound')
+        path = '/'.join(parts[1:])
+        parent = path.rsplit('/', 1)[0] if '/' in path else ''
+        entry = share.get(path)
+
+        if restype == 'directory':
+            if method == 'PUT':
+                if parent not in share or share[parent] is not None:
+                    raise _ServerError(404, 'ParentNotFound')
+                if path in share:
+                    raise _ServerError(409, 'ResourceAlreadyExists')
+                share[path] = None
+                return 201, _file_headers(), b''
+            if path not in share or entry is not None:
+                raise _ServerError(404, 'ResourceNotFound')
+            if query.get('comp') == 'list':
+                return self._list_directory(share, path, query)
+            if method == 'DELETE':
+                del share[path]
+                return 202, {}, b''
+            return 200, _file_headers(), b''
+
+        if method == 'PUT' and query.get('comp') == 'range':
+            if not isinstance(entry, bytearray):
+                raise _ServerError(404, 'ResourceNotFound')
+            start, end = _parse_range(headers['x-ms-range'])
+            if headers.get('x-ms-write') == 'clear':
+                entry[start:end + 1] = bytearray(end - start + 1)
+            else:
+                entry[start:end + 1] = body
+            return 201, _file_headers(), b''
+        if method == 'PUT':
+            if parent not in share or share[parent] is not None:
+                raise _ServerError(404, 'ParentNotFound')
+            share[path] = bytearray(int(headers['x-ms-content-length']))
+            self._file_content_encodings[(share_name, path)] = headers.get('x-ms-content-encoding')
+            return 201, _file_headers(), b''
+
+        if not isinstance(entry, bytearray):
+            raise _ServerError(404, 'ResourceNotFound')
+        if method == 'DELETE':
+            del share[path]
+            return 202, {}, b''
+        return _get_range(entry, headers, _file_headers(self._file_content_encodings.get((share_name, path))))
+
+    def _list_directory(self, share, path, query):
+        base = path + '/' if path else ''
+        prefix = base + query.get('prefix', '')
+        names = sorted(name[len(base):] for name in share
+                       if name.startswith(prefix) and name != path and '/' not in name[len(base):])
+        names, next_marker = _page(names, query)
+        items = ''
+        for name in names:
+            entry = share[base + name]
+            if entry is None:
+                items += '<Directory><Name>{0}</Name></Directory>'.format(escape(name))
+            else:
+                items += '<File><Name>{0}</Name><Properties><Content-Length>{1}</Content-Length></Properties>' \
+                         '</File>'.format(escape(name), len(entry))
+        return _list_response('Entries', items, next_marker)
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # the headers and body of a response are written separately, which would otherwise wait for the delayed ack
+    disable_nagle_algorithm = True
+    storage_server = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._handle()
+
+    do_PUT = do_POST = do_DELETE = do_HEAD = do_GET
+
+    def _handle(self):
+        server = self.storage_server
+        parsed = urlparse(self.path)
+        query = dict((key, values[0]) for key, values in parse_qs(parsed.query, keep_blank_values=True).items())
+        parts = [unquote(part) for part in parsed.path.split('/') if part]
+        headers = dict((key, value) for key, value in self.headers.items())
+        headers = _CaseInsensitiveDict(headers)
+
+        length = int(headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+
+        server._record(self.command, parsed.path, query, headers)
+        failure = server._next_failure()
+        if server.latency:
+            time.sleep(server.latency)
+
+        try:
+            if failure is not None:
+                time.sleep(failure[2])
+                raise _ServerError(failure[0], failure[1])
+            handler = getattr(server, '_' + server.service)
+            with server._lock:
+                status, response_headers, response_body = handler(self.command, parts, query, headers, body)
+        except _ServerError as ex:
+            status = ex.status
+            response_headers = {'x-ms-error-code': ex.code}
+            response_body = '<?xml version="1.0" encoding="utf-8"?><Error><Code>{0}</Code>' \
+                            '<Message>{0}</Message></Error>'.format(ex.code).encode('utf-8')
+
+        self.send_response(status)
+        response_headers.setdefault('Content-Length', str(len(response_body)))
+        response_headers['x-ms-request-id'] = str(uuid.uuid4())
+        response_headers['x-ms-version'] = headers.get('x-ms-version', '')
+        response_headers['Date'] = formatdate(usegmt=True)
+        if 'x-ms-client-request-id' in headers:
+            response_headers['x-ms-client-request-id'] = headers['x-ms-client-request-id']
+        for key, value in response_headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(response_body)
+
+
+class _CaseInsensitiveDict(dict):
+    def __init__(self, values):
+        super(_CaseInsensitiveDict, self).__init__((key.lower(), value) for key, value in values.items())
+
+    def get(self, key, default=None):
+        return super(_CaseInsensitiveDict, self).get(key.lower(), default)
+
+    def __getitem__(self, key):
+        return super(_CaseInsensitiveDict, self).__getitem__(key.lower())
+
+    def __contains__(self, key):
+        return super(_CaseInsensitiveDict, self).__contains__(key.lower())
+
+
+def _md5(data):
+    return base64.b64encode(hashlib.md5(data).digest()).decode('utf-8')
+
+
+def _parse_headers(lines):
+    return dict(line.split(': ', 1) for line in lines if line)
+
+
+def _get_metadata(headers):
+    return dict((key[10:], value) for key, value in headers.items() if key.startswith('x-ms-meta-'))
+
+
+def _metadata_headers(metadata):
+    return dict(('x-ms-meta-' + key, value) for key, value in metadata.items())
+
+
+def _blob_headers(blob):
+    headers = _metadata_headers(blob.metadata)
+    headers.update({
+        'ETag': blob.etag,
+        'Last-Modified': blob.last_modified,
+        'x-ms-blob-type': blob.blob_type,
+    })
+    if blob.content_encoding:
+        headers['Content-Encoding'] = blob.content_encoding
+    return headers
+
+
+def _file_headers(content_encoding=None):
+    headers = {
+        'ETag': '"0x{0}"'.format(uuid.uuid4().hex[:15].upper()),
+        'Last-Modified': formatdate(usegmt=True),
+    }
+    if content_encoding:
+        headers['Content-Encoding'] = content_encoding
+    return headers
+
+
+def _parse_range(value):
+    start, end = value.split('=', 1)[1].split('-', 1)
+    return int(start), int(end) if end else None
+
+
+def _get_range(content, headers, response_headers):
+    header = headers.get('x-ms-range') or headers.get('Range')
+    if header is None:
+        response_headers['Content-MD5'] = _md5(content)
+        return 200, response_headers, bytes(content)
+
+    start, end = _parse_range(header)
+    if start >= len(content):
+        raise _ServerError(416, 'InvalidRange')
+    end = len(content) - 1 if end is None else min(end, len(content) - 1)
+    data = bytes(content[start:end + 1])
+    response_headers['Content-Range'] = 'bytes {0}-{1}/{2}'.format(start, end, len(content))
+    if headers.get('x-ms-range-get-content-md5') == 'true':
+        response_headers['Content-MD5'] = _md5(data)
+    return 206, response_headers, data
+
+
+def _page(items, query, key=lambda item: item):
+    marker = query.get('marker')
+    if marker:
+        items = [item for item in items if key(item) >= marker]
+    max_results = int(query.get('maxresults', 5000))
+    next_marker = key(items[max_results]) if len(items) > max_results else ''
+    return items[:max_results], next_marker
+
+
+def _list_response(kind, items, next_marker):
+    body = '<?xml version="1.0" encoding="utf-8"?><EnumerationResults><{0}>{1}</{0}>' \
+           '<NextMarker>{2}</NextMarker></EnumerationResults>'.format(kind, items, escape(next_marker))
+    return 200, {'Content-Type': 'application/xml'}, body.encode('utf-8')
+
+
+def _messages_response(messages, include_text):
+    items = ''
+    for message in messages:
+        items += '<QueueMessage><MessageId>{0}</MessageId><InsertionTime>{1}</InsertionTime>' \
+                 '<ExpirationTime>{2}</ExpirationTime><PopReceipt>{3}</PopReceipt>' \
+                 '<TimeNextVisible>{4}</TimeNextVisible><DequeueCount>{5}</DequeueCount>'.format(
+                     message.id,
+                     formatdate(message.insertion_time, usegmt=True),
+                     formatdate(message.insertion_time + 7 * 24 * 3600, usegmt=True),
+                     message.pop_receipt,
+                     formatdate(message.visible_at, usegmt=True),
+                     message.dequeue_count)
+        if include_text:
+            items += '<MessageText>{0}</MessageText>'.format(escape(message.text))
+        items += '</QueueMessage>'
+    body = '<?xml version="1.0" encoding="utf-8"?><QueueMessagesList>{0}</QueueMessagesList>'.format(items)
+    return body.encode('utf-8')
@@ -0,0 +1,536 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import argparse
+import atexit
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from timeit import default_timer
+
+from azure.storage.blob import (
+    BatchDeleteSubRequest,
+    BatchSetBlobTierSubRequest,
+    BlockBlobService,
+    PageBlobService,
+)
+from azure.storage.blob.models import StandardBlobTier
+from azure.storage.common import Urllib3Transport
+from azure.storage.file import FileService
+from azure.storage.queue import QueueService
+from tests.local_storage_server import LocalStorageServer
+
+# Benchmarks the clients against tests.local_storage_server, so that the results
+# are reproducible without an account and the network: chunked uploads and
+# downloads of blobs and files at several max_connections, uploads from local
+# files, from open files in blocks read as substreams, and from streams which
+# return short reads, like sockets and pipes, uploads of sparse page blobs,
+# uploads over a connection with latency in blocks of a fixed or adaptive size,
+# listing, queue message operations, blob batches and small blob operations
+# through each transport. Unlike tests/blob/blob_performance.py, it needs no
+# account.
+#
+# Each benchmark is run --repeat times and the run with the median wall time is
+# reported, as operations per second, MB per second, CPU time per MB and the
+# peak resident set size. The stand-in server runs in the same process, so the
+# CPU time and memory include the server's; compare them between commits rather
+# than reading them as the cost of the client alone. The peak resident set size
+# is reset before each run on Linux, and is the peak of the whole process
+# elsewhere.
+#
+# python -m tests.offline_performance --output after.json --compare before.json
+
+MB = 1024 * 1024
+TRANSFER_SIZE = 32 * MB
+BLOCK_SIZE = 4 * MB
+CONNECTION_COUNTS = [1, 2, 4, 8]
+SHORT_READ_SIZES = [16 * 1024, 64 * 1024]
+LATENCY_TRANSFER_SIZE = 128 * MB
+REQUEST_LATENCY = 0.02
+LISTED_BLOB_COUNT = 20000
+MESSAGE_COUNT = 1000
+SMALL_OPERATION_COUNT = 2000
+BATCH_SIZE = 256
+BATCH_COUNT = 8
+
+CONTAINER_NAME = 'performance'
+SHARE_NAME = 'performance'
+QUEUE_NAME = 'performance'
+
+
+# ------------------------------------------------------------------------------
+# Benchmarks: each creates what it needs, and returns a function which prepares
+# a run, or None, and the operation to time, which returns the number of
+# operations it made and of bytes it transferred.
+
+def blob_upload(server, max_connections):
+    service = server.create_service(BlockBlobService)
+    service.MAX_BLOCK_SIZE = BLOCK_SIZE
+    service.MAX_SINGLE_PUT_SIZE = BLOCK_SIZE
+    service.create_container(CONTAINER_NAME, fail_on_exist=False)
+    data = os.urandom(TRANSFER_SIZE)
+
+    def upload():
+        service.create_blob_from_bytes(CONTAINER_NAME, 'upload', data, max_connections=max_connections)
+        return 1, len(data)
+
+    return None, upload
+
+
+def _create_upload_file(data):
+    handle, file_path = tempfile.mkstemp(suffix='.dat')
+    with os.fdopen(handle, 'wb') as stream:
+        stream.write(data)
+    atexit.register(os.remove, file_path)
+    return file_path
+
+
+def blob_upload_from_path(server, max_connections):
+    service = server.create_service(BlockBlobService)
+    service.MAX_BLOCK_SIZE = BLOCK_SIZE
+    service.MAX_SINGLE_PUT_SIZE = BLOCK_SIZE
+    service.create_container(CONTAINER_NAME, fail_on_exist=False)
+    file_path = _create_upload_file(os.urandom(TRANSFER_SIZE))
+
+    def upload():
+        service.create_blob_from_path(CONTAINER_NAME, 'upload', file_path, max_connections=max_connections)
+        return 1, TRANSFER_SIZE
+
+    return None, upload
+
+
+def blob_upload_from_file_stream(server, max_connections):
+    service = server.create_service(BlockBlobService)
+    service.MAX_BLOCK_SIZE = BLOCK_SIZE
+    service.MAX_SINGLE_PUT_SIZE = BLOCK_SIZE
+    # blocks of BLOCK_SIZE are sent as substreams of the file rather than read into memory
+    service.MIN_LARGE_BLOCK_UPLOAD_THRESHOLD = BLOCK_SIZE
+    service.create_container(CONTAINER_NAME, fail_on_exist=False)
+    file_path = _create_upload_file(os.urandom(TRANSFER_SIZE))
+
+    def upload():
+        with open(file_path, 'rb') as stream:
+            service.create_blob_from_stream(CONTAINER_NAME, 'upload', stream, count=TRANSFER_SIZE,
+                                            max_connections=max_connections)
+        return 1, TRANSFER_SIZE
+
+    return None, upload
+
+
+class _ShortReadStream(object):
+    '''
+    A non-seekable stream which returns at most read_size bytes per read, like a
+    socket or a pipe.
+    '''
+
+    def __init__(self, data, read_size):
+        self._data = memoryview(data)
+        self._read_size = read_size
+        self._position = 0
+
+    def read(self, size=-1):
+        end = self._position + min(size, self._read_size)
+        data = self._data[self._position:end].tobytes()
+        self._position += len(data)
+        return data
+
+    def readinto(self, buffer):
+        data = self._data[self._position:self._position + min(len(buffer), self._read_size)]
+        buffer[:len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+
+def blob_upload_short_reads(server, read_size):
+    service = server.create_service(BlockBlobService)
+    service.MAX_BLOCK_SIZE = BLOCK_SIZE
+    service.MAX_SINGLE_PUT_SIZE = BLOCK_SIZE
+    service.create_container(CONTAINER_NAME, fail_on_exist=False)
+    data = os.urandom(TRANSFER_SIZE)
+
+    def upload():
+        service.create_blob_from_stream(CONTAINER_NAME, 'upload', _ShortReadStream(data, read_size),
+                                        count=len(data), max_connections=1)
+        return 1, len(data)
+
+    return None, upload
+
+
+def page_blob_upload_sparse(server, source):
+    service = server.create_service(PageBlobService)
+    service.create_container(CONTAINER_NAME, fail_on_exist=False)
+    # a disk image which is mostly empty: one chunk of data, and a few pages of it in another
+    data = bytearray(TRANSFER_SIZE)
+    data[8 * MB:12 * MB] = os.urandom(4 * MB)
+    data[20 * MB:20 * MB + 64 * 1024] = os.urandom(64 * 1024)
+
+    if source == 'bytes':
+        data = bytes(data)
+
+        def upload():
+            service.create_blob_from_bytes(CONTAINER_NAME, 'sparse', data)
+            return 1, len(data)
+    else:
+        # the empty regions are left as holes of the file
+        handle, file_path = tempfile.mkstemp(suffix='.dat')
+        with os.fdopen(handle, 'wb') as stream:
+            for start, end in ((8 * MB, 12 * MB), (20 * MB, 20 * MB + 64 * 1024)):
+                stream.seek(start)
+                stream.write(data[start:end])
+            stream.truncate(TRANSFER_SIZE)
+        atexit.register(os.remove, file_path)
+
+        def upload():
+            service.create_blob_from_path(CONTAINER_NAME, 'sparse', file_path)
+            return 1, TRANSFER_SIZE
+
+    return None, upload
+
+
+def blob_upload_with_latency(server, adaptive):
+    service = server.create_service(BlockBlobService)
+    service.MAX_BLOCK_SIZE = BLOCK_SIZE
+    service.MAX_SINGLE_PUT_SIZE = BLOCK_SIZE
+    service.ADAPTIVE_BLOCK_SIZE = adaptive
+    service.create_container(CONTAINER_NAME, fail_on_exist=False)
+    data = os.urandom(LATENCY_TRANSFER_SIZE)
+
+    def upload():
+        # the server is shared with the other blob benchmarks, so the latency is only added for this one
+        server.latency = REQUEST_LATENCY
+        try:
+            service.create_blob_from_bytes(CONTAINER_NAME, 'upload', data, max_connections=1)
+        finally:
+            server.latency = 0
+        return 1, len(data)
+
+    return None, upload
+
+
+def blob_download(server, max_connections):
+    service = server.create_service(BlockBlobService)
+    service.MAX_CHUNK_GET_SIZE = BLOCK_SIZE
+    service.MAX_SINGLE_GET_SIZE = BLOCK_SIZE
+    server.add_blobs(CONTAINER_NAME, ['download'], os.urandom(TRANSFER_SIZE))
+
+    def download():
+        blob = service.get_blob_to_bytes(CONTAINER_NAME, 'download', max_connections=max_connections)
+        return 1, len(blob.content)
+
+    return None, download
+
+
+def file_upload(server, max_connections):
+    service = server.create_service(FileService)
+    service.create_share(SHARE_NAME, fail_on_exist=False)
+    data = os.urandom(TRANSFER_SIZE)
+
+    def upload():
+        service.create_file_from_bytes(SHARE_NAME, None, 'upload', data, max_connections=max_connections)
+        return 1, len(data)
+
+    return None, upload
+
+
+def file_upload_from_path(server, max_connections):
+    service = server.create_service(FileService)
+    service.create_share(SHARE_NAME, fail_on_exist=False)
+    file_path = _create_upload_file(os.urandom(TRANSFER_SIZE))
+
+    def upload():
+        service.create_file_from_path(SHARE_NAME, None, 'upload', file_path, max_connections=max_connections)
+        return 1, TRANSFER_SIZE
+
+    return None, upload
+
+
+def file_download(server, max_connections):
+    service = server.create_service(FileService)
+    service.MAX_CHUNK_GET_SIZE = BLOCK_SIZE
+    service.MAX_SINGLE_GET_SIZE = BLOCK_SIZE
+    service.create_share(SHARE_NAME, fail_on_exist=False)
+    service.create_file_from_bytes(SHARE_NAME, None, 'download', os.urandom(TRANSFER_SIZE), max_connections=8)
+
+    def download():
+        file = service.get_file_to_bytes(SHARE_NAME, None, 'download', max_connections=max_connections)
+        return 1, len(file.content)
+
+    return None, download
+
+
+def blob_listing(server, names_only):
+    service = server.create_service(BlockBlobService)
+    server.add_blobs('listing', ['blob{0:06d}'.format(i) for i in range(LISTED_BLOB_COUNT)])
+    list_blobs = service.list_blob_names if names_only else service.list_blobs
+
+    def list_all():
+        return sum(1 for _ in list_blobs('listing')), 0
+
+    return None, list_all
+
+
+def queue_messages(server, operation):
+    service = server.create_service(QueueService)
+    messages = []
+
+    def put():
+        for i in range(MESSAGE_COUNT):
+            service.put_message(QUEUE_NAME, u'message {0}'.format(i))
+        return MESSAGE_COUNT, 0
+
+    def get():
+        del messages[:]
+        while len(messages) < MESSAGE_COUNT:
+            messages.extend(service.get_messages(QUEUE_NAME, num_messages=32, visibility_timeout=300))
+        return len(messages), 0
+
+    def delete():
+        for message in messages:
+            service.delete_message(QUEUE_NAME, message.id, message.pop_receipt)
+        return len(messages), 0
+
+    def prepare():
+        service.delete_queue(QUEUE_NAME)
+        service.create_queue(QUEUE_NAME)
+        if operation != 'put':
+            put()
+        if operation == 'delete':
+            get()
+
+    return prepare, {'put': put, 'get': get, 'delete': delete}[operation]
+
+
+def blob_small_operations(server, transport):
+    service = server.create_service(BlockBlobService)
+    if transport == 'urllib3':
+        service.transport = Urllib3Transport()
+    service.create_container(CONTAINER_NAME)
+    service.create_blob_from_bytes(CONTAINER_NAME, 'small', b'small')
+
+    def get_properties():
+        for _ in range(SMALL_OPERATION_COUNT):
+            service.get_blob_properties(CONTAINER_NAME, 'small')
+        return SMALL_OPERATION_COUNT, 0
+
+    return None, get_properties
+
+
+def blob_batch(server, operation):
+    service = server.create_service(BlockBlobService)
+    names = ['blob{0:04d}'.format(i) for i in range(BATCH_SIZE * BATCH_COUNT)]
+    if operation == 'delete':
+        sub_requests = [BatchDeleteSubRequest('batch', name) for name in names]
+        send = service.batch_delete_blobs
+    else:
+        sub_requests = [BatchSetBlobTierSubRequest('batch', name, StandardBlobTier.Cool) for name in names]
+        send = service.batch_set_standard_blob_tier
+
+    def send_batches():
+        for i in range(0, len(sub_requests), BATCH_SIZE):
+            responses = send(sub_requests[i:i + BATCH_SIZE])
+            if not all(response.is_successful for response in responses):
+                raise AssertionError('a sub-request of the batch failed')
+        return len(sub_requests), 0
+
+    return lambda: server.add_blobs('batch', names), send_batches
+
+
+BENCHMARKS = [('blob', 'blob_upload', blob_upload, {'max_connections': count}) for count in CONNECTION_COUNTS] + \
+             [('blob', 'blob_upload_from_path', blob_upload_from_path, {'max_connections': count})
+              for count in CONNECTION_COUNTS] + \
+             [('blob', 'blob_upload_from_file_stream', blob_upload_from_file_stream, {'max_connections': count})
+              for count in CONNECTION_COUNTS] + \
+             [('blob', 'blob_upload_short_reads', blob_upload_short_reads, {'read_size': size})
+              for size in SHORT_READ_SIZES] + \
+             [('blob', 'page_blob_upload_sparse', page_blob_upload_sparse, {'source': source})
+              for source in ('bytes', 'sparse_file')] + \
+             [('blob', 'blob_upload_with_latency', blob_upload_with_latency, {'adaptive': adaptive})
+              for adaptive in (False, True)] + \
+             [('blob', 'blob_download', blob_download, {'max_connections': count}) for count in CONNECTION_COUNTS] + \
+             [('file', 'file_upload', file_upload, {'max_connections': count}) for count in CONNECTION_COUNTS] + \
+             [('file', 'file_upload_from_path', file_upload_from_path, {'max_connections': count})
+              for count in CONNECTION_COUNTS] + \
+             [('file', 'file_download', file_download, {'max_connections': count}) for count in CONNECTION_COUNTS] + \
+             [('blob', 'blob_listing', blob_listing, {'names_only': names_only}) for names_only in (False, True)] + \
+             [('queue', 'queue_messages', queue_messages, {'operation': operation})
+              for operation in ('put', 'get', 'delete')] + \
+             [('blob', 'blob_batch', blob_batch, {'operation': operation}) for operation in ('delete', 'set_tier')] + \
+             [('blob', 'blob_small_operations', blob_small_operations, {'transport': transport})
+              for transport in ('requests', 'urllib3')]
+
+
+# ------------------------------------------------------------------------------
+# Measurement
+
+def _get_cpu_time():
+    user, system = os.times()[:2]
+    return user + system
+
+
+def _reset_peak_rss():
+    # Linux resets the peak resident set size of the process when 5 is written to clear_refs
+    try:
+        with open('/proc/self/clear_refs', 'w') as clear_refs:
+            clear_refs.write('5')
+    except (IOError, OSError):
+        pass
+
+
+def _get_peak_rss():
+    '''
+    Returns the peak resident set size of the process in MB, or None where it
+    cannot be measured.
+    '''
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024.0
+    except (IOError, OSError):
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    return peak / float(MB) if sys.platform == 'darwin' else peak / 1024.0
+
+
+def measure(prepare, operation, repeat):
+    runs = []
+    for _ in range(repeat):
+        if prepare is not None:
+            prepare()
+        gc.collect()
+        _reset_peak_rss()
+
+        start, cpu_start = default_timer(), _get_cpu_time()
+        operations, size = operation()
+        seconds, cpu_seconds = default_timer() - start, _get_cpu_time() - cpu_start
+        runs.append((seconds, cpu_seconds, operations, size, _get_peak_rss()))
+
+    # the run with the median wall time
+    seconds, cpu_seconds, operations, size, peak_rss = sorted(runs)[len(runs) // 2]
+    megabytes = size / float(MB)
+    return {
+        'seconds': seconds,
+        'operations': operations,
+        'ops_per_second': operations / seconds,
+        'mb_per_second': megabytes / seconds if megabytes else None,
+        'cpu_seconds': cpu_seconds,
+        'cpu_seconds_per_mb': cpu_seconds / megabytes if megabytes else None,
+        'peak_rss_mb': peak_rss,
+    }
+
+
+def get_benchmark_id(name, parameters):
+    return '{0}[{1}]'.format(name, ','.join('{0}={1}'.format(key, parameters[key]) for key in sorted(parameters)))
+
+
+def run_benchmarks(repeat, selected=None):
+    results = []
+    servers = {}
+    try:
+        for service, name, benchmark, parameters in BENCHMARKS:
+            benchmark_id = get_benchmark_id(name, parameters)
+            if selected and not any(pattern in benchmark_id for pattern in selected):
+                continue
+
+            if service not in servers:
+                servers[service] = LocalStorageServer(service).start()
+            prepare, operation = benchmark(servers[service], **parameters)
+            result = measure(prepare, operation, repeat)
+            result.update({'id': benchmark_id, 'benchmark': name, 'parameters': parameters})
+            results.append(result)
+            print(format_result(result))
+    finally:
+        for server in servers.values():
+            server.stop()
+    return results
+
+
+# ------------------------------------------------------------------------------
+# Reporting
+
+def format_result(result):
+    line = '{0:<45} {1:>10.1f} ops/s'.format(result['id'], result['ops_per_second'])
+    if result['mb_per_second'] is not None:
+        line += ' {0:>8.1f} MB/s {1:>7.4f} CPU s/MB'.format(result['mb_per_second'], result['cpu_seconds_per_mb'])
+    if result['peak_rss_mb'] is not None:
+        line += ' {0:>7.0f} MB peak RSS'.format(result['peak_rss_mb'])
+    return line
+
+
+def get_environment():
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.STDOUT).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': _get_cpu_count(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+    }
+
+
+def _get_cpu_count():
+    try:
+        from multiprocessing import cpu_count
+        return cpu_count()
+    except (ImportError, NotImplementedError):
+        return None
+
+
+def compare(previous, results):
+    '''
+    Prints the change of the throughput of each benchmark from a previous run:
+    MB per second for transfers, operations per second otherwise.
+    '''
+    previous_results = dict((result['id'], result) for result in previous['results'])
+    print('')
+    print('compared with {0}:'.format(previous['environment'].get('commit') or 'the previous run'))
+    for result in results:
+        before = previous_results.get(result['id'])
+        if before is None:
+            continue
+        metric = 'ops_per_second' if result['mb_per_second'] is None else 'mb_per_second'
+        change = (result[metric] / before[metric] - 1) * 100
+        print('{0:<45} {1:>10.1f} -> {2:>10.1f} {3} ({4:+.1f}%)'.format(
+            result['id'], before[metric], result[metric], metric, change))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks the clients against a local stand-in storage server.')
+    parser.add_argument('--output', help='the file to save the results to, as JSON')
+    parser.add_argument('--compare', help='the JSON results of a previous run to compare with')
+    parser.add_argument('--repeat', type=int, default=3, help='the number of runs of each benchmark')
+    parser.add_argument('benchmarks', nargs='*', help='run only the benchmarks whose id contains one of these')
+    args = parser.parse_args(argv)
+
+    report = {
+        'environment': get_environment(),
+        'repeat': args.repeat,
+        'results': run_benchmarks(args.repeat, args.benchmarks),
+    }
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as previous:
+            compare(json.load(previous), report['results'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import asyncio
+import time
+import unittest
+
+from azure.common import AzureConflictHttpError
+
+from tests.local_storage_server import LocalStorageServer
+from tests.testcase import StorageTestCase
+
+try:
+    import aiohttp
+    from azure.storage.queue.aio import AsyncQueueService
+except ImportError:
+    aiohttp = None
+
+
+# ------------------------------------------------------------------------------
+
+@unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+class StorageAsyncQueueTest(StorageTestCase):
+    def setUp(self):
+        super(StorageAsyncQueueTest, self).setUp()
+        self.server = LocalStorageServer('queue').start()
+        self.loop = asyncio.new_event_loop()
+
+        self.qs = self.server.create_service(AsyncQueueService)
+        self.queue_name = self.get_resource_name('pythonqueue')
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.qs.close())
+        self.loop.close()
+        self.server.stop()
+        return super(StorageAsyncQueueTest, self).tearDown()
+
+    # --Helpers-----------------------------------------------------------------
+    def _run(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    # --Test cases--------------------------------------------------------------
+    def test_create_exists_and_delete_queue(self):
+        # Act
+        created = self._run(self.qs.create_queue(self.queue_name))
+        created_again = self._run(self.qs.create_queue(self.queue_name))
+        exists = self._run(self.qs.exists(self.queue_name))
+        deleted = self._run(self.qs.delete_queue(self.queue_name))
+        exists_after_delete = self._run(self.qs.exists(self.queue_name))
+        deleted_again = self._run(self.qs.delete_queue(self.queue_name))
+
+        # Assert
+        self.assertTrue(created)
+        self.assertFalse(created_again)
+        self.assertTrue(exists)
+        self.assertTrue(deleted)
+        self.assertFalse(exists_after_delete)
+        self.assertFalse(deleted_again)
+
+    def test_create_queue_fail_on_exist(self):
+        # Arrange
+        self._run(self.qs.create_queue(self.queue_name))
+
+        # Act
+        with self.assertRaises(AzureConflictHttpError):
+            self._run(self.qs.create_queue(self.queue_name, fail_on_exist=True))
+
+    def test_list_queues(self):
+        # Arrange
+        names = ['{0}{1}'.format(self.queue_name, i) for i in range(3)]
+        for name in names:
+            self._run(self.qs.create_queue(name))
+
+        async def list_queues():
+            return [queue async for queue in await self.qs.list_queues()]
+
+        # Act
+        queues = self._run(list_queues())
+
+        # Assert
+        self.assertEqual([queue.name for queue in queues], names)
+
+    def test_put_get_and_delete_message(self):
+        # Arrange
+        self._run(self.qs.create_queue(self.queue_name))
+
+        # Act
+        sent = self._run(self.qs.put_message(self.queue_name, u'message1'))
+        messages = self._run(self.qs.get_messages(self.queue_name))
+        self._run(self.qs.delete_message(self.queue_name, messages[0].id, messages[0].pop_receipt))
+        remaining = self._run(self.qs.peek_messages(self.queue_name))
+
+        # Assert
+        self.assertIsNotNone(sent.id)
+        self.assertEqual(len(messages), 1)
+        self.assertEqual(messages[0].content, u'message1')
+        self.assertEqual(remaining, [])
+
+    def test_many_concurrent_polls(self):
+        # Arrange
+        self._run(self.qs.create_queue(self.queue_name))
+        self._run(self.qs.put_message(self.queue_name, u'message1'))
+        self.server.latency = 0.2
+
+        async def poll(count):
+            return await asyncio.gather(*[self.qs.get_messages(self.queue_name) for _ in range(count)])
+
+        # Act
+        start = time.time()
+        results = self._run(poll(50))
+        elapsed = time.time() - start
+
+        # Assert
+        self.assertEqual(sum(len(messages) for messages in results), 1)
+        self.assertLess(elapsed, 50 * 0.2 / 4)
+
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()